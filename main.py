@@ -207,6 +207,33 @@ def generate(**kwargs):
         sys.exit(1)
     
 
+@cli.command(name='outputs-gc')
+@click.option('--output-dir', default='outputs', help='Session output directory (default: outputs)')
+@click.option('--dry-run/--apply', default=True, help='Only report what would be removed (default: dry run)')
+@click.option('--quota-gb', type=float, help='Collect oldest intermediates until outputs fit this size')
+def outputs_gc(output_dir, dry_run, quota_gb):
+    """🧹 Apply the session retention policy and show disk usage"""
+    from src.utils.session_gc import get_session_gc
+    
+    gc = get_session_gc(output_dir)
+    if quota_gb is not None:
+        gc.policy.quota_bytes = int(quota_gb * 1024 ** 3)
+    gc.refresh()
+    report = gc.collect(dry_run=dry_run)
+    usage = gc.usage()
+    
+    print(f"📦 {usage['sessions']} sessions, {usage['total_bytes'] / 1024 ** 2:.1f}MB")
+    for artifact_class, size in usage['by_class'].items():
+        print(f"   {artifact_class:<13} {size / 1024 ** 2:>10.1f}MB")
+    for action in report.actions:
+        print(f"   {'would remove' if dry_run else 'removed'} {action.session_id}/{action.subdir} "
+              f"({action.bytes / 1024 ** 2:.1f}MB, {action.reason})")
+    if dry_run:
+        print(f"🔍 Dry run: {report.planned_bytes / 1024 ** 2:.1f}MB reclaimable (use --apply to delete)")
+    else:
+        print(f"✅ Freed {report.freed_bytes / 1024 ** 2:.1f}MB")
+
+
 # Add social media commands
 add_social_commands(cli)
 
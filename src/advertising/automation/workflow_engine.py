@@ -296,8 +296,8 @@ class WorkflowAutomationEngine:
         async def monitor_trends():
             while trigger.enabled:
                 try:
-                    # Get trending data
-                    trending_data = self.trending_analyzer.get_all_trending_data(limit=10)
+                    # Get trending data (shared snapshots; fetches run off the event loop)
+                    trending_data = await asyncio.to_thread(self.trending_analyzer.get_all_trending_data, limit=10)
                     
                     # Check viral score threshold
                     for platform, data in trending_data.get('platforms', {}).items():
@@ -21,6 +21,9 @@ try:
         Language
     )
     from ..utils.logging_config  import get_logger
+    from ..utils.speech_rate_model import get_speech_rate_model
+    from ..utils.session_context import create_session_context
+    from ..utils.tracing import session_trace, traced
     from .continuity_decision_agent  import ContinuityDecisionAgent
     from .voice_director_agent  import VoiceDirectorAgent
     from .video_composition_agents import (
@@ -51,6 +54,9 @@ except ImportError:
         Language
     )
     from src.utils.logging_config import get_logger
+    from src.utils.speech_rate_model import get_speech_rate_model
+    from src.utils.session_context import create_session_context
+    from src.utils.tracing import session_trace, traced
     from src.agents.continuity_decision_agent import ContinuityDecisionAgent
     from src.agents.voice_director_agent import VoiceDirectorAgent
     from src.agents.video_composition_agents import (
@@ -128,6 +134,9 @@ class WorkingOrchestrator:
         
         # CRITICAL: Store core decisions for system-wide use
         self.core_decisions = core_decisions
+        
+        # Measured TTS speaking rate for sizing scripts before synthesis
+        self.speech_rate = get_speech_rate_model()
         if core_decisions:
             logger.info(f"✅ Core decisions received: {core_decisions.num_clips} clips, {core_decisions.clip_durations}")
         else:
@@ -240,7 +249,7 @@ class WorkingOrchestrator:
         
         # Initialize parallel processor for performance optimization
         from ..utils.parallel_processor import ParallelProcessor
-        self.parallel_processor = ParallelProcessor(max_workers=4)
+        self.parallel_processor = ParallelProcessor(max_workers=4, discussion_timeout=600)
         
         # Results storage
         self.agent_decisions = {}
@@ -328,6 +337,12 @@ class WorkingOrchestrator:
 
         Returns:
             Generation result with success status and metadata """
+        with session_trace("orchestrator.generate_video") as tracer:
+            tracer.bind(create_session_context(self.session_id).get_output_path("analysis"))
+            return await self._generate_video(config)
+
+    async def _generate_video(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the orchestrated generation phases (see generate_video)"""
         logger.info(f"🎬 Starting {self.mode} AI agent video generation")
         
         # Store config for access in extraction methods
@@ -366,7 +381,7 @@ class WorkingOrchestrator:
                         "reasoning": "Cheap mode - using default duration settings",
                         "decisions": {
                             "duration_compliance": "assumed_compliant",
-                            "word_count_limit": f"auto_calculated_{int(self.duration * 2.8)}_words",
+                            "word_count_limit": f"auto_calculated_{self.speech_rate.word_budget(self.duration, language=self.language)}_words",
                             "segment_timing": "auto_segmented"
                         }
                     }
@@ -546,6 +561,7 @@ class WorkingOrchestrator:
                 } if self.mode == OrchestratorMode.PROFESSIONAL else None
             }
 
+    @traced("phase.frame_continuity")
     def _make_frame_continuity_decision(
         self,
         config: Dict[str,
@@ -603,6 +619,7 @@ class WorkingOrchestrator:
 
         return decision
 
+    @traced("phase.trending")
     def _analyze_trending_content(self, config: Dict[str, Any]):
         """Analyze trending content for insights"""
         logger.info("📈 Analyzing trending content...")
@@ -633,6 +650,7 @@ class WorkingOrchestrator:
             'note': 'Using fallback trending data'
             }
     
+    @traced("phase.discussions")
     def _conduct_agent_discussions(self, config: Dict[str, Any]):
         """Conduct AI agent discussions based on mode"""
         logger.info("🤝 Conducting AI agent discussions...")
@@ -940,6 +958,60 @@ class WorkingOrchestrator:
             # Use standard system's start_discussion method
             return self.discussion_system.start_discussion(topic, participants)
     
+    def _run_discussion_batch(self, phase: str, discussion_tasks: list):
+        """
+        Run independent discussions concurrently and store their results
+        
+        Discussions that time out are left out (partial results), and the
+        batch timings are written to the session's performance metrics.
+        
+        Args:
+            phase: Name of the discussion phase (used in metrics)
+            discussion_tasks: Tasks with task_id, topic and participants
+        """
+        for task in discussion_tasks:
+            task.setdefault('runner', self._start_discussion)
+        
+        try:
+            parallel_results = self.parallel_processor.run_discussions(discussion_tasks)
+            self.discussion_results.update(parallel_results)
+            self._record_discussion_metrics(phase, self.parallel_processor.last_discussion_metrics)
+            logger.info(f"🚀 Parallel {phase} discussions completed: {len(parallel_results)} topics")
+        except Exception as e:
+            logger.error(f"❌ Parallel discussions failed, falling back to sequential: {e}")
+            # Fallback to sequential processing
+            for task in discussion_tasks:
+                try:
+                    result = self._start_discussion(task['topic'], task['participants'])
+                    self.discussion_results[task['task_id']] = result
+                except Exception as task_error:
+                    logger.error(f"❌ Discussion {task['task_id']} failed: {task_error}")
+    
+    def _record_discussion_metrics(self, phase: str, metrics: Dict[str, Any]):
+        """Save parallel discussion timings to the session's performance metrics"""
+        try:
+            import json
+            from ..utils.session_context import get_current_session_context
+            
+            session_context = get_current_session_context()
+            if not session_context or not metrics:
+                return
+            
+            metrics_path = session_context.get_output_path("performance_metrics", "discussion_metrics.json")
+            all_metrics = {}
+            if os.path.exists(metrics_path):
+                with open(metrics_path, 'r') as f:
+                    all_metrics = json.load(f)
+            
+            all_metrics[phase] = dict(metrics, recorded_at=datetime.now().isoformat())
+            with open(metrics_path, 'w') as f:
+                json.dump(all_metrics, f, indent=2)
+            
+            logger.info(f"⏱️ {phase} discussions: {metrics['wall_clock_seconds']:.1f}s wall clock vs "
+                        f"{metrics['sequential_seconds']:.1f}s sequential ({metrics['speedup']}x)")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to save discussion metrics: {e}")
+    
     def _conduct_duration_validation_only(self, config: Dict[str, Any]):
         """Conduct ONLY duration validation discussion for simple/cheap modes"""
         logger.info("⏱️ Conducting mandatory duration validation...")
@@ -966,8 +1038,8 @@ class WorkingOrchestrator:
                 'target_duration': self.duration,
                 'max_duration': self.duration * 1.05,  # 5% tolerance
                 'min_duration': self.duration * 0.95,  # 5% tolerance
-                'words_per_second': 2.8,  # Speaking rate (matches TTS configuration)
-                'max_words': int(self.duration * 2.8),
+                'words_per_second': round(self.speech_rate.words_per_second(language=self.language), 2),  # Measured TTS speaking rate
+                'max_words': self.speech_rate.word_budget(self.duration, language=self.language),
                 'platform': self.platform.value,
                 'num_segments': max(1, self.duration // 8),  # Approximate segments
                 'mode': self.mode,
@@ -1017,7 +1089,7 @@ class WorkingOrchestrator:
                 'target_duration': self.duration,
                 'max_duration': self.duration * 1.05,
                 'min_duration': self.duration * 0.95,
-                'words_per_second': 2.8,
+                'words_per_second': round(self.speech_rate.words_per_second(language=self.language), 2),
                 'platform': self.platform.value,
                 'num_segments': max(1, self.duration // 8)
             },
@@ -1081,43 +1153,8 @@ class WorkingOrchestrator:
             'discussion_system': self.discussion_system
         })
         
-        # Run all discussions in parallel using async processing
-        import asyncio
-        try:
-            import nest_asyncio
-            nest_asyncio.apply()
-        except ImportError:
-            pass
-        
-        try:
-            # Try to get the current loop
-            loop = asyncio.get_running_loop()
-            # We're in an async context, use nest_asyncio
-            parallel_results = asyncio.run(
-                self.parallel_processor.run_parallel_ai_discussions(discussion_tasks)
-            )
-        except RuntimeError:
-            # No loop running, create new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            parallel_results = loop.run_until_complete(
-                self.parallel_processor.run_parallel_ai_discussions(discussion_tasks)
-            )
-            
-            # Store results
-            self.discussion_results.update(parallel_results)
-            
-            logger.info(f"🚀 Parallel enhanced discussions completed: {len(parallel_results)} topics")
-            
-        except Exception as e:
-            logger.error(f"❌ Parallel discussions failed, falling back to sequential: {e}")
-            # Fallback to sequential processing
-            for task in discussion_tasks:
-                try:
-                    result = self._start_discussion(task['topic'], task['participants'])
-                    self.discussion_results[task['task_id']] = result
-                except Exception as task_error:
-                    logger.error(f"❌ Discussion {task['task_id']} failed: {task_error}")
+        # Run all discussions concurrently on the processor's discussion pool
+        self._run_discussion_batch('enhanced', discussion_tasks)
         
         logger.info(f"✅ Completed {len(self.discussion_results)} enhanced discussions")
     def _conduct_advanced_discussions(self, config: Dict[str, Any]):
@@ -1132,6 +1169,9 @@ class WorkingOrchestrator:
         # Professional discussions build on enhanced base
         self._conduct_enhanced_discussions(config)
         
+        # Discussions 4-7 are independent of each other, so run them concurrently
+        discussion_tasks = []
+        
         # Discussion 4: Marketing & Brand Strategy (4 agents)
         marketing_topic = DiscussionTopic(
             topic_id="marketing_strategy", 
@@ -1147,11 +1187,11 @@ class WorkingOrchestrator:
             required_decisions=["marketing_strategy", "brand_alignment", "audience_targeting"]
         )
         
-        marketing_result = self._start_discussion(
-            marketing_topic,
-            [AgentRole.MARKETING_STRATEGIST, AgentRole.BRAND_SPECIALIST, AgentRole.SOCIAL_MEDIA_EXPERT, AgentRole.AUDIENCE_RESEARCHER]
-        )
-        self.discussion_results['marketing_strategy'] = marketing_result
+        discussion_tasks.append({
+            'task_id': 'marketing_strategy',
+            'topic': marketing_topic,
+            'participants': [AgentRole.MARKETING_STRATEGIST, AgentRole.BRAND_SPECIALIST, AgentRole.SOCIAL_MEDIA_EXPERT, AgentRole.AUDIENCE_RESEARCHER]
+        })
         
         # Discussion 5: Visual Design & Typography (4 agents)
         design_topic = DiscussionTopic(
@@ -1168,11 +1208,11 @@ class WorkingOrchestrator:
             required_decisions=["visual_design", "typography", "color_scheme", "motion_graphics"]
         )
         
-        design_result = self._start_discussion(
-            design_topic,
-            [AgentRole.VISUAL_DESIGNER, AgentRole.TYPOGRAPHY_EXPERT, AgentRole.COLOR_SPECIALIST, AgentRole.MOTION_GRAPHICS]
-        )
-        self.discussion_results['design_strategy'] = design_result
+        discussion_tasks.append({
+            'task_id': 'design_strategy',
+            'topic': design_topic,
+            'participants': [AgentRole.VISUAL_DESIGNER, AgentRole.TYPOGRAPHY_EXPERT, AgentRole.COLOR_SPECIALIST, AgentRole.MOTION_GRAPHICS]
+        })
         
         # Discussion 6: Engagement & Virality Strategy (4 agents)
         engagement_topic = DiscussionTopic(
@@ -1188,11 +1228,11 @@ class WorkingOrchestrator:
             required_decisions=["engagement_hooks", "viral_elements", "cta_strategy", "shareability"]
         )
         
-        engagement_result = self._start_discussion(
-            engagement_topic,
-            [AgentRole.ENGAGEMENT_OPTIMIZER, AgentRole.VIRAL_SPECIALIST, AgentRole.ANALYTICS_EXPERT, AgentRole.CONTENT_STRATEGIST]
-        )
-        self.discussion_results['engagement_strategy'] = engagement_result
+        discussion_tasks.append({
+            'task_id': 'engagement_strategy',
+            'topic': engagement_topic,
+            'participants': [AgentRole.ENGAGEMENT_OPTIMIZER, AgentRole.VIRAL_SPECIALIST, AgentRole.ANALYTICS_EXPERT, AgentRole.CONTENT_STRATEGIST]
+        })
         
         # Discussion 7: Platform Optimization & Copy Strategy (4 agents)
         platform_topic = DiscussionTopic(
@@ -1208,11 +1248,13 @@ class WorkingOrchestrator:
             required_decisions=["platform_optimization", "copy_strategy", "thumbnail_design", "algorithm_alignment"]
         )
         
-        platform_result = self._start_discussion(
-            platform_topic,
-            [AgentRole.PLATFORM_OPTIMIZER, AgentRole.COPYWRITER, AgentRole.THUMBNAIL_DESIGNER, AgentRole.TREND_ANALYST]
-        )
-        self.discussion_results['platform_optimization'] = platform_result
+        discussion_tasks.append({
+            'task_id': 'platform_optimization',
+            'topic': platform_topic,
+            'participants': [AgentRole.PLATFORM_OPTIMIZER, AgentRole.COPYWRITER, AgentRole.THUMBNAIL_DESIGNER, AgentRole.TREND_ANALYST]
+        })
+        
+        self._run_discussion_batch('advanced', discussion_tasks)
         
         # Discussion 8: Advanced Neuroscience & Psychological Triggers (Professional Mode)
         advanced_neuro_topic = DiscussionTopic(
@@ -1272,6 +1314,7 @@ class WorkingOrchestrator:
         self.discussion_results['multilingual_strategy'] = multilang_result
         logger.info("✅ Multilingual discussions completed")
 
+    @traced("phase.script")
     async def _generate_enhanced_script(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Generate script with AI enhancement and processing"""
         logger.info("📝 Generating enhanced script...")
@@ -1346,7 +1389,7 @@ class WorkingOrchestrator:
                     'themes': [self.tone],
                     'success_factors': [self.style, 'engaging'],
                     'duration_constraints': duration_constraints,
-                    'max_words': int(actual_duration * 2.8),  # Enforce word limit (2.8 words per second for TTS)
+                    'max_words': self.speech_rate.word_budget(actual_duration, language=self.language),  # Enforce word limit at the measured TTS rate
                     'tolerance_percent': 0.15,  # 15% tolerance (fixed)
                     'target_language': target_language
                 }
@@ -1423,6 +1466,7 @@ class WorkingOrchestrator:
         logger.info(f"✅ Fast decisions made: {fast_decisions['num_clips']} clips, {settings['style']} style")
         return fast_decisions
     
+    @traced("phase.decisions")
     def _make_comprehensive_decisions(self, script_data: Dict[str, Any], config: Dict[str, Any],
                                       frame_continuity_decision: Dict[str, Any]) -> Dict[str, Any]:
         """Make comprehensive AI decisions based on mode"""
@@ -2147,6 +2191,7 @@ class WorkingOrchestrator:
                 f.write(f"Subtitle generation failed for {language.value}: {script}")
             return subtitle_path
 
+    @traced("phase.video")
     async def _generate_enhanced_video(self, script_data: Dict[str, Any],
                                  decisions: Dict[str, Any], config: Dict[str, Any]) -> str:
         """Generate enhanced video with all AI decisions"""
@@ -2498,6 +2543,7 @@ class WorkingOrchestrator:
         
         return base_agents
 
+    @traced("phase.cheap_video")
     async def _generate_cheap_video(self, script_data: Dict[str, Any], decisions: Dict[str, Any], config: Dict[str, Any]) -> Optional[str]:
         """Generate video in cheap mode with granular level control"""
         logger.info(f"💰 Starting cheap mode video generation (level: {self.cheap_mode_level})")
@@ -2634,7 +2680,7 @@ class WorkingOrchestrator:
         total_words = len(words)
         
         # Calculate words per segment based on duration
-        target_words = min(total_words, int(self.duration * 2.8))  # 2.8 words per second
+        target_words = min(total_words, self.speech_rate.word_budget(self.duration, language=self.language))
         
         # Create engaging hook, main content, and CTA
         hook_text = f"What if I told you {' '.join(words[:min(8, total_words//3)])}?"
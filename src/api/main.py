@@ -6,9 +6,9 @@ Complete REST API with WebSocket support
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel, Field
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 import asyncio
@@ -18,6 +18,8 @@ import bcrypt
 from pathlib import Path
 import logging
 
+from src.api.progress_fanout import ALL_SESSIONS, ConnectionManager
+
 # Core video generation dependencies
 try:
     from src.ai.manager import AIServiceManager
@@ -26,6 +28,19 @@ except ImportError:
     print("Warning: AI manager not available")
     ai_manager = None
 
+try:
+    from src.shared.monitoring.performance_monitor import performance_monitor
+except ImportError:
+    print("Warning: Performance monitor not available")
+    performance_monitor = None
+
+try:
+    from src.utils.session_gc import get_session_gc
+    session_gc = get_session_gc("outputs")
+except ImportError:
+    print("Warning: Session GC not available")
+    session_gc = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -59,25 +74,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 # Global instances for video generation only
 # (advertising components removed for simplicity)
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
+# WebSocket connection manager: per-session channels with bounded per-client queues
 manager = ConnectionManager()
 
 # Pydantic models
@@ -125,6 +122,16 @@ class GenerationSession(BaseModel):
 users_db = {}
 sessions_db = {}  # Store video generation sessions
 generation_progress = {}  # Store generation progress
+stop_requests: Dict[str, asyncio.Event] = {}  # Set when a session's generation should stop
+
+# Output markers of main.py mapped to the progress they report
+PROGRESS_MARKERS = [
+    ("Discussion phase", {"progress": 25, "currentPhase": "AI Discussion", "message": "AI agents discussing and planning..."}),
+    ("Generating script", {"progress": 40, "currentPhase": "Script Generation", "message": "Creating video script..."}),
+    ("Generating video", {"progress": 60, "currentPhase": "Video Generation", "message": "AI generating video content..."}),
+    ("Processing audio", {"progress": 80, "currentPhase": "Audio Processing", "message": "Creating voiceover and background music..."}),
+    ("Final assembly", {"progress": 95, "currentPhase": "Final Assembly", "message": "Combining all elements..."}),
+]
 
 # Authentication functions
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -292,6 +299,8 @@ async def stop_generation(session_id: str):
     
     sessions_db[session_id]["status"] = "stopped"
     sessions_db[session_id]["updated_at"] = datetime.now().isoformat()
+    if session_id in stop_requests:
+        stop_requests[session_id].set()
     
     return {"message": "Generation stopped", "session_id": session_id}
 
@@ -379,11 +388,7 @@ async def run_real_video_generation(session_id: str, config: VideoGenerationConf
             "message": "Starting video generation process..."
         })
         
-        await manager.broadcast(json.dumps({
-            "event": "progress_update",
-            "session_id": session_id,
-            "data": generation_progress[session_id]
-        }))
+        manager.publish_progress(session_id, generation_progress[session_id])
         
         # Run the actual generation command
         try:
@@ -398,66 +403,33 @@ async def run_real_video_generation(session_id: str, config: VideoGenerationConf
             logger.error(f"Failed to start process: {e}")
             raise
         
-        # Monitor the process and update progress
-        while process.returncode is None:
-            if sessions_db[session_id]["status"] == "stopped":
-                process.terminate()
-                break
+        # Read output as it arrives; stderr is drained alongside so the pipe never fills
+        stop_event = stop_requests.setdefault(session_id, asyncio.Event())
+        if sessions_db[session_id]["status"] == "stopped":
+            stop_event.set()
+        stop_task = asyncio.create_task(_terminate_on_stop(process, stop_event))
+        stderr_task = asyncio.create_task(process.stderr.read())
+        
+        try:
+            async for stdout_data in process.stdout:
+                line = stdout_data.decode(errors="replace").strip()
+                logger.info(f"Generation output: {line}")
                 
-            # Check for output to parse progress
-            try:
-                stdout_data = await asyncio.wait_for(process.stdout.readline(), timeout=1.0)
-                if stdout_data:
-                    line = stdout_data.decode().strip()
-                    logger.info(f"Generation output: {line}")
-                    
-                    # Parse progress from output (you'll need to add progress indicators to main.py)
-                    if "Discussion phase" in line:
-                        generation_progress[session_id].update({
-                            "progress": 25,
-                            "currentPhase": "AI Discussion",
-                            "message": "AI agents discussing and planning..."
-                        })
-                    elif "Generating script" in line:
-                        generation_progress[session_id].update({
-                            "progress": 40,
-                            "currentPhase": "Script Generation", 
-                            "message": "Creating video script..."
-                        })
-                    elif "Generating video" in line:
-                        generation_progress[session_id].update({
-                            "progress": 60,
-                            "currentPhase": "Video Generation",
-                            "message": "AI generating video content..."
-                        })
-                    elif "Processing audio" in line:
-                        generation_progress[session_id].update({
-                            "progress": 80,
-                            "currentPhase": "Audio Processing",
-                            "message": "Creating voiceover and background music..."
-                        })
-                    elif "Final assembly" in line:
-                        generation_progress[session_id].update({
-                            "progress": 95,
-                            "currentPhase": "Final Assembly",
-                            "message": "Combining all elements..."
-                        })
-                    
-                    # Broadcast updated progress
-                    await manager.broadcast(json.dumps({
-                        "event": "progress_update",
-                        "session_id": session_id,
-                        "data": generation_progress[session_id]
-                    }))
-                        
-            except asyncio.TimeoutError:
-                # No output yet, continue waiting
-                pass
+                # Parse progress from output (you'll need to add progress indicators to main.py)
+                for marker, update in PROGRESS_MARKERS:
+                    if marker in line:
+                        generation_progress[session_id].update(update)
+                        break
+                
+                # Only changed fields reach subscribers; unchanged lines send nothing
+                manager.publish_progress(session_id, generation_progress[session_id])
             
-            await asyncio.sleep(0.5)
-        
-        # Wait for process to complete
-        stdout, stderr = await process.communicate()
+            await process.wait()
+            stderr = await stderr_task
+        finally:
+            stop_task.cancel()
+            stderr_task.cancel()
+            stop_requests.pop(session_id, None)
         
         if process.returncode == 0:
             # Generation successful
@@ -483,15 +455,12 @@ async def run_real_video_generation(session_id: str, config: VideoGenerationConf
                     "thumbnail": str(video_files[0]).replace('.mp4', '_thumbnail.jpg')
                 }
             
-            # Broadcast completion
-            await manager.broadcast(json.dumps({
-                "event": "generation_complete", 
-                "session_id": session_id,
-                "data": {
-                    "session": sessions_db[session_id],
-                    "finalVideo": final_video
-                }
-            }))
+            # Publish completion to the session's subscribers
+            manager.publish_progress(session_id, generation_progress[session_id])
+            manager.publish(session_id, "generation_complete", {
+                "session": sessions_db[session_id],
+                "finalVideo": final_video
+            })
             
         else:
             # Generation failed
@@ -502,6 +471,7 @@ async def run_real_video_generation(session_id: str, config: VideoGenerationConf
                 "status": "failed",
                 "message": f"Generation failed: {error_msg}"
             })
+            manager.publish_progress(session_id, generation_progress[session_id])
             
     except Exception as e:
         logger.error(f"Exception during generation for session {session_id}: {e}")
@@ -510,6 +480,16 @@ async def run_real_video_generation(session_id: str, config: VideoGenerationConf
             "status": "failed",
             "message": f"Generation failed: {str(e)}"
         })
+        manager.publish_progress(session_id, generation_progress[session_id])
+    finally:
+        # Completed, failed or stopped: progress state is released once nobody watches the session
+        manager.finish_session(session_id)
+
+async def _terminate_on_stop(process, stop_event: asyncio.Event):
+    """Terminate the generation process once a stop is requested"""
+    await stop_event.wait()
+    if process.returncode is None:
+        process.terminate()
 
 # AI endpoints for video generation
 @app.post("/api/ai/generate-creative")
@@ -556,15 +536,27 @@ async def websocket_endpoint(websocket: WebSocket):
                     json.dumps({"type": "pong"}),
                     websocket
                 )
-            elif message.get("type") == "subscribe":
-                # Handle subscription to specific events
+            elif message.get("type") in ("subscribe", "join_session"):
+                # Progress for a session is only sent to its subscribers ("*" for all)
+                session_id = message.get("sessionId") or message.get("session_id") or message.get("channel")
+                if session_id != ALL_SESSIONS and session_id not in sessions_db:
+                    await manager.send_personal_message(
+                        json.dumps({"type": "session_not_found", "sessionId": session_id}),
+                        websocket
+                    )
+                    continue
                 await manager.send_personal_message(
                     json.dumps({
-                        "type": "subscribed",
-                        "channel": message.get("channel")
+                        "type": "subscribed" if message.get("type") == "subscribe" else "session_joined",
+                        "channel": session_id,
+                        "sessionId": session_id
                     }),
                     websocket
                 )
+                manager.subscribe(websocket, session_id)
+            elif message.get("type") in ("unsubscribe", "leave_session"):
+                session_id = message.get("sessionId") or message.get("session_id") or message.get("channel")
+                manager.unsubscribe(websocket, session_id)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -591,15 +583,45 @@ async def health_check():
         }
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus/OpenMetrics scrape endpoint"""
+    if not performance_monitor:
+        raise HTTPException(status_code=503, detail="Performance monitor not available")
+    return PlainTextResponse(
+        performance_monitor.export_openmetrics(),
+        media_type="application/openmetrics-text; version=1.0.0; charset=utf-8"
+    )
+
+@app.get("/api/storage")
+async def storage_usage(current_user: dict = Depends(get_current_user)):
+    """Disk usage of session outputs by artifact type"""
+    if not session_gc:
+        raise HTTPException(status_code=503, detail="Session GC not available")
+    return session_gc.usage()
+
+@app.post("/api/storage/gc")
+async def run_storage_gc(dry_run: bool = True, current_user: dict = Depends(get_current_user)):
+    """Apply the retention policy now (dry run by default)"""
+    if not session_gc:
+        raise HTTPException(status_code=503, detail="Session GC not available")
+    await asyncio.to_thread(session_gc.refresh)
+    report = await asyncio.to_thread(session_gc.collect, dry_run)
+    return report.to_dict()
+
 # Start background tasks
 @app.on_event("startup")
 async def startup_event():
     """Initialize background tasks on startup"""
+    if session_gc:
+        session_gc.start()
     print("✅ ViralAI Video Generation API started")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if session_gc:
+        session_gc.stop()
     print("👋 ViralAI Video Generation API stopped")
 
 # Static files can be served in production if needed
@@ -0,0 +1,285 @@
+"""
+Progress Fan-out for WebSocket Clients
+Routes session events only to the clients subscribed to that session.
+Every client gets a bounded send queue drained by its own writer task, so
+a slow client never holds up the others; pending progress updates for a
+session are coalesced and sent as deltas against the last published state.
+"""
+import asyncio
+import copy
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Channel name for clients that want every session (dashboards, admin views)
+ALL_SESSIONS = "*"
+
+
+def progress_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of ``current`` that are new or changed since ``previous``"""
+    return {
+        key: copy.deepcopy(value)
+        for key, value in current.items()
+        if key not in previous or previous[key] != value
+    }
+
+
+@dataclass
+class OutgoingMessage:
+    """A message waiting in a client's send queue"""
+    payload: Union[Dict[str, Any], str]
+    coalesce_key: Optional[str] = None
+    droppable: bool = True
+    session_id: Optional[str] = None
+
+    def text(self) -> str:
+        if isinstance(self.payload, str):
+            return self.payload
+        return json.dumps(self.payload, default=str)
+
+    def merge(self, newer: "OutgoingMessage") -> "OutgoingMessage":
+        """Fold a newer message with the same coalesce key into this one"""
+        if (isinstance(self.payload, dict) and isinstance(newer.payload, dict)
+                and newer.payload.get("delta") and isinstance(self.payload.get("data"), dict)):
+            payload = dict(newer.payload)
+            payload["data"] = {**self.payload["data"], **newer.payload["data"]}
+            # A full snapshot stays a full snapshot after absorbing deltas
+            payload["delta"] = self.payload.get("delta", True)
+            return OutgoingMessage(payload, newer.coalesce_key, newer.droppable, newer.session_id)
+        return newer
+
+
+class ClientChannel:
+    """Subscriptions and bounded send queue of one connected client"""
+
+    def __init__(self, websocket: Any, max_queue: int = 100):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.subscriptions: Set[str] = set()
+        self.dropped = 0
+        self.coalesced = 0
+        self.task: Optional[asyncio.Task] = None
+        self._queue: "OrderedDict[Any, OutgoingMessage]" = OrderedDict()
+        self._ids = count()
+        self._resync: Set[str] = set()
+        self._wakeup = asyncio.Event()
+
+    def wants(self, session_id: str) -> bool:
+        return ALL_SESSIONS in self.subscriptions or session_id in self.subscriptions
+
+    def needs_resync(self, session_id: str) -> bool:
+        """True once if a progress update for the session was dropped"""
+        if session_id in self._resync:
+            self._resync.discard(session_id)
+            return True
+        return False
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, message: OutgoingMessage):
+        """
+        Queue a message without waiting on the socket
+
+        A message with a coalesce key replaces the pending one with the same
+        key. When the queue is full the oldest droppable message goes first;
+        messages that must not be dropped are queued regardless.
+        """
+        key = message.coalesce_key
+        if key is not None and key in self._queue:
+            message = self._queue.pop(key).merge(message)
+            self.coalesced += 1
+        else:
+            key = key if key is not None else next(self._ids)
+            while len(self._queue) >= self.max_queue and self._drop_oldest():
+                pass
+
+        # Re-inserting at the end keeps the order relative to other session events
+        self._queue[key] = message
+        self._wakeup.set()
+
+    def _drop_oldest(self) -> bool:
+        for key, queued in self._queue.items():
+            if queued.droppable:
+                del self._queue[key]
+                self.dropped += 1
+                if queued.coalesce_key is not None and queued.session_id:
+                    # The client missed a delta; send the full state next time
+                    self._resync.add(queued.session_id)
+                return True
+        return False
+
+    async def run(self):
+        """Writer loop: send queued messages until the socket fails"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                _, message = self._queue.popitem(last=False)
+                await self.websocket.send_text(message.text())
+
+    def close(self):
+        self._queue.clear()
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
+class ConnectionManager:
+    """
+    WebSocket clients, their session subscriptions and the progress state they were sent
+
+    A session's progress state is kept while its job runs. Once the job
+    finishes it is dropped as soon as no client is subscribed to that session
+    (``*`` subscribers don't keep it), so state does not pile up per session.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self.clients: Dict[Any, ClientChannel] = {}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._sequence: Dict[str, int] = {}
+        self._finished: Set[str] = set()
+
+    @property
+    def active_connections(self) -> List[Any]:
+        return list(self.clients)
+
+    async def connect(self, websocket: Any) -> ClientChannel:
+        await websocket.accept()
+        return self.register(websocket)
+
+    def register(self, websocket: Any) -> ClientChannel:
+        """Track an accepted socket and start its writer task"""
+        channel = ClientChannel(websocket, self.max_queue)
+        self.clients[websocket] = channel
+        channel.task = asyncio.create_task(channel.run())
+        channel.task.add_done_callback(lambda task: self._writer_done(websocket, task))
+        return channel
+
+    def _writer_done(self, websocket: Any, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ WebSocket writer stopped: {task.exception()}")
+            self.disconnect(websocket)
+
+    def disconnect(self, websocket: Any):
+        channel = self.clients.pop(websocket, None)
+        if channel:
+            channel.close()
+            for session_id in channel.subscriptions & self._finished:
+                self._release_if_unwatched(session_id)
+
+    def subscribe(self, websocket: Any, session_id: str) -> bool:
+        """
+        Subscribe a client to a session (or ``*`` for all sessions)
+
+        Returns:
+            False if the client is not connected
+        """
+        channel = self.clients.get(websocket)
+        if channel is None:
+            return False
+        channel.subscriptions.add(session_id)
+
+        # Catch the new subscriber up with the full state it has not seen
+        sessions = list(self._snapshots) if session_id == ALL_SESSIONS else [session_id]
+        for sid in sessions:
+            if sid in self._snapshots:
+                channel.enqueue(self._progress_message(sid, copy.deepcopy(self._snapshots[sid]), full=True))
+        return True
+
+    def unsubscribe(self, websocket: Any, session_id: str):
+        channel = self.clients.get(websocket)
+        if channel:
+            channel.subscriptions.discard(session_id)
+            if session_id in self._finished:
+                self._release_if_unwatched(session_id)
+
+    def finish_session(self, session_id: str):
+        """Mark a session's job as done (completed, failed or stopped) so its state can be released"""
+        if session_id in self._snapshots:
+            self._finished.add(session_id)
+            self._release_if_unwatched(session_id)
+
+    def _release_if_unwatched(self, session_id: str):
+        if any(session_id in channel.subscriptions for channel in self.clients.values()):
+            return
+        self._snapshots.pop(session_id, None)
+        self._sequence.pop(session_id, None)
+        self._finished.discard(session_id)
+
+    def subscribers(self, session_id: str) -> List[ClientChannel]:
+        return [channel for channel in self.clients.values() if channel.wants(session_id)]
+
+    def publish_progress(self, session_id: str, progress: Dict[str, Any]) -> int:
+        """
+        Send the changes in a session's progress to its subscribers
+
+        Args:
+            session_id: Session the progress belongs to
+            progress: Current full progress state
+
+        Returns:
+            Number of clients the update was queued for (0 if nothing changed)
+        """
+        known = session_id in self._snapshots
+        delta = progress_delta(self._snapshots.get(session_id, {}), progress)
+        if known and not delta:
+            return 0
+        self._snapshots[session_id] = copy.deepcopy(progress)
+        self._sequence[session_id] = self._sequence.get(session_id, 0) + 1
+
+        subscribers = self.subscribers(session_id)
+        for channel in subscribers:
+            if channel.needs_resync(session_id):
+                channel.enqueue(self._progress_message(session_id, copy.deepcopy(progress), full=True))
+            else:
+                channel.enqueue(self._progress_message(session_id, delta, full=False))
+        return len(subscribers)
+
+    def publish(self, session_id: str, event: str, data: Any, droppable: bool = False) -> int:
+        """Send a one-off session event (completion, failure) to its subscribers"""
+        payload = {"event": event, "session_id": session_id, "data": data}
+        subscribers = self.subscribers(session_id)
+        for channel in subscribers:
+            channel.enqueue(OutgoingMessage(payload, droppable=droppable, session_id=session_id))
+        return len(subscribers)
+
+    async def send_personal_message(self, message: str, websocket: Any):
+        channel = self.clients.get(websocket)
+        if channel is None:
+            await websocket.send_text(message)
+        else:
+            channel.enqueue(OutgoingMessage(message, droppable=False))
+
+    async def broadcast(self, message: str):
+        for channel in list(self.clients.values()):
+            channel.enqueue(OutgoingMessage(message))
+
+    def stats(self) -> Dict[str, Any]:
+        channels = list(self.clients.values())
+        return {
+            "clients": len(channels),
+            "pending": sum(channel.pending for channel in channels),
+            "dropped": sum(channel.dropped for channel in channels),
+            "coalesced": sum(channel.coalesced for channel in channels),
+            "sessions": len(self._snapshots)
+        }
+
+    def _progress_message(self, session_id: str, data: Dict[str, Any], full: bool) -> OutgoingMessage:
+        return OutgoingMessage(
+            {
+                "event": "progress_update",
+                "session_id": session_id,
+                "seq": self._sequence.get(session_id, 0),
+                "delta": not full,
+                "data": data
+            },
+            coalesce_key=f"progress:{session_id}",
+            session_id=session_id
+        )
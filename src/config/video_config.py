@@ -288,6 +288,36 @@ class AudioConfig:
     })
 
 
+@dataclass
+class RenditionSpec:
+    """Geometry and limits of one per-platform rendition"""
+    width: int
+    height: int
+    fit: str = 'crop'               # crop: fill the frame; pad: letterbox; fit: keep aspect inside the box
+    video_bitrate_k: int = 5000     # Target/peak video bitrate (kbit/s)
+    max_size_mb: Optional[float] = None  # Upload limit; lowers the bitrate for long videos
+    fps: Optional[int] = None       # Frame rate cap (None keeps the master's)
+
+
+@dataclass
+class RenditionConfig:
+    """Rendition ladder emitted at final assembly for multi-platform publishing"""
+    ladder: Dict[str, RenditionSpec] = field(default_factory=lambda: {
+        'tiktok': RenditionSpec(1080, 1920, 'crop', video_bitrate_k=6000, max_size_mb=287),
+        'instagram': RenditionSpec(1080, 1920, 'crop', video_bitrate_k=5000, max_size_mb=300),
+        'youtube': RenditionSpec(1920, 1080, 'pad', video_bitrate_k=8000),
+        'facebook': RenditionSpec(1280, 720, 'pad', video_bitrate_k=4000),
+        'twitter': RenditionSpec(1280, 720, 'pad', video_bitrate_k=5000, max_size_mb=512),
+        'telegram': RenditionSpec(1280, 1280, 'fit', video_bitrate_k=2500, max_size_mb=50),
+        'whatsapp': RenditionSpec(848, 848, 'fit', video_bitrate_k=1500, max_size_mb=16, fps=30),
+    })
+    audio_bitrate_k: int = 128
+    # Share of a size limit the encode aims for (VBV overshoot and container overhead)
+    size_safety_margin: float = 0.92
+    min_video_bitrate_k: int = 300
+    output_subdir: str = 'renditions'
+
+
 @dataclass
 class VideoGenerationConfig:
     """Master configuration for video generation"""
@@ -297,6 +327,7 @@ class VideoGenerationConfig:
     default_text: DefaultTextConfig = field(default_factory=DefaultTextConfig)
     layout: LayoutConfig = field(default_factory=LayoutConfig)
     audio: AudioConfig = field(default_factory=AudioConfig)
+    renditions: RenditionConfig = field(default_factory=RenditionConfig)
     
     def get_fps(self, platform: str) -> int:
         """Get FPS for platform"""
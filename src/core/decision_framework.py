@@ -6,6 +6,8 @@ Makes all key decisions upfront and propagates them throughout the system
 
 import os
 import json
+import asyncio
+import inspect
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -17,6 +19,7 @@ from ..models.video_models import Platform, VideoCategory, Language
 from ..utils.session_context import SessionContext
 from ..agents.mission_planning_agent import MissionPlanningAgent
 from ..agents.character_description_agent import CharacterDescriptionAgent
+from .decision_graph import DecisionGraph, DecisionMemo
 
 
 logger = get_logger(__name__)
@@ -127,11 +130,22 @@ class CoreDecisions:
 class DecisionFramework:
     """Central decision-making system"""
     
-    def __init__(self, session_context: SessionContext, api_key: str = None):
+    # Slow decisions memoized across runs, with the decision records they produce;
+    # the first record's source tells whether the result came from AI
+    MEMOIZED_DECISIONS = {
+        'visual_elements': ['color_palette'],
+        'clip_structure': ['num_clips'],
+        'character': ['character_image_path', 'character_id', 'character_scene']
+    }
+    
+    def __init__(self, session_context: SessionContext, api_key: str = None,
+                 memo_dir: Optional[str] = os.path.join("cache", "decisions")):
         self.session_context = session_context
         self.decisions: Dict[str, Decision] = {}
         self.core_decisions: Optional[CoreDecisions] = None
         self.mission_planning_agent = None
+        # Memo of slow decisions keyed by the request (None disables it)
+        self.memo = DecisionMemo(memo_dir) if memo_dir else None
         
         # Initialize Mission Planning Agent if API key is available
         if api_key:
@@ -161,55 +175,41 @@ class DecisionFramework:
         """
         logger.info("🎯 Making all core decisions upfront...")
         
-        # 1. Basic video parameters (highest priority: CLI > config > default)
-        duration_seconds = self._decide_duration(cli_args, user_config)
-        platform = self._decide_platform(cli_args, user_config)
-        category, category_string = self._decide_category(cli_args, user_config)
-        target_audience = self._decide_target_audience(cli_args, user_config)
-        language = self._decide_language(cli_args, user_config)
-        
-        # 2. Creative decisions (CLI > config > AI agents > default)
-        style = self._decide_style(cli_args, user_config, ai_agents_available)
-        tone = self._decide_tone(cli_args, user_config, ai_agents_available)
-        visual_style = self._decide_visual_style(cli_args, user_config, ai_agents_available)
-        
-        # 2.5. Theme and style reference decisions
-        theme_id = self._decide_theme(cli_args, user_config)
-        style_reference_id = self._decide_style_reference(cli_args, user_config)
-        
-        # 2.6. Character consistency decisions
-        character_id, character_scene, character_image_path = self._decide_character_consistency(cli_args, user_config)
+        graph = self._build_decision_graph(cli_args, user_config, ai_agents_available)
         
-        # 3. Technical decisions
-        frame_continuity = self._decide_frame_continuity(duration_seconds, platform, ai_agents_available)
-        continuous_generation = self._decide_continuous_generation(cli_args, duration_seconds, platform, ai_agents_available)
-        mode = self._decide_mode(cli_args, user_config)
-        cheap_mode = self._decide_cheap_mode(cli_args, user_config)
-        cheap_mode_level = self._decide_cheap_mode_level(cli_args, user_config)
-        
-        # 4. Content decisions
-        mission = self._decide_mission(cli_args, user_config)
-        hook, call_to_action = self._decide_content_elements(mission, platform, ai_agents_available)
-        
-        # 5. Voice decisions (based on previous decisions)
-        voice_strategy, voice_personality, voice_variety = self._decide_voice_strategy(
-            mission, duration_seconds, platform, ai_agents_available
-        )
+        memo_key = self.memo.key_for(cli_args, user_config, ai_agents_available) if self.memo else None
+        memo_entries = self.memo.load(memo_key) if self.memo else {}
+        fresh_entries: Dict[str, Any] = {}
+        for name, records in self.MEMOIZED_DECISIONS.items():
+            self._memoize_node(graph, name, records, memo_entries, fresh_entries)
         
-        # 6. Visual decisions (based on previous decisions)
-        color_palette, typography_style, animation_style = self._decide_visual_elements(
-            visual_style, platform, ai_agents_available
-        )
+        results = await graph.resolve()
         
-        # 7. Audio decisions
-        background_music_style, sound_effects_enabled = self._decide_audio_elements(
-            style, tone, platform, ai_agents_available
-        )
+        if self.memo:
+            self.memo.store(memo_key, fresh_entries)
         
-        # 8. Generation decisions (based on all previous decisions)
-        clip_structure = await self._decide_clip_structure_with_scores(
-            duration_seconds, voice_strategy, ai_agents_available
-        )
+        duration_seconds = results['duration']
+        platform = results['platform']
+        category, category_string = results['category']
+        target_audience = results['target_audience']
+        language = results['language']
+        style = results['style']
+        tone = results['tone']
+        visual_style = results['visual_style']
+        theme_id = results['theme']
+        style_reference_id = results['style_reference']
+        character_id, character_scene, character_image_path = results['character']
+        frame_continuity = results['frame_continuity']
+        continuous_generation = results['continuous_generation']
+        mode = results['mode']
+        cheap_mode = results['cheap_mode']
+        cheap_mode_level = results['cheap_mode_level']
+        mission = results['mission']
+        hook, call_to_action = results['content_elements']
+        voice_strategy, voice_personality, voice_variety = results['voice']
+        color_palette, typography_style, animation_style = results['visual_elements']
+        background_music_style, sound_effects_enabled = results['audio_elements']
+        clip_structure = results['clip_structure']
         num_clips = clip_structure['num_clips']
         clip_durations = clip_structure['clip_durations']
         
@@ -274,6 +274,135 @@ class DecisionFramework:
         
         return self.core_decisions
     
+    def _build_decision_graph(self,
+                              cli_args: Dict[str, Any],
+                              user_config: Optional[Dict[str, Any]],
+                              ai_available: bool) -> DecisionGraph:
+        """
+        Declare every core decision together with the decisions it reads
+        
+        Decisions taken straight from CLI/config have no inputs. Decisions
+        that may call a model or generate assets are blocking, so they run
+        concurrently on worker threads.
+        """
+        graph = DecisionGraph()
+        
+        # 1. Basic video parameters (highest priority: CLI > config > default)
+        graph.add('duration', lambda _: self._decide_duration(cli_args, user_config))
+        graph.add('platform', lambda _: self._decide_platform(cli_args, user_config))
+        graph.add('category', lambda _: self._decide_category(cli_args, user_config))
+        graph.add('target_audience', lambda _: self._decide_target_audience(cli_args, user_config))
+        graph.add('language', lambda _: self._decide_language(cli_args, user_config))
+        
+        # 2. Creative decisions (CLI > config > AI agents > default)
+        graph.add('style', lambda _: self._decide_style(cli_args, user_config, ai_available))
+        graph.add('tone', lambda _: self._decide_tone(cli_args, user_config, ai_available))
+        graph.add('visual_style', lambda _: self._decide_visual_style(cli_args, user_config, ai_available))
+        
+        # 2.5. Theme and style reference decisions
+        graph.add('theme', lambda _: self._decide_theme(cli_args, user_config))
+        graph.add('style_reference', lambda _: self._decide_style_reference(cli_args, user_config))
+        
+        # 2.6. Character consistency decisions (may generate a character image)
+        graph.add('character', lambda _: self._decide_character_consistency(cli_args, user_config),
+                  blocking=True)
+        
+        # 3. Technical decisions
+        graph.add('frame_continuity',
+                  lambda d: self._decide_frame_continuity(d['duration'], d['platform'], ai_available),
+                  inputs=['duration', 'platform'])
+        graph.add('continuous_generation',
+                  lambda d: self._decide_continuous_generation(cli_args, d['duration'], d['platform'], ai_available),
+                  inputs=['duration', 'platform'])
+        graph.add('mode', lambda _: self._decide_mode(cli_args, user_config))
+        graph.add('cheap_mode', lambda _: self._decide_cheap_mode(cli_args, user_config))
+        graph.add('cheap_mode_level', lambda _: self._decide_cheap_mode_level(cli_args, user_config))
+        
+        # 4. Content decisions (also read the recorded language, tone and visual style)
+        graph.add('mission', lambda _: self._decide_mission(cli_args, user_config))
+        graph.add('content_elements',
+                  lambda d: self._decide_content_elements(d['mission'], d['platform'], ai_available),
+                  inputs=['mission', 'platform', 'language', 'tone', 'visual_style'])
+        
+        # 5. Voice decisions
+        graph.add('voice',
+                  lambda d: self._decide_voice_strategy(d['mission'], d['duration'], d['platform'], ai_available),
+                  inputs=['mission', 'duration', 'platform'])
+        
+        # 6. Visual decisions
+        graph.add('visual_elements',
+                  lambda d: self._decide_visual_elements(d['visual_style'], d['platform'], ai_available),
+                  inputs=['visual_style', 'platform'], blocking=True)
+        
+        # 7. Audio decisions
+        graph.add('audio_elements',
+                  lambda d: self._decide_audio_elements(d['style'], d['tone'], d['platform'], ai_available),
+                  inputs=['style', 'tone', 'platform'])
+        
+        # 8. Generation decisions (mission planning also reads mission, platform and category)
+        graph.add('clip_structure',
+                  lambda d: self._decide_clip_structure_with_scores(
+                      d['duration'], d['voice'][0], ai_available, use_planning_agent=not d['cheap_mode']),
+                  inputs=['duration', 'voice', 'cheap_mode', 'mission', 'platform', 'category'])
+        
+        return graph
+    
+    def _memoize_node(self,
+                      graph: DecisionGraph,
+                      name: str,
+                      records: List[str],
+                      memo_entries: Dict[str, Any],
+                      fresh_entries: Dict[str, Any]):
+        """Serve a decision from the memo when possible, otherwise remember its result"""
+        node = graph.nodes[name]
+        original, blocking = node.resolve, node.blocking
+        
+        async def resolve(inputs: Dict[str, Any]):
+            entry = memo_entries.get(name)
+            if entry is not None and self._memo_entry_valid(name, entry):
+                for record in entry.get('decisions', []):
+                    self._record_decision(record['key'], record['value'], DecisionSource(record['source']),
+                                          record['confidence'], f"{record['reasoning']} (memoized)")
+                if name == 'clip_structure' and entry['value'].get('mission_plan'):
+                    self._write_mission_plan(entry['value']['mission_plan'])
+                logger.info(f"♻️ Reusing memoized decision: {name}")
+                return entry['value']
+            
+            value = await asyncio.to_thread(original, inputs) if blocking else original(inputs)
+            if inspect.isawaitable(value):
+                value = await value
+            
+            # Fallbacks are not memoized so later runs retry the AI
+            primary = self.decisions.get(records[0])
+            if primary is None or primary.source != DecisionSource.AI_AGENT:
+                return value
+            
+            fresh_entries[name] = {
+                'value': value,
+                'decisions': [
+                    {
+                        'key': key,
+                        'value': self.decisions[key].value,
+                        'source': self.decisions[key].source.value,
+                        'confidence': self.decisions[key].confidence,
+                        'reasoning': self.decisions[key].reasoning
+                    }
+                    for key in records if key in self.decisions
+                ]
+            }
+            return value
+        
+        node.resolve = resolve
+        node.blocking = False
+    
+    @staticmethod
+    def _memo_entry_valid(name: str, entry: Dict[str, Any]) -> bool:
+        """Reject memo entries that point at files which no longer exist"""
+        if name == 'character':
+            image_path = entry['value'][2]
+            return image_path is None or os.path.exists(image_path)
+        return True
+    
     def _decide_duration(self, cli_args: Dict[str, Any], user_config: Dict[str, Any]) -> int:
         """Decide video duration with 8-second clip constraint"""
         # Get base duration request
@@ -653,13 +782,18 @@ class DecisionFramework:
             logger.warning("Failed to parse AI JSON response")
             return {}
     
-    async def _decide_clip_structure_with_scores(self, duration: int, voice_strategy: str, ai_available: bool) -> Dict[str, Any]:
+    async def _decide_clip_structure_with_scores(self, duration: int, voice_strategy: str, ai_available: bool,
+                                                 use_planning_agent: bool = True) -> Dict[str, Any]:
         """Decide clip structure using AI-based optimization with scores"""
         if ai_available:
             # AI-driven clip structure optimization
-            clip_structure = await self._ai_optimize_clip_structure(duration, voice_strategy)
-            self._record_decision('num_clips', clip_structure['num_clips'], DecisionSource.AI_AGENT, 0.9, 
-                                clip_structure['reasoning'])
+            clip_structure = await self._ai_optimize_clip_structure(duration, voice_strategy, use_planning_agent)
+            if clip_structure.pop('heuristic', False):
+                self._record_decision('num_clips', clip_structure['num_clips'], DecisionSource.SYSTEM_DEFAULT, 0.7,
+                                    clip_structure['reasoning'])
+            else:
+                self._record_decision('num_clips', clip_structure['num_clips'], DecisionSource.AI_AGENT, 0.9, 
+                                    clip_structure['reasoning'])
         else:
             # Simple fallback
             num_clips = max(2, duration // 5)
@@ -676,8 +810,14 @@ class DecisionFramework:
         
         return clip_structure
     
-    async def _ai_optimize_clip_structure(self, duration: int, voice_strategy: str) -> Dict[str, Any]:
-        """AI-driven clip structure optimization using Mission Planning Agent"""
+    async def _ai_optimize_clip_structure(self, duration: int, voice_strategy: str,
+                                          use_planning_agent: bool = True) -> Dict[str, Any]:
+        """
+        AI-driven clip structure optimization using Mission Planning Agent
+        
+        Clips are fixed at 8 seconds, so in cheap mode (use_planning_agent=False)
+        the AI calls are skipped and only the heuristic scores are computed.
+        """
         # CRITICAL: Pre-calculate clip constraints BEFORE AI optimization
         # Force 8-second clips as per user requirement
         import math
@@ -695,8 +835,11 @@ class DecisionFramework:
         logger.info(f"   Number of clips: {num_clips}")
         
         try:
+            if not use_planning_agent:
+                logger.info("💰 Cheap mode: skipping AI clip structure optimization")
+            
             # Use Mission Planning Agent if available
-            if self.mission_planning_agent:
+            elif self.mission_planning_agent:
                 # Get mission information from core decisions
                 mission = self.decisions.get('mission', {}).value if 'mission' in self.decisions else "Create engaging content"
                 platform = self.decisions.get('platform', {}).value if 'platform' in self.decisions else "tiktok"
@@ -733,18 +876,19 @@ class DecisionFramework:
                 logger.info(f"   Cost Efficiency: {clip_recommendation['cost_efficiency_score']:.2f}")
                 logger.info(f"   Content Quality: {clip_recommendation['content_quality_score']:.2f}")
                 
-                # Save mission plan to session
-                self._save_mission_plan(mission_plan)
+                # Save mission plan to session (kept with the result so a memoized run can restore it)
+                clip_recommendation['mission_plan'] = self._save_mission_plan(mission_plan)
                 
                 return clip_recommendation
             
-            # Fallback to basic AI optimization if Mission Planning Agent not available
-            logger.info("🤖 Using basic AI optimization (Mission Planning Agent not available)")
-            clip_recommendation = self._basic_ai_optimize_clip_structure(duration, voice_strategy, num_clips)
-            # Force 8-second clips
-            clip_recommendation['num_clips'] = num_clips
-            clip_recommendation['clip_durations'] = [CLIP_DURATION] * num_clips
-            return clip_recommendation
+            else:
+                # Fallback to basic AI optimization if Mission Planning Agent not available
+                logger.info("🤖 Using basic AI optimization (Mission Planning Agent not available)")
+                clip_recommendation = self._basic_ai_optimize_clip_structure(duration, voice_strategy, num_clips)
+                # Force 8-second clips
+                clip_recommendation['num_clips'] = num_clips
+                clip_recommendation['clip_durations'] = [CLIP_DURATION] * num_clips
+                return clip_recommendation
             
         except Exception as e:
             logger.warning(f"⚠️ Mission-based clip optimization failed: {e}")
@@ -841,7 +985,8 @@ class DecisionFramework:
             'reasoning': reasoning,
             'cost_efficiency_score': cost_efficiency_score,
             'content_quality_score': content_quality_score,
-            'optimal_balance_score': optimal_balance_score
+            'optimal_balance_score': optimal_balance_score,
+            'heuristic': True
         }
     
     def _record_decision(self, key: str, value: Any, source: DecisionSource, confidence: float, reasoning: str):
@@ -856,12 +1001,9 @@ class DecisionFramework:
         self.decisions[key] = decision
         logger.debug(f"🎯 Decision: {key} = {value} (source: {source.value}, confidence: {confidence:.2f})")
     
-    def _save_mission_plan(self, mission_plan):
-        """Save mission plan to session"""
+    def _save_mission_plan(self, mission_plan) -> Optional[Dict[str, Any]]:
+        """Save mission plan to session and return it as a JSON-safe dict"""
         try:
-            mission_plan_path = self.session_context.get_output_path("decisions", "mission_plan.json")
-            os.makedirs(os.path.dirname(mission_plan_path), exist_ok=True)
-            
             # Convert mission plan to dict
             mission_dict = {
                 'mission_statement': mission_plan.mission_statement,
@@ -987,6 +1129,19 @@ class DecisionFramework:
                     'analysis_timestamp': mission_plan.ethical_optimization.analysis_timestamp
                 }
             
+            self._write_mission_plan(mission_dict)
+            return json.loads(json.dumps(mission_dict, default=str))
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to save mission plan: {e}")
+            return None
+    
+    def _write_mission_plan(self, mission_dict: Dict[str, Any]):
+        """Write a mission plan dict to the session"""
+        try:
+            mission_plan_path = self.session_context.get_output_path("decisions", "mission_plan.json")
+            os.makedirs(os.path.dirname(mission_plan_path), exist_ok=True)
+            
             with open(mission_plan_path, 'w') as f:
                 json.dump(mission_dict, f, indent=2, default=str)
             
@@ -1041,7 +1196,7 @@ Provide strategic reasoning in this exact JSON format:
                 ai_decision = json.loads(json_match.group())
                 
                 # Validate AI decision
-                num_clips = max(max(2, min_clips_needed), min(5, int(ai_decision['num_clips'])))
+                num_clips = max(max(2, num_clips), min(5, int(ai_decision['num_clips'])))
                 clip_durations = ai_decision['clip_durations']
                 
                 # Ensure durations sum to target duration
@@ -1073,7 +1228,7 @@ Provide strategic reasoning in this exact JSON format:
             logger.warning(f"⚠️ Basic AI clip structure optimization failed: {e}")
         
         # Fallback to heuristic
-        return self._heuristic_optimize_clip_structure(duration, voice_strategy, min_clips_needed)
+        return self._heuristic_optimize_clip_structure(duration, voice_strategy, num_clips)
     
     def _decide_theme(self, cli_args: Dict[str, Any], user_config: Dict[str, Any]) -> Optional[str]:
         """Decide which theme to use if any"""
@@ -1140,7 +1295,7 @@ Provide strategic reasoning in this exact JSON format:
                     character_image_path = char_manager.get_character_for_mission(character_id, character_scene)
                     
                     if character_image_path:
-                        self._record_decision("character_image_path", character_image_path, DecisionSource.SYSTEM_DEFAULT,
+                        self._record_decision("character_image_path", character_image_path, DecisionSource.AI_AGENT,
                                             confidence=0.9, reasoning="Generated character scene image for video consistency")
                     else:
                         logger.warning(f"Failed to generate character scene for stored character {character_id}")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Decision Graph - Dependency-ordered, concurrent decision resolution
+Decisions declare their inputs explicitly; independent decisions resolve
+concurrently and slow (AI-backed) ones run off the event loop
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DecisionNode:
+    """
+    A decision and the decisions it depends on
+
+    ``resolve`` receives a dict holding only the declared ``inputs`` and
+    may return a value or an awaitable. Blocking nodes (AI calls, image
+    generation) run on a worker thread so they overlap with each other.
+    """
+    name: str
+    resolve: Callable[[Dict[str, Any]], Any]
+    inputs: List[str] = field(default_factory=list)
+    blocking: bool = False
+
+
+class DecisionGraph:
+    """Resolves a set of DecisionNodes as a DAG"""
+
+    def __init__(self):
+        self.nodes: Dict[str, DecisionNode] = {}
+
+    def add(self, name: str, resolve: Callable[[Dict[str, Any]], Any],
+            inputs: Optional[List[str]] = None, blocking: bool = False) -> DecisionNode:
+        """Declare a decision"""
+        if name in self.nodes:
+            raise ValueError(f"Decision '{name}' declared twice")
+        node = DecisionNode(name=name, resolve=resolve, inputs=list(inputs or []), blocking=blocking)
+        self.nodes[name] = node
+        return node
+
+    def order(self) -> List[str]:
+        """
+        Topological order of the decisions
+
+        Raises:
+            ValueError: On unknown inputs or dependency cycles
+        """
+        ordered: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Decision cycle: {' -> '.join(path + [name])}")
+            if name not in self.nodes:
+                raise ValueError(f"Decision '{path[-1]}' depends on unknown decision '{name}'")
+
+            state[name] = "visiting"
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            ordered.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return ordered
+
+    async def resolve(self) -> Dict[str, Any]:
+        """
+        Resolve every decision, starting each as soon as its inputs are ready
+
+        Returns:
+            Mapping of decision name to value
+        """
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Future] = {}
+
+        async def run(node: DecisionNode):
+            if node.inputs:
+                await asyncio.gather(*(tasks[name] for name in node.inputs))
+            inputs = {name: results[name] for name in node.inputs}
+
+            if node.blocking:
+                value = await asyncio.to_thread(node.resolve, inputs)
+            else:
+                value = node.resolve(inputs)
+            if inspect.isawaitable(value):
+                value = await value
+
+            results[node.name] = value
+            return value
+
+        for name in self.order():
+            tasks[name] = asyncio.ensure_future(run(self.nodes[name]))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return results
+
+
+class DecisionMemo:
+    """
+    On-disk memo of slow decision results keyed by the decision inputs
+
+    Entries are keyed by a hash of the CLI arguments and user config, so a
+    rerun or another version of the same request skips the AI calls.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key_for(*parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+    def load(self, key: str) -> Dict[str, Any]:
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable decision memo {path}: {e}")
+            return {}
+
+    def store(self, key: str, entries: Dict[str, Any]):
+        if not entries:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            existing = self.load(key)
+            existing.update(entries)
+
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(existing, f, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to store decision memo: {e}")
@@ -0,0 +1,307 @@
+"""
+FFmpeg Effect Compiler - Compiles cinematic effects into FFmpeg filter chains
+Grading, camera moves, letterboxing, Ken Burns and motion blur run inside a
+single FFmpeg encode instead of per-frame Python loops, with audio preserved
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class VideoStreamInfo:
+    """Properties of a clip needed to build size- and time-dependent filters"""
+    width: int
+    height: int
+    fps: float
+    duration: float
+    has_audio: bool
+
+    @property
+    def frame_count(self) -> int:
+        return max(1, int(round(self.duration * self.fps)))
+
+
+class FFmpegEffectCompiler:
+    """
+    Builds FFmpeg filter expressions for cinematic effects and renders them
+
+    Filter builders return plain filter strings; callers join them into one
+    chain and pass it to ``render``, which encodes video once and copies the
+    audio stream untouched.
+    """
+
+    LUT_CUBE_SIZE = 33
+
+    def __init__(self, lut_dir: Optional[str] = None, preset: str = "medium", crf: int = 18):
+        self.lut_dir = lut_dir or os.path.join(tempfile.gettempdir(), "viralai_luts")
+        self.preset = preset
+        self.crf = crf
+
+    def probe(self, video_path: str) -> Optional[VideoStreamInfo]:
+        """Read size, frame rate, duration and audio presence with one ffprobe call"""
+        cmd = [
+            'ffprobe', '-v', 'quiet',
+            '-show_entries', 'stream=codec_type,width,height,avg_frame_rate,r_frame_rate:format=duration',
+            '-of', 'json', video_path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            logger.warning(f"⚠️ ffprobe unavailable: {e}")
+            return None
+        if result.returncode != 0:
+            logger.warning(f"⚠️ Could not probe {video_path}")
+            return None
+
+        try:
+            probe = json.loads(result.stdout)
+            streams = probe.get('streams', [])
+            video = next(s for s in streams if s.get('codec_type') == 'video')
+            fps = self._parse_rate(video.get('avg_frame_rate')) or self._parse_rate(video.get('r_frame_rate')) or 24.0
+            return VideoStreamInfo(
+                width=int(video['width']),
+                height=int(video['height']),
+                fps=fps,
+                duration=float(probe.get('format', {}).get('duration') or 0),
+                has_audio=any(s.get('codec_type') == 'audio' for s in streams)
+            )
+        except (StopIteration, KeyError, ValueError) as e:
+            logger.warning(f"⚠️ Unexpected ffprobe output for {video_path}: {e}")
+            return None
+
+    # Colour
+
+    def linear_grade(self, scale: float = 1.0, offset: float = 0.0,
+                     r: float = 1.0, g: float = 1.0, b: float = 1.0) -> str:
+        """clip(clip(v * scale + offset) * channel_gain) per RGB channel"""
+        def channel(gain):
+            base = f"clip(val*{scale:g}{offset:+g},0,255)"
+            return f"clip({base}*{gain:g},0,255)" if gain != 1.0 else base
+        return f"lutrgb=r='{channel(r)}':g='{channel(g)}':b='{channel(b)}'"
+
+    def saturation(self, factor: float) -> str:
+        return f"eq=saturation={factor:g}"
+
+    def gaussian_blur(self, sigma: float) -> str:
+        return f"gblur=sigma={sigma:g}"
+
+    def lut3d(self, name: str, channel_lut: np.ndarray) -> str:
+        """
+        Turn a per-channel 256-entry LUT (shape (256, 1, 3), RGB order)
+        into a .cube file and return a lut3d filter that applies it
+        """
+        lut = np.asarray(channel_lut, dtype=np.float64).reshape(256, 3)
+        digest = hashlib.sha1(lut.tobytes()).hexdigest()[:12]
+        cube_path = os.path.join(self.lut_dir, f"{name}_{digest}.cube")
+
+        if not os.path.exists(cube_path):
+            os.makedirs(self.lut_dir, exist_ok=True)
+            n = self.LUT_CUBE_SIZE
+            samples = np.linspace(0, 255, n)
+            curves = [np.interp(samples, np.arange(256), lut[:, c]) / 255.0 for c in range(3)]
+
+            lines = [f'TITLE "{name}"', f"LUT_3D_SIZE {n}"]
+            # .cube order: red changes fastest, then green, then blue
+            for bi in range(n):
+                for gi in range(n):
+                    for ri in range(n):
+                        lines.append(f"{curves[0][ri]:.6f} {curves[1][gi]:.6f} {curves[2][bi]:.6f}")
+
+            tmp_path = cube_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_path, cube_path)
+
+        return f"lut3d=file='{self._escape_path(cube_path)}'"
+
+    # Geometry
+
+    def static_zoom(self, factor: float, info: VideoStreamInfo) -> str:
+        """Centered zoom by a constant factor, keeping the output size"""
+        return f"crop=iw/{factor:g}:ih/{factor:g},scale={info.width}:{info.height}"
+
+    def shake(self, amplitude: int = 2) -> str:
+        """Deterministic handheld shake of +/- amplitude pixels with black edges"""
+        a = int(amplitude)
+        return (f"crop=iw-{2 * a}:ih-{2 * a}:"
+                f"x='{a}+{a}*sin(n*1.7)':y='{a}+{a}*sin(n*2.3+1)',"
+                f"pad=iw+{2 * a}:ih+{2 * a}:{a}:{a}:black")
+
+    def letterbox(self, info: VideoStreamInfo, ratio: float = 0.1) -> str:
+        """Black bars covering ``ratio`` of the height at top and bottom"""
+        bar = int(info.height * ratio)
+        return f"crop=iw:ih-{2 * bar}:0:{bar},pad=iw:ih+{2 * bar}:0:{bar}:black"
+
+    def ken_burns(self, info: VideoStreamInfo, zoom_factor: float = 1.2, pan_direction: str = 'center') -> str:
+        """Zoom from 1.0 to ``zoom_factor`` over the clip, optionally panning 10% of the width"""
+        frames = info.frame_count
+        progress = f"(on/{frames})"
+        pan = {'left': f"-iw*0.1*{progress}", 'right': f"iw*0.1*{progress}"}.get(pan_direction, "0")
+        return (f"zoompan=z='1+{zoom_factor - 1:g}*{progress}':"
+                f"x='max(0,min(iw-iw/zoom,iw/2+({pan})-iw/zoom/2))':"
+                f"y='ih/2-ih/zoom/2':d=1:s={info.width}x{info.height}:fps={info.fps:g}")
+
+    # Time
+
+    def motion_blur(self, intensity: float = 0.5) -> str:
+        """Temporal motion blur averaging neighbouring frames"""
+        frames = max(2, int(round(1 + 4 * max(0.0, min(1.0, intensity)))))
+        return f"tmix=frames={frames}"
+
+    # Rendering
+
+    def render(self, input_path: str, output_path: str, filters: List[str],
+               info: Optional[VideoStreamInfo] = None, fps: Optional[float] = None) -> Optional[str]:
+        """
+        Apply a filter chain in a single encode, copying audio untouched
+
+        Args:
+            input_path: Source clip
+            output_path: Destination clip
+            filters: Filter strings to chain in order
+            info: Probe result (probed when omitted)
+            fps: Optional output frame rate
+
+        Returns:
+            output_path on success, otherwise None
+        """
+        info = info or self.probe(input_path)
+        chain = [f for f in filters if f]
+        if fps:
+            chain.append(f"fps={fps:g}")
+        chain.append("format=yuv420p")
+
+        cmd = ['ffmpeg', '-y', '-v', 'error', '-i', input_path,
+               '-map', '0:v:0', '-vf', ",".join(chain),
+               '-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf)]
+        if info is None or info.has_audio:
+            cmd += ['-map', '0:a?', '-c:a', 'copy']
+        cmd += ['-movflags', '+faststart', output_path]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            logger.error(f"❌ FFmpeg unavailable: {e}")
+            return None
+        if result.returncode != 0 or not os.path.exists(output_path):
+            logger.error(f"❌ FFmpeg effect render failed: {result.stderr[-500:]}")
+            return None
+        return output_path
+
+    def render_sequence(self, segments: List[Tuple[str, List[str], VideoStreamInfo]], output_path: str,
+                        transition: Optional[str] = None, transition_duration: float = 0.5) -> Optional[str]:
+        """
+        Grade and join several clips in a single encode
+
+        Every clip runs through its own filter chain inside one filter graph,
+        is normalised to the first clip's size and frame rate, and the results
+        are joined with xfade (or concat for hard cuts). Audio is joined the
+        same way; clips without audio contribute silence.
+
+        Args:
+            segments: (clip path, filters, probe info) per clip, in order
+            output_path: Destination clip
+            transition: xfade transition name, or None for hard cuts
+            transition_duration: Length of each transition in seconds
+
+        Returns:
+            output_path on success, otherwise None
+        """
+        from ..utils.frame_interpolator import FrameInterpolator
+
+        if not segments:
+            return None
+        first = segments[0][2]
+        with_audio = any(info.has_audio for _, _, info in segments)
+        transition = transition if len(segments) > 1 else None
+
+        inputs = []
+        for path, _, _ in segments:
+            inputs += ['-i', path]
+
+        graph = []
+        for i, (_, filters, info) in enumerate(segments):
+            chain = [f for f in filters if f] + [
+                f"scale={first.width}:{first.height}:force_original_aspect_ratio=decrease",
+                f"pad={first.width}:{first.height}:(ow-iw)/2:(oh-ih)/2:black",
+                "setsar=1", f"fps={first.fps:g}", "format=yuv420p", "settb=AVTB"
+            ]
+            graph.append(f"[{i}:v]{','.join(chain)}[v{i}]")
+
+        if with_audio:
+            input_count = len(segments)
+            for i, (_, _, info) in enumerate(segments):
+                if info.has_audio:
+                    source = f"[{i}:a]"
+                else:
+                    # Silent stand-in so every segment has an audio stream to join
+                    inputs += ['-f', 'lavfi', '-t', f"{info.duration:.3f}", '-i', 'anullsrc=r=48000:cl=stereo']
+                    source = f"[{input_count}:a]"
+                    input_count += 1
+                graph.append(f"{source}aresample=48000,aformat=channel_layouts=stereo,"
+                             f"apad,atrim=0:{info.duration:.3f},asetpts=PTS-STARTPTS[a{i}]")
+
+        labels = [f"v{i}" for i in range(len(segments))]
+        if transition:
+            durations = [info.duration for _, _, info in segments]
+            graph.append(FrameInterpolator.build_xfade_chain(labels, durations, transition_duration,
+                                                             transition, output_label="xfv"))
+            # xfade outputs yuv444p, which many players and platforms reject
+            graph.append("[xfv]format=yuv420p[outv]")
+            if with_audio:
+                fade = min([transition_duration] + [d for d in durations if d > 0])
+                current = "a0"
+                for i in range(1, len(segments)):
+                    label = "outa" if i == len(segments) - 1 else f"ax{i}"
+                    graph.append(f"[{current}][a{i}]acrossfade=d={fade:.3f}[{label}]")
+                    current = label
+        else:
+            graph.append("".join(f"[{label}]" for label in labels) + f"concat=n={len(segments)}:v=1:a=0[outv]")
+            if with_audio:
+                graph.append("".join(f"[a{i}]" for i in range(len(segments)))
+                             + f"concat=n={len(segments)}:v=0:a=1[outa]")
+
+        cmd = ['ffmpeg', '-y', '-v', 'error'] + inputs + [
+            '-filter_complex', ";".join(graph), '-map', '[outv]',
+            '-c:v', 'libx264', '-preset', self.preset, '-crf', str(self.crf)
+        ]
+        if with_audio:
+            cmd += ['-map', '[outa]', '-c:a', 'aac']
+        cmd += ['-movflags', '+faststart', output_path]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            logger.error(f"❌ FFmpeg unavailable: {e}")
+            return None
+        if result.returncode != 0 or not os.path.exists(output_path):
+            logger.error(f"❌ FFmpeg sequence render failed: {result.stderr[-500:]}")
+            return None
+        return output_path
+
+    @staticmethod
+    def _escape_path(path: str) -> str:
+        return path.replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+
+    @staticmethod
+    def _parse_rate(rate: Optional[str]) -> Optional[float]:
+        if not rate or rate in ("0/0", "0"):
+            return None
+        try:
+            value = float(Fraction(rate))
+        except (ValueError, ZeroDivisionError):
+            return None
+        return value if value > 0 else None
@@ -15,6 +15,7 @@ from moviepy.editor import VideoFileClip, VideoClip, ImageClip, CompositeVideoCl
 from moviepy.video.fx import all as vfx
 
 from ..utils.logging_config import get_logger
+from .ffmpeg_effect_compiler import FFmpegEffectCompiler, VideoStreamInfo
 
 logger = get_logger(__name__)
 
@@ -87,6 +88,10 @@ class BaseTransition(ABC):
         """Apply transition between two clips"""
         pass
     
+    def ffmpeg_transition(self) -> Optional[str]:
+        """FFmpeg xfade transition equivalent, or None if it only runs per-frame"""
+        return None
+    
     def _ease_in_out(self, t: float) -> float:
         """Easing function for smooth transitions"""
         return t * t * (3.0 - 2.0 * t)
@@ -103,6 +108,9 @@ class BaseTransition(ABC):
 class FadeTransition(BaseTransition):
     """Fade transition between clips"""
     
+    def ffmpeg_transition(self) -> Optional[str]:
+        return 'fade'
+    
     def apply(self, clip1: VideoFileClip, clip2: VideoFileClip, duration: float) -> VideoFileClip:
         """Apply fade transition"""
         try:
@@ -131,6 +139,9 @@ class SlideTransition(BaseTransition):
     def __init__(self, direction: str = 'left'):
         self.direction = direction
     
+    def ffmpeg_transition(self) -> Optional[str]:
+        return f'slide{self.direction}' if self.direction in ('left', 'right', 'up', 'down') else None
+    
     def apply(self, clip1: VideoFileClip, clip2: VideoFileClip, duration: float) -> VideoFileClip:
         """Apply slide transition"""
         try:
@@ -188,6 +199,9 @@ class SlideTransition(BaseTransition):
 class ZoomTransition(BaseTransition):
     """Zoom transition with motion blur"""
     
+    def ffmpeg_transition(self) -> Optional[str]:
+        return 'zoomin'
+    
     def apply(self, clip1: VideoFileClip, clip2: VideoFileClip, duration: float) -> VideoFileClip:
         """Apply zoom transition"""
         try:
@@ -237,6 +251,10 @@ class BaseVideoEffect(ABC):
     def apply(self, clip: VideoFileClip) -> VideoFileClip:
         """Apply effect to clip"""
         pass
+    
+    def ffmpeg_filter(self, info: VideoStreamInfo, compiler: FFmpegEffectCompiler) -> Optional[str]:
+        """FFmpeg filter equivalent of this effect, or None if it only runs per-frame"""
+        return None
 
 
 class MotionBlurEffect(BaseVideoEffect):
@@ -272,6 +290,9 @@ class MotionBlurEffect(BaseVideoEffect):
         except Exception as e:
             logger.error(f"❌ Motion blur failed: {e}")
             return clip
+    
+    def ffmpeg_filter(self, info: VideoStreamInfo, compiler: FFmpegEffectCompiler) -> Optional[str]:
+        return compiler.motion_blur(self.intensity)
 
 
 class KenBurnsEffect(BaseVideoEffect):
@@ -334,6 +355,9 @@ class KenBurnsEffect(BaseVideoEffect):
         except Exception as e:
             logger.error(f"❌ Ken Burns effect failed: {e}")
             return clip
+    
+    def ffmpeg_filter(self, info: VideoStreamInfo, compiler: FFmpegEffectCompiler) -> Optional[str]:
+        return compiler.ken_burns(info, self.zoom_factor, self.pan_direction)
 
 
 class GlitchEffect(BaseVideoEffect):
@@ -422,6 +446,13 @@ class ColorGradingService:
             logger.error(f"❌ Color grading failed: {e}")
             return clip
     
+    def ffmpeg_filter(self, lut_name: str, compiler: FFmpegEffectCompiler) -> str:
+        """lut3d filter applying the same LUT inside FFmpeg"""
+        if lut_name not in self.luts:
+            logger.warning(f"⚠️ LUT '{lut_name}' not found, using default")
+            lut_name = 'cinematic'
+        return compiler.lut3d(lut_name, self.luts[lut_name])
+    
     def _create_cinematic_lut(self) -> np.ndarray:
         """Create cinematic color LUT"""
         lut = np.arange(256, dtype=np.uint8)
@@ -564,6 +595,7 @@ class ProfessionalEffectsEngine:
         """Initialize effects engine with all services"""
         # Initialize services
         self.color_grading = ColorGradingService()
+        self.compiler = FFmpegEffectCompiler()
         self.text_animations = TextAnimationService()
         
         # Initialize effect libraries
@@ -585,6 +617,14 @@ class ProfessionalEffectsEngine:
     def apply_cinematic_effects(self, video_path: str, 
                                effects_config: List[EffectConfig]) -> str:
         """Apply professional cinematic effects to video"""
+        output_path = video_path.replace('.mp4', '_cinematic.mp4')
+        
+        # Single FFmpeg encode when every effect has a filter equivalent
+        filters = self._compile_effects(video_path, effects_config, 'cinematic')
+        if filters is not None and self.compiler.render(video_path, output_path, filters[1], info=filters[0]):
+            logger.info(f"✅ Cinematic effects applied: {output_path}")
+            return output_path
+        
         try:
             clip = VideoFileClip(video_path)
             
@@ -594,7 +634,6 @@ class ProfessionalEffectsEngine:
             # Apply color grading
             clip = self.color_grading.apply_lut(clip, 'cinematic')
             
-            output_path = video_path.replace('.mp4', '_cinematic.mp4')
             clip.write_videofile(output_path, codec='libx264', audio_codec='aac')
             clip.close()
             
@@ -632,6 +671,39 @@ class ProfessionalEffectsEngine:
             logger.error(f"❌ Transition failed: {e}")
             return clip1_path
     
+    def _compile_effects(self, video_path: str,
+                         effects_config: List[EffectConfig],
+                         color_grade: Optional[str]) -> Optional[Tuple[VideoStreamInfo, List[str]]]:
+        """
+        Compile effects into an FFmpeg filter chain
+        
+        Returns:
+            (probe info, filters), or None if an effect has no FFmpeg equivalent
+        """
+        info = self.compiler.probe(video_path)
+        if info is None:
+            return None
+        
+        filters = []
+        for config in effects_config:
+            if config.type == EffectType.FILTER and config.name in self.video_effects:
+                effect_filter = self.video_effects[config.name].ffmpeg_filter(info, self.compiler)
+            elif config.type == EffectType.COLOR:
+                effect_filter = self.color_grading.ffmpeg_filter(config.name, self.compiler)
+            elif config.type == EffectType.MOTION and config.name in ('slow_motion', 'fast_forward'):
+                # Speed changes alter duration and audio; leave them to moviepy
+                effect_filter = None
+            else:
+                continue
+            
+            if effect_filter is None:
+                return None
+            filters.append(effect_filter)
+        
+        if color_grade:
+            filters.append(self.color_grading.ffmpeg_filter(color_grade, self.compiler))
+        return info, filters
+    
     def _apply_effect(self, clip: VideoFileClip, config: EffectConfig) -> VideoFileClip:
         """Apply a single effect based on config"""
         try:
@@ -656,13 +728,32 @@ class ProfessionalEffectsEngine:
     
     def create_professional_sequence(self, clips: List[str], 
                                    transition_type: str = 'fade',
-                                   color_grade: str = 'cinematic') -> str:
+                                   color_grade: str = 'cinematic',
+                                   transition_duration: float = 0.5) -> str:
         """Create professional video sequence with transitions and effects"""
         try:
             if not clips:
                 logger.warning("⚠️ No clips provided for professional sequence")
                 return ""
-                
+            
+            output_path = f"professional_sequence_{len(clips)}_clips.mp4"
+            
+            # Grade (and Ken Burns every third clip) and join everything in one FFmpeg encode
+            segments = []
+            for i, clip_path in enumerate(clips):
+                effects = [EffectConfig('ken_burns', EffectType.FILTER)] if i % 3 == 0 else []
+                compiled = self._compile_effects(clip_path, effects, color_grade)
+                if compiled is None:
+                    break
+                segments.append((clip_path, compiled[1], compiled[0]))
+            
+            if len(segments) == len(clips):
+                transition = self.transitions.get(transition_type)
+                xfade = transition.ffmpeg_transition() if transition else None
+                if self.compiler.render_sequence(segments, output_path, xfade, transition_duration):
+                    logger.info(f"✅ Professional sequence created in one pass: {output_path}")
+                    return output_path
+            
             processed_clips = []
             
             for i, clip_path in enumerate(clips):
@@ -716,7 +807,6 @@ class ProfessionalEffectsEngine:
                 logger.warning("⚠️ Recursion detected in concatenation, using first clip")
                 return clips[0]
             
-            output_path = f"professional_sequence_{len(clips)}_clips.mp4"
             final.write_videofile(output_path, codec='libx264', audio_codec='aac')
             
             # Clean up
@@ -9,6 +9,7 @@ import re
 from collections import defaultdict
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from ..config.ai_model_config import DEFAULT_AI_MODEL
 from ..models.video_models import (
@@ -16,6 +17,7 @@ from ..models.video_models import (
     GeneratedVideoConfig
 )
 from ..utils.logging_config import get_logger
+from ..utils.tracing import traced
 from ..utils.exceptions import (
     GenerationFailedError, APIException,
     NetworkError
@@ -35,8 +37,35 @@ class Director:
     - Optimize scripts for maximum virality
     """
 
-    def __init__(self, api_key: str, model_name: str = None):
-        """Initialize Director with specified model"""
+    # Structured output for batched segment rewriting
+    SEGMENT_REWRITE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "segments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "text": {"type": "string"}
+                    },
+                    "required": ["index", "text"]
+                }
+            }
+        },
+        "required": ["segments"]
+    }
+
+    def __init__(self, api_key: str, model_name: str = None, batch_refinement: bool = True):
+        """
+        Initialize Director with specified model
+
+        Args:
+            api_key: Gemini API key
+            model_name: Model to use (defaults to DEFAULT_AI_MODEL)
+            batch_refinement: Rewrite all segments of a script in one structured
+                request instead of one request per segment
+        """
         if not api_key or not api_key.strip():
             raise ValueError("API key cannot be empty")
         
@@ -44,6 +73,7 @@ class Director:
         self.model_name = model_name if model_name else DEFAULT_AI_MODEL
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(self.model_name)
+        self.batch_refinement = batch_refinement
         self.hook_templates = self._load_hook_templates()
         self.content_structures = self._load_content_structures()
         
@@ -52,6 +82,7 @@ class Director:
 
         logger.info(f"Director initialized with model: {self.model_name}")
 
+    @traced("llm.director.write_script")
     def write_script(self,
                     mission: str,
                     style: str,
@@ -86,14 +117,23 @@ class Director:
                 if current_context:
                     logger.info("Incorporated current information from Gemini's internet access")
 
-            # Generate script components
-            hook = self._create_hook(mission, style, platform, patterns, current_context)
-            main_content = self._structure_content(
-                mission, duration, patterns, current_context
-            )
-            # Pass target_language from patterns to _create_cta
+            # Generate script components - hook, body and CTA are independent
+            # of each other, so their model calls run concurrently
             target_language = patterns.get('target_language') if patterns else None
-            cta = self._create_cta(platform, category, mission, target_language)
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="director") as executor:
+                hook_future = executor.submit(
+                    self._create_hook, mission, style, platform, patterns, current_context
+                )
+                content_future = executor.submit(
+                    self._structure_content, mission, duration, patterns, current_context
+                )
+                # Pass target_language from patterns to _create_cta
+                cta_future = executor.submit(
+                    self._create_cta, platform, category, mission, target_language
+                )
+                hook = hook_future.result()
+                main_content = content_future.result()
+                cta = cta_future.result()
 
             # Assemble complete script
             script = self._assemble_script(
@@ -754,6 +794,7 @@ class Director:
 
             # Find relevant insertion points
             segments = script.get('segments', [])
+            targets = {}
 
             for i, segment in enumerate(segments):
                 # Check if segment could incorporate news
@@ -761,9 +802,18 @@ class Director:
                     relevant_news = self._find_relevant_news(segment, news_items)
                     if relevant_news:
                         segment['news_context'] = relevant_news
-                        segment['text'] = self._blend_news_into_text(
-                            segment['text'], relevant_news
-                        )
+                        targets[i] = relevant_news
+
+            rewrites = self._rewrite_segments_batched(
+                {i: (segments[i]['text'], self._format_news_for_blend(news)) for i, news in targets.items()},
+                "Blend the news naturally into the text as supporting context, "
+                "without replacing the original message"
+            )
+            for i, news in targets.items():
+                if i in rewrites:
+                    segments[i]['text'] = rewrites[i]
+                else:
+                    segments[i]['text'] = self._blend_news_into_text(segments[i]['text'], news)
 
             script['has_news'] = True
             script['news_items'] = news_items
@@ -1664,13 +1714,24 @@ class Director:
 
             # Find relevant insertion points
             segments = script.get('segments', [])
+            targets = []
 
             for i, segment in enumerate(segments):
                 # Check if segment could incorporate current info
                 if self._can_incorporate_current_info(segment, current_context):
                     segment['current_context'] = current_context
-                    segment['text'] = self._blend_current_info_into_text(
-                        segment['text'], current_context
+                    targets.append(i)
+
+            rewrites = self._rewrite_segments_batched(
+                {i: (segments[i]['text'], current_context) for i in targets},
+                "Blend the context naturally into the text, adding specific recent details where appropriate"
+            )
+            for i in targets:
+                if i in rewrites:
+                    segments[i]['text'] = rewrites[i]
+                else:
+                    segments[i]['text'] = self._blend_current_info_into_text(
+                        segments[i]['text'], current_context
                     )
 
             script['has_current_info'] = True
@@ -1682,6 +1743,83 @@ class Director:
             logger.warning(f"Current info incorporation failed: {e}")
             return script
 
+    @traced("llm.director.rewrite_segments")
+    def _rewrite_segments_batched(self, segments: Dict[int, Tuple[str, str]],
+                                  instruction: str) -> Dict[int, str]:
+        """
+        Rewrite several segments in a single structured request
+
+        Args:
+            segments: Segment index -> (original text, context to incorporate)
+            instruction: What to do with the context
+
+        Returns:
+            Rewritten text for every segment that passed validation; callers
+            fall back to per-segment calls for the rest
+        """
+        if not self.batch_refinement or len(segments) < 2:
+            return {}
+
+        payload = [
+            {"index": i, "text": text, "context": context}
+            for i, (text, context) in segments.items()
+        ]
+        prompt = f"""
+        Rewrite each of these video script segments.
+
+        {instruction}. For every segment:
+        - Keep the original tone and style
+        - Make it feel natural and engaging
+        - Maintain the same approximate length
+
+        Segments (JSON):
+        {json.dumps(payload, ensure_ascii=False, indent=2)}
+
+        Return JSON {{"segments": [{{"index": <index>, "text": "<rewritten text>"}}]}}
+        with one entry per input segment, using the same indexes.
+        """
+
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config=genai.GenerationConfig(
+                    response_mime_type="application/json",
+                    response_schema=self.SEGMENT_REWRITE_SCHEMA
+                )
+            )
+            result = self._extract_json(response.text) if response and response.text else None
+        except Exception as e:
+            logger.warning(f"Batched segment rewrite failed: {e}")
+            return {}
+
+        rewrites = {}
+        items = result.get('segments', []) if isinstance(result, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index, text = item.get('index'), item.get('text')
+            if index in segments and index not in rewrites and self._is_valid_rewrite(segments[index][0], text):
+                rewrites[index] = text.strip()
+
+        rejected = len(segments) - len(rewrites)
+        logger.info(f"✍️ Batched rewrite: {len(rewrites)}/{len(segments)} segments in one request"
+                    + (f", {rejected} falling back to individual calls" if rejected else ""))
+        return rewrites
+
+    @staticmethod
+    def _is_valid_rewrite(original: str, rewritten: Any) -> bool:
+        """A rewrite must be non-empty text of roughly the original length"""
+        if not isinstance(rewritten, str) or not rewritten.strip():
+            return False
+        original_length = max(len(original or ''), 1)
+        return 0.5 <= len(rewritten.strip()) / original_length <= 2.5
+
+    @staticmethod
+    def _format_news_for_blend(news_items: List[Dict[str, Any]]) -> str:
+        """Most relevant news item as context text, matching _blend_news_into_text"""
+        top_news = news_items[0]
+        return f"Title: {top_news.get('title', '')}\nDescription: {top_news.get('description', '')}"
+
     def _can_incorporate_current_info(self, segment: Dict[str, Any], 
                                      current_context: str) -> bool:
         """Check if segment can incorporate current information"""
@@ -10,6 +10,8 @@ from typing import Optional, Dict, Any, List
 from google.cloud import texttospeech
 from gtts import gTTS
 from ..utils.logging_config import get_logger
+from ..utils.speech_rate_model import get_speech_rate_model
+from .tts_synthesis_engine import get_tts_engine
 from ..models.video_models import Language
 from ..agents.voice_director_agent import VoiceDirectorAgent
 
@@ -31,6 +33,12 @@ class EnhancedMultilingualTTS:
             # Initialize Voice Director Agent
             self.voice_director = VoiceDirectorAgent(api_key)
 
+            # Learned per-voice speech rate, calibrated by every synthesis
+            self.speech_rate = get_speech_rate_model()
+
+            # Shared engine: per-provider concurrency limits and audio cache
+            self.engine = get_tts_engine()
+
             # Language code mapping for Google Cloud TTS
             self.language_codes = {
                 Language.ENGLISH_US: "en-US",
@@ -81,7 +89,7 @@ class EnhancedMultilingualTTS:
                                        mission: str,
                                        platform: Any,
                                        category: Any,
-                                       duration_seconds: int,
+                                       duration_seconds: float,
                                        num_clips: int,
                                        clip_index: Optional[int] = None,
                                        cheap_mode: bool = False,
@@ -90,9 +98,6 @@ class EnhancedMultilingualTTS:
 
         logger.info(f"🎤 Generating intelligent voice audio for {language.value}")
 
-        # CRITICAL FIX: Set target duration for speed adjustment
-        self._target_duration = duration_seconds
-
         try:
             # In cheap mode, skip expensive AI voice selection
             if cheap_mode:
@@ -114,7 +119,7 @@ class EnhancedMultilingualTTS:
 
             if not voice_strategy:
                 logger.warning("⚠️ AI voice selection failed, using single voice fallback")
-                return [self._generate_fallback_audio(script, language)]
+                return [self._generate_fallback_audio(script, language, duration_seconds)]
 
             # The voice_strategy is already the voice_config from VoiceDirectorAgent
             voice_config = voice_strategy
@@ -122,10 +127,7 @@ class EnhancedMultilingualTTS:
             # Validate voice_config structure
             if not isinstance(voice_config, dict) or "clip_voices" not in voice_config:
                 logger.warning("⚠️ Invalid voice_config structure, using fallback")
-                return [self._generate_fallback_audio(script, language)]
-
-            # Generate audio for each clip
-            audio_files = []
+                return [self._generate_fallback_audio(script, language, duration_seconds)]
 
             if clip_index is not None:
                 # Generate for specific clip
@@ -139,7 +141,7 @@ class EnhancedMultilingualTTS:
                         clip_voices = [voice_config["clip_voices"][wrapped_index]]
                     else:
                         logger.warning(f"⚠️ Fallback needed: no voice config available")
-                        return [self._generate_fallback_audio(script, language)]
+                        return [self._generate_fallback_audio(script, language, duration_seconds)]
             else:
                 # Generate for all clips
                 clip_voices = voice_config["clip_voices"]
@@ -148,39 +150,39 @@ class EnhancedMultilingualTTS:
             if not clip_voices:
                 logger.warning("⚠️ No voice configurations available, using fallback")
                 logger.info("🔄 Using basic fallback audio generation")
-                return [self._generate_fallback_audio(script, language)]
+                return [self._generate_fallback_audio(script, language, duration_seconds)]
 
-            for i, clip_voice in enumerate(clip_voices):
+            def render_clip(item):
+                i, clip_voice = item
                 try:
                     audio_path = self._generate_clip_audio(
                         script=script,
                         language=language,
-                        voice_config=clip_voice
+                        voice_config=clip_voice,
+                        target_duration=duration_seconds
                     )
 
                     if audio_path and os.path.exists(audio_path):
-                        audio_files.append(audio_path)
                         logger.info(f"✅ Generated audio for clip {clip_voice.get('clip_index', i)}: {clip_voice.get('voice_name', 'unknown')}")
-                    else:
-                        logger.warning(f"❌ Failed to generate audio for clip {clip_voice.get('clip_index', i)}")
-                        # Use fallback for this clip
-                        fallback_audio = self._generate_fallback_audio(script, language)
-                        if fallback_audio:
-                            audio_files.append(fallback_audio)
-                            
+                        return audio_path
+                    logger.warning(f"❌ Failed to generate audio for clip {clip_voice.get('clip_index', i)}")
+
                 except Exception as e:
                     logger.error(f"❌ Error generating audio for clip {i}: {e}")
-                    # Use fallback for this clip
-                    try:
-                        fallback_audio = self._generate_fallback_audio(script, language)
-                        if fallback_audio:
-                            audio_files.append(fallback_audio)
-                    except Exception as fallback_error:
-                        logger.error(f"❌ Fallback also failed for clip {i}: {fallback_error}")
+
+                # Fallback for this clip only
+                try:
+                    return self._generate_fallback_audio(script, language, duration_seconds)
+                except Exception as fallback_error:
+                    logger.error(f"❌ Fallback also failed for clip {i}: {fallback_error}")
+                    return None
+
+            # Clips synthesize concurrently within the per-provider limits
+            audio_files = [path for path in self.engine.map(render_clip, list(enumerate(clip_voices))) if path]
 
             if not audio_files:
                 logger.error("❌ No audio files generated, using final fallback")
-                return [self._generate_fallback_audio(script, language)]
+                return [self._generate_fallback_audio(script, language, duration_seconds)]
 
             return audio_files
 
@@ -188,28 +190,72 @@ class EnhancedMultilingualTTS:
             logger.error(f"❌ Intelligent voice generation failed: {e}")
             # Fallback to simple generation
             try:
-                return [self._generate_fallback_audio(script, language)]
+                return [self._generate_fallback_audio(script, language, duration_seconds)]
             except Exception as fallback_error:
                 logger.error(f"❌ Even fallback failed: {fallback_error}")
                 return [self._create_silent_audio()]
 
+    def generate_segment_audio_batch(self,
+                                     segments: List[Dict[str, Any]],
+                                     language: Language,
+                                     mission: str,
+                                     platform: Any,
+                                     category: Any,
+                                     num_clips: int,
+                                     cheap_mode: bool = False,
+                                     force_single_voice: bool = True) -> List[Optional[str]]:
+        """
+        Synthesize script segments concurrently
+
+        Args:
+            segments: Dicts with 'text' and 'duration' (seconds), in playback order
+            language, mission, platform, category, num_clips, cheap_mode,
+            force_single_voice: As for generate_intelligent_voice_audio
+
+        Returns:
+            One audio path per segment (None where synthesis failed), in order
+        """
+        logger.info(f"🎤 Synthesizing {len(segments)} segments concurrently")
+
+        def render_segment(item):
+            index, segment = item
+            audio_files = self.generate_intelligent_voice_audio(
+                script=segment['text'],
+                language=language,
+                mission=mission,
+                platform=platform,
+                category=category,
+                duration_seconds=float(segment['duration']),
+                num_clips=num_clips,
+                clip_index=index,
+                cheap_mode=cheap_mode,
+                force_single_voice=force_single_voice
+            )
+            return audio_files[0] if audio_files else None
+
+        results = self.engine.map(render_segment, list(enumerate(segments)))
+        logger.info(f"🎤 Segment synthesis done (cache hits: {self.engine.stats['hits']}, "
+                    f"misses: {self.engine.stats['misses']})")
+        return results
+
     def _generate_clip_audio(
         self,
         script: str,
         language: Language,
-        voice_config: Dict) -> Optional[str]:
+        voice_config: Dict,
+        target_duration: Optional[float] = None) -> Optional[str]:
         """Generate audio for a specific clip with given voice configuration"""
 
         try:
             # Check if voice_config is None or empty
             if not voice_config or not isinstance(voice_config, dict):
                 logger.warning("⚠️ Invalid voice_config, using fallback")
-                return self._generate_fallback_audio(script, language)
+                return self._generate_fallback_audio(script, language, target_duration)
             
             voice_name = voice_config.get("voice_name")
             if not voice_name:
                 logger.warning("⚠️ No voice_name in voice_config, using fallback")
-                return self._generate_fallback_audio(script, language)
+                return self._generate_fallback_audio(script, language, target_duration)
                 
             speed = voice_config.get("speed", 1.0)
             pitch = voice_config.get("pitch", 0.0)
@@ -224,7 +270,8 @@ class EnhancedMultilingualTTS:
                     language,
                     voice_name,
                     speed,
-                    pitch)
+                    pitch,
+                    target_duration)
             else:
                 # Fallback to enhanced gTTS
                 return self._generate_enhanced_gtts_audio(script, language, emotion)
@@ -246,7 +293,8 @@ class EnhancedMultilingualTTS:
         language: Language,
         voice_name: str,
         speed: float,
-        pitch: float) -> Optional[str]:
+        pitch: float,
+        target_duration: Optional[float] = None) -> Optional[str]:
         """Generate audio using Google Cloud TTS with duration control"""
 
         try:
@@ -257,18 +305,19 @@ class EnhancedMultilingualTTS:
 
             # CRITICAL FIX: Calculate optimal speed to match target duration
             # Estimate base duration and adjust speed accordingly
-            estimated_words = len(enhanced_script.split())
             base_speed = speed  # Start with requested speed
             
             # Adjust speed to match target duration if provided
-            if hasattr(self, '_target_duration') and self._target_duration:
-                # Estimate base duration (roughly 2.5 words per second at normal speed)
-                estimated_base_duration = estimated_words / 2.5
+            if target_duration:
+                # Predict base duration at normal speed from this voice's measured rate
+                estimated_base_duration = self.speech_rate.predict_duration(
+                    enhanced_script, voice_name, language
+                )
                 if estimated_base_duration > 0:
                     # Calculate required speed to match target duration
                     # If we need to fit more content in less time, speed up (>1.0)
                     # If we need to fit less content in more time, slow down (<1.0)
-                    required_speed = estimated_base_duration / self._target_duration
+                    required_speed = estimated_base_duration / target_duration
                     
                     # But we want to avoid speaking too fast - cap at reasonable speed
                     # For better user experience, limit max speed to 1.1x normal
@@ -277,7 +326,7 @@ class EnhancedMultilingualTTS:
                     
                     adjusted_speed = max(min_allowed_speed, min(max_allowed_speed, required_speed))
                     base_speed = adjusted_speed
-                    logger.info(f"🎵 Adjusted speed from {speed} to {adjusted_speed:.2f} to match target duration ({self._target_duration}s)")
+                    logger.info(f"🎵 Adjusted speed from {speed} to {adjusted_speed:.2f} to match target duration ({target_duration}s)")
                     
                     # If we would need to speak too fast, warn about content length
                     if required_speed > max_allowed_speed:
@@ -334,27 +383,36 @@ class EnhancedMultilingualTTS:
                 name=voice_name
             )
 
-            # Generate speech
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
+            def synthesize():
+                # Generate speech
+                response = self.client.synthesize_speech(
+                    input=synthesis_input,
+                    voice=voice,
+                    audio_config=audio_config
+                )
 
-            # Save audio file
-            audio_path = os.path.join(
-                tempfile.gettempdir(),
-                f"multilang_tts_{uuid.uuid4()}.mp3")
+                # Save audio file
+                audio_path = os.path.join(
+                    tempfile.gettempdir(),
+                    f"multilang_tts_{uuid.uuid4()}.mp3")
 
-            with open(audio_path, "wb") as out:
-                out.write(response.audio_content)
+                with open(audio_path, "wb") as out:
+                    out.write(response.audio_content)
 
-            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
-                file_size = os.path.getsize(audio_path) / (1024 * 1024)
-                logger.info(f"✅ Google Cloud TTS generated: {file_size:.2f}MB")
-                return audio_path
-            else:
-                raise Exception("Generated audio file is empty")
+                if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
+                    file_size = os.path.getsize(audio_path) / (1024 * 1024)
+                    logger.info(f"✅ Google Cloud TTS generated: {file_size:.2f}MB")
+                    self._record_speech_rate(audio_path, enhanced_script, voice_name, language, base_speed)
+                    return audio_path
+                else:
+                    raise Exception("Generated audio file is empty")
+
+            return self.engine.synthesize(
+                "google_cloud",
+                {"text": enhanced_script, "voice": voice_name, "language": language_code,
+                 "rate": round(base_speed, 3), "pitch": pitch},
+                synthesize
+            )
 
         except Exception as e:
             logger.error(f"❌ Google Cloud TTS failed: {e}")
@@ -368,11 +426,11 @@ class EnhancedMultilingualTTS:
         """Generate audio using enhanced gTTS with emotion-based configuration"""
 
         try:
-            # Get gTTS configuration for language
-            gtts_config = self.gtts_fallback_config.get(
+            # Get gTTS configuration for language (copied - adjusted per emotion below)
+            gtts_config = dict(self.gtts_fallback_config.get(
                 language,
                 {'lang': 'en',
-                'tld': 'com'})
+                'tld': 'com'}))
 
             # Enhance text for language
             enhanced_script = self._enhance_text_for_language(script, language)
@@ -385,20 +443,28 @@ class EnhancedMultilingualTTS:
                 if gtts_config['lang'] == 'en':
                     gtts_config['tld'] = 'com.au'  # Australian for authority
 
-            # Generate with gTTS - use slow=False for natural speech speed
-            tts = gTTS(text=enhanced_script, lang=gtts_config['lang'], tld=gtts_config['tld'], slow=False)
+            def synthesize():
+                # Generate with gTTS - use slow=False for natural speech speed
+                tts = gTTS(text=enhanced_script, lang=gtts_config['lang'], tld=gtts_config['tld'], slow=False)
 
-            audio_path = os.path.join(
-                tempfile.gettempdir(),
-                f"enhanced_gtts_{uuid.uuid4()}.mp3")
-            tts.save(audio_path)
+                audio_path = os.path.join(
+                    tempfile.gettempdir(),
+                    f"enhanced_gtts_{uuid.uuid4()}.mp3")
+                tts.save(audio_path)
 
-            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
-                file_size = os.path.getsize(audio_path) / (1024 * 1024)
-                logger.info(f"✅ Enhanced gTTS generated: {file_size:.2f}MB")
-                return audio_path
-            else:
-                raise Exception("Generated audio file is empty")
+                if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
+                    file_size = os.path.getsize(audio_path) / (1024 * 1024)
+                    logger.info(f"✅ Enhanced gTTS generated: {file_size:.2f}MB")
+                    self._record_speech_rate(audio_path, enhanced_script, f"gtts-{gtts_config['tld']}", language)
+                    return audio_path
+                else:
+                    raise Exception("Generated audio file is empty")
+
+            return self.engine.synthesize(
+                "gtts",
+                {"text": enhanced_script, "lang": gtts_config['lang'], "tld": gtts_config['tld']},
+                synthesize
+            )
 
         except Exception as e:
             logger.error(f"❌ Enhanced gTTS failed: {e}")
@@ -540,7 +606,10 @@ class EnhancedMultilingualTTS:
             logger.warning(f"⚠️ Text enhancement failed: {e}")
             return text if text else "Hello world"
 
-    def _generate_fallback_audio(self, script: str, language: Language) -> str:
+    def _generate_fallback_audio(self,
+                                 script: str,
+                                 language: Language,
+                                 target_duration: Optional[float] = None) -> str:
         """Generate fallback audio when all else fails"""
 
         logger.warning("🔄 Using basic fallback audio generation")
@@ -554,16 +623,24 @@ class EnhancedMultilingualTTS:
             # Multiple attempts for reliable generation
             for attempt in range(3):
                 try:
-                    tts = gTTS(text=enhanced_script, lang=gtts_config['lang'], tld=gtts_config['tld'], slow=False)
-                    audio_path = os.path.join(
-                        tempfile.gettempdir(),
-                        f"fallback_tts_{uuid.uuid4()}.mp3")
-                    tts.save(audio_path)
+                    def synthesize():
+                        tts = gTTS(text=enhanced_script, lang=gtts_config['lang'], tld=gtts_config['tld'], slow=False)
+                        audio_path = os.path.join(
+                            tempfile.gettempdir(),
+                            f"fallback_tts_{uuid.uuid4()}.mp3")
+                        tts.save(audio_path)
+                        return audio_path
+
+                    audio_path = self.engine.synthesize(
+                        "gtts",
+                        {"text": enhanced_script, "lang": gtts_config['lang'], "tld": gtts_config['tld']},
+                        synthesize
+                    )
 
                     # Validate the generated audio
-                    if os.path.exists(audio_path) and os.path.getsize(audio_path) > 1000:
+                    if audio_path and os.path.exists(audio_path) and os.path.getsize(audio_path) > 1000:
                         # Additional validation: Check audio duration
-                        if hasattr(self, '_target_duration'):
+                        if target_duration:
                             audio_duration = self._get_audio_duration(audio_path)
                             if audio_duration and audio_duration > 0:
                                 logger.info(f"✅ Fallback audio generated: {audio_path} (duration: {audio_duration:.2f}s)")
@@ -577,7 +654,7 @@ class EnhancedMultilingualTTS:
                             return audio_path
                     else:
                         logger.warning(f"⚠️ Generated audio too small on attempt {attempt + 1}")
-                        if os.path.exists(audio_path):
+                        if audio_path and os.path.exists(audio_path):
                             os.remove(audio_path)
                             
                 except Exception as e:
@@ -622,6 +699,13 @@ class EnhancedMultilingualTTS:
             logger.error(f"❌ Silent audio creation failed: {e}")
             raise Exception("All audio generation methods failed")
 
+    def _record_speech_rate(self, audio_path: str, text: str, voice_name: str,
+                            language: Language, speaking_rate: float = 1.0):
+        """Calibrate the speech rate model with the measured duration of a synthesis"""
+        duration = self._get_audio_duration(audio_path)
+        if duration:
+            self.speech_rate.record(text, duration, voice_name, language, speaking_rate)
+
     def _get_audio_duration(self, audio_path: str) -> Optional[float]:
         """Get audio duration using ffprobe"""
         try:
@@ -15,6 +15,7 @@ from ..ai.manager import AIServiceManager
 from ..ai.interfaces.text_generation import TextGenerationRequest
 from ..config.tts_config import tts_config
 from ..utils.text_validator import TextValidator
+from ..utils.speech_rate_model import get_speech_rate_model
 
 logger = get_logger(__name__)
 
@@ -41,6 +42,9 @@ class EnhancedScriptProcessor:
         # Initialize text validator
         self.text_validator = TextValidator()
         
+        # Measured speech rate, so scripts are sized before any TTS call
+        self.speech_rate = get_speech_rate_model()
+        
         # Import video config for minimum segment duration
         from ..config import video_config
         self.min_segment_duration = video_config.audio.min_segment_duration
@@ -136,12 +140,17 @@ class EnhancedScriptProcessor:
             if target_duration:
                 logger.info(f"🎯 Target duration: {target_duration} seconds")
 
+            # Speaking rate learned from measured syntheses in this language
+            # (TTSConfig's 2.8 words per second until enough samples exist)
+            words_per_second = self.speech_rate.words_per_second(language=language_value)
+            word_range = (
+                int((target_duration or 0) * words_per_second * 0.96),
+                int((target_duration or 0) * words_per_second * 1.04)
+            )
+
             # CRITICAL: Enforce duration constraints BEFORE processing
             if target_duration:
                 # Calculate word targets based on target duration
-                # Standard speaking rate: 150-160 words per minute
-                # For TTS, we use 2.8 words per second to include natural pauses
-                words_per_second = 2.8
                 
                 # Calculate both minimum and maximum acceptable word counts
                 min_words = int(target_duration * words_per_second * 0.9)  # 90% of target
@@ -218,7 +227,7 @@ If you see this format:
 - Visual descriptions should NEVER be in the audio
 
 REQUIREMENTS:
-1. DURATION CONTROL: Target is EXACTLY {target_duration}s - aim for {int(tts_config.get_target_word_range(target_duration)[0])} to {int(tts_config.get_target_word_range(target_duration)[1])} words MAXIMUM
+1. DURATION CONTROL: Target is EXACTLY {target_duration}s - aim for {word_range[0]} to {word_range[1]} words MAXIMUM
 2. TTS OPTIMIZATION: Use clear, pronounceable words
 3. NATURAL FLOW: Maintain conversational tone
 4. CONTENT EXPANSION: If the script is too short, expand it by:
@@ -233,7 +242,7 @@ REQUIREMENTS:
    - Condensing verbose phrases
    - Keeping only the most impactful moments
 4. {segment_instruction}
-5. TIMING CALCULATION: Estimate speaking time (average 2.7-2.9 words per second for natural pace)
+5. TIMING CALCULATION: Estimate speaking time (average {words_per_second:.1f} words per second for natural pace)
 6. CONTRACTION AVOIDANCE: NEVER use contractions - always write full forms (use "do not" instead of "don't", "it is" instead of "it's", "let us" instead of "let's", etc.)
 7. SENTENCE INTEGRITY: Each segment must contain complete sentences with proper punctuation
 8. SUBTITLE CONSTRAINTS: {sentences_per_segment}
@@ -254,8 +263,8 @@ CRITICAL TTS RULES:
 
 DURATION CALCULATION AND STRATEGY:
 - PRIORITY: Create scripts that fit EXACTLY within the duration - NOT MORE!
-- Average speaking speed: 2.7-2.9 words per second (comfortable pace)
-- TARGET word count for {target_duration}s: {int(tts_config.get_target_word_range(target_duration)[0])} to {int(tts_config.get_target_word_range(target_duration)[1])} words MAXIMUM
+- Average speaking speed: {words_per_second:.1f} words per second (comfortable pace)
+- TARGET word count for {target_duration}s: {word_range[0]} to {word_range[1]} words MAXIMUM
 - DO NOT EXCEED this word count!
 - IMPORTANT: Account for contraction expansion when calculating word count (e.g., "don't" becomes "do not" = 2 words)
 - STRATEGY: Be concise and impactful - quality over quantity
@@ -318,7 +327,15 @@ CRITICAL: If target duration is {target_duration}s, ensure total_estimated_durat
                 
                 # Validate duration matching if target was specified
                 if target_duration:
-                    estimated_duration = result.get('total_estimated_duration', 0)
+                    # Check with the measured speech rate rather than the model's own estimate,
+                    # so overruns are corrected here instead of after synthesis
+                    if result.get('optimized_script'):
+                        estimated_duration = self.speech_rate.predict_duration(
+                            result['optimized_script'], language=language_value
+                        )
+                        result['total_estimated_duration'] = round(estimated_duration, 2)
+                    else:
+                        estimated_duration = result.get('total_estimated_duration', 0)
                     duration_diff = abs(estimated_duration - target_duration)
                     
                     if duration_diff > 5:  # More than 5 seconds off
@@ -404,7 +421,7 @@ CRITICAL: If target duration is {target_duration}s, ensure total_estimated_durat
                 # Assume it's already an enum
                 language_value = language.value if hasattr(language, 'value') else str(language)
                 
-            target_words = tts_config.calculate_word_count(target_duration)
+            target_words = self.speech_rate.word_budget(target_duration, language=language_value)
             
             # Simple word-based trimming/expansion
             words = script_content.split()
@@ -443,7 +460,7 @@ CRITICAL: If target duration is {target_duration}s, ensure total_estimated_durat
             
             for i, sentence in enumerate(sentences):
                 sentence_words = len(sentence.split())
-                sentence_duration = tts_config.calculate_duration(sentence_words)
+                sentence_duration = self.speech_rate.predict_duration(sentence, language=language_value)
                 
                 segments.append({
                     "text": sentence,
@@ -11,8 +11,6 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-import numpy as np
-import cv2
 from datetime import timedelta
 
 # Use existing VEO client from codebase
@@ -36,7 +34,12 @@ except ImportError:
         mime_type: str = "image/jpeg"
 from src.ai.manager import AIServiceManager
 from src.utils.session_context import SessionContext
+from src.utils.continuity_frame_extractor import ContinuityFrameExtractor
+from src.effects.ffmpeg_effect_compiler import FFmpegEffectCompiler, VideoStreamInfo
 from src.config.video_config import video_config
+from src.generators.scene_render_farm import (
+    SceneRenderFarm, SceneRenderFarmConfig, SceneJob, scene_fingerprint
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +82,7 @@ class Scene:
     reference_images: List[ReferenceImage] = field(default_factory=list)
     overlap_frames: int = 15  # frames to overlap with next scene
     audio_cues: List[str] = field(default_factory=list)
+    chain_from_previous: bool = False  # start from the previous scene's last frame
     
     @property
     def veo_prompt(self) -> str:
@@ -135,9 +139,18 @@ class HollywoodVeoDirector:
     
     def __init__(self, 
                  project_id: str,
-                 session_context: Optional[SessionContext] = None):
-        """Initialize Hollywood VEO Director"""
+                 session_context: Optional[SessionContext] = None,
+                 render_farm_config: Optional[SceneRenderFarmConfig] = None):
+        """
+        Initialize Hollywood VEO Director
+        
+        Pass the session_context of an interrupted run to resume it: the saved
+        script is reused and scenes already rendered are skipped.
+        """
         self.project_id = project_id
+        self.render_farm_config = render_farm_config or SceneRenderFarmConfig()
+        self.continuity_frames = ContinuityFrameExtractor()
+        self.effect_compiler = FFmpegEffectCompiler(preset="slow")
         # Initialize session properly
         if session_context:
             self.session = session_context
@@ -211,7 +224,14 @@ class HollywoodVeoDirector:
                                         mission: str,
                                         genre: str,
                                         style: str) -> MovieScript:
-        """Generate professional Hollywood script"""
+        """Generate professional Hollywood script (reusing the saved one when resuming)"""
+        
+        script_path = os.path.join(self.session.session_dir, "hollywood_script.json")
+        if os.path.exists(script_path):
+            with open(script_path, "r") as f:
+                script_data = json.load(f)
+            logger.info(f"📝 Resuming with saved script: {script_data.get('title', 'untitled')}")
+            return self._build_movie_script(script_data, genre)
         
         prompt = f"""
         Create a professional Hollywood movie script for a 5-minute film.
@@ -236,6 +256,7 @@ class HollywoodVeoDirector:
         - Dialogue (if any)
         - Character appearances
         - Audio/sound requirements
+        - chain_from_previous: true if the shot continues directly from the previous one
         
         Format as JSON with scenes array.
         """
@@ -256,7 +277,17 @@ class HollywoodVeoDirector:
         
         # Parse script
         script_data = json.loads(response)
+        script = self._build_movie_script(script_data, genre)
         
+        # Save script so an interrupted render can resume with the same scenes
+        with open(script_path, "w") as f:
+            json.dump(script_data, f, indent=2)
+        
+        logger.info(f"📝 Generated {len(script.scenes)} scenes for 5-minute movie")
+        return script
+    
+    def _build_movie_script(self, script_data: Dict[str, Any], genre: str) -> MovieScript:
+        """Build a MovieScript from the script JSON"""
         scenes = []
         for idx, scene_data in enumerate(script_data["scenes"]):
             scene = Scene(
@@ -268,7 +299,8 @@ class HollywoodVeoDirector:
                 camera_movement=CameraMovement[scene_data.get("camera", "STATIC").upper()],
                 shot_size=scene_data.get("shot_size", "medium"),
                 characters=scene_data.get("characters", []),
-                audio_cues=scene_data.get("audio_cues", [])
+                audio_cues=scene_data.get("audio_cues", []),
+                chain_from_previous=bool(scene_data.get("chain_from_previous", False)) and idx > 0
             )
             scenes.append(scene)
         
@@ -285,12 +317,6 @@ class HollywoodVeoDirector:
         # Validate and adjust timing
         self._adjust_scene_timing(script)
         
-        # Save script
-        script_path = os.path.join(self.session.session_dir, "hollywood_script.json")
-        with open(script_path, "w") as f:
-            json.dump(script_data, f, indent=2)
-        
-        logger.info(f"📝 Generated {len(scenes)} scenes for 5-minute movie")
         return script
     
     def _adjust_scene_timing(self, script: MovieScript):
@@ -345,57 +371,79 @@ class HollywoodVeoDirector:
     def _generate_all_scenes(self,
                                   script: MovieScript,
                                   character_refs: Dict[str, ReferenceImage]) -> List[str]:
-        """Generate all scenes with VEO 3"""
-        scene_clips = []
+        """
+        Generate all scenes with VEO 3 on the scene render farm
         
-        # Process in batches for parallel generation
-        batch_size = 5
-        for i in range(0, len(script.scenes), batch_size):
-            batch = script.scenes[i:i+batch_size]
+        Scenes render concurrently up to the farm's worker limit; a scene with
+        chain_from_previous waits for the previous scene. Progress is kept in
+        the scene manifest, so rerunning the same session skips finished scenes.
+        
+        Raises:
+            RuntimeError: If rendering paused (quota exhausted or repeated failures)
+        """
+        jobs = []
+        fingerprints: Dict[int, str] = {}
+        for scene in script.scenes:
+            # Add character references to scene
+            for char_name in scene.characters:
+                ref = character_refs.get(char_name)
+                if ref and ref not in scene.reference_images:
+                    scene.reference_images.append(ref)
             
-            # Generate batch in parallel
-            tasks = []
-            for scene in batch:
-                # Add character references to scene
-                for char_name in scene.characters:
-                    if char_name in character_refs:
-                        scene.reference_images.append(character_refs[char_name])
-                
-                # Generate synchronously
-                clip = self._generate_scene_with_continuity(
-                    scene,
-                    prev_scene=script.scenes[scene.scene_id-1] if scene.scene_id > 0 else None,
-                    next_scene=script.scenes[scene.scene_id+1] if scene.scene_id < len(script.scenes)-1 else None
-                )
-                tasks.append(task)
+            prev_scene = script.scenes[scene.scene_id-1] if scene.scene_id > 0 else None
+            next_scene = script.scenes[scene.scene_id+1] if scene.scene_id < len(script.scenes)-1 else None
             
-            # Process synchronously instead of async
-            batch_clips = []            
-            for scene in batch:
-                # Add character references to scene
-                for char_name in scene.characters:
-                    if char_name in character_refs:
-                        scene.reference_images.append(character_refs[char_name])
-                
-                clip = self._generate_scene_with_continuity(
-                    scene,
-                    prev_scene=script.scenes[scene.scene_id-1] if scene.scene_id > 0 else None,
-                    next_scene=script.scenes[scene.scene_id+1] if scene.scene_id < len(script.scenes)-1 else None
-                )
-                batch_clips.append(clip)
-            scene_clips.extend(batch_clips)
+            # A chained scene starts from the previous clip's last frame, so it
+            # inherits the previous scene's fingerprint
+            fingerprints[scene.scene_id] = scene_fingerprint(
+                self._continuity_prompt(scene, prev_scene, next_scene),
+                scene.duration,
+                scene.scene_type.value,
+                scene.camera_movement.value,
+                scene.chain_from_previous,
+                fingerprints.get(scene.scene_id - 1) if scene.chain_from_previous else None
+            )
             
-            logger.info(f"🎬 Generated batch {i//batch_size + 1}/{len(script.scenes)//batch_size + 1}")
+            jobs.append(SceneJob(
+                scene_id=scene.scene_id,
+                fingerprint=fingerprints[scene.scene_id],
+                render=lambda dep_clips, s=scene, p=prev_scene, n=next_scene:
+                    self._generate_scene_with_continuity(
+                        s, p, n,
+                        previous_clip=dep_clips.get(s.scene_id - 1),
+                        allow_placeholder=False
+                    ),
+                depends_on=[scene.scene_id - 1] if scene.chain_from_previous else []
+            ))
+        
+        farm = SceneRenderFarm(self.scenes_dir, self.render_farm_config)
+        result = farm.render(jobs)
+        
+        if result.paused:
+            raise RuntimeError(
+                f"Scene rendering paused after {len(result.clips)}/{len(jobs)} scenes; "
+                f"rerun with session {self.session.session_id} to resume"
+            )
         
+        # Failed scenes get placeholders in the cut but stay failed in the
+        # manifest, so a rerun retries them
+        scene_clips = []
+        for scene in script.scenes:
+            clip = result.clips.get(scene.scene_id)
+            if clip is None:
+                logger.warning(f"⚠️ Scene {scene.scene_id} failed ({result.failed.get(scene.scene_id)}), using placeholder")
+                clip = self._create_placeholder_clip(scene)
+            scene_clips.append(clip)
+        
+        logger.info(f"🎬 Generated {len(result.clips)}/{len(jobs)} scenes "
+                    f"({len(result.skipped)} reused from previous runs)")
         return scene_clips
     
-    def _generate_scene_with_continuity(self,
-                                             scene: Scene,
-                                             prev_scene: Optional[Scene],
-                                             next_scene: Optional[Scene]) -> str:
-        """Generate scene with continuity overlap"""
-        
-        # Enhance prompt with continuity hints
+    def _continuity_prompt(self,
+                           scene: Scene,
+                           prev_scene: Optional[Scene],
+                           next_scene: Optional[Scene]) -> str:
+        """Scene prompt with continuity hints from neighbouring scenes"""
         continuity_prompt = scene.veo_prompt
         
         if prev_scene:
@@ -404,16 +452,40 @@ class HollywoodVeoDirector:
         if next_scene:
             continuity_prompt += f" (leading to: {next_scene.description[:50]})"
         
+        return continuity_prompt
+    
+    def _generate_scene_with_continuity(self,
+                                             scene: Scene,
+                                             prev_scene: Optional[Scene],
+                                             next_scene: Optional[Scene],
+                                             previous_clip: Optional[str] = None,
+                                             allow_placeholder: bool = True) -> str:
+        """Generate scene with continuity overlap"""
+        
+        # Enhance prompt with continuity hints
+        continuity_prompt = self._continuity_prompt(scene, prev_scene, next_scene)
+        
+        # Chained scenes start from the previous scene's last frame
+        image_path = None
+        if previous_clip:
+            image_path = self.continuity_frames.extract_to_path(
+                previous_clip,
+                os.path.join(self.scenes_dir, f"scene_{scene.scene_id}_start_frame.jpg")
+            )
+        
         # Generate with VEO 3 using existing client method
         # Note: Current VEO client doesn't support async, so we'll adapt
         clip_path = self.veo_client.generate_video(
             prompt=continuity_prompt,
             duration=scene.duration,
             clip_id=f"scene_{scene.scene_id}",
+            image_path=image_path,
             aspect_ratio="16:9"
         )
         
         if not clip_path:
+            if not allow_placeholder:
+                raise RuntimeError(f"VEO generation failed for scene {scene.scene_id}")
             # Fallback to placeholder if generation fails
             clip_path = self._create_placeholder_clip(scene)
         
@@ -423,95 +495,62 @@ class HollywoodVeoDirector:
         return enhanced_clip
     
     def _enhance_scene_clip(self, clip_path: str, scene: Scene) -> str:
-        """Apply Hollywood-quality enhancements to scene"""
+        """Apply Hollywood-quality enhancements to scene in a single FFmpeg encode"""
         
-        # Load clip
-        cap = cv2.VideoCapture(clip_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        info = self.effect_compiler.probe(clip_path)
+        if info is None:
+            logger.warning(f"⚠️ Could not probe scene {scene.scene_id}, skipping enhancements")
+            return clip_path
         
         # Output path
         enhanced_path = clip_path.replace(".mp4", "_enhanced.mp4")
         
-        # Setup writer with cinema settings
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(enhanced_path, fourcc, self.CINEMA_FPS, (width, height))
+        filters = self._cinematic_grading_filters(scene.scene_type)
         
-        # Apply enhancements frame by frame
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Apply cinematic color grading
-            frame = self._apply_cinematic_grading(frame, scene.scene_type)
-            
-            # Apply camera movement simulation
-            if scene.camera_movement != CameraMovement.STATIC:
-                frame = self._simulate_camera_movement(frame, scene.camera_movement)
-            
-            # Add letterbox for cinematic aspect ratio
-            frame = self._add_letterbox(frame)
-            
-            out.write(frame)
+        # Apply camera movement simulation
+        if scene.camera_movement != CameraMovement.STATIC:
+            filters.append(self._camera_movement_filter(scene.camera_movement, info))
+        
+        # Add letterbox for cinematic aspect ratio
+        filters.append(self.effect_compiler.letterbox(info, 0.1))
         
-        cap.release()
-        out.release()
+        # Cinema frame rate, audio copied through untouched
+        if not self.effect_compiler.render(clip_path, enhanced_path, filters, info=info, fps=self.CINEMA_FPS):
+            logger.warning(f"⚠️ Enhancement failed for scene {scene.scene_id}, using original clip")
+            return clip_path
         
         return enhanced_path
     
-    def _apply_cinematic_grading(self, frame: np.ndarray, scene_type: SceneType) -> np.ndarray:
-        """Apply Hollywood color grading"""
+    def _cinematic_grading_filters(self, scene_type: SceneType) -> List[str]:
+        """Hollywood color grading as FFmpeg filters"""
         
         # Scene-specific color grading
         if scene_type == SceneType.ACTION:
             # High contrast, cool tones
-            frame = cv2.convertScaleAbs(frame, alpha=1.3, beta=-20)
-            frame[:,:,0] = np.clip(frame[:,:,0] * 1.1, 0, 255)  # Boost blue
+            return [self.effect_compiler.linear_grade(scale=1.3, offset=-20, b=1.1)]
         
         elif scene_type == SceneType.EMOTIONAL:
             # Warm, soft tones
-            frame[:,:,2] = np.clip(frame[:,:,2] * 1.1, 0, 255)  # Boost red
-            frame = cv2.GaussianBlur(frame, (3, 3), 0)  # Soft focus
+            return [self.effect_compiler.linear_grade(r=1.1), self.effect_compiler.gaussian_blur(0.8)]
         
         elif scene_type == SceneType.ESTABLISHING:
             # Epic, saturated look
-            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV).astype(np.float32)
-            hsv[:,:,1] *= 1.2  # Increase saturation
-            frame = cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+            return [self.effect_compiler.saturation(1.2)]
         
-        return frame
+        return []
     
-    def _simulate_camera_movement(self, frame: np.ndarray, movement: CameraMovement) -> np.ndarray:
+    def _camera_movement_filter(self, movement: CameraMovement, info: VideoStreamInfo) -> Optional[str]:
         """Simulate professional camera movements"""
-        h, w = frame.shape[:2]
         
         if movement == CameraMovement.DOLLY_IN:
             # Zoom in effect
-            scale = 1.02
-            M = cv2.getRotationMatrix2D((w/2, h/2), 0, scale)
-            frame = cv2.warpAffine(frame, M, (w, h))
+            return self.effect_compiler.static_zoom(1.02, info)
         
         elif movement == CameraMovement.HANDHELD:
             # Subtle shake
-            dx = np.random.randint(-2, 3)
-            dy = np.random.randint(-2, 3)
-            M = np.float32([[1, 0, dx], [0, 1, dy]])
-            frame = cv2.warpAffine(frame, M, (w, h))
-        
-        return frame
-    
-    def _add_letterbox(self, frame: np.ndarray) -> np.ndarray:
-        """Add cinematic letterbox bars"""
-        h, w = frame.shape[:2]
-        bar_height = int(h * 0.1)
-        
-        # Add black bars
-        frame[:bar_height, :] = 0
-        frame[-bar_height:, :] = 0
+            return self.effect_compiler.shake(2)
         
-        return frame
+        return None
     
     def _generate_music_score(self, script: MovieScript) -> str:
         """Generate Hollywood music score with Lyria 2"""
@@ -25,6 +25,12 @@ except ImportError:
     # Fallback if not available
     ImageGenerationModel = None
 
+from src.utils.frame_interpolator import FrameInterpolator
+from src.generators.reference_embedding_index import (
+    SIGNATURE_DIM, ReferenceEmbeddingIndex, compute_color_signature, compute_image_embedding,
+    palette_coverage
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,8 +104,10 @@ class Imagen4ContinuityEngine:
     IMAGEN4_MODEL = "imagen-4"
     IMAGEN4_FAST_MODEL = "imagen-4-fast"
     
-    # Consistency thresholds
-    SIMILARITY_THRESHOLD = 0.85
+    # Consistency thresholds; a render of the same character covers all of
+    # its reference's subject colors in one region, while different characters
+    # stay below ~0.35 (~0.67 when they share skin or hair tones)
+    PALETTE_COVERAGE_THRESHOLD = 0.75
     MAX_REFERENCES_PER_GENERATION = 5
     
     def __init__(self,
@@ -129,8 +137,11 @@ class Imagen4ContinuityEngine:
         # Initialize Vertex AI
         vertexai.init(project=project_id, location=location)
         
-        # Reference database
+        # Reference database, persisted embedding index and character color signatures
         self.reference_db: Dict[str, VisualReference] = {}
+        self.embedding_index = ReferenceEmbeddingIndex(os.path.join(cache_dir, "embedding_index"))
+        self.signature_index = ReferenceEmbeddingIndex(os.path.join(cache_dir, "character_signatures"),
+                                                       dim=SIGNATURE_DIM)
         self.load_reference_database()
         
         logger.info("🎨 Imagen 4 Continuity Engine initialized")
@@ -148,12 +159,69 @@ class Imagen4ContinuityEngine:
                         ref_type=ConsistencyType[ref_data["ref_type"].upper()],
                         image_path=ref_data["image_path"],
                         description=ref_data["description"],
-                        metadata=ref_data.get("metadata", {})
+                        metadata=ref_data.get("metadata", {}),
+                        embedding=self.embedding_index.get(ref_data["ref_id"])
                     )
                     self.reference_db[ref.ref_id] = ref
             
+            # Backfill embeddings for references saved before the index existed
+            missing = [ref for ref in self.reference_db.values()
+                       if ref.embedding is None and os.path.exists(ref.image_path)]
+            if missing:
+                embeddings = np.stack([compute_image_embedding(ref.image_path) for ref in missing])
+                self.embedding_index.add_many([ref.ref_id for ref in missing], embeddings)
+                for ref in missing:
+                    ref.embedding = self.embedding_index.get(ref.ref_id)
+            
+            for ref in self.reference_db.values():
+                if (ref.ref_type == ConsistencyType.CHARACTER and ref.ref_id not in self.signature_index
+                        and os.path.exists(ref.image_path)):
+                    self.signature_index.add(ref.ref_id, compute_color_signature(ref.image_path))
+            
             logger.info(f"📚 Loaded {len(self.reference_db)} visual references")
     
+    def remove_reference(self, ref_id: str) -> bool:
+        """Remove a visual reference and its embedding"""
+        removed = self.reference_db.pop(ref_id, None) is not None
+        self.embedding_index.remove(ref_id)
+        self.signature_index.remove(ref_id)
+        
+        if removed:
+            self.save_reference_database()
+        return removed
+    
+    async def find_similar_references(self,
+                                      image_path: str,
+                                      top_k: int = 5,
+                                      ref_type: Optional[ConsistencyType] = None) -> List[Tuple[str, float]]:
+        """
+        Find the stored references most similar to an image
+        
+        Args:
+            image_path: Path to image to match
+            top_k: Number of matches to return
+            ref_type: Only consider references of this type
+            
+        Returns:
+            List of (ref_id, similarity) sorted best first
+        """
+        
+        candidates = None
+        if ref_type is not None:
+            candidates = [ref_id for ref_id, ref in self.reference_db.items()
+                          if ref.ref_type == ref_type]
+        
+        embedding = await self._generate_embedding(image_path)
+        return self.embedding_index.top_k(embedding, k=top_k, candidate_ids=candidates)[0]
+    
+    def _index_reference(self, ref: VisualReference):
+        """Compute and persist the embedding (and character color signature) for a new reference"""
+        if ref.embedding is None:
+            ref.embedding = compute_image_embedding(ref.image_path)
+        self.embedding_index.add(ref.ref_id, ref.embedding)
+        if ref.ref_type == ConsistencyType.CHARACTER:
+            self.signature_index.add(ref.ref_id, compute_color_signature(ref.image_path))
+    
     def save_reference_database(self):
         """Save reference database to cache"""
         db_path = os.path.join(self.cache_dir, "reference_db.json")
@@ -214,6 +282,7 @@ class Imagen4ContinuityEngine:
         
         # Store in database
         self.reference_db[character_id] = ref
+        self._index_reference(ref)
         self.save_reference_database()
         
         logger.info(f"✅ Character reference created: {character_id}")
@@ -271,6 +340,7 @@ class Imagen4ContinuityEngine:
         )
         
         self.reference_db[location_id] = ref
+        self._index_reference(ref)
         self.save_reference_database()
         
         return ref
@@ -433,21 +503,9 @@ class Imagen4ContinuityEngine:
     async def _generate_embedding(self, image_path: str) -> np.ndarray:
         """Generate embedding for similarity matching"""
         
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
-            return np.zeros(512)  # Default embedding size
-        
-        # Resize to standard size
-        img = cv2.resize(img, (224, 224))
-        
-        # Simple embedding (in production, use proper vision model)
-        # This is a placeholder - real implementation would use
-        # a vision transformer or similar model
-        embedding = img.flatten()[:512].astype(np.float32)
-        embedding = embedding / np.linalg.norm(embedding)
-        
-        return embedding
+        # Perceptual CPU features (structure, color, edge layout);
+        # zeros of EMBEDDING_DIM if the image cannot be read
+        return await asyncio.to_thread(compute_image_embedding, image_path)
     
     async def _verify_consistency(self,
                                  generated_path: str,
@@ -457,16 +515,26 @@ class Imagen4ContinuityEngine:
         # Generate embedding for new image
         new_embedding = await self._generate_embedding(generated_path)
         
-        # Check similarity with character references
-        for ref in references:
-            if ref.ref_type == ConsistencyType.CHARACTER and ref.embedding is not None:
-                similarity = np.dot(new_embedding, ref.embedding)
-                
-                if similarity < self.SIMILARITY_THRESHOLD:
-                    logger.warning(f"Low similarity ({similarity:.2f}) with {ref.ref_id}")
-                    return False
-        
-        return True
+        # Each scene character must outrank every other character...
+        character_ids = [ref.ref_id for ref in references if ref.ref_type == ConsistencyType.CHARACTER]
+        rival_ids = [ref_id for ref_id, ref in self.reference_db.items()
+                     if ref.ref_type == ConsistencyType.CHARACTER and ref_id not in character_ids]
+        mismatched = self.embedding_index.mismatched(new_embedding, character_ids, rival_ids)
+        
+        for ref_id, similarity in mismatched.items():
+            logger.warning(f"Low similarity ({similarity:.2f}) with {ref_id}")
+        
+        # ...and its subject colors must appear together in the render
+        signatures = {ref_id: self.signature_index.get(ref_id) for ref_id in character_ids}
+        for ref_id, signature in signatures.items():
+            if signature is None:
+                continue
+            coverage = await asyncio.to_thread(palette_coverage, signature, generated_path)
+            if coverage < self.PALETTE_COVERAGE_THRESHOLD:
+                logger.warning(f"Low palette coverage ({coverage:.2f}) with {ref_id}")
+                mismatched[ref_id] = coverage
+        
+        return not mismatched
     
     def _create_placeholder_image(self, prompt: str) -> str:
         """Create placeholder image for testing"""
@@ -521,6 +589,7 @@ class Imagen4ContinuityEngine:
         )
         
         self.reference_db[style_id] = ref
+        self._index_reference(ref)
         self.save_reference_database()
         
         return ref
@@ -532,6 +601,9 @@ class Imagen4ContinuityEngine:
         """
         Generate interpolated frames between scenes for smooth transitions
         
+        Frames are computed locally with optical-flow warping, so the
+        result is deterministic and costs no Imagen quota.
+        
         Args:
             scene1_path: Path to first scene
             scene2_path: Path to second scene
@@ -543,26 +615,11 @@ class Imagen4ContinuityEngine:
         
         logger.info(f"🔄 Interpolating {num_frames} frames between scenes")
         
-        interpolated_frames = []
-        
-        for i in range(num_frames):
-            alpha = (i + 1) / (num_frames + 1)
-            
-            prompt = f"""
-            Visual blend between two scenes
-            {int((1-alpha)*100)}% of first scene
-            {int(alpha*100)}% of second scene
-            Smooth transition
-            Maintain visual consistency
-            """
-            
-            frame_path = await self._generate_imagen4(
-                prompt=prompt,
-                speed=Imagen4Speed.FAST,
-                aspect_ratio="16:9"
-            )
-            
-            interpolated_frames.append(frame_path)
+        prefix = f"interp_{Path(scene1_path).stem}_{Path(scene2_path).stem}"
+        interpolated_frames = await asyncio.to_thread(
+            FrameInterpolator().interpolate_frames,
+            scene1_path, scene2_path, num_frames, self.scenes_dir, prefix
+        )
         
         return interpolated_frames
     
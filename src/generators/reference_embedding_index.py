@@ -0,0 +1,384 @@
+"""
+Reference Embedding Index
+Persisted, memory-mapped float32 matrix of visual reference embeddings
+with batched cosine top-k lookups for continuity checks
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 512
+
+# Feature block sizes (sum to EMBEDDING_DIM)
+_DCT_SIZE = 16          # 16x16 low-frequency luminance coefficients = 256
+_HSV_BINS = (8, 4, 4)   # hue/saturation/value histogram = 128
+_GRID_CELLS = 4         # 4x4 grid of gradient orientation histograms
+_ORIENTATION_BINS = 8   # 4 * 4 * 8 = 128
+
+# Character color signatures
+_SIGNATURE_BINS = (18, 4, 4)                 # hue/saturation/value
+SIGNATURE_DIM = 18 * 4 * 4
+_BACKGROUND_DISTANCE = 40.0                  # BGR distance from the border color counted as subject
+_MIN_COLOR_SHARE = 0.03                      # subject colors below this share are ignored
+_COVERAGE_GRID = 64                          # images are searched on a 64x64 grid
+_COVERAGE_WINDOWS = (12, 16, 24, 32)         # window sizes on that grid
+_MIN_COLOR_PRESENCE = 0.01                   # share of a window a color must cover to be present
+
+
+def compute_image_embedding(image: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    Compute a perceptual embedding for an image on CPU.
+
+    Combines low-frequency luminance structure (DCT), color distribution
+    (HSV histogram) and a coarse edge-orientation layout. Each block is
+    normalized separately so no single cue dominates the cosine similarity.
+
+    Args:
+        image: Image path or BGR image array
+
+    Returns:
+        L2-normalized float32 vector of EMBEDDING_DIM values
+        (all zeros if the image cannot be read)
+    """
+    img = cv2.imread(image) if isinstance(image, str) else image
+    if img is None or img.size == 0:
+        return np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+    # Structure: low-frequency DCT without the DC term (overall brightness)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA).astype(np.float32)
+    dct = cv2.dct(small)[:_DCT_SIZE, :_DCT_SIZE].flatten()
+    dct[0] = 0.0
+
+    # Color: HSV histogram
+    hsv = cv2.cvtColor(cv2.resize(img, (128, 128), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2HSV)
+    color_hist = cv2.calcHist([hsv], [0, 1, 2], None, list(_HSV_BINS),
+                              [0, 180, 0, 256, 0, 256]).flatten()
+
+    # Layout: magnitude-weighted gradient orientations per grid cell
+    grad_x = cv2.Sobel(small, cv2.CV_32F, 1, 0)
+    grad_y = cv2.Sobel(small, cv2.CV_32F, 0, 1)
+    magnitude, angle = cv2.cartToPolar(grad_x, grad_y)
+    orientation = (angle / (2 * np.pi) * _ORIENTATION_BINS).astype(np.int64) % _ORIENTATION_BINS
+    cell = small.shape[0] // _GRID_CELLS
+    rows, cols = np.indices(small.shape)
+    cell_index = (rows // cell) * _GRID_CELLS + (cols // cell)
+    edge_hist = np.bincount(
+        (cell_index * _ORIENTATION_BINS + orientation).ravel(),
+        weights=magnitude.ravel(),
+        minlength=_GRID_CELLS * _GRID_CELLS * _ORIENTATION_BINS
+    )
+
+    blocks = [_normalize(block.astype(np.float32)) for block in (dct, color_hist, edge_hist)]
+    return _normalize(np.concatenate(blocks))
+
+
+def compute_color_signature(image: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    Color histogram of a reference image's subject.
+
+    References are rendered on a clean background, so pixels close to the
+    median border color are dropped before counting colors.
+
+    Args:
+        image: Image path or BGR image array
+
+    Returns:
+        float32 histogram of SIGNATURE_DIM bins summing to 1
+        (all zeros if the image cannot be read)
+    """
+    img = cv2.imread(image) if isinstance(image, str) else image
+    if img is None or img.size == 0:
+        return np.zeros(SIGNATURE_DIM, dtype=np.float32)
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+    border = np.concatenate([img[0], img[-1], img[:, 0], img[:, -1]]).astype(np.float32)
+    distance = np.linalg.norm(img.astype(np.float32) - np.median(border, axis=0), axis=2)
+    subject = distance > _BACKGROUND_DISTANCE
+    if subject.mean() < 0.02:
+        # No clean background to remove
+        subject[:] = True
+
+    counts = np.bincount(_color_bins(img)[subject], minlength=SIGNATURE_DIM).astype(np.float32)
+    return counts / counts.sum()
+
+
+def palette_coverage(signature: np.ndarray, image: Union[str, np.ndarray]) -> float:
+    """
+    Share of a subject's colors found together in one region of an image.
+
+    Every color holding at least _MIN_COLOR_SHARE of the signature counts
+    equally, and a color is present in a window when it covers
+    _MIN_COLOR_PRESENCE of it. Unlike the global embedding this ignores
+    where the subject is, how large it is and what surrounds it.
+
+    Args:
+        signature: Color signature (any positive scale)
+        image: Image path or BGR image array
+
+    Returns:
+        Best coverage over all windows, from 0 to 1
+    """
+    signature = np.asarray(signature, dtype=np.float32)
+    total = signature.sum()
+    img = cv2.imread(image) if isinstance(image, str) else image
+    if total <= 0 or img is None or img.size == 0:
+        return 0.0
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+    colors = np.flatnonzero(signature / total >= _MIN_COLOR_SHARE)
+    if colors.size == 0:
+        return 0.0
+
+    size = _COVERAGE_GRID
+    bins = _color_bins(cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA))
+    # Per-color integral images give every window's color counts in O(1)
+    integral = np.zeros((size + 1, size + 1, colors.size), dtype=np.float32)
+    integral[1:, 1:] = (bins[..., np.newaxis] == colors).cumsum(0).cumsum(1)
+
+    best = 0.0
+    for window in _COVERAGE_WINDOWS:
+        starts = np.arange(0, size - window + 1, 2)
+        top, left = starts[:, np.newaxis], starts[np.newaxis, :]
+        counts = (integral[top + window, left + window] - integral[top, left + window]
+                  - integral[top + window, left] + integral[top, left])
+        present = counts / (window * window) >= _MIN_COLOR_PRESENCE
+        best = max(best, float(present.mean(axis=-1).max()))
+    return best
+
+
+def _color_bins(img: np.ndarray) -> np.ndarray:
+    """Signature bin of every pixel"""
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype(np.int64)
+    hue_bins, sat_bins, val_bins = _SIGNATURE_BINS
+    return ((hsv[..., 0] * hue_bins // 180) * sat_bins * val_bins
+            + (hsv[..., 1] * sat_bins // 256) * val_bins
+            + hsv[..., 2] * val_bins // 256)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+    return np.divide(vector, norm, out=np.zeros_like(vector), where=norm > 0)
+
+
+class ReferenceEmbeddingIndex:
+    """
+    Disk-backed embedding matrix keyed by reference ID
+
+    Rows live in a raw float32 file that is memory-mapped for lookups, so
+    loading the index does not read embeddings into memory and adding or
+    removing a reference touches a single row.
+    """
+
+    MATRIX_FILE = "embeddings.f32"
+    META_FILE = "index.json"
+
+    def __init__(self, index_dir: str, dim: int = EMBEDDING_DIM):
+        """
+        Initialize embedding index
+
+        Args:
+            index_dir: Directory holding the matrix and ID files
+            dim: Embedding dimension
+        """
+        self.index_dir = index_dir
+        self.dim = dim
+        self.matrix_path = os.path.join(index_dir, self.MATRIX_FILE)
+        self.meta_path = os.path.join(index_dir, self.META_FILE)
+
+        os.makedirs(index_dir, exist_ok=True)
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, ref_id: str) -> bool:
+        return ref_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def get(self, ref_id: str) -> Optional[np.ndarray]:
+        """Get a copy of the stored embedding for a reference"""
+        row = self._rows.get(ref_id)
+        if row is None:
+            return None
+        return np.array(self._matrix[row])
+
+    def add(self, ref_id: str, embedding: np.ndarray):
+        """Add or replace a single reference embedding"""
+        self.add_many([ref_id], np.asarray(embedding)[np.newaxis, :])
+
+    def add_many(self, ref_ids: Sequence[str], embeddings: np.ndarray):
+        """Add or replace embeddings for several references at once"""
+        embeddings = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ref_ids), self.dim))
+
+        new_rows: Dict[str, np.ndarray] = {}
+        for ref_id, embedding in zip(ref_ids, embeddings):
+            if ref_id in self._rows:
+                self._write_row(self._rows[ref_id], embedding)
+            else:
+                new_rows[ref_id] = embedding
+
+        if new_rows:
+            with open(self.matrix_path, "ab") as f:
+                f.write(np.stack(list(new_rows.values())).tobytes())
+            for ref_id in new_rows:
+                self._rows[ref_id] = len(self._ids)
+                self._ids.append(ref_id)
+
+        self._save_meta()
+        self._remap()
+
+    def remove(self, ref_id: str) -> bool:
+        """Remove a reference by moving the last row into its slot"""
+        row = self._rows.pop(ref_id, None)
+        if row is None:
+            return False
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._write_row(row, np.array(self._matrix[last]))
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+
+        self._save_meta()
+        os.truncate(self.matrix_path, len(self._ids) * self.dim * 4)
+        self._remap()
+        return True
+
+    def similarities(self, query: np.ndarray, ref_ids: Sequence[str]) -> Dict[str, float]:
+        """Cosine similarity of one query against the given references"""
+        present = [ref_id for ref_id in ref_ids if ref_id in self._rows]
+        if not present:
+            return {}
+
+        rows = np.fromiter((self._rows[ref_id] for ref_id in present), dtype=np.int64)
+        scores = self._matrix[rows] @ _normalize(np.asarray(query, dtype=np.float32))
+        return dict(zip(present, scores.tolist()))
+
+    def mismatched(self,
+                   query: np.ndarray,
+                   required_ids: Sequence[str],
+                   rival_ids: Sequence[str] = (),
+                   floor: float = 0.0) -> Dict[str, float]:
+        """
+        Required references an embedding does not match
+
+        The perceptual embedding separates subjects by rank rather than by
+        absolute score, so a required reference fails when it scores below
+        the floor or below the best-scoring rival reference.
+
+        Args:
+            query: Embedding of the image being checked
+            required_ids: References the image should match
+            rival_ids: Comparable references the image should not match
+            floor: Minimum cosine similarity for any required reference
+
+        Returns:
+            Similarity of each failing required reference
+        """
+        required = self.similarities(query, required_ids)
+        rivals = self.similarities(query, [ref_id for ref_id in rival_ids if ref_id not in required])
+        bar = max([floor] + list(rivals.values()))
+        return {ref_id: score for ref_id, score in required.items() if score < bar}
+
+    def top_k(self,
+              queries: np.ndarray,
+              k: int = 5,
+              candidate_ids: Optional[Sequence[str]] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Batched cosine top-k search
+
+        Args:
+            queries: One embedding or a (n, dim) matrix of embeddings
+            k: Number of matches per query
+            candidate_ids: Restrict the search to these references
+
+        Returns:
+            For each query, a list of (ref_id, similarity) sorted best first
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if not self._ids:
+            return [[] for _ in range(len(queries))]
+
+        if candidate_ids is None:
+            ids = self._ids
+            matrix = self._matrix
+        else:
+            ids = [ref_id for ref_id in candidate_ids if ref_id in self._rows]
+            if not ids:
+                return [[] for _ in range(len(queries))]
+            matrix = self._matrix[np.fromiter((self._rows[i] for i in ids), dtype=np.int64)]
+
+        scores = queries @ matrix.T
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        results = []
+        for query_scores, candidates in zip(scores, top):
+            ordered = candidates[np.argsort(-query_scores[candidates])]
+            results.append([(ids[i], float(query_scores[i])) for i in ordered])
+        return results
+
+    def _load(self):
+        ids = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+            if meta.get("dim", self.dim) == self.dim:
+                ids = meta.get("ids", [])
+            else:
+                logger.warning(f"Embedding index dimension changed, discarding {self.index_dir}")
+
+        row_bytes = self.dim * 4
+        stored_rows = os.path.getsize(self.matrix_path) // row_bytes if os.path.exists(self.matrix_path) else 0
+
+        # Rows are appended before the ID list is saved; an interrupted write
+        # leaves unlisted rows, which are dropped so later appends stay aligned
+        self._ids = ids[:stored_rows]
+        self._rows = {ref_id: row for row, ref_id in enumerate(self._ids)}
+        if os.path.exists(self.matrix_path) and os.path.getsize(self.matrix_path) != len(self._ids) * row_bytes:
+            os.truncate(self.matrix_path, len(self._ids) * row_bytes)
+        self._remap()
+
+        if self._ids:
+            logger.info(f"📐 Loaded {len(self._ids)} reference embeddings")
+
+    def _remap(self):
+        if self._ids:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r",
+                                     shape=(len(self._ids), self.dim))
+        else:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+
+    def _write_row(self, row: int, embedding: np.ndarray):
+        writable = np.memmap(self.matrix_path, dtype=np.float32, mode="r+",
+                             shape=(len(self._ids), self.dim))
+        writable[row] = embedding
+        writable.flush()
+        del writable
+
+    def _save_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"dim": self.dim, "ids": self._ids}, f)
+        os.replace(tmp_path, self.meta_path)
@@ -0,0 +1,238 @@
+"""
+Scene Render Farm
+Renders independent scenes with bounded parallelism, honours continuity
+dependencies between scenes and keeps a durable per-scene manifest so an
+interrupted long-form render resumes where it stopped
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.exceptions import QuotaExceededError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class SceneStatus(Enum):
+    """Render state of a scene in the manifest"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class SceneRenderFarmConfig:
+    """Configuration for the scene render farm"""
+    max_workers: int = 3
+    max_attempts: int = 2
+    # Consecutive failures that pause the farm (quota exhaustion or an outage)
+    max_consecutive_failures: int = 3
+    manifest_filename: str = "scene_manifest.json"
+
+
+@dataclass
+class SceneJob:
+    """
+    A scene to render
+
+    ``render`` receives the outputs of the scenes listed in ``depends_on``
+    (keyed by scene id) and returns the rendered clip path, or raises.
+    """
+    scene_id: int
+    fingerprint: str
+    render: Callable[[Dict[int, str]], str]
+    depends_on: List[int] = field(default_factory=list)
+
+
+@dataclass
+class SceneRenderResult:
+    """Outcome of a render farm run"""
+    clips: Dict[int, str]
+    failed: Dict[int, str]
+    skipped: List[int]
+    paused: bool = False
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed and not self.paused
+
+
+def scene_fingerprint(*parts: Any) -> str:
+    """Stable fingerprint of everything that affects a scene's render"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_quota_error(error: Exception) -> bool:
+    if isinstance(error, (QuotaExceededError, RateLimitError)):
+        return True
+    message = str(error).lower()
+    return "429" in message or "quota" in message or "resource_exhausted" in message
+
+
+class SceneRenderFarm:
+    """
+    Renders scenes concurrently and records progress in a JSON manifest
+
+    Completed scenes whose fingerprint and output file are still valid, and
+    whose dependencies are reused too, are skipped on later runs. Scenes
+    left ``running`` by a crash are treated as pending. On quota
+    exhaustion, or after too many consecutive failures, the farm stops
+    scheduling new scenes, lets in-flight scenes finish and reports
+    ``paused`` so the job can be resumed later.
+    """
+
+    def __init__(self, work_dir: str, config: Optional[SceneRenderFarmConfig] = None):
+        self.config = config or SceneRenderFarmConfig()
+        self.manifest_path = os.path.join(work_dir, self.config.manifest_filename)
+        self._lock = threading.Lock()
+        os.makedirs(work_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def render(self, jobs: List[SceneJob]) -> SceneRenderResult:
+        """
+        Render all jobs, respecting dependencies and the worker limit
+
+        Args:
+            jobs: Scenes to render
+
+        Returns:
+            SceneRenderResult with clip paths of every completed scene
+        """
+        jobs_by_id = {job.scene_id: job for job in jobs}
+        clips: Dict[int, str] = {}
+        failed: Dict[int, str] = {}
+        skipped: List[int] = []
+
+        reusable = set()
+        for job in jobs:
+            entry = self.manifest.get(str(job.scene_id))
+            if (entry and entry.get("status") == SceneStatus.COMPLETED.value
+                    and entry.get("fingerprint") == job.fingerprint
+                    and entry.get("output") and os.path.exists(entry["output"])):
+                reusable.add(job.scene_id)
+
+        # A scene rendered from a dependency's output is stale once that dependency re-renders
+        changed = True
+        while changed:
+            changed = False
+            for scene_id in list(reusable):
+                if any(d in jobs_by_id and d not in reusable for d in jobs_by_id[scene_id].depends_on):
+                    reusable.discard(scene_id)
+                    changed = True
+
+        for job in jobs:
+            if job.scene_id in reusable:
+                clips[job.scene_id] = self.manifest[str(job.scene_id)]["output"]
+                skipped.append(job.scene_id)
+            else:
+                self._update(job.scene_id, status=SceneStatus.PENDING.value, fingerprint=job.fingerprint,
+                             attempts=0, error=None)
+
+        if skipped:
+            logger.info(f"♻️ Reusing {len(skipped)} completed scenes from manifest")
+
+        remaining = [job.scene_id for job in jobs if job.scene_id not in clips]
+        attempts: Dict[int, int] = {}
+        consecutive_failures = 0
+        paused = False
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers,
+                                thread_name_prefix="scene-render") as executor:
+            while remaining or in_flight:
+                if not paused:
+                    for scene_id in list(remaining):
+                        if len(in_flight) >= self.config.max_workers:
+                            break
+                        job = jobs_by_id[scene_id]
+                        deps = [d for d in job.depends_on if d in jobs_by_id]
+                        if any(d in failed for d in deps):
+                            remaining.remove(scene_id)
+                            failed[scene_id] = "dependency failed"
+                            self._update(scene_id, status=SceneStatus.FAILED.value, error="dependency failed")
+                            continue
+                        if not all(d in clips for d in deps):
+                            continue
+
+                        remaining.remove(scene_id)
+                        attempts[scene_id] = attempts.get(scene_id, 0) + 1
+                        self._update(scene_id, status=SceneStatus.RUNNING.value, attempts=attempts[scene_id])
+                        dep_clips = {d: clips[d] for d in deps}
+                        in_flight[executor.submit(job.render, dep_clips)] = scene_id
+
+                if not in_flight:
+                    # Nothing runnable: paused, or dependencies can never be satisfied
+                    break
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    scene_id = in_flight.pop(future)
+                    try:
+                        output = future.result()
+                        if not output or not os.path.exists(output):
+                            raise RuntimeError(f"scene {scene_id} produced no output")
+                    except Exception as e:
+                        consecutive_failures += 1
+                        if _is_quota_error(e):
+                            paused = True
+                            logger.warning(f"⏸️ Quota exhausted at scene {scene_id}, pausing render farm")
+                        elif consecutive_failures >= self.config.max_consecutive_failures:
+                            paused = True
+                            logger.warning(f"⏸️ {consecutive_failures} consecutive scene failures, pausing render farm")
+
+                        if not paused and attempts[scene_id] < self.config.max_attempts:
+                            logger.warning(f"🔁 Retrying scene {scene_id}: {e}")
+                            remaining.insert(0, scene_id)
+                            self._update(scene_id, status=SceneStatus.PENDING.value, error=str(e))
+                        elif paused:
+                            # Left pending so a resumed run picks it up
+                            self._update(scene_id, status=SceneStatus.PENDING.value, error=str(e))
+                        else:
+                            failed[scene_id] = str(e)
+                            self._update(scene_id, status=SceneStatus.FAILED.value, error=str(e))
+                            logger.error(f"❌ Scene {scene_id} failed: {e}")
+                        continue
+
+                    consecutive_failures = 0
+                    clips[scene_id] = output
+                    self._update(scene_id, status=SceneStatus.COMPLETED.value, output=output, error=None)
+                    logger.info(f"🎬 Scene {scene_id} rendered ({len(clips)}/{len(jobs)})")
+
+        for scene_id in remaining:
+            if not paused and scene_id not in failed:
+                failed[scene_id] = "unresolvable dependency"
+                self._update(scene_id, status=SceneStatus.FAILED.value, error=failed[scene_id])
+
+        return SceneRenderResult(clips=clips, failed=failed, skipped=skipped, paused=paused)
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f).get("scenes", {})
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable scene manifest: {e}")
+            return {}
+
+    def _update(self, scene_id: int, **fields):
+        with self._lock:
+            entry = self.manifest.setdefault(str(scene_id), {})
+            entry.update(fields)
+            entry["updated_at"] = time.time()
+
+            # Write-then-rename so a crash never leaves a half-written manifest
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"scenes": self.manifest}, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
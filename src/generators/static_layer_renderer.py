@@ -0,0 +1,409 @@
+"""
+Static Layer Renderer
+Fast cheap-mode renderer: static layers (backgrounds, banners, badges) are
+flattened into one image once and timed text is pre-rasterized into sprites.
+Without moving layers, only the distinct frames (one per subtitle change)
+are composited and encoded as a variable-frame-rate stream; with moving
+layers, one FFmpeg pass loops the still and overlays each sprite only
+while it is visible
+"""
+
+import os
+import functools
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from ..utils.logging_config import get_logger
+from ..utils.tracing import run_subprocess, trace_span
+
+logger = get_logger(__name__)
+
+Color = Union[str, Tuple[int, int, int]]
+# moviepy-style position: pixel offsets or 'center' for either axis
+Position = Tuple[Union[int, str], Union[int, str]]
+
+FONT_DIRS = [
+    "/System/Library/Fonts",
+    "/System/Library/Fonts/Supplemental",
+    "/Library/Fonts",
+    os.path.expanduser("~/Library/Fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    "C:\\Windows\\Fonts",
+]
+FALLBACK_FONTS = ["dejavusansbold", "liberationsansbold", "dejavusans", "liberationsans"]
+
+
+def _normalize_font_name(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+@functools.lru_cache(maxsize=1)
+def _font_index() -> dict:
+    """Normalized font file stem -> path, built once per process"""
+    index = {}
+    for font_dir in FONT_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for directory, _, filenames in os.walk(font_dir):
+            for filename in filenames:
+                stem, extension = os.path.splitext(filename)
+                if extension.lower() in (".ttf", ".otf", ".ttc"):
+                    index.setdefault(_normalize_font_name(stem), os.path.join(directory, filename))
+    return index
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(font: str, size: int) -> ImageFont.ImageFont:
+    """
+    Resolve an ImageMagick-style font name (e.g. 'Arial-Bold') or a font path
+
+    Args:
+        font: Font name or path to a font file
+        size: Font size in pixels
+
+    Returns:
+        A Pillow font, falling back to a bundled sans font
+    """
+    if os.path.isfile(font):
+        return ImageFont.truetype(font, size)
+
+    index = _font_index()
+    name = _normalize_font_name(font)
+    candidates = [name, name.replace("bold", "bd"), name.replace("bold", "") + "bold"]
+    for candidate in candidates + FALLBACK_FONTS:
+        if candidate in index:
+            try:
+                return ImageFont.truetype(index[candidate], size)
+            except OSError:
+                continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+@dataclass
+class TimedSprite:
+    """A pre-rendered overlay shown between ``start`` and ``end``"""
+    path: str
+    x: Union[int, str]  # Pixels or an FFmpeg overlay expression (e.g. scrolling)
+    y: Union[int, str]
+    start: float
+    end: float
+
+
+class StaticLayerRenderer:
+    """
+    Builds a cheap-mode video from one flattened background plus timed sprites
+
+    Static drawing calls (``add_rect``, ``add_text``) paint onto a single
+    canvas; ``add_timed_text`` and ``add_scrolling_text`` render sprites.
+    ``render`` encodes everything, muxing the audio, in one FFmpeg call.
+    """
+
+    def __init__(self, width: int, height: int, work_dir: str, fps: int = 30,
+                 background: Color = (0, 0, 0)):
+        """
+        Args:
+            width: Frame width
+            height: Frame height
+            work_dir: Directory for the flattened background and sprite images
+            fps: Output frame rate
+            background: Background color
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.work_dir = work_dir
+        self.canvas = Image.new("RGBA", (width, height), self._rgba(background))
+        self.sprites: List[TimedSprite] = []
+        self._sprite_images: List[Image.Image] = []
+        os.makedirs(work_dir, exist_ok=True)
+
+    # Static layers
+
+    def add_rect(self, box: Tuple[int, int, int, int], color: Color, opacity: float = 1.0):
+        """Paint a filled rectangle (left, top, width, height) onto the static layer"""
+        left, top, width, height = box
+        layer = Image.new("RGBA", (width, height), self._rgba(color, opacity))
+        self.canvas.alpha_composite(layer, (max(left, 0), max(top, 0)))
+
+    def add_text(self, text: str, position: Position, font: str, font_size: int,
+                 color: Color = "white", opacity: float = 1.0, **style):
+        """Paint text onto the static layer (see ``render_text`` for style options)"""
+        image = self.render_text(text, font, font_size, color, opacity=opacity, **style)
+        self.canvas.paste(image, self._resolve_position(position, image.size), image)
+
+    # Timed layers
+
+    def add_timed_text(self, text: str, start: float, end: float, position: Position,
+                       font: str, font_size: int, color: Color = "white", **style) -> Optional[TimedSprite]:
+        """Rasterize text once and show it between ``start`` and ``end``"""
+        if end <= start or not text.strip():
+            return None
+        image = self.render_text(text, font, font_size, color, **style)
+        x, y = self._resolve_position(position, image.size)
+        return self._add_sprite(image, x, y, start, end)
+
+    def add_scrolling_text(self, text: str, y: int, speed: float, font: str, font_size: int,
+                           color: Color = "white", start: float = 0.0,
+                           end: Optional[float] = None, **style) -> TimedSprite:
+        """Text entering from the right edge and moving left at ``speed`` pixels per second"""
+        image = self.render_text(text, font, font_size, color, **style)
+        x = f"main_w-(t-{start:.3f})*{speed:g}"
+        return self._add_sprite(image, x, y, start, end if end is not None else float("inf"))
+
+    def _add_sprite(self, image: Image.Image, x: Union[int, str], y: Union[int, str],
+                    start: float, end: float) -> TimedSprite:
+        path = os.path.join(self.work_dir, f"sprite_{len(self.sprites):03d}.png")
+        image.save(path, compress_level=1)
+        sprite = TimedSprite(path, x, y, start, end)
+        self.sprites.append(sprite)
+        self._sprite_images.append(image)
+        return sprite
+
+    @property
+    def has_motion(self) -> bool:
+        """True if any sprite position is a time expression"""
+        return any(not isinstance(s.x, int) or not isinstance(s.y, int) for s in self.sprites)
+
+    # Rasterizing
+
+    def render_text(self, text: str, font: str, font_size: int, color: Color = "white",
+                    stroke_color: Optional[Color] = None, stroke_width: int = 0,
+                    bg_color: Optional[Color] = None, max_width: Optional[int] = None,
+                    opacity: float = 1.0, padding: int = 0, line_spacing: float = 1.15) -> Image.Image:
+        """
+        Rasterize text into a tightly cropped RGBA image
+
+        Args:
+            text: Text to draw (already shaped for RTL scripts)
+            font: Font name or path
+            font_size: Font size in pixels
+            color: Fill color
+            stroke_color: Outline color
+            stroke_width: Outline width in pixels
+            bg_color: Box color behind the text
+            max_width: Wrap words to this width and center the lines
+            opacity: Opacity of the whole image
+            padding: Pixels around the text (added to the stroke)
+            line_spacing: Line height as a multiple of the font size
+
+        Returns:
+            The rendered image
+        """
+        pil_font = load_font(font, font_size)
+        stroke_width = stroke_width if stroke_color is not None else 0
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        lines = self._wrap(text, pil_font, max_width, measure, stroke_width) if max_width else text.split("\n")
+
+        line_height = int(font_size * line_spacing)
+        widths = [measure.textbbox((0, 0), line, font=pil_font, stroke_width=stroke_width)[2] for line in lines]
+        margin = padding + stroke_width
+        block_width = max(widths or [0])
+        size = (max(block_width + 2 * margin, 1), max(line_height * len(lines) + 2 * margin, 1))
+
+        image = Image.new("RGBA", size, self._rgba(bg_color) if bg_color else (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        fill = self._rgba(color)
+        outline = self._rgba(stroke_color) if stroke_color is not None else None
+        for i, (line, line_width) in enumerate(zip(lines, widths)):
+            x = margin + (block_width - line_width) // 2
+            draw.text((x, margin + i * line_height), line, font=pil_font, fill=fill,
+                      stroke_width=stroke_width, stroke_fill=outline)
+
+        if opacity < 1.0:
+            alpha = image.getchannel("A").point(lambda a: int(a * opacity))
+            image.putalpha(alpha)
+        return image
+
+    @staticmethod
+    def _wrap(text: str, font, max_width: int, draw: ImageDraw.ImageDraw, stroke_width: int) -> List[str]:
+        lines, current = [], []
+        for word in text.split():
+            candidate = " ".join(current + [word])
+            if not current or draw.textbbox((0, 0), candidate, font=font, stroke_width=stroke_width)[2] <= max_width:
+                current.append(word)
+            else:
+                lines.append(" ".join(current))
+                current = [word]
+        if current:
+            lines.append(" ".join(current))
+        return lines or [text]
+
+    def _resolve_position(self, position: Position, size: Tuple[int, int]) -> Tuple[int, int]:
+        x, y = position
+        x = (self.width - size[0]) // 2 if x == "center" else int(x)
+        y = (self.height - size[1]) // 2 if y == "center" else int(y)
+        return x, y
+
+    @staticmethod
+    def _rgba(color: Color, opacity: float = 1.0) -> Tuple[int, int, int, int]:
+        rgb = ImageColor.getrgb(color) if isinstance(color, str) else tuple(color)
+        return rgb[0], rgb[1], rgb[2], int(round((rgb[3] if len(rgb) > 3 else 255) * opacity))
+
+    # Encoding
+
+    def flatten(self) -> str:
+        """Write the static layer and return its path"""
+        path = os.path.join(self.work_dir, "static_layer.png")
+        self.canvas.convert("RGB").save(path, compress_level=1)
+        return path
+
+    def still_frames(self, duration: float) -> List[Tuple[str, float]]:
+        """
+        Composite one frame per distinct set of visible sprites
+
+        Args:
+            duration: Video duration in seconds
+
+        Returns:
+            (frame image path, seconds shown) in display order
+        """
+        bounds = {0.0, duration}
+        for sprite in self.sprites:
+            bounds.update(min(max(t, 0.0), duration) for t in (sprite.start, sprite.end) if t != float("inf"))
+        bounds = sorted(bounds)
+
+        frames: List[Tuple[str, float]] = []
+        previous = None
+        for start, end in zip(bounds, bounds[1:]):
+            if end - start < 1e-6:
+                continue
+            middle = (start + end) / 2
+            visible = tuple(i for i, s in enumerate(self.sprites) if s.start <= middle < s.end)
+            if visible == previous:
+                frames[-1] = (frames[-1][0], frames[-1][1] + end - start)
+                continue
+            frame = self.canvas.copy()
+            for i in visible:
+                image = self._sprite_images[i]
+                frame.paste(image, (self.sprites[i].x, self.sprites[i].y), image)
+            # Uncompressed: written once and read once, so compression only costs time
+            path = os.path.join(self.work_dir, f"frame_{len(frames):03d}.bmp")
+            frame.convert("RGB").save(path)
+            frames.append((path, end - start))
+            previous = visible
+        return frames
+
+    def build_still_command(self, output_path: str, duration: float, audio_path: Optional[str] = None,
+                            codec: str = "libx264", preset: str = "veryfast", crf: int = 23,
+                            audio_codec: str = "aac") -> List[str]:
+        """
+        FFmpeg command encoding only the distinct frames, each held for its duration
+
+        Only valid without moving sprites. The output has a variable frame
+        rate; arguments match ``build_command``.
+        """
+        frames = self.still_frames(duration)
+        concat_path = os.path.join(self.work_dir, "frames.txt")
+        with open(concat_path, "w") as f:
+            for path, seconds in frames:
+                f.write(f"file '{self._concat_escape(path)}'\nduration {seconds:.3f}\n")
+            # The concat demuxer ignores the last duration unless the file is repeated
+            f.write(f"file '{self._concat_escape(frames[-1][0])}'\n")
+
+        cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_path]
+        if audio_path:
+            cmd += ["-i", audio_path]
+        cmd += ["-map", "0:v"]
+        if audio_path:
+            cmd += ["-map", "1:a", "-c:a", audio_codec, "-b:a", "128k"]
+        cmd += ["-vf", "format=yuv420p", "-c:v", codec, "-preset", preset]
+        if codec == "libx264":
+            cmd += ["-tune", "stillimage"]
+        cmd += ["-crf", str(crf), "-fps_mode", "vfr", "-t", f"{duration:.3f}",
+                "-movflags", "+faststart", output_path]
+        return cmd
+
+    @staticmethod
+    def _concat_escape(path: str) -> str:
+        return os.path.abspath(path).replace("'", "'\\''")
+
+    def build_command(self, output_path: str, duration: float, audio_path: Optional[str] = None,
+                      codec: str = "libx264", preset: str = "veryfast", crf: int = 23,
+                      audio_codec: str = "aac") -> List[str]:
+        """
+        FFmpeg command repeating the flattened still and overlaying each sprite while visible
+
+        Args:
+            output_path: Output video
+            duration: Output duration in seconds
+            audio_path: Audio muxed into the output (optional)
+            codec: Video codec
+            preset: Encoder preset
+            crf: Constant rate factor
+            audio_codec: Audio codec
+
+        Returns:
+            The command as an argument list
+        """
+        cmd = ["ffmpeg", "-y", "-i", self.flatten()]
+        for sprite in self.sprites:
+            cmd += ["-i", sprite.path]
+        if audio_path:
+            cmd += ["-i", audio_path]
+
+        # Decode and convert the still once, then repeat it in the filter graph
+        filters = [f"[0:v]format=yuv420p,loop=loop=-1:size=1,setpts=N/{self.fps}/TB[bg]"]
+        current = "bg"
+        for index, sprite in enumerate(self.sprites, start=1):
+            enable = (f"gte(t,{sprite.start:.3f})" if sprite.end == float("inf")
+                      else f"between(t,{sprite.start:.3f},{sprite.end:.3f})")
+            label = f"v{index}"
+            filters.append(f"[{current}][{index}:v]overlay=x='{sprite.x}':y='{sprite.y}':"
+                           f"enable='{enable}'[{label}]")
+            current = label
+        filters.append(f"[{current}]format=yuv420p[vout]")
+
+        cmd += ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+        if audio_path:
+            cmd += ["-map", f"{len(self.sprites) + 1}:a", "-c:a", audio_codec, "-b:a", "128k"]
+        cmd += [
+            "-c:v", codec,
+            "-preset", preset,
+        ]
+        if codec == "libx264":
+            cmd += ["-tune", "stillimage"]
+        cmd += ["-crf", str(crf), "-r", str(self.fps), "-t", f"{duration:.3f}",
+                "-movflags", "+faststart", output_path]
+        return cmd
+
+    def render(self, output_path: str, duration: float, audio_path: Optional[str] = None,
+               frame_mode: str = "auto", **encoding) -> str:
+        """
+        Encode the video in one FFmpeg pass
+
+        Args:
+            output_path: Output video
+            duration: Output duration in seconds
+            audio_path: Audio muxed into the output (optional)
+            frame_mode: "still" (distinct frames only, variable frame rate),
+                "constant" (every frame at ``fps``) or "auto" (still unless
+                a sprite moves)
+            **encoding: Passed to the command builder
+
+        Returns:
+            ``output_path``
+        """
+        still = frame_mode == "still" or (frame_mode == "auto" and not self.has_motion)
+        with trace_span("static_layer.render", sprites=len(self.sprites), duration=round(duration, 2),
+                        still=still):
+            if still:
+                cmd = self.build_still_command(output_path, duration, audio_path, **encoding)
+            else:
+                cmd = self.build_command(output_path, duration, audio_path, **encoding)
+            logger.info(f"⚡ Rendering {duration:.1f}s static-layer video with {len(self.sprites)} timed sprites "
+                        f"({'distinct frames only' if still else f'{self.fps}fps overlays'})")
+            try:
+                run_subprocess(cmd, span_name="ffmpeg", capture_output=True, text=True, check=True,
+                               timeout=max(120, int(duration * 10)))
+            except subprocess.CalledProcessError as e:
+                logger.error(f"❌ Static-layer render failed: {(e.stderr or '')[-500:]}")
+                raise
+        return output_path
@@ -0,0 +1,159 @@
+"""
+TTS Synthesis Engine
+Bounded concurrent synthesis per TTS provider with a content-addressed
+audio cache, so segments synthesize in parallel and identical text/voice
+requests (retries, multi-version runs) are never re-spoken
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logging_config import get_logger
+from ..utils.tracing import propagate, trace_span
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TTSEngineConfig:
+    """Configuration for the TTS synthesis engine"""
+    cache_dir: str = os.path.join("cache", "tts_audio")
+    # Concurrent requests allowed per provider
+    provider_limits: Dict[str, int] = field(default_factory=lambda: {
+        "google_cloud": 4,
+        "gtts": 2
+    })
+    default_limit: int = 2
+    max_workers: int = 6
+    cache_enabled: bool = True
+
+
+class TTSAudioCache:
+    """
+    Content-addressed store of synthesized audio
+
+    Keys hash everything that changes the audio (provider, text, voice,
+    language, rate, pitch). Lookups return a private copy because callers
+    move or delete the files they get back.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key_for(provider: str, **params: Any) -> str:
+        payload = json.dumps({"provider": provider, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def get(self, key: str, suffix: str = ".mp3") -> Optional[str]:
+        cached = self._path(key, suffix)
+        if not os.path.exists(cached):
+            return None
+        copy_path = os.path.join(tempfile.gettempdir(), f"tts_cached_{uuid.uuid4()}{suffix}")
+        try:
+            shutil.copyfile(cached, copy_path)
+        except OSError as e:
+            logger.warning(f"⚠️ TTS cache read failed: {e}")
+            return None
+        return copy_path
+
+    def put(self, key: str, audio_path: str, suffix: str = ".mp3"):
+        cached = self._path(key, suffix)
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            tmp_path = f"{cached}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(audio_path, tmp_path)
+            os.replace(tmp_path, cached)
+        except OSError as e:
+            logger.warning(f"⚠️ TTS cache write failed: {e}")
+
+
+class TTSSynthesisEngine:
+    """
+    Runs synthesis calls through per-provider concurrency limits and the audio cache
+
+    ``synthesize`` is safe to call from many threads; ``map`` fans a list of
+    jobs out over the engine's worker pool and returns results in order.
+    """
+
+    def __init__(self, config: Optional[TTSEngineConfig] = None):
+        self.config = config or TTSEngineConfig()
+        self.cache = TTSAudioCache(self.config.cache_dir) if self.config.cache_enabled else None
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._limits_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix="tts")
+        self.stats = {"hits": 0, "misses": 0}
+
+    def synthesize(self, provider: str, params: Dict[str, Any],
+                   synth: Callable[[], Optional[str]], suffix: str = ".mp3") -> Optional[str]:
+        """
+        Return cached audio for ``params`` or call ``synth`` under the provider limit
+
+        Args:
+            provider: Provider name used for the concurrency limit and cache key
+            params: Everything that affects the audio (text, voice, language, rate...)
+            synth: Performs the synthesis and returns an audio path, or None
+            suffix: Audio file extension
+
+        Returns:
+            Path to an audio file owned by the caller, or None
+        """
+        with trace_span("tts.synthesize", provider=provider) as span:
+            key = TTSAudioCache.key_for(provider, **params) if self.cache else None
+            if key:
+                cached = self.cache.get(key, suffix)
+                if cached:
+                    self.stats["hits"] += 1
+                    span.set(cache_hit=True)
+                    logger.info(f"♻️ TTS cache hit ({provider})")
+                    return cached
+
+            self.stats["misses"] += 1
+            with self._limit(provider):
+                audio_path = synth()
+
+            if key and audio_path and os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
+                self.cache.put(key, audio_path, suffix)
+            return audio_path
+
+    def map(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Run ``fn`` over ``items`` concurrently, preserving order"""
+        # Nested calls from an engine worker run inline so the pool can't deadlock
+        if len(items) <= 1 or threading.current_thread().name.startswith("tts"):
+            return [fn(item) for item in items]
+        return list(self.executor.map(propagate(fn), items))
+
+    def _limit(self, provider: str) -> threading.BoundedSemaphore:
+        with self._limits_lock:
+            if provider not in self._limits:
+                limit = self.config.provider_limits.get(provider, self.config.default_limit)
+                self._limits[provider] = threading.BoundedSemaphore(limit)
+            return self._limits[provider]
+
+    def __del__(self):
+        if hasattr(self, 'executor'):
+            self.executor.shutdown(wait=False)
+
+
+_default_engine: Optional[TTSSynthesisEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_tts_engine() -> TTSSynthesisEngine:
+    """Get the process-wide TTS engine, so provider limits apply across clients"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = TTSSynthesisEngine()
+        return _default_engine
@@ -28,10 +28,12 @@ except ImportError:
 
 try:
     from src.utils.logging_config import get_logger
+    from src.utils.tracing import traced
     from src.generators.json_prompt_system import VEOJsonPrompt, JSONPromptValidator, GeneratorType
     from src.utils.veo3_safety_validator import VEO3SafetyValidator, validate_and_fix_prompt
 except ImportError:
     from utils.logging_config import get_logger
+    from utils.tracing import traced
     from generators.json_prompt_system import VEOJsonPrompt, JSONPromptValidator, GeneratorType
     from utils.veo3_safety_validator import VEO3SafetyValidator, validate_and_fix_prompt
 
@@ -546,6 +548,7 @@ class VertexAIVeo3Client(BaseVeoClient):
             self._save_response_log(clip_id, -1, {"exception": str(e), "traceback": traceback.format_exc()})
             return None
 
+    @traced("veo.poll")
     def _poll_operation_status(self, operation_name: str, clip_id: str = "unknown") -> str:
         """Poll the operation status until completion or failure using fetchPredictOperation"""
         import time
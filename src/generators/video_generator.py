@@ -22,7 +22,9 @@ warnings.filterwarnings("ignore", category=UserWarning, module="imageio_ffmpeg")
 from ..models.video_models import GeneratedVideoConfig, Platform, VideoCategory
 from ..utils.logging_config import get_logger
 from ..utils.timeline_visualizer import TimelineVisualizer
+from ..utils.tracing import get_tracer, session_trace, traced
 from ..utils.ffmpeg_processor import FFmpegProcessor
+from ..utils.continuity_frame_extractor import ContinuityFrameExtractor
 from ..generators.veo_client_factory import VeoClientFactory, VeoModel
 from ..generators.gemini_image_client import GeminiImageClient
 from ..generators.enhanced_multilang_tts import EnhancedMultilingualTTS
@@ -548,6 +550,7 @@ The last frame of this scene connects to the next.
         # ENHANCED: Frame continuity preference
         self.prefer_frame_continuity = True  # Always prefer frame continuity
         self.frame_continuity_retries = 4   # Number of different approaches to try
+        self._continuity_frames = ContinuityFrameExtractor()  # Cached single-frame decodes per clip
         
         # Initialize voice config to prevent AttributeError
         self._last_voice_config = {
@@ -718,6 +721,12 @@ The last frame of this scene connects to the next.
         Returns:
             Video file path or VideoGenerationResult object
         """
+        # Joins the caller's trace if there is one, otherwise traces this session
+        with session_trace("video_generator.generate_video"):
+            return await self._generate_video(config)
+    
+    async def _generate_video(self, config: GeneratedVideoConfig) -> Union[str, VideoGenerationResult]:
+        """Run the generation pipeline (see generate_video)"""
         start_time = time.time()
         
         # CRITICAL: Store mission context and platform for VEO prompt generation
@@ -746,6 +755,9 @@ The last frame of this scene connects to the next.
         
         # Create session context for this generation
         session_context = create_session_context(session_id)
+        tracer = get_tracer()
+        if tracer:
+            tracer.bind(session_context.get_output_path("analysis"))
         
         # Initialize duration feedback system for this session
         self.duration_feedback_system = DurationFeedbackSystem(session_context)
@@ -1319,6 +1331,7 @@ The last frame of this scene connects to the next.
         logger.info(f"✅ Generated config for: {mission}")
         return config
     
+    @traced("stage.script")
     async def _process_script_with_ai(self, config: GeneratedVideoConfig, session_context: SessionContext) -> Dict[str, Any]:
         """Process script using AI script processor"""
         logger.info("📝 Processing script with AI")
@@ -1505,6 +1518,7 @@ The last frame of this scene connects to the next.
 
         return result
     
+    @traced("stage.visual_style")
     def _get_visual_style_decision(self, config: GeneratedVideoConfig) -> Dict[str, Any]:
         """Get AI decision for visual style"""
         
@@ -1575,6 +1589,7 @@ The last frame of this scene connects to the next.
         logger.info(f"✅ Positioning decision: {positioning_decision.get('primary_subtitle_position', 'bottom_third')}")
         return positioning_decision
     
+    @traced("stage.video_clips")
     def _generate_video_clips(self, config: GeneratedVideoConfig, 
                             script_result: Dict[str, Any],
                             style_decision: Dict[str, Any],
@@ -2220,100 +2235,28 @@ The last frame of this scene connects to the next.
     def _extract_last_frame(self, video_path: str, clip_id: str, session_context: Optional[SessionContext] = None) -> Optional[str]:
         """Extract the last frame from a video for frame continuity"""
         try:
-            import subprocess
-            import glob
-            
             # Create frame path in session directory
             if session_context:
                 frame_path = session_context.get_output_path("images", f"last_frame_{clip_id}.jpg")
-                temp_dir = session_context.get_output_path("temp_files", f"frames_{clip_id}")
-                # Ensure both directories exist
-                os.makedirs(os.path.dirname(frame_path), exist_ok=True)
-                os.makedirs(temp_dir, exist_ok=True)
             else:
                 from ..utils.session_manager import session_manager
-                session_dir = session_manager.get_session_path("images")
-                os.makedirs(session_dir, exist_ok=True)
-                frame_path = os.path.join(session_dir, f"last_frame_{clip_id}.jpg")
-                temp_dir = os.path.join(session_manager.get_session_path("temp_files"), f"frames_{clip_id}")
-                os.makedirs(temp_dir, exist_ok=True)
-            
-            # Get video duration
-            duration = self._get_video_duration(video_path)
-            if not duration:
-                logger.warning("Could not determine video duration")
-                duration = 8.0  # Default assumption
-            
-            # Extract all frames from the last second
-            start_time = max(0, duration - 1.0)  # Last 1 second
-            
-            # Extract frames to temporary directory
-            temp_pattern = os.path.join(temp_dir, "frame_%04d.jpg")
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', video_path,
-                '-ss', str(start_time),  # Start from last second
-                '-q:v', '1',
-                '-pix_fmt', 'yuvj420p',  # Use full-range YUV for JPEG
-                '-an',
-                temp_pattern
-            ]
+                frame_path = os.path.join(session_manager.get_session_path("images"), f"last_frame_{clip_id}.jpg")
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Seek on the input side straight to the continuity frame and decode only that frame
+            frames_to_trim = video_config.animation.frame_continuity_trim_frames
+            extracted = self._continuity_frames.extract_to_path(video_path, frame_path, frames_to_trim)
             
-            if result.returncode == 0:
-                # Find all extracted frames
-                frame_files = sorted(glob.glob(os.path.join(temp_dir, "frame_*.jpg")))
-                
-                if frame_files:
-                    # Get FPS to determine which frame to use
-                    from ..config.video_config import video_config
-                    platform = getattr(self, '_current_platform', 'instagram')
-                    fps = video_config.get_fps(platform)
-                    frames_to_trim = video_config.animation.frame_continuity_trim_frames
-                    
-                    # Calculate which frame to use (default to last if calculation fails)
-                    frame_index = max(0, len(frame_files) - int(frames_to_trim) - 1)
-                    selected_frame = frame_files[frame_index] if frame_index < len(frame_files) else frame_files[-1]
-                    
-                    # Copy the selected frame to final location
-                    import shutil
-                    shutil.copy2(selected_frame, frame_path)
-                    
-                    logger.info(f"🖼️ Extracted frame {frame_index + 1}/{len(frame_files)} for continuity: {frame_path}")
-                    logger.debug(f"📍 Selected frame from last second (frames_to_trim: {frames_to_trim})")
-                    
-                    # Clean up temporary frames
-                    for f in frame_files:
-                        try:
-                            os.remove(f)
-                        except:
-                            pass
-                    try:
-                        os.rmdir(temp_dir)
-                    except:
-                        pass
-                    
-                    return frame_path
-                else:
-                    logger.warning("No frames extracted from video")
+            if extracted:
+                logger.info(f"🖼️ Extracted continuity frame (trim {frames_to_trim}): {frame_path}")
             else:
-                logger.warning(f"Failed to extract frames: {result.stderr}")
-            
-            # Cleanup on failure
-            try:
-                if os.path.exists(temp_dir):
-                    import shutil
-                    shutil.rmtree(temp_dir)
-            except:
-                pass
-            
-            return None
+                logger.warning("No continuity frame extracted from video")
+            return extracted
                 
         except Exception as e:
             logger.error(f"Error extracting last frame: {e}")
             return None
     
+    @traced("stage.audio")
     def _generate_ai_optimized_audio(self, config: GeneratedVideoConfig,
                                    script_result: Dict[str, Any],
                                    session_context: SessionContext) -> List[str]:
@@ -2514,64 +2457,76 @@ The last frame of this scene connects to the next.
             target_duration = config.duration_seconds
             max_duration = target_duration * 1.05  # 5% tolerance
             
-            # Generate audio for each segment
+            # Determine the language from config
+            languages = getattr(config, 'languages', [Language.ENGLISH_US])
+            target_language = languages[0] if languages else Language.ENGLISH_US
+            
+            # Plan segments against the duration budget using the measured speech
+            # rate, then synthesize them all concurrently
+            planned_segments = []
+            planned_duration = 0.0
             for i, segment in enumerate(segments_to_generate):
-                # Check if we're approaching the duration limit
-                if total_audio_duration >= max_duration:
-                    logger.warning(f"⚠️ Stopping audio generation at segment {i+1} - already at {total_audio_duration:.1f}s (max: {max_duration:.1f}s)")
+                if planned_duration >= max_duration:
+                    logger.warning(f"⚠️ Skipping audio for segment {i+1}+ - planned audio already at {planned_duration:.1f}s (max: {max_duration:.1f}s)")
                     break
-                    
+                
                 # Use full_text for TTS if available (avoid truncated text), otherwise use text
                 segment_text = segment.get('full_text', segment.get('text', ''))
                 # Audio segment duration - NOT used for video clips
                 segment_duration = segment.get('duration', 5.0)
                 
                 # Adjust segment duration if it would exceed total
-                remaining_duration = max_duration - total_audio_duration
+                remaining_duration = max_duration - planned_duration
                 if segment_duration > remaining_duration:
                     segment_duration = remaining_duration
                     logger.info(f"📏 Adjusted segment {i+1} duration to {segment_duration:.1f}s to fit within target")
                 
-                logger.info(f"🎵 Generating audio for segment {i+1}/{len(segments_to_generate)}: '{segment_text[:50]}...' (duration: {segment_duration:.1f}s)")
-                
-                # Determine the language from config
-                languages = getattr(config, 'languages', [Language.ENGLISH_US])
-                target_language = languages[0] if languages else Language.ENGLISH_US
-                
-                # Generate audio for this specific segment
-                segment_audio_files = self.tts_client.generate_intelligent_voice_audio(
-                    script=segment_text,
-                    language=target_language,
-                    mission=config.mission,
-                    platform=config.target_platform,
-                    category=config.category,
-                    duration_seconds=int(segment_duration),  # Convert to int
-                    num_clips=num_segments,  # Use actual number of segments
-                    clip_index=i,  # This should now be within range
-                    cheap_mode=getattr(config, 'cheap_mode', False) or (getattr(config, 'cheap_mode', False) and getattr(config, 'cheap_mode_level', 'full') in ['audio', 'full']),  # Use cheap audio only when cheap_mode is enabled
-                    force_single_voice=True  # Always use single voice for consistency
-                )
+                planned_segments.append({'text': segment_text, 'duration': segment_duration})
+                planned_duration += self.tts_client.speech_rate.predict_duration(
+                    segment_text, language=target_language)
+                logger.info(f"🎵 Planned audio for segment {i+1}/{len(segments_to_generate)}: '{segment_text[:50]}...' (duration: {segment_duration:.1f}s)")
+            
+            cheap_audio = getattr(config, 'cheap_mode', False) or (getattr(config, 'cheap_mode', False) and getattr(config, 'cheap_mode_level', 'full') in ['audio', 'full'])  # Use cheap audio only when cheap_mode is enabled
+            segment_audio = self.tts_client.generate_segment_audio_batch(
+                planned_segments,
+                language=target_language,
+                mission=config.mission,
+                platform=config.target_platform,
+                category=config.category,
+                num_clips=num_segments,  # Use actual number of segments
+                cheap_mode=cheap_audio,
+                force_single_voice=True  # Always use single voice for consistency
+            )
+            
+            for i, (segment, audio_path) in enumerate(zip(planned_segments, segment_audio)):
+                # Check if we're approaching the duration limit
+                if total_audio_duration >= max_duration:
+                    logger.warning(f"⚠️ Dropping audio from segment {i+1} - already at {total_audio_duration:.1f}s (max: {max_duration:.1f}s)")
+                    for unused in segment_audio[i:]:
+                        if unused and os.path.exists(unused):
+                            os.remove(unused)
+                    break
                 
-                if segment_audio_files and len(segment_audio_files) > 0:
-                    temp_audio_files.append(segment_audio_files[0])
+                if audio_path:
+                    temp_audio_files.append(audio_path)
                     
                     # CRITICAL: Track actual audio duration using FFmpeg
                     try:
                         from ..utils.ffmpeg_processor import FFmpegProcessor
                         with FFmpegProcessor() as ffmpeg:
-                            actual_segment_duration = ffmpeg.get_duration(segment_audio_files[0])
+                            actual_segment_duration = ffmpeg.get_duration(audio_path)
                         total_audio_duration += actual_segment_duration
                         logger.info(f"✅ Generated audio segment {i+1}: {actual_segment_duration:.1f}s (total: {total_audio_duration:.1f}s)")
                     except:
                         # Fallback estimate
-                        total_audio_duration += segment_duration
+                        total_audio_duration += segment['duration']
                 else:
                     logger.warning(f"⚠️ Failed to generate audio for segment {i+1}")
                     # Create a fallback for this segment
-                    fallback_audio = self._create_fallback_audio_segment(segment_text, segment_duration, config, session_context)
+                    fallback_audio = self._create_fallback_audio_segment(segment['text'], segment['duration'], config, session_context)
                     if fallback_audio:
                         temp_audio_files.append(fallback_audio)
-                        total_audio_duration += segment_duration
+                        total_audio_duration += segment['duration']
             
             # Save audio files to session directory
             audio_files = []
@@ -2725,6 +2680,7 @@ The last frame of this scene connects to the next.
             logger.error(f"❌ Fallback audio segment creation failed: {e}")
             return None
 
+    @traced("stage.compose")
     def _compose_final_video_with_subtitles(self, clips: List[str], audio_files: List[str], 
                                            script_result: Dict[str, Any], style_decision: Dict[str, Any],
                                            positioning_decision: Dict[str, Any], config: GeneratedVideoConfig,
@@ -2942,50 +2898,21 @@ The last frame of this scene connects to the next.
             # Step 3b: Add PNG overlays (flags, logos, etc.) if requested
             video_with_overlays_no_subs = self._add_png_overlays(video_with_overlays_no_subs, config, session_context)
             
-            # Step 4: Now add subtitles to the overlay video using high-quality subtitle integration
-            logger.info("📝 Adding subtitles to overlay video with high quality settings")
-            # Create subtitles first
+            # Step 4: Create subtitles; libass burns them in during the orientation encode
+            logger.info("📝 Creating styled subtitles for the final encode")
+            platform_name = str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform)
             subtitle_data = self._create_subtitles_with_timings(script_result, audio_files, session_context, timeline_visualizer)
             subtitle_files = subtitle_data.get('files', {})
             subtitle_timings = subtitle_data.get('timings', [])
-            
-            # Use subtitle integration tool for better quality
-            if subtitle_files.get('srt'):
-                from ..utils.subtitle_integration_tool import SubtitleIntegrationTool
-                subtitle_tool = SubtitleIntegrationTool()
-                video_with_subtitles_path = session_context.get_output_path("temp_files", "video_with_subtitles_hq.mp4")
-                
-                # Get language for subtitle styling
-                languages = getattr(config, 'languages', [])
-                language = languages[0] if languages else None
-                
-                # Get video dimensions for proper scaling
-                video_width, video_height = self._get_video_dimensions(str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform))
-                
-                success = subtitle_tool.integrate_subtitles_with_ffmpeg(
-                    video_path=video_with_overlays_no_subs,
-                    subtitle_path=subtitle_files['srt'],
-                    output_path=video_with_subtitles_path,
-                    language=language,
-                    video_width=video_width,
-                    video_height=video_height
-                )
-                
-                if success and os.path.exists(video_with_subtitles_path):
-                    video_with_overlays = video_with_subtitles_path
-                    logger.info("✅ Successfully added high-quality subtitles to overlay video")
-                else:
-                    logger.warning("⚠️ Subtitle integration failed, using overlay video without subtitles")
-                    video_with_overlays = video_with_overlays_no_subs
-            else:
-                logger.warning("⚠️ No SRT file available, using overlay video without subtitles")
-                video_with_overlays = video_with_overlays_no_subs
+            ass_path = self._create_ass_subtitles(subtitle_timings, config, positioning_decision, session_context)
+            if ass_path:
+                subtitle_files['ass'] = ass_path
             
             # Step 5: Create VERSION 2 - Video with overlays only (no subtitles)
             logger.info("🎬 Saving VERSION 2: Video with overlays only (no subtitles)")
             # We already created the overlay-only version in step 3
             video_overlays_only = video_with_overlays_no_subs
-            video_overlays_only = self._apply_platform_orientation(video_overlays_only, str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform), session_context)
+            video_overlays_only = self._apply_platform_orientation(video_overlays_only, platform_name, session_context)
             if config.duration_seconds >= 10:
                 current_duration = self._get_video_duration(video_overlays_only)
                 if current_duration and current_duration < target_duration - 1.0:
@@ -2995,12 +2922,16 @@ The last frame of this scene connects to the next.
             overlays_only_path = session_context.save_final_video(video_overlays_only, suffix="_overlays_only")
             logger.info(f"✅ VERSION 2 created: {overlays_only_path}")
             
-            # Step 6: Apply platform orientation to main video
-            oriented_video_path = self._apply_platform_orientation(
-                video_with_overlays, 
-                str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform), 
-                session_context
-            )
+            # Step 6: Apply platform orientation to main video, burning in the subtitles in the same pass
+            oriented_video_path = video_with_overlays_no_subs
+            if ass_path:
+                oriented_video_path = self._apply_platform_orientation(
+                    video_with_overlays_no_subs, platform_name, session_context, subtitle_path=ass_path
+                )
+            if oriented_video_path == video_with_overlays_no_subs:
+                # No ASS document or libass pass failed: separate SRT burn-in, then orientation
+                video_with_overlays = self._burn_srt_subtitles(video_with_overlays_no_subs, subtitle_files, config, session_context)
+                oriented_video_path = self._apply_platform_orientation(video_with_overlays, platform_name, session_context)
             
             # Step 7: Check audio duration and handle overflow
             # Calculate total audio duration
@@ -3093,6 +3024,9 @@ The last frame of this scene connects to the next.
             saved_path = session_context.save_final_video(final_video_path, suffix="_final")
             logger.info(f"✅ VERSION 3 created: {saved_path}")
             
+            # Optional: per-platform renditions for publishers, all from one decode
+            self._render_rendition_ladder(saved_path, config, session_context)
+            
             # LangGraph final quality check
             if self.use_langgraph and self.quality_monitor:
                 try:
@@ -3402,6 +3336,9 @@ The last frame of this scene connects to the next.
             if len(clips) > 1:
                 logger.info("🎯 Multiple clips detected - Frame continuity is STRONGLY PREFERRED")
                 
+                # Probe clip durations once; every attempt reuses them for its xfade offsets
+                clip_durations = [self._get_video_duration(clip) or 8.0 for clip in clips]
+                
                 # Try frame continuity with different approaches
                 frame_continuity_attempts = [
                     ("standard", {}),
@@ -3415,7 +3352,7 @@ The last frame of this scene connects to the next.
                         logger.info(f"🔄 Attempting frame continuity ({attempt_name})...")
                         result = self._compose_with_frame_continuity(
                             clips, audio_files, output_path, session_context, 
-                            target_duration, platform=platform, **options
+                            target_duration, platform=platform, clip_durations=clip_durations, **options
                         )
                         if result and os.path.exists(result):
                             logger.info(f"✅ Frame continuity succeeded with {attempt_name} approach!")
@@ -3952,17 +3889,18 @@ The last frame of this scene connects to the next.
     
     def _add_subtitle_overlays(self, video_path: str, config: GeneratedVideoConfig, 
                              session_context: SessionContext) -> str:
-        """Add subtitle overlays to the video using MoviePy"""
+        """Burn subtitle overlays into the video with one libass pass"""
         try:
-            from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
+            from ..utils.ass_subtitles import build_subtitle_document, ass_filter
             import tempfile
             
-            logger.info("📝 Adding subtitle overlays using MoviePy")
+            logger.info("📝 Adding subtitle overlays using libass")
             
-            # Load the video
-            video = VideoFileClip(video_path)
-            video_duration = video.duration
-            video_width, video_height = video.size
+            video_width, video_height = self._get_video_resolution(video_path)
+            video_duration = self._get_video_duration(video_path)
+            if not video_width or not video_duration:
+                logger.error(f"❌ Could not probe video for subtitles: {video_path}")
+                return video_path
             
             # Create subtitle content based on the actual processed script
             subtitle_segments = self._create_subtitle_segments(
@@ -3971,177 +3909,68 @@ The last frame of this scene connects to the next.
                 session_context=session_context,
                 video_width=video_width
             )
+            if not subtitle_segments:
+                logger.warning("⚠️ No subtitle overlays created")
+                return video_path
             
             # Get positioning decision
             positioning_decision = self._get_positioning_decision(config, {'primary_style': 'dynamic'})
             primary_position = positioning_decision.get('primary_subtitle_position', 'bottom_third')
             
-            # Create text clips for subtitles
-            text_clips = []
-            for i, segment in enumerate(subtitle_segments):
-                try:
-                    # Use full_text for subtitles if available (avoid truncated text), otherwise use text  
-                    text = segment.get('full_text', segment.get('text', ''))
-                    
-                    # Add RTL mark for Hebrew, Arabic, and Persian text
-                    import re
-                    rtl_chars = re.compile(r'[\u0590-\u05FF\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
-                    is_rtl = rtl_chars.search(text)
-                    if is_rtl:
-                        # Only reshape, don't apply bidi for MoviePy (it handles RTL natively)
-                        if RTL_SUPPORT:
-                            # MoviePy expects logical order, not visual order
-                            text = arabic_reshaper.reshape(text)
-                            # DON'T apply get_display() - MoviePy will handle the visual ordering
-                            logger.debug(f"🔤 Reshaped RTL text (logical order) for MoviePy")
-                        else:
-                            # Fallback: Add Right-to-Left Mark (RLM) at the beginning and end
-                            text = '\u200F' + text + '\u200F'
-                            logger.debug(f"🔤 Added RTL marks to subtitle (no reshaper available)")
-                    
-                    # Select appropriate font for RTL support
-                    subtitle_font = video_config.text_overlay.rtl_font if is_rtl else video_config.text_overlay.default_font
-                    
-                    start_time = segment['start']
-                    end_time = segment['end']
-                    
-                    if end_time <= start_time:
-                        continue
-                    
-                    # Calculate position based on AI decision and video orientation
-                    is_portrait = video_height > video_width  # Check if portrait orientation
-                    
-                    if primary_position == 'top_third':
-                        y_pos = video_height * 0.20  # 20% from top
-                    elif primary_position == 'center':
-                        y_pos = video_height * 0.50  # Center
-                    else:  # bottom_third (default)
-                        if is_portrait:
-                            # Optimal position for portrait videos (better for TikTok/Instagram)
-                            # Not too low to avoid UI overlap, not too high to maintain readability
-                            y_pos = video_height * 0.70  # 70% down for portrait
-                        else:
-                            # Standard position for landscape
-                            y_pos = video_height * 0.65  # 65% down for landscape
-                    
-                    # Calculate better font size for subtitles (larger and more readable)
-                    # Use a percentage of video height for consistent sizing across platforms
-                    base_font_size = video_config.get_font_size('subtitle', video_width)
-                    # Adjust font size based on video dimensions
-                    if is_portrait:
-                        # Smaller, more elegant size for portrait videos (TikTok/Instagram)
-                        font_size = max(
-                            int(video_height * 0.02),  # 2% of video height for portrait
-                            base_font_size,
-                            28  # Minimum font size for portrait
-                        )
-                    else:
-                        # Standard size for landscape
-                        font_size = max(
-                            int(video_height * 0.018),  # 1.8% of video height for landscape
-                            base_font_size,
-                            20  # Minimum font size for landscape
-                        )
-                    
-                    # Cap maximum font size to prevent overly large text
-                    font_size = min(font_size, int(video_height * 0.025))  # Max 2.5% of height
-                    logger.info(f"📏 Subtitle font size: {font_size}px for {video_width}x{video_height} video")
-                    
-                    # Create text clip with modern styling
-                    # MoviePy uses 'center' for all alignments in caption method
-                    text_align = 'center'  # Caption method handles RTL internally
-                    
-                    text_clip = TextClip(
-                        text,
-                        fontsize=font_size,
-                        color='white',
-                        font=subtitle_font,  # Use RTL font if needed
-                        stroke_color='black',
-                        stroke_width=max(3, int(font_size * 0.08)),  # Dynamic stroke width
-                        method='caption',
-                        size=(int(video_width * 0.9), None),  # 90% width for better readability
-                        align=text_align
-                    )
-                    
-                    # Create semi-transparent background for the text
-                    from moviepy.editor import ColorClip
-                    
-                    # Get text clip dimensions
-                    text_width, text_height = text_clip.size
-                    
-                    # Calculate dynamic padding based on font size
-                    padding_x = int(font_size * 0.8)  # Horizontal padding
-                    padding_y = int(font_size * 0.4)  # Vertical padding
-                    
-                    # Create a semi-transparent black background
-                    background = ColorClip(
-                        size=(text_width + padding_x * 2, text_height + padding_y * 2),
-                        color=(0, 0, 0),  # Black background
-                        duration=end_time - start_time
-                    ).set_opacity(0.7)  # 70% opacity for better readability
-                    
-                    # Center both background and text at the same position
-                    final_y_pos = y_pos - padding_y  # Adjust for padding
-                    background = background.set_position(('center', final_y_pos)).set_start(start_time)
-                    text_clip = text_clip.set_position(('center', y_pos)).set_start(start_time).set_duration(end_time - start_time)
-                    
-                    # Add both background and text to clips
-                    text_clips.append(background)
-                    text_clips.append(text_clip)
-                    
-                    logger.info(f"📝 Added subtitle: '{text[:30]}...' at {start_time:.1f}-{end_time:.1f}s")
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to create subtitle clip {i}: {e}")
-                    continue
+            # Use a percentage of video height for consistent sizing across platforms
+            base_font_size = video_config.get_font_size('subtitle', video_width)
+            if video_height > video_width:
+                font_size = max(int(video_height * 0.02), base_font_size, 28)
+            else:
+                font_size = max(int(video_height * 0.018), base_font_size, 20)
+            # Cap maximum font size to prevent overly large text
+            font_size = min(font_size, int(video_height * 0.025))
+            logger.info(f"📏 Subtitle font size: {font_size}px for {video_width}x{video_height} video")
+            
+            # One styled document for every segment, on a 70% opacity box
+            document = build_subtitle_document(
+                subtitle_segments, video_width, video_height,
+                position=primary_position, font_size=font_size,
+                boxed=True, box_opacity=0.7
+            )
+            ass_path = document.save(session_context.get_output_path("subtitles", "subtitle_overlays.ass"))
             
-            # Composite video with subtitle overlays
-            if text_clips:
-                logger.info(f"🎬 Compositing video with {len(text_clips)} subtitle overlays")
-                final_video = CompositeVideoClip([video] + text_clips)
-                
-                # Create output path
-                temp_output = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
-                output_path = temp_output.name
-                temp_output.close()
-                
-                # Render the video with subtitles
-                final_video.write_videofile(
-                    output_path,
-                    fps=video_config.get_fps(str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform)),
-                    codec=video_config.encoding.video_codec,
-                    audio_codec=video_config.encoding.audio_codec,
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None
-                )
+            # Create output path
+            temp_output = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
+            output_path = temp_output.name
+            temp_output.close()
+            
+            cmd = [
+                'ffmpeg', '-y', '-i', video_path,
+                '-vf', ass_filter(ass_path),
+                '-c:v', video_config.encoding.video_codec,
+                '-preset', video_config.encoding.fallback_preset,
+                '-pix_fmt', 'yuv420p',
+                '-c:a', 'copy',
+                output_path
+            ]
+            logger.info(f"🎬 Burning in {len(document.events)} subtitle overlays")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            
+            # Verify output
+            if result.returncode == 0 and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+                file_size = os.path.getsize(output_path) / (1024 * 1024)
+                logger.info(f"✅ Subtitle overlays added: {output_path} ({file_size:.1f}MB)")
                 
-                # Clean up
-                final_video.close()
-                video.close()
-                for clip in text_clips:
-                    clip.close()
+                # Clean up original video
+                try:
+                    os.remove(video_path)
+                except:
+                    pass
                 
-                # Verify output
-                if os.path.exists(output_path):
-                    file_size = os.path.getsize(output_path) / (1024 * 1024)
-                    logger.info(f"✅ Subtitle overlays added: {output_path} ({file_size:.1f}MB)")
-                    
-                    # Clean up original video
-                    try:
-                        os.remove(video_path)
-                    except:
-                        pass
-                    
-                    return output_path
-                else:
-                    logger.error("❌ Failed to create video with subtitles")
-                    return video_path
-            else:
-                logger.warning("⚠️ No subtitle overlays created")
-                video.close()
-                return video_path
+                return output_path
+            
+            logger.error(f"❌ Failed to create video with subtitles: {result.stderr[-500:]}")
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            return video_path
                 
         except Exception as e:
             logger.error(f"❌ Subtitle overlay creation failed: {e}")
@@ -4867,6 +4696,7 @@ The last frame of this scene connects to the next.
                                      output_path: str, session_context: SessionContext, 
                                      target_duration: Optional[float] = None,
                                      platform: Optional[str] = None,
+                                     clip_durations: Optional[List[float]] = None,
                                      crossfade: bool = False,
                                      blend_frames: int = 0,
                                      trim_frames: int = 1) -> str:
@@ -4878,6 +4708,7 @@ The last frame of this scene connects to the next.
             output_path: Output video path
             session_context: Session context
             target_duration: Target duration for the video
+            clip_durations: Known duration of each clip (probed when omitted)
             crossfade: Whether to use crossfade between clips
             blend_frames: Number of frames to blend at transitions
             trim_frames: Number of frames to trim from start of clips (except first)
@@ -4916,39 +4747,51 @@ The last frame of this scene connects to the next.
                 width, height = 1920, 1080  # YouTube, Facebook landscape
             else:
                 width, height = 1080, 1920  # TikTok, Instagram portrait
+            
+            # xfade needs matching frame rates on both of its inputs
+            fps_filter = f",fps={fps}" if (crossfade or blend_frames > 0) and len(clips) > 1 else ""
+            
             for i, clip in enumerate(clips):
                 if i == 0:
                     # First clip: scale to target dimensions and use as-is
-                    video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]")
+                    video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1{fps_filter}[v{i}]")
                 else:
                     # Subsequent clips: scale to portrait and remove frames based on trim_frames
                     if trim_frames > 0:
-                        video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,trim=start={frame_duration},setpts=PTS-STARTPTS[v{i}]")
+                        video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,trim=start={frame_duration},setpts=PTS-STARTPTS{fps_filter}[v{i}]")
                     else:
                         # No trimming
-                        video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]")
+                        video_filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1{fps_filter}[v{i}]")
             
             # Concatenate all video streams with optional effects
             if len(clips) > 1:
                 trim_filters = ";".join(video_filter_parts)
                 
-                if crossfade:
-                    # Use xfade filter for smooth transitions
-                    xfade_filter = trim_filters + ";"
-                    for i in range(len(clips) - 1):
-                        if i == 0:
-                            xfade_filter += f"[v0][v1]xfade=transition=fade:duration=0.5:offset=3[vx1];"
-                        elif i == len(clips) - 2:
-                            xfade_filter += f"[vx{i}][v{i+1}]xfade=transition=fade:duration=0.5:offset=6[outv]"
-                        else:
-                            xfade_filter += f"[vx{i}][v{i+1}]xfade=transition=fade:duration=0.5:offset=6[vx{i+1}];"
-                    video_filter = xfade_filter
-                elif blend_frames > 0:
-                    # Use blend filter for frame blending
-                    blend_filter = trim_filters + ";"
-                    concat_inputs = "".join([f"[v{i}]" for i in range(len(clips))])
-                    video_filter = f"{blend_filter}{concat_inputs}concat=n={len(clips)}:v=1:a=0[outv]"
-                    # Note: Actual frame blending would require more complex filters
+                if crossfade or blend_frames > 0:
+                    # Local xfade transitions with offsets taken from the real clip durations;
+                    # blend_frames gives a short frame-accurate blend instead of a full crossfade
+                    from ..utils.frame_interpolator import FrameInterpolator
+                    
+                    if crossfade:
+                        transition_duration = video_config.animation.default_transition_duration
+                    else:
+                        transition_duration = blend_frames * video_config.animation.get_frame_duration(fps)
+                    
+                    if clip_durations is None:
+                        clip_durations = [self._get_video_duration(clip) or 8.0 for clip in clips]
+                    
+                    stream_durations = []
+                    for i, clip_duration in enumerate(clip_durations):
+                        if i > 0 and trim_frames > 0:
+                            clip_duration -= frame_duration
+                        stream_durations.append(clip_duration)
+                    
+                    xfade_chain = FrameInterpolator.build_xfade_chain(
+                        [f"v{i}" for i in range(len(clips))], stream_durations, transition_duration,
+                        output_label="xfv"
+                    )
+                    # xfade outputs yuv444p; bring it back to yuv420p like the concat path
+                    video_filter = f"{trim_filters};{xfade_chain};[xfv]format=yuv420p[outv]"
                 else:
                     # Standard concatenation
                     concat_inputs = "".join([f"[v{i}]" for i in range(len(clips))])
@@ -5919,8 +5762,72 @@ This is a placeholder file. In a full implementation, this would be a complete M
         
         return platform_ratios.get(platform.lower(), '9:16')  # Default to portrait for modern social media
     
-    def _apply_platform_orientation(self, video_path: str, platform: str, session_context: SessionContext) -> str:
-        """Apply correct orientation and dimensions for target platform"""
+    def _create_ass_subtitles(self, subtitle_timings: List[Dict[str, Any]], config: GeneratedVideoConfig,
+                              positioning_decision: Dict[str, Any], session_context: SessionContext) -> Optional[str]:
+        """Write the timed subtitles as a styled ASS document for libass; returns its path"""
+        if not subtitle_timings:
+            return None
+        try:
+            from ..utils.ass_subtitles import build_subtitle_document
+            
+            platform = str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform)
+            video_width, video_height = self._get_video_dimensions(platform)
+            document = build_subtitle_document(
+                subtitle_timings, video_width, video_height,
+                position=(positioning_decision or {}).get('primary_subtitle_position', 'bottom_third')
+            )
+            return document.save(session_context.get_output_path("subtitles", "subtitles.ass"))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to create ASS subtitles: {e}")
+            return None
+    
+    def _burn_srt_subtitles(self, video_path: str, subtitle_files: Dict[str, str],
+                            config: GeneratedVideoConfig, session_context: SessionContext) -> str:
+        """Burn the SRT subtitles in with a separate encode (fallback when the libass pass fails)"""
+        if not subtitle_files.get('srt'):
+            logger.warning("⚠️ No SRT file available, using overlay video without subtitles")
+            return video_path
+        
+        from ..utils.subtitle_integration_tool import SubtitleIntegrationTool
+        subtitle_tool = SubtitleIntegrationTool()
+        video_with_subtitles_path = session_context.get_output_path("temp_files", "video_with_subtitles_hq.mp4")
+        
+        # Get language for subtitle styling
+        languages = getattr(config, 'languages', [])
+        language = languages[0] if languages else None
+        
+        # Get video dimensions for proper scaling
+        video_width, video_height = self._get_video_dimensions(str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform))
+        
+        success = subtitle_tool.integrate_subtitles_with_ffmpeg(
+            video_path=video_path,
+            subtitle_path=subtitle_files['srt'],
+            output_path=video_with_subtitles_path,
+            language=language,
+            video_width=video_width,
+            video_height=video_height
+        )
+        
+        if success and os.path.exists(video_with_subtitles_path):
+            logger.info("✅ Successfully added high-quality subtitles to overlay video")
+            return video_with_subtitles_path
+        logger.warning("⚠️ Subtitle integration failed, using overlay video without subtitles")
+        return video_path
+    
+    def _apply_platform_orientation(self, video_path: str, platform: str, session_context: SessionContext,
+                                    subtitle_path: Optional[str] = None) -> str:
+        """
+        Apply correct orientation and dimensions for target platform
+        
+        Args:
+            video_path: Input video
+            platform: Target platform name
+            session_context: Session the output is written to
+            subtitle_path: ASS document burned in by libass in the same encode
+        
+        Returns:
+            Path of the oriented video, or ``video_path`` if the encode failed
+        """
         try:
             # Check if input video exists
             if not os.path.exists(video_path):
@@ -5932,16 +5839,23 @@ This is a placeholder file. In a full implementation, this would be a complete M
             
             logger.info(f"🎬 Applying {platform} orientation: {target_width}x{target_height} ({aspect_ratio})")
             
-            # Create output path
-            oriented_path = session_context.get_output_path("temp_files", f"oriented_{os.path.basename(video_path)}")
+            # Create output path (a subtitled render never overwrites the plain oriented file)
+            prefix = "oriented_subtitled_" if subtitle_path else "oriented_"
+            oriented_path = session_context.get_output_path("temp_files", f"{prefix}{os.path.basename(video_path)}")
             os.makedirs(os.path.dirname(oriented_path), exist_ok=True)
             
+            subtitle_filter = ""
+            if subtitle_path:
+                from ..utils.ass_subtitles import ass_filter
+                subtitle_filter = f",{ass_filter(subtitle_path)}"
+                logger.info(f"📝 Burning in subtitles during orientation: {os.path.basename(subtitle_path)}")
+            
             # Use FFmpeg to resize and reorient video for platform
             if aspect_ratio == '9:16':  # Portrait
                 # For portrait, crop from center and scale
                 cmd = [
                     'ffmpeg', '-i', video_path,
-                    '-vf', f'scale={target_width}:{target_height}:force_original_aspect_ratio=increase,crop={target_width}:{target_height}',
+                    '-vf', f'scale={target_width}:{target_height}:force_original_aspect_ratio=increase,crop={target_width}:{target_height}{subtitle_filter}',
                     '-c:v', 'libx264', '-c:a', video_config.encoding.audio_codec,
                     '-preset', video_config.encoding.fallback_preset,
                     '-y', oriented_path
@@ -5950,7 +5864,7 @@ This is a placeholder file. In a full implementation, this would be a complete M
                 # For landscape, pad with black bars
                 cmd = [
                     'ffmpeg', '-i', video_path,
-                    '-vf', f'scale={target_width}:{target_height}:force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2:black',
+                    '-vf', f'scale={target_width}:{target_height}:force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2:black{subtitle_filter}',
                     '-c:v', 'libx264', '-c:a', video_config.encoding.audio_codec,
                     '-preset', video_config.encoding.fallback_preset,
                     '-y', oriented_path
@@ -5969,6 +5883,40 @@ This is a placeholder file. In a full implementation, this would be a complete M
             logger.error(f"❌ Platform orientation failed: {e}")
             return video_path
 
+    def _render_rendition_ladder(self, video_path: str, config: GeneratedVideoConfig,
+                                 session_context: SessionContext) -> Dict[str, str]:
+        """
+        Encode the requested per-platform renditions in one ffmpeg pass and
+        register them in the session manifest
+        
+        Platforms come from ``config.rendition_platforms`` or the
+        comma-separated ``VIDEO_RENDITIONS`` environment variable.
+        
+        Returns:
+            Platform name to rendition path (empty when disabled or failed)
+        """
+        platforms = getattr(config, 'rendition_platforms', None) or [
+            p.strip() for p in os.getenv('VIDEO_RENDITIONS', '').split(',') if p.strip()
+        ]
+        if not platforms or not os.path.exists(video_path):
+            return {}
+        
+        try:
+            from ..utils.rendition_ladder import render_ladder
+            
+            output_dir = session_context.get_output_path("final_output", video_config.renditions.output_subdir)
+            renditions = render_ladder(video_path, output_dir, platforms)
+            
+            for platform, rendition in renditions.items():
+                details = rendition.to_dict()
+                details.pop('path')
+                session_context.register_rendition(platform, rendition.path, video_path, details)
+            return {platform: rendition.path for platform, rendition in renditions.items()}
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Rendition ladder skipped: {e}")
+            return {}
+    
     def _add_fade_out_ending(self, video_path: str, session_context: SessionContext, audio_files: Optional[List[str]] = None) -> str:
         """Add fade out effect at the end of the video, extending if needed for audio"""
         try:
@@ -6027,6 +5975,8 @@ This is a placeholder file. In a full implementation, this would be a complete M
             from ..utils.ffmpeg_utils import FFmpegAcceleration
             base_cmd = FFmpegAcceleration.get_optimized_ffmpeg_base()
             hw_encoder = FFmpegAcceleration.get_hw_encoder('h264')
+            # Still-frame (variable frame rate) videos need regular frames for the fade to animate
+            frame_rate = video_config.get_fps('default')
             
             if extension_needed > 0:
                 logger.info(f"🎬 Audio is {extension_needed:.2f}s longer than video - extending with black fadeout")
@@ -6040,7 +5990,7 @@ This is a placeholder file. In a full implementation, this would be a complete M
                 
                 # Complex filter to extend video with black and apply fade
                 filter_complex = (
-                    f"[0:v]fade=t=out:st={fade_start_time}:d={video_config.animation.fade_out_duration}[fade_video];"
+                    f"[0:v]fps={frame_rate},fade=t=out:st={fade_start_time}:d={video_config.animation.fade_out_duration}[fade_video];"
                     f"color=black:size={width}x{height}:duration={black_duration}[black];"
                     f"[fade_video][black]concat=n=2:v=1:a=0[outv]"
                 )
@@ -6063,7 +6013,7 @@ This is a placeholder file. In a full implementation, this would be a complete M
                 
                 cmd = base_cmd + [
                     '-i', video_path,
-                    '-vf', f'fade=t=out:st={fade_start_time}:d={fade_duration}',
+                    '-vf', f'fps={frame_rate},fade=t=out:st={fade_start_time}:d={fade_duration}',
                     '-c:v', hw_encoder or 'libx264', 
                     '-c:a', 'copy',
                     '-preset', video_config.encoding.fallback_preset,
@@ -7887,7 +7837,28 @@ Return ONLY the modified script text, no explanations."""
         except Exception as e:
             logger.error(f"❌ Error getting video duration: {e}")
             return None
-    
+
+    def _get_video_resolution(self, video_path: str) -> tuple:
+        """Get (width, height) of a video's first video stream, or (None, None)"""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height', '-of', 'json', video_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                streams = json.loads(result.stdout).get('streams', [])
+                if streams:
+                    return int(streams[0]['width']), int(streams[0]['height'])
+
+            logger.warning(f"⚠️ Could not determine video resolution for: {video_path}")
+            return None, None
+
+        except Exception as e:
+            logger.error(f"❌ Error getting video resolution: {e}")
+            return None, None
+
+    @traced("stage.cheap_video")
     def _generate_cheap_video(self, config: GeneratedVideoConfig, session_context: SessionContext) -> str:
         """Generate a cheap text-based video showing prompts instead of actual video generation"""
         logger.info("💰 Starting cheap mode video generation")
@@ -7987,6 +7958,11 @@ Return ONLY the modified script text, no explanations."""
     
     def _create_text_video(self, config: GeneratedVideoConfig, audio_file: str, session_context: SessionContext, script_text: str = None) -> str:
         """Create a simple text-based video with theme support"""
+        fast_path = self._create_static_text_video(config, audio_file, session_context, script_text)
+        if fast_path:
+            return fast_path
+        logger.warning("⚠️ Static-layer render unavailable, falling back to MoviePy compositing")
+        
         try:
             from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, ColorClip, ImageClip
             import numpy as np
@@ -8135,16 +8111,104 @@ Return ONLY the modified script text, no explanations."""
             logger.error(f"❌ Failed to create text video: {e}")
             return None
 
-    def _create_cheap_mode_subtitles(self, script_text: str, duration: float, audio_file: str, bottom_offset: Optional[int] = None, video_height: int = 1920) -> List:
-        """Create subtitle clips for cheap mode video with accurate gTTS timing"""
+    @traced("cheap_mode.static_render")
+    def _create_static_text_video(self, config: GeneratedVideoConfig, audio_file: str, session_context: SessionContext, script_text: str = None) -> Optional[str]:
+        """Render the cheap mode text video from one flattened still plus subtitle sprites
+        
+        Same layout as the MoviePy path, but backgrounds, banners and badges are
+        drawn once and FFmpeg loops them while overlaying each pre-rendered
+        subtitle for its time range, muxing the audio in the same pass.
+        
+        Returns:
+            Path to the final video, or None if the fast path is unavailable
+        """
         try:
-            # Use default offset if not provided
-            if bottom_offset is None:
-                bottom_offset = video_config.get_subtitle_offset('default')
+            from .static_layer_renderer import StaticLayerRenderer
             
-            # Determine video width based on height (assuming portrait mode for cheap mode)
-            video_width = 1080 if video_height == 1920 else 1920
-            from moviepy.editor import TextClip
+            with FFmpegProcessor() as ffmpeg:
+                duration = ffmpeg.get_duration(audio_file)
+            if not duration or duration <= 0:
+                return None
+            
+            platform = str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform)
+            if self._get_platform_aspect_ratio(platform) == '16:9':
+                width, height = 1920, 1080
+            else:
+                width, height = 1080, 1920
+            
+            theme_id = getattr(self.core_decisions, 'theme_id', None) if getattr(self, 'core_decisions', None) else None
+            is_news = bool(theme_id and 'news' in str(theme_id).lower())
+            text_overlay = video_config.text_overlay
+            
+            renderer = StaticLayerRenderer(
+                width, height,
+                work_dir=session_context.get_output_path("temp_files", "static_layers"),
+                fps=video_config.get_fps(platform),
+                background=(10, 20, 40) if is_news else (0, 0, 0)
+            )
+            
+            if is_news:
+                renderer.add_rect((0, 0, width, 120), (200, 0, 0))
+                renderer.add_rect((0, height - 100, width, 100), (0, 0, 0), opacity=text_overlay.background_opacity)
+                renderer.add_text(video_config.default_text.breaking_news_text, (50, 40),
+                                  text_overlay.default_font, video_config.get_font_size('header', width),
+                                  text_overlay.default_text_color, bg_color='red')
+                renderer.add_text(video_config.default_text.news_channel_text, ('center', 45),
+                                  text_overlay.default_font, video_config.get_font_size('caption', width),
+                                  text_overlay.default_text_color)
+                renderer.add_scrolling_text(
+                    "Water crisis deepens • Officials maintain luxury pools • Citizens demand action • Breaking: Drought emergency declared",
+                    y=height - 80, speed=200,
+                    font=text_overlay.default_font.replace('-Bold', ''),
+                    font_size=video_config.get_font_size('news_ticker', width),
+                    color=text_overlay.default_text_color
+                )
+            
+            badge = video_config.layout.overlay_positions['badge']
+            renderer.add_text(video_config.default_text.badge_texts.get('cheap', '💰 CHEAP'),
+                              (badge['x'], int(height * badge['y_percent'])),
+                              text_overlay.default_font, video_config.get_font_size('badge', width),
+                              'lime', opacity=text_overlay.badge_opacity, stroke_color='black', stroke_width=2)
+            
+            if script_text is None:
+                script_text = f"{config.hook} {' '.join(config.main_content)} {config.call_to_action}"
+            bottom_offset = video_config.get_subtitle_offset('news' if is_news else 'default')
+            for sentence, start_time, end_time, is_rtl in self._cheap_mode_subtitle_cues(script_text, duration, audio_file):
+                renderer.add_timed_text(
+                    sentence, start_time, end_time, ('center', height - bottom_offset),
+                    text_overlay.rtl_font if is_rtl else text_overlay.default_font,
+                    video_config.get_font_size('subtitle', width),
+                    text_overlay.default_text_color,
+                    stroke_color=text_overlay.default_stroke_color,
+                    stroke_width=video_config.get_stroke_width('subtitle'),
+                    max_width=1000
+                )
+            
+            output_path = session_context.get_output_path("final_output", f"final_video_{session_context.session_id}.mp4")
+            render_start = time.perf_counter()
+            renderer.render(
+                output_path, duration, audio_file,
+                codec=video_config.encoding.video_codec,
+                preset='veryfast',
+                crf=video_config.get_crf(platform),
+                audio_codec=video_config.encoding.audio_codec
+            )
+            render_seconds = time.perf_counter() - render_start
+            logger.info(f"✅ Cheap mode text video created: {output_path} "
+                        f"({duration / max(render_seconds, 1e-6):.1f}x real time)")
+            return output_path
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Static-layer cheap mode render failed: {e}")
+            return None
+
+    def _cheap_mode_subtitle_cues(self, script_text: str, duration: float, audio_file: str) -> List[tuple]:
+        """Split the script into timed subtitle cues using gTTS/premium speaking rates
+
+        Returns:
+            List of (display text, start, end, is_rtl); RTL text is already shaped for display
+        """
+        try:
             import re
             
             # Get actual audio duration for accurate timing using FFmpeg
@@ -8210,7 +8274,7 @@ Return ONLY the modified script text, no explanations."""
                 logger.info(f"🎯 Auto-calibrated speaking rate: {speaking_rate:.1f} -> {calibrated_speaking_rate:.1f} words/sec")
                 speaking_rate = max(1.5, min(4.0, calibrated_speaking_rate))  # Keep within reasonable bounds
             
-            subtitle_clips = []
+            cues = []
             current_time = 0.0
             
             for i, sentence in enumerate(sentences):
@@ -8249,6 +8313,27 @@ Return ONLY the modified script text, no explanations."""
                         sentence = '\u200F' + sentence + '\u200F'
                         logger.debug(f"🔤 Added RTL marks to cheap mode subtitle (no reshaper available)")
                 
+                cues.append((sentence, start_time, end_time, bool(is_rtl)))
+            
+            return cues
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to time cheap mode subtitles: {e}")
+            return []
+
+    def _create_cheap_mode_subtitles(self, script_text: str, duration: float, audio_file: str, bottom_offset: Optional[int] = None, video_height: int = 1920) -> List:
+        """Create subtitle clips for cheap mode video with accurate gTTS timing"""
+        try:
+            # Use default offset if not provided
+            if bottom_offset is None:
+                bottom_offset = video_config.get_subtitle_offset('default')
+            
+            # Determine video width based on height (assuming portrait mode for cheap mode)
+            video_width = 1080 if video_height == 1920 else 1920
+            from moviepy.editor import TextClip
+            
+            subtitle_clips = []
+            for sentence, start_time, end_time, is_rtl in self._cheap_mode_subtitle_cues(script_text, duration, audio_file):
                 # Select appropriate font for RTL support
                 subtitle_font = video_config.text_overlay.rtl_font if is_rtl else video_config.text_overlay.default_font
                 
@@ -9003,12 +9088,14 @@ Return ONLY the modified script text, no explanations."""
             metrics_dir = os.path.join(session_context.session_dir, 'performance_metrics')
             os.makedirs(metrics_dir, exist_ok=True)
             
+            # Measured stage timings from the session trace (so far)
+            tracer = get_tracer()
             metrics = {
                 'generation_mode': 'cheap_mode_full',
                 'duration_seconds': config.duration_seconds,
                 'platform': str(config.target_platform) if hasattr(config.target_platform, "value") else str(config.target_platform),
                 'cost_efficiency': 'maximum',
-                'generation_time_estimate': '30-60_seconds',
+                'stage_timings': tracer.summary() if tracer else {},
                 'resources_used': ['gTTS', 'text_video', 'moviepy'],
                 'veo_usage': False,
                 'created_at': datetime.now().isoformat()
@@ -0,0 +1,258 @@
+"""
+Windowed Metric Aggregation for the Monitoring Microservice
+Parses batched metric payloads (NDJSON or Influx-style line protocol) and
+maintains tumbling-window aggregates incrementally, so summaries and
+dashboard updates never rescan raw samples
+"""
+import os
+import sys
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from src.shared.monitoring.metrics_core import LogHistogram
+except ImportError:  # Run as a script from src/microservices/monitoring
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+    from src.shared.monitoring.metrics_core import LogHistogram
+
+
+def parse_timestamp(value: Any) -> float:
+    """Epoch seconds from ISO strings or epoch seconds/milliseconds/nanoseconds"""
+    if value is None or value == "":
+        return time.time()
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace(".", "", 1).isdigit()):
+        number = float(value)
+        if number > 1e17:
+            return number / 1e9
+        if number > 1e14:
+            return number / 1e6
+        if number > 1e11:
+            return number / 1e3
+        return number
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+def _split_unescaped(text: str, separator: str) -> List[str]:
+    parts, current, escaped = [], [], False
+    for char in text:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == separator:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def parse_line_protocol(line: str, default_service: str = "unknown") -> List[Dict[str, Any]]:
+    """
+    Parse one line-protocol line: ``name[,tag=v...] field=value[,field=value...] [timestamp]``
+
+    A ``service`` tag names the service. The field ``value`` is recorded
+    under the measurement name, other fields as ``<measurement>.<field>``.
+    """
+    sections = _split_unescaped(line.strip(), " ")
+    sections = [section for section in sections if section]
+    if len(sections) < 2:
+        raise ValueError(f"Expected measurement and fields: {line!r}")
+
+    head = _split_unescaped(sections[0], ",")
+    measurement, tags = head[0], {}
+    for tag in head[1:]:
+        key, _, value = tag.partition("=")
+        tags[key] = value
+    service = tags.pop("service", default_service)
+    timestamp = parse_timestamp(sections[2]) if len(sections) > 2 else time.time()
+
+    metrics = []
+    for field in _split_unescaped(sections[1], ","):
+        key, _, raw = field.partition("=")
+        if not raw:
+            raise ValueError(f"Field without value: {field!r}")
+        if raw.endswith("i"):
+            raw = raw[:-1]
+        if raw.lower() in ("t", "true", "f", "false"):
+            value: Any = 1 if raw.lower() in ("t", "true") else 0
+        elif raw.startswith('"'):
+            value = raw.strip('"')
+        else:
+            value = float(raw)
+        metrics.append({
+            "service": service,
+            "name": measurement if key == "value" else f"{measurement}.{key}",
+            "value": value,
+            "tags": dict(tags),
+            "timestamp": timestamp
+        })
+    return metrics
+
+
+def parse_batch(body: str, content_type: str = "", default_service: str = "unknown") -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Parse a batch of metrics, one per line, as NDJSON or line protocol
+
+    Returns:
+        (metrics, error messages for the lines that were skipped)
+    """
+    lines = [line for line in body.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    use_json = "json" in content_type or (lines and lines[0].lstrip().startswith("{"))
+    metrics, errors = [], []
+    for number, line in enumerate(lines, 1):
+        try:
+            if use_json:
+                item = json.loads(line)
+                if not item.get("name"):
+                    raise ValueError("Missing metric name")
+                metrics.append({
+                    "service": item.get("service", default_service),
+                    "name": item["name"],
+                    "value": item.get("value"),
+                    "tags": item.get("tags") or {},
+                    "timestamp": parse_timestamp(item.get("timestamp"))
+                })
+            else:
+                metrics.extend(parse_line_protocol(line, default_service))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append(f"line {number}: {e}")
+    return metrics, errors
+
+
+class WindowStats:
+    """Aggregate of one metric over one window"""
+
+    __slots__ = ("histogram", "latest", "latest_at")
+
+    def __init__(self, precision: float):
+        self.histogram = LogHistogram(precision=precision)
+        self.latest: Any = None
+        self.latest_at = 0.0
+
+    def add(self, value: float, timestamp: float):
+        self.histogram.record(value)
+        if timestamp >= self.latest_at:
+            self.latest, self.latest_at = value, timestamp
+
+
+class WindowedAggregator:
+    """
+    Tumbling-window aggregates per metric key
+
+    Each key keeps the last ``retained_windows`` windows of
+    ``window_seconds``. Recording touches one window's sketch; summaries
+    merge a handful of windows; ``drain_deltas`` hands out the windows
+    updated since the last call, for pushing to dashboards.
+    """
+
+    def __init__(self, window_seconds: float = 10.0, retained_windows: int = 360,
+                 precision: float = 0.01):
+        self.window_seconds = window_seconds
+        self.retained_windows = retained_windows
+        self.precision = precision
+        self._windows: Dict[str, "OrderedDict[int, WindowStats]"] = defaultdict(OrderedDict)
+        self._dirty: Dict[Tuple[str, int], None] = {}
+        self._lock = threading.Lock()
+
+    def window_of(self, timestamp: float) -> int:
+        return int(timestamp // self.window_seconds)
+
+    def record(self, key: str, value: Any, timestamp: Optional[float] = None) -> bool:
+        """Add a numeric sample; returns False for values that can't be aggregated"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return False
+        timestamp = timestamp or time.time()
+        window = self.window_of(timestamp)
+        with self._lock:
+            windows = self._windows[key]
+            stats = windows.get(window)
+            if stats is None:
+                oldest_kept = self.window_of(time.time()) - self.retained_windows
+                if window <= oldest_kept:
+                    return False
+                stats = windows[window] = WindowStats(self.precision)
+                if len(windows) > 1 and window < next(reversed(windows)):
+                    # Late sample for an older window: keep windows ordered
+                    self._windows[key] = OrderedDict(sorted(windows.items()))
+                while len(self._windows[key]) > self.retained_windows:
+                    self._windows[key].popitem(last=False)
+            stats.add(float(value), timestamp)
+            self._dirty[(key, window)] = None
+        return True
+
+    def summary(self, service: Optional[str] = None, last_seconds: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-key count/min/max/avg/percentiles/latest over the recent windows"""
+        cutoff = self.window_of(time.time() - last_seconds) if last_seconds else None
+        result = {}
+        with self._lock:
+            for key, windows in self._windows.items():
+                if service and not key.startswith(service):
+                    continue
+                merged = LogHistogram(precision=self.precision)
+                latest = None
+                for window, stats in windows.items():
+                    if cutoff is not None and window < cutoff:
+                        continue
+                    merged.merge(stats.histogram)
+                    if latest is None or stats.latest_at >= latest.latest_at:
+                        latest = stats
+                if merged.count:
+                    result[key] = self._describe(merged, latest)
+        return result
+
+    def drain_deltas(self) -> List[Dict[str, Any]]:
+        """Aggregates of the windows updated since the previous call"""
+        with self._lock:
+            dirty, self._dirty = list(self._dirty), {}
+            deltas = []
+            for key, window in dirty:
+                stats = self._windows.get(key, {}).get(window)
+                if stats is None:
+                    continue
+                delta = self._describe(stats.histogram, stats)
+                delta.update(key=key, window_start=datetime.fromtimestamp(window * self.window_seconds).isoformat(),
+                             window_seconds=self.window_seconds)
+                deltas.append(delta)
+        return deltas
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._windows)
+
+    @staticmethod
+    def _describe(histogram: LogHistogram, latest: Optional[WindowStats]) -> Dict[str, Any]:
+        stats = histogram.summary()
+        stats.update(
+            latest=latest.latest if latest else None,
+            latest_timestamp=datetime.fromtimestamp(latest.latest_at).isoformat() if latest else None
+        )
+        return stats
+
+
+class EventDigest:
+    """Recent events plus per-type counts, handed to dashboards in batches"""
+
+    def __init__(self, max_pending: int = 100):
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=max_pending)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict[str, Any]):
+        with self._lock:
+            self._pending.append(event)
+            self._counts[f"{event.get('service')}.{event.get('type')}"] += 1
+
+    def drain(self) -> Dict[str, Any]:
+        with self._lock:
+            digest = {"events": list(self._pending), "counts": dict(self._counts)}
+            self._pending.clear()
+            self._counts.clear()
+        return digest
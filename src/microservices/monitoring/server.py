@@ -1,20 +1,27 @@
 """
 Monitoring and Metrics Microservice
 Runs as independent HTTP server on port 8003
-Collects metrics from all other services
+Collects metrics from all other services; metrics arrive singly or in
+batches and are aggregated into tumbling windows that are pushed to
+dashboards as deltas
 """
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import json
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 import threading
 import requests
 import logging
 
+try:
+    from .metric_windows import EventDigest, WindowedAggregator, parse_batch
+except ImportError:  # Run as a script
+    from metric_windows import EventDigest, WindowedAggregator, parse_batch
+
 app = Flask(__name__)
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -33,6 +40,11 @@ class MetricsCollector:
         self.service_health = {}
         self.alerts = deque(maxlen=100)
         
+        # Incremental aggregates; dashboards get deltas instead of raw samples
+        self.aggregator = WindowedAggregator(window_seconds=10.0)
+        self.event_digest = EventDigest()
+        self.broadcast_interval = 2.0
+        
         # Service endpoints to monitor
         self.services = {
             "prompt-optimizer": "http://localhost:8001",
@@ -46,11 +58,16 @@ class MetricsCollector:
         
         # Start metrics aggregation
         self.start_metrics_aggregation()
+        
+        # Start pushing aggregate deltas to dashboards
+        self.start_delta_broadcast()
     
-    def record_metric(self, service: str, name: str, value: Any, tags: Dict[str, str] = None):
+    def record_metric(self, service: str, name: str, value: Any, tags: Dict[str, str] = None,
+                      timestamp: Optional[float] = None):
         """Record a metric"""
+        timestamp = timestamp or time.time()
         metric = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
             "service": service,
             "name": name,
             "value": value,
@@ -59,15 +76,20 @@ class MetricsCollector:
         
         key = f"{service}.{name}"
         self.metrics[key].append(metric)
+        self.aggregator.record(key, value, timestamp)
         
         # Check for alerts
         self._check_alerts(key, value)
         
-        # Emit to WebSocket clients
-        socketio.emit('metric', metric)
-        
         return metric
     
+    def record_metrics(self, metrics: List[Dict[str, Any]]) -> int:
+        """Record a parsed batch of metrics; returns how many were recorded"""
+        for metric in metrics:
+            self.record_metric(metric["service"], metric["name"], metric["value"],
+                               metric.get("tags"), metric.get("timestamp"))
+        return len(metrics)
+    
     def record_event(self, service: str, event_type: str, data: Dict[str, Any]):
         """Record an event"""
         event = {
@@ -78,9 +100,7 @@ class MetricsCollector:
         }
         
         self.events.append(event)
-        
-        # Emit to WebSocket clients
-        socketio.emit('event', event)
+        self.event_digest.add(event)
         
         return event
     
@@ -104,26 +124,8 @@ class MetricsCollector:
         return result
     
     def get_aggregated_metrics(self, service: str = None) -> Dict[str, Any]:
-        """Get aggregated metrics summary"""
-        summary = {}
-        
-        for key, metrics_list in self.metrics.items():
-            if service and not key.startswith(service):
-                continue
-            
-            if metrics_list:
-                values = [m["value"] for m in metrics_list if isinstance(m["value"], (int, float))]
-                if values:
-                    summary[key] = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values),
-                        "latest": metrics_list[-1]["value"],
-                        "latest_timestamp": metrics_list[-1]["timestamp"]
-                    }
-        
-        return summary
+        """Get aggregated metrics summary (count/min/max/avg/percentiles) over the retained windows"""
+        return self.aggregator.summary(service)
     
     def start_health_monitoring(self):
         """Start background health monitoring"""
@@ -178,6 +180,27 @@ class MetricsCollector:
         thread = threading.Thread(target=collect_metrics, daemon=True)
         thread.start()
     
+    def start_delta_broadcast(self):
+        """Push windows updated since the last push, and new events, to WebSocket clients"""
+        def broadcast_deltas():
+            while True:
+                time.sleep(self.broadcast_interval)
+                try:
+                    deltas = self.aggregator.drain_deltas()
+                    digest = self.event_digest.drain()
+                    if deltas or digest["events"]:
+                        socketio.emit('metrics_delta', {
+                            "timestamp": datetime.now().isoformat(),
+                            "metrics": deltas,
+                            "events": digest["events"],
+                            "event_counts": digest["counts"]
+                        })
+                except Exception as e:
+                    logger.error(f"Delta broadcast failed: {e}")
+        
+        thread = threading.Thread(target=broadcast_deltas, daemon=True)
+        thread.start()
+    
     def _check_alerts(self, metric_key: str, value: Any):
         """Check if metric triggers any alerts"""
         # Alert rules
@@ -264,6 +287,24 @@ def record_metric():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/metrics/batch', methods=['POST'])
+def record_metrics_batch():
+    """Record many metrics at once, as NDJSON or line protocol (one metric per line)"""
+    try:
+        body = request.get_data(as_text=True)
+        metrics, errors = parse_batch(body, request.content_type or "",
+                                      default_service=request.args.get('service', 'unknown'))
+        accepted = collector.record_metrics(metrics)
+        status = 400 if errors and not accepted else 200
+        return jsonify({
+            "accepted": accepted,
+            "rejected": len(errors),
+            "errors": errors[:10]
+        }), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/events', methods=['POST'])
 def record_event():
     """Record an event"""
@@ -403,8 +444,11 @@ def dashboard_page():
                 updateServices(data);
             });
             
-            socket.on('metric', function(data) {
-                console.log('New metric:', data);
+            const metrics = {};
+            
+            socket.on('metrics_delta', function(data) {
+                data.metrics.forEach(m => { metrics[m.key] = m; });
+                renderMetrics();
             });
             
             socket.on('alert', function(data) {
@@ -427,6 +471,22 @@ def dashboard_page():
                 }
             }
             
+            function renderMetrics() {
+                const container = document.getElementById('metrics');
+                container.innerHTML = '';
+                
+                for (const [key, m] of Object.entries(metrics).sort()) {
+                    const card = document.createElement('div');
+                    card.className = 'service-card';
+                    card.innerHTML = `
+                        <h3>${key}</h3>
+                        <div class="metric">Latest: ${m.latest}</div>
+                        <div class="metric">Window: n=${m.count} avg=${m.avg.toFixed(2)} p95=${m.p95.toFixed(2)} max=${m.max}</div>
+                    `;
+                    container.appendChild(card);
+                }
+            }
+            
             function addAlert(alert) {
                 const container = document.getElementById('alerts');
                 const alertDiv = document.createElement('div');
@@ -440,6 +500,10 @@ def dashboard_page():
                 .then(r => r.json())
                 .then(data => {
                     updateServices(data.services);
+                    for (const [key, m] of Object.entries(data.metrics_summary || {})) {
+                        metrics[key] = m;
+                    }
+                    renderMetrics();
                     if (data.recent_alerts) {
                         data.recent_alerts.forEach(addAlert);
                     }
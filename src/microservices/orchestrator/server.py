@@ -1,14 +1,20 @@
 """
 Orchestrator Microservice
 Runs as independent HTTP server on port 8005
-Coordinates all other microservices for end-to-end video generation
+Coordinates all other microservices for end-to-end video generation.
+Stages are pipelined: each optimized prompt batch flows straight into video
+generation while audio runs alongside, over pooled HTTP sessions, with
+metrics and events buffered and flushed in the background
 """
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import json
+import time
 import uuid
 import asyncio
+import queue
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
@@ -62,6 +68,109 @@ class WorkflowStatus:
     results: Dict[str, Any] = None
 
 
+def create_session(pool_size: int = 20) -> requests.Session:
+    """HTTP session with keep-alive connection pools sized for concurrent stage calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class MetricsBuffer:
+    """
+    Buffers metrics and events and ships them to monitoring from a background thread
+
+    Metrics go out as one NDJSON ``POST /metrics/batch`` per flush; if the
+    monitoring service has no batch endpoint, items are posted one by one
+    (still off the request path). When monitoring is down the buffer drops
+    the oldest items rather than growing.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session, service: str = "orchestrator",
+                 flush_interval: float = 1.0, batch_size: int = 200, max_buffered: int = 10000):
+        self.base_url = base_url
+        self.session = session
+        self.service = service
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._items: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_buffered)
+        self._batch_supported = True
+        self._stop = threading.Event()
+        self._flushing = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+        self._thread.start()
+
+    def metric(self, name: str, value: Any, tags: Optional[Dict[str, str]] = None):
+        self._put({"kind": "metric", "service": self.service, "name": name, "value": value,
+                   "tags": tags or {}, "timestamp": datetime.now().isoformat()})
+
+    def event(self, event_type: str, data: Dict[str, Any]):
+        self._put({"kind": "event", "service": self.service, "type": event_type, "data": data})
+
+    def _put(self, item: Dict[str, Any]):
+        while True:
+            try:
+                self._items.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._items.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def flush(self):
+        """Send everything buffered so far"""
+        with self._flushing:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._items.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                self._send(batch)
+
+    def _send(self, batch: List[Dict[str, Any]]):
+        metrics = [item for item in batch if item["kind"] == "metric"]
+        events = [item for item in batch if item["kind"] == "event"]
+        try:
+            if metrics and self._batch_supported:
+                payload = "\n".join(json.dumps({k: v for k, v in m.items() if k != "kind"}) for m in metrics)
+                response = self.session.post(
+                    f"{self.base_url}/metrics/batch", data=payload,
+                    headers={"Content-Type": "application/x-ndjson"}, timeout=2
+                )
+                if response.status_code in (404, 405):
+                    self._batch_supported = False
+                else:
+                    metrics = []
+            for metric in metrics:
+                self.session.post(f"{self.base_url}/metrics", json={
+                    "service": metric["service"], "name": metric["name"],
+                    "value": metric["value"], "tags": metric["tags"]
+                }, timeout=1)
+            for event in events:
+                self.session.post(f"{self.base_url}/events", json={
+                    "service": event["service"], "type": event["type"], "data": event["data"]
+                }, timeout=1)
+        except requests.RequestException:
+            pass  # Don't fail if monitoring is down
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+
 class OrchestratorService:
     """Orchestrates all microservices for video generation"""
     
@@ -78,8 +187,24 @@ class OrchestratorService:
         # Workflow storage
         self.workflows = {}
         
-        # Thread pool for parallel execution
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # Clip jobs run on the video generator's durable queue; seconds to wait for one
+        self.video_job_timeout = 900
+        self.video_job_poll_max = 5.0
+        
+        # Workflows run on one pool and their stage tasks on others, so a
+        # workflow waiting for its clips can never starve them of threads.
+        # Clip tasks long-poll their jobs, so the short optimizer and audio
+        # calls get their own pool and never queue behind them.
+        self.executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="workflow")
+        self.clip_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="clip")
+        self.rpc_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rpc")
+        
+        # Pooled HTTP connections and background metric shipping
+        self.session = create_session(pool_size=32)
+        self.metrics = MetricsBuffer(self.services["monitoring"], create_session(pool_size=4))
+        
+        # Prompts sent to the optimizer per request; smaller batches reach video generation sooner
+        self.prompt_batch_size = 4
         
         # Statistics
         self.stats = {
@@ -128,41 +253,14 @@ class OrchestratorService:
             self._update_status(workflow_id, WorkflowStage.SCRIPT_GENERATION, 0.1)
             script = self._generate_script(request)
             
-            # Stage 2: Optimize prompts
-            self._update_status(workflow_id, WorkflowStage.PROMPT_OPTIMIZATION, 0.3)
-            optimized_prompts = self._optimize_prompts(script, request)
-            
-            # Stage 3: Generate audio (parallel with video if enabled)
-            self._update_status(workflow_id, WorkflowStage.AUDIO_GENERATION, 0.4)
-            
             if request.parallel_generation:
-                # Parallel execution
-                futures = []
-                
-                # Audio generation
-                audio_future = self.executor.submit(
-                    self._generate_audio, script, request
-                )
-                futures.append(("audio", audio_future))
-                
-                # Video generation for each clip
-                self._update_status(workflow_id, WorkflowStage.VIDEO_GENERATION, 0.5)
-                for i, prompt in enumerate(optimized_prompts):
-                    video_future = self.executor.submit(
-                        self._generate_video, prompt, f"clip_{i}", request
-                    )
-                    futures.append((f"video_{i}", video_future))
-                
-                # Collect results
-                results = {}
-                for name, future in futures:
-                    try:
-                        results[name] = future.result(timeout=60)
-                    except Exception as e:
-                        logger.error(f"Parallel task {name} failed: {e}")
-                        results[name] = {"error": str(e)}
+                results = self._run_pipelined(workflow_id, script, request)
             else:
                 # Sequential execution
+                self._update_status(workflow_id, WorkflowStage.PROMPT_OPTIMIZATION, 0.3)
+                optimized_prompts = self._optimize_prompts(script, request)
+                
+                self._update_status(workflow_id, WorkflowStage.AUDIO_GENERATION, 0.4)
                 audio_results = self._generate_audio(script, request)
                 
                 self._update_status(workflow_id, WorkflowStage.VIDEO_GENERATION, 0.6)
@@ -186,6 +284,44 @@ class OrchestratorService:
         except Exception as e:
             self._fail_workflow(workflow_id, str(e))
     
+    def _run_pipelined(self, workflow_id: str, script: Dict[str, Any], request: WorkflowRequest) -> Dict[str, Any]:
+        """
+        Overlap the stages: audio starts with the script, and each clip is
+        submitted for generation as soon as its prompt batch is optimized
+        
+        Returns:
+            Results keyed "audio" and "video_<index>"
+        """
+        audio_future = self.rpc_executor.submit(self._generate_audio, script, request)
+        self._update_status(workflow_id, WorkflowStage.PROMPT_OPTIMIZATION, 0.3)
+        
+        video_futures = {}
+        for index, prompt in self._iter_optimized_prompts(script, request):
+            if not video_futures:
+                self._update_status(workflow_id, WorkflowStage.VIDEO_GENERATION, 0.5)
+            future = self.clip_executor.submit(self._generate_video, prompt, f"clip_{index}", request)
+            video_futures[future] = f"video_{index}"
+        
+        # Collect results as clips finish; each clip task enforces its own job
+        # timeout from when it starts, so a task that waited for a thread is not cut short
+        results = {}
+        total = max(1, len(video_futures))
+        for future in as_completed(video_futures):
+            name = video_futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error(f"Parallel task {name} failed: {e}")
+                results[name] = {"error": str(e)}
+            self._update_status(workflow_id, WorkflowStage.VIDEO_GENERATION, 0.5 + 0.3 * len(results) / total)
+        
+        try:
+            results["audio"] = audio_future.result(timeout=self.video_job_timeout)
+        except Exception as e:
+            logger.error(f"Parallel task audio failed: {e}")
+            results["audio"] = {"error": str(e)}
+        return results
+    
     def _generate_script(self, request: WorkflowRequest) -> Dict[str, Any]:
         """Generate script via script service"""
         try:
@@ -210,41 +346,54 @@ class OrchestratorService:
     
     def _optimize_prompts(self, script: Dict[str, Any], request: WorkflowRequest) -> List[str]:
         """Optimize prompts for each video segment"""
-        optimized = []
-        
+        optimized = dict(self._iter_optimized_prompts(script, request))
+        return [optimized[i] for i in sorted(optimized)]
+    
+    def _iter_optimized_prompts(self, script: Dict[str, Any], request: WorkflowRequest):
+        """Yield (segment index, prompt) pairs as their optimization batches complete"""
         if not request.optimize_prompts:
             # Return raw prompts
-            for segment in script["segments"]:
-                optimized.append(f"{request.mission}: {segment['text']}")
-            return optimized
+            for i, segment in enumerate(script["segments"]):
+                yield i, f"{request.mission}: {segment['text']}"
+            return
         
+        prompts = [
+            (i, f"{request.mission}: {segment['text']} in {request.style} style")
+            for i, segment in enumerate(script["segments"])
+        ]
+        batches = [prompts[i:i + self.prompt_batch_size] for i in range(0, len(prompts), self.prompt_batch_size)]
+        futures = [self.rpc_executor.submit(self._optimize_batch, batch) for batch in batches]
+        
+        optimized_count = 0
+        for future in as_completed(futures):
+            for index, prompt in future.result():
+                optimized_count += 1
+                yield index, prompt
+        self._send_metric("prompts.optimized", optimized_count)
+    
+    def _optimize_batch(self, prompts: List[tuple]) -> List[tuple]:
+        """Optimize (index, prompt) pairs in one optimizer request, keeping originals on failure"""
         try:
-            # Call prompt optimizer service
-            for segment in script["segments"]:
-                prompt = f"{request.mission}: {segment['text']} in {request.style} style"
-                
-                response = requests.post(
-                    f"{self.services['prompt_optimizer']}/optimize",
-                    json={
-                        "prompt": prompt,
-                        "level": "moderate"
-                    },
-                    timeout=5
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    optimized.append(result["optimized_prompt"])
-                else:
-                    optimized.append(prompt)  # Use original if optimization fails
-            
-            self._send_metric("prompts.optimized", len(optimized))
-            return optimized
+            response = self.session.post(
+                f"{self.services['prompt_optimizer']}/optimize-batch",
+                json={
+                    "prompts": [prompt for _, prompt in prompts],
+                    "level": "moderate"
+                },
+                timeout=10
+            )
             
+            if response.status_code == 200:
+                results = response.json().get("results", [])
+                return [
+                    (index, result.get("optimized_prompt") or prompt)
+                    for (index, prompt), result in zip(prompts, results + [{}] * (len(prompts) - len(results)))
+                ]
+            logger.warning(f"Batch prompt optimization returned {response.status_code}, using originals")
         except Exception as e:
             logger.warning(f"Prompt optimization failed: {e}")
-            # Return unoptimized prompts
-            return [f"{request.mission}: {s['text']}" for s in script["segments"]]
+        # Use original prompts if optimization fails
+        return prompts
     
     def _generate_audio(self, script: Dict[str, Any], request: WorkflowRequest) -> Dict[str, Any]:
         """Generate audio for script"""
@@ -267,32 +416,54 @@ class OrchestratorService:
             return {"error": str(e)}
     
     def _generate_video(self, prompt: str, clip_id: str, request: WorkflowRequest) -> Dict[str, Any]:
-        """Generate video clip"""
+        """Generate video clip through the video generator's job queue"""
         try:
-            response = requests.post(
-                f"{self.services['video_generator']}/generate",
+            response = self.session.post(
+                f"{self.services['video_generator']}/generate-async",
                 json={
                     "prompt": prompt,
                     "clip_id": clip_id,
                     "duration": request.duration / 3,  # Divide by number of segments
                     "platform": request.platform,
                     "style": request.style,
-                    "optimize_prompt": False  # Already optimized
+                    "optimize_prompt": False,  # Already optimized
+                    "priority": "normal"
                 },
-                timeout=30
+                timeout=10
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                self._send_metric("video.generated", 1)
-                return result
-            else:
+            if response.status_code != 200:
                 raise Exception(f"Video generation failed: {response.text}")
+            
+            job = self._wait_for_video_job(response.json()["job_id"])
+            if job.get("status") != "completed":
+                raise Exception(f"Video job {job.get('job_id')} {job.get('status')}: {job.get('error')}")
+            
+            self._send_metric("video.generated", 1)
+            return job.get("result") or {}
                 
         except Exception as e:
             logger.error(f"Video generation for {clip_id} failed: {e}")
             return {"error": str(e), "clip_id": clip_id}
     
+    def _wait_for_video_job(self, job_id: str) -> Dict[str, Any]:
+        """Poll a queued clip job until it completes or fails (backing off to video_job_poll_max)"""
+        deadline = time.time() + self.video_job_timeout
+        delay = 0.5
+        while time.time() < deadline:
+            try:
+                response = self.session.get(f"{self.services['video_generator']}/job/{job_id}", timeout=5)
+                if response.status_code == 200:
+                    job = response.json()
+                    if job.get("status") in ("completed", "failed"):
+                        return job
+            except requests.RequestException as e:
+                # The generator may be restarting; the job itself is durable
+                logger.warning(f"Polling job {job_id} failed: {e}")
+            time.sleep(delay)
+            delay = min(delay * 1.5, self.video_job_poll_max)
+        raise TimeoutError(f"Video job {job_id} did not finish in {self.video_job_timeout}s")
+    
     def _post_process(self, results: Dict[str, Any], request: WorkflowRequest) -> Dict[str, Any]:
         """Post-process and combine results"""
         try:
@@ -361,34 +532,12 @@ class OrchestratorService:
             })
     
     def _send_metric(self, name: str, value: Any):
-        """Send metric to monitoring service"""
-        try:
-            requests.post(
-                f"{self.services['monitoring']}/metrics",
-                json={
-                    "service": "orchestrator",
-                    "name": name,
-                    "value": value
-                },
-                timeout=1
-            )
-        except:
-            pass  # Don't fail if monitoring is down
+        """Buffer a metric for the monitoring service"""
+        self.metrics.metric(name, value)
     
     def _send_event(self, event_type: str, data: Dict[str, Any]):
-        """Send event to monitoring service"""
-        try:
-            requests.post(
-                f"{self.services['monitoring']}/events",
-                json={
-                    "service": "orchestrator",
-                    "type": event_type,
-                    "data": data
-                },
-                timeout=1
-            )
-        except:
-            pass
+        """Buffer an event for the monitoring service"""
+        self.metrics.event(event_type, data)
     
     def get_workflow_status(self, workflow_id: str) -> Optional[WorkflowStatus]:
         """Get workflow status"""
@@ -486,7 +635,7 @@ def check_services():
     
     for service_name, service_url in orchestrator.services.items():
         try:
-            response = requests.get(f"{service_url}/health", timeout=2)
+            response = orchestrator.session.get(f"{service_url}/health", timeout=2)
             service_status[service_name] = {
                 "status": "healthy" if response.status_code == 200 else "unhealthy",
                 "response_time": response.elapsed.total_seconds()
@@ -244,6 +244,31 @@ def optimize_prompt():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/optimize-batch', methods=['POST'])
+def optimize_prompts_batch():
+    """Optimize several prompts in one request; results keep the input order"""
+    try:
+        data = request.json
+        prompts = data.get('prompts') or []
+        level = data.get('level', 'moderate')
+
+        if not prompts:
+            return jsonify({"error": "No prompts provided"}), 400
+
+        results = []
+        for prompt in prompts:
+            try:
+                results.append(optimizer_service.optimize(prompt, level))
+            except Exception as e:
+                results.append({"error": str(e), "original_prompt": prompt})
+
+        return jsonify({"results": results, "count": len(results)})
+
+    except Exception as e:
+        logger.error(f"Batch optimization error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/validate', methods=['POST'])
 def validate_prompt():
     """Validate prompt safety"""
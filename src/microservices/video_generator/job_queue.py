@@ -0,0 +1,435 @@
+"""
+Durable Job Queue for the Video Generator Microservice
+SQLite-backed queue with priority lanes, leases that expire when a worker
+dies (visibility timeout), retries with exponential backoff and a worker
+pool, so queued work survives restarts and one long job doesn't block the rest
+"""
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(Enum):
+    """Lifecycle of a queued job"""
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobPriority(Enum):
+    """Priority lanes; lower lanes are leased first"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+    @classmethod
+    def from_value(cls, value: Any) -> "JobPriority":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str) and value.upper() in cls.__members__:
+            return cls[value.upper()]
+        try:
+            return cls(int(value))
+        except (TypeError, ValueError):
+            return cls.NORMAL
+
+
+@dataclass
+class JobQueueConfig:
+    """Job queue and worker pool settings"""
+    db_path: str = "/tmp/video_outputs/jobs.db"
+    workers: int = 2
+    # Visibility timeout: a lease not renewed for this long is handed to another worker
+    lease_seconds: float = 120.0
+    max_attempts: int = 3
+    backoff_base: float = 5.0
+    backoff_max: float = 300.0
+    # Idle workers wait this long between polls unless woken by a new job
+    poll_interval: float = 2.0
+
+    @classmethod
+    def from_env(cls) -> "JobQueueConfig":
+        defaults = cls()
+        return cls(
+            db_path=os.getenv("VIDEO_JOB_DB", defaults.db_path),
+            workers=int(os.getenv("VIDEO_JOB_WORKERS", defaults.workers)),
+            lease_seconds=float(os.getenv("VIDEO_JOB_LEASE_SECONDS", defaults.lease_seconds)),
+            max_attempts=int(os.getenv("VIDEO_JOB_MAX_ATTEMPTS", defaults.max_attempts))
+        )
+
+
+@dataclass
+class Job:
+    """A job row"""
+    job_id: str
+    payload: Dict[str, Any]
+    state: JobState
+    priority: JobPriority
+    attempts: int
+    max_attempts: int
+    available_at: float
+    created_at: float
+    updated_at: float
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.state.value
+        data["state"] = self.state.value
+        data["priority"] = self.priority.name.lower()
+        for key in ("available_at", "created_at", "updated_at", "lease_expires"):
+            if data[key] is not None:
+                data[key] = datetime.fromtimestamp(data[key]).isoformat()
+        return data
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority, available_at);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (state, lease_expires);
+"""
+
+
+class DurableJobQueue:
+    """
+    SQLite job queue shared by the HTTP handlers and the worker pool
+
+    Each thread gets its own connection; WAL mode lets status reads run
+    while a worker holds the write lock to lease a job.
+    """
+
+    def __init__(self, config: Optional[JobQueueConfig] = None):
+        self.config = config or JobQueueConfig()
+        if os.path.dirname(self.config.db_path):
+            os.makedirs(os.path.dirname(self.config.db_path), exist_ok=True)
+        self._local = threading.local()
+        # Set on enqueue so idle workers pick new jobs up without waiting a poll interval
+        self.wakeup = threading.Event()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.config.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def enqueue(self, payload: Dict[str, Any], priority: Any = JobPriority.NORMAL,
+                job_id: Optional[str] = None, max_attempts: Optional[int] = None,
+                delay: float = 0.0) -> Job:
+        """
+        Add a job
+
+        Args:
+            payload: JSON-serializable job request
+            priority: JobPriority or its name ('high', 'normal', 'low')
+            job_id: Caller-chosen id (generated when omitted)
+            max_attempts: Attempts before the job is failed (config default when omitted)
+            delay: Seconds before the job becomes available
+
+        Returns:
+            The queued job
+        """
+        now = time.time()
+        job_id = job_id or str(uuid.uuid4())
+        lane = JobPriority.from_value(priority)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, payload, state, priority, attempts, max_attempts, "
+                "available_at, created_at, updated_at) VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?)",
+                (job_id, json.dumps(payload), JobState.QUEUED.value, lane.value,
+                 max_attempts or self.config.max_attempts, now + delay, now, now)
+            )
+        self.wakeup.set()
+        logger.info(f"📥 Job queued: {job_id} ({lane.name.lower()})")
+        return self.get(job_id)
+
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None) -> Optional[Job]:
+        """Claim the next available job for ``worker_id``, or None if nothing is ready"""
+        now = time.time()
+        lease_seconds = lease_seconds or self.config.lease_seconds
+        with self._transaction() as conn:
+            self._reclaim_expired(conn, now)
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE state = ? AND available_at <= ? "
+                "ORDER BY priority, available_at, created_at LIMIT 1",
+                (JobState.QUEUED.value, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE job_id = ?",
+                (JobState.PROCESSING.value, worker_id, now + lease_seconds, now, row["job_id"])
+            )
+        return self.get(row["job_id"])
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """Extend a lease; False if the worker no longer owns the job"""
+        now = time.time()
+        lease_seconds = lease_seconds or self.config.lease_seconds
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND state = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, JobState.PROCESSING.value, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Record a job's result; False if the lease was lost to another worker"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE job_id = ? AND state = ? AND lease_owner = ?",
+                (JobState.COMPLETED.value, json.dumps(result, default=str), time.time(),
+                 job_id, JobState.PROCESSING.value, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retryable: bool = True,
+             result: Optional[Dict[str, Any]] = None) -> Optional[JobState]:
+        """
+        Record a failed attempt, re-queueing the job with backoff while attempts remain
+
+        Returns:
+            The job's new state, or None if the lease was lost to another worker
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE job_id = ? AND state = ? AND lease_owner = ?",
+                (job_id, JobState.PROCESSING.value, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            if retryable and row["attempts"] < row["max_attempts"]:
+                state = JobState.QUEUED
+                available_at = now + self.backoff(row["attempts"])
+            else:
+                state = JobState.FAILED
+                available_at = now
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, result = ?, available_at = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE job_id = ?",
+                (state.value, error, json.dumps(result, default=str) if result else None,
+                 available_at, now, job_id)
+            )
+        if state == JobState.QUEUED:
+            logger.warning(f"🔁 Job {job_id} attempt {row['attempts']} failed, retrying: {error}")
+        else:
+            logger.error(f"❌ Job {job_id} failed after {row['attempts']} attempts: {error}")
+        return state
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry ``attempts + 1`` (exponential with jitter)"""
+        delay = min(self.config.backoff_base * (2 ** max(0, attempts - 1)), self.config.backoff_max)
+        return delay * random.uniform(0.8, 1.2)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def list(self, state: Optional[JobState] = None, limit: int = 100) -> List[Job]:
+        if state:
+            rows = self._connection().execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY created_at DESC LIMIT ?", (state.value, limit)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {state.value: 0 for state in JobState}
+        for row in self._connection().execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[row["state"]] = row["n"]
+        return counts
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs last updated before the cutoff"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?",
+                (JobState.COMPLETED.value, JobState.FAILED.value, time.time() - older_than_seconds)
+            )
+            return cursor.rowcount
+
+    def _reclaim_expired(self, conn: sqlite3.Connection, now: float):
+        """Return jobs whose workers stopped renewing their lease to the queue"""
+        expired = conn.execute(
+            "SELECT job_id, attempts, max_attempts FROM jobs WHERE state = ? AND lease_expires < ?",
+            (JobState.PROCESSING.value, now)
+        ).fetchall()
+        for row in expired:
+            exhausted = row["attempts"] >= row["max_attempts"]
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, available_at = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE job_id = ?",
+                (JobState.FAILED.value if exhausted else JobState.QUEUED.value,
+                 "Lease expired (worker stopped or restarted)",
+                 now + (0 if exhausted else self.backoff(row["attempts"])), now, row["job_id"])
+            )
+            logger.warning(f"⏰ Lease expired for job {row['job_id']}; "
+                           f"{'failed' if exhausted else 're-queued'}")
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            job_id=row["job_id"],
+            payload=json.loads(row["payload"]),
+            state=JobState(row["state"]),
+            priority=JobPriority(row["priority"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            available_at=row["available_at"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            lease_owner=row["lease_owner"],
+            lease_expires=row["lease_expires"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"]
+        )
+
+
+class JobWorkerPool:
+    """
+    Worker threads that lease jobs and run them through a handler
+
+    The handler receives the job and returns a result dict; a result with
+    ``success: False`` or an exception counts as a failed attempt. A result
+    with ``retryable: False`` fails the job without re-queueing it, for
+    handlers that already retry internally. Leases of
+    running jobs are renewed in the background, so only jobs of a dead
+    process expire.
+    """
+
+    def __init__(self, queue: DurableJobQueue, handler: Callable[[Job], Dict[str, Any]],
+                 workers: Optional[int] = None, name: str = "video-worker"):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers or queue.config.workers
+        self.name = name
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, str] = {}  # job_id -> worker_id
+        self._running_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"{self.instance_id}-{index}",),
+                                      name=f"{self.name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name=f"{self.name}-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"👷 Started {self.workers} job workers ({self.instance_id})")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self.queue.wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def active_jobs(self) -> List[str]:
+        with self._running_lock:
+            return list(self._running)
+
+    def run_one(self, worker_id: str) -> bool:
+        """Lease and run a single job; False if none was ready"""
+        job = self.queue.lease(worker_id)
+        if job is None:
+            return False
+
+        with self._running_lock:
+            self._running[job.job_id] = worker_id
+        logger.info(f"🎬 {worker_id} processing job {job.job_id} (attempt {job.attempts}/{job.max_attempts})")
+        try:
+            result = self.handler(job)
+            if isinstance(result, dict) and result.get("success") is False:
+                self.queue.fail(job.job_id, worker_id, str(result.get("error") or "Job failed"),
+                                retryable=result.get("retryable", True), result=result)
+            else:
+                self.queue.complete(job.job_id, worker_id, result if isinstance(result, dict) else {"result": result})
+        except Exception as e:
+            logger.error(f"Job {job.job_id} raised: {e}")
+            self.queue.fail(job.job_id, worker_id, str(e))
+        finally:
+            with self._running_lock:
+                self._running.pop(job.job_id, None)
+        return True
+
+    def _work(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                if self.run_one(worker_id):
+                    continue
+            except sqlite3.Error as e:
+                logger.error(f"Job queue error: {e}")
+            # Idle: sleep until a job is enqueued or the next poll (retries become due over time)
+            self.queue.wakeup.wait(self.queue.config.poll_interval)
+            self.queue.wakeup.clear()
+
+    def _heartbeat(self):
+        interval = max(1.0, self.queue.config.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            with self._running_lock:
+                running = dict(self._running)
+            for job_id, worker_id in running.items():
+                try:
+                    if not self.queue.heartbeat(job_id, worker_id):
+                        logger.warning(f"⚠️ Lost lease on job {job_id}")
+                except sqlite3.Error as e:
+                    logger.error(f"Lease renewal failed for {job_id}: {e}")
@@ -1,7 +1,8 @@
 """
 Video Generator Microservice
 Runs as independent HTTP server on port 8002
-Handles VEO3 video generation with retry logic
+Handles VEO3 video generation with retry logic; async jobs go through a
+durable SQLite queue drained by a worker pool
 """
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
@@ -14,9 +15,13 @@ from datetime import datetime
 import requests
 import redis
 import logging
-from queue import Queue
 import threading
 
+try:
+    from .job_queue import DurableJobQueue, Job, JobQueueConfig, JobState, JobWorkerPool
+except ImportError:  # Run as a script
+    from job_queue import DurableJobQueue, Job, JobQueueConfig, JobState, JobWorkerPool
+
 app = Flask(__name__)
 CORS(app)
 
@@ -34,9 +39,8 @@ except:
     REDIS_ENABLED = False
     logger.warning("⚠️ Redis not available, using in-memory queue")
 
-# Job queue for async processing
-job_queue = Queue()
-jobs_status = {}
+# Durable job queue for async processing (survives restarts)
+job_queue = DurableJobQueue(JobQueueConfig.from_env())
 
 
 class VideoGenerationService:
@@ -46,6 +50,8 @@ class VideoGenerationService:
         self.generation_count = 0
         self.success_count = 0
         self.failure_count = 0
+        self.active_count = 0
+        self._stats_lock = threading.Lock()
         self.retry_config = {
             "max_attempts": 3,
             "initial_delay": 2.0,
@@ -60,18 +66,12 @@ class VideoGenerationService:
         self.output_dir = "/tmp/video_outputs"
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def generate_video(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_video(self, request: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate video with retry logic"""
-        job_id = str(uuid.uuid4())
-        start_time = datetime.now()
-        self.generation_count += 1
-        
-        # Update job status
-        jobs_status[job_id] = {
-            "status": "processing",
-            "started_at": start_time.isoformat(),
-            "request": request
-        }
+        job_id = job_id or str(uuid.uuid4())
+        with self._stats_lock:
+            self.generation_count += 1
+            self.active_count += 1
         
         try:
             # Step 1: Optimize prompt if needed
@@ -80,20 +80,11 @@ class VideoGenerationService:
             # Step 2: Try generation with retry
             result = self._generate_with_retry(optimized_prompt, request)
             
-            if result["success"]:
-                self.success_count += 1
-                jobs_status[job_id] = {
-                    "status": "completed",
-                    "result": result,
-                    "completed_at": datetime.now().isoformat()
-                }
-            else:
-                self.failure_count += 1
-                jobs_status[job_id] = {
-                    "status": "failed",
-                    "error": result.get("error"),
-                    "completed_at": datetime.now().isoformat()
-                }
+            with self._stats_lock:
+                if result["success"]:
+                    self.success_count += 1
+                else:
+                    self.failure_count += 1
             
             return {
                 "job_id": job_id,
@@ -102,17 +93,16 @@ class VideoGenerationService:
             
         except Exception as e:
             logger.error(f"Generation failed: {e}")
-            self.failure_count += 1
-            jobs_status[job_id] = {
-                "status": "error",
-                "error": str(e),
-                "completed_at": datetime.now().isoformat()
-            }
+            with self._stats_lock:
+                self.failure_count += 1
             return {
                 "job_id": job_id,
                 "success": False,
                 "error": str(e)
             }
+        finally:
+            with self._stats_lock:
+                self.active_count -= 1
     
     def _optimize_prompt_if_needed(self, request: Dict[str, Any]) -> str:
         """Optimize prompt using prompt optimizer service"""
@@ -187,10 +177,12 @@ class VideoGenerationService:
                     if attempts == 2:
                         prompt = self._simplify_prompt_further(prompt)
         
+        # Retries (with backoff and a simplified prompt) are exhausted; the queue must not repeat them
         return {
             "success": False,
             "error": last_error or "Generation failed after all attempts",
-            "attempts": attempts
+            "attempts": attempts,
+            "retryable": False
         }
     
     def _simulate_veo3_generation(self, prompt: str, duration: float, clip_id: str) -> str:
@@ -227,7 +219,8 @@ class VideoGenerationService:
             "successful": self.success_count,
             "failed": self.failure_count,
             "success_rate": self.success_count / max(1, self.generation_count),
-            "active_jobs": len([j for j in jobs_status.values() if j["status"] == "processing"])
+            "active_jobs": self.active_count,
+            "queue": job_queue.counts()
         }
 
 
@@ -235,24 +228,14 @@ class VideoGenerationService:
 video_service = VideoGenerationService()
 
 
-# Background worker for async processing
-def process_jobs():
-    """Background worker to process jobs from queue"""
-    while True:
-        try:
-            if not job_queue.empty():
-                job = job_queue.get()
-                logger.info(f"Processing job from queue: {job['job_id']}")
-                result = video_service.generate_video(job['request'])
-                jobs_status[job['job_id']] = result
-        except Exception as e:
-            logger.error(f"Job processing error: {e}")
-        time.sleep(1)
+# Worker pool for async processing
+def process_job(job: Job) -> Dict[str, Any]:
+    """Run one leased job; only failures outside the generation retries are retried by the queue"""
+    return video_service.generate_video(job.payload, job_id=job.job_id)
 
 
-# Start background worker
-worker_thread = threading.Thread(target=process_jobs, daemon=True)
-worker_thread.start()
+worker_pool = JobWorkerPool(job_queue, process_job)
+worker_pool.start()
 
 
 # ============= HTTP API Endpoints =============
@@ -294,24 +277,13 @@ def generate_video_async():
         if not request_data.get('prompt'):
             return jsonify({"error": "No prompt provided"}), 400
         
-        job_id = str(uuid.uuid4())
-        job = {
-            "job_id": job_id,
-            "request": request_data
-        }
-        
-        # Add to queue
-        job_queue.put(job)
-        
-        # Store initial status
-        jobs_status[job_id] = {
-            "status": "queued",
-            "queued_at": datetime.now().isoformat()
-        }
+        # Add to queue (priority lane: high, normal or low)
+        job = job_queue.enqueue(request_data, priority=request_data.get("priority", "normal"))
         
         return jsonify({
-            "job_id": job_id,
-            "status": "queued",
+            "job_id": job.job_id,
+            "status": job.state.value,
+            "priority": job.priority.name.lower(),
             "message": "Job queued for processing"
         })
         
@@ -323,10 +295,11 @@ def generate_video_async():
 @app.route('/job/<job_id>', methods=['GET'])
 def get_job_status(job_id):
     """Get job status"""
-    if job_id not in jobs_status:
+    job = job_queue.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
     
-    return jsonify(jobs_status[job_id])
+    return jsonify(job.to_dict())
 
 
 @app.route('/stats', methods=['GET'])
@@ -337,15 +310,20 @@ def get_stats():
 
 @app.route('/jobs', methods=['GET'])
 def list_jobs():
-    """List all jobs"""
+    """List recent jobs"""
+    summary = job_queue.counts()
+    state = request.args.get('status')
+    recent = job_queue.list(
+        state=JobState(state) if state in summary else None,
+        limit=request.args.get('limit', 100, type=int)
+    )
     return jsonify({
-        "total_jobs": len(jobs_status),
-        "jobs": list(jobs_status.keys()),
-        "summary": {
-            "queued": len([j for j in jobs_status.values() if j.get("status") == "queued"]),
-            "processing": len([j for j in jobs_status.values() if j.get("status") == "processing"]),
-            "completed": len([j for j in jobs_status.values() if j.get("status") == "completed"]),
-            "failed": len([j for j in jobs_status.values() if j.get("status") == "failed"])
+        "total_jobs": sum(summary.values()),
+        "jobs": [job.job_id for job in recent],
+        "summary": summary,
+        "workers": {
+            "pool_size": worker_pool.workers,
+            "active_jobs": worker_pool.active_jobs
         }
     })
 
@@ -190,6 +190,7 @@ class GeneratedVideoConfig:
     images_per_second: int = 2
     cheap_mode: bool = False  # Enable cost-saving mode
     cheap_mode_level: str = "full"  # Granular cheap mode: full, audio, video
+    rendition_platforms: Optional[List[str]] = None  # Emit per-platform renditions of the final video
 
     def __post_init__(self):
         if self.main_content is None:
@@ -5,11 +5,17 @@ Trending Services - Real-time trending data from multiple platforms
 from .youtube_trending_service import YouTubeTrendingService
 from .tiktok_trending_service import TikTokTrendingService
 from .instagram_trending_service import InstagramTrendingService
+from .trending_snapshot_store import TrendingSnapshotStore, TrendingSnapshotConfig, get_trending_snapshot_store
+from .local_trending_source import LocalTrendingSource
 from .unified_trending_analyzer import UnifiedTrendingAnalyzer
 
 __all__ = [
     'YouTubeTrendingService',
     'TikTokTrendingService', 
     'InstagramTrendingService',
-    'UnifiedTrendingAnalyzer'
+    'UnifiedTrendingAnalyzer',
+    'TrendingSnapshotStore',
+    'TrendingSnapshotConfig',
+    'get_trending_snapshot_store',
+    'LocalTrendingSource'
 ]
\ No newline at end of file
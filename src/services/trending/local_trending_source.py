@@ -0,0 +1,73 @@
+"""
+Local Trending Source - Deterministic stand-in for the platform trending APIs
+Used in tests and offline runs so no third-party quota is spent
+"""
+
+import hashlib
+from typing import Dict, List, Any, Optional
+
+from ...utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_BASE_TAGS = [
+    'viral', 'trending', 'fyp', 'comedy', 'news', 'tech', 'ai', 'music',
+    'dance', 'food', 'travel', 'fitness', 'fashion', 'education', 'gaming'
+]
+
+
+class LocalTrendingSource:
+    """Produces stable, API-shaped trending data without network access"""
+
+    def __init__(self, seed: str = "viralai"):
+        self.seed = seed
+
+    def get_platform_trends(self, platform: str, keyword: Optional[str], limit: int) -> Dict[str, Any]:
+        """Return trending data shaped like the real platform fetchers"""
+        platform = platform.lower()
+        hashtags = self._hashtags(platform, keyword, limit)
+
+        if platform == 'youtube':
+            videos = [
+                {
+                    'video_id': f"local{i:04d}",
+                    'title': f"{(keyword or tag['tag'][1:]).title()} explained #{i + 1}",
+                    'view_count': int(tag['usage_count'] / 10),
+                    'tags': [tag['tag'][1:]]
+                }
+                for i, tag in enumerate(hashtags)
+            ]
+            return {
+                'trending_videos': videos,
+                'trending_tags': [{'tag': t['tag'][1:], 'count': len(hashtags) - i} for i, t in enumerate(hashtags)],
+                'analysis': {'optimal_duration_range': {'sweet_spot': 60}, 'trending_title_words': []}
+            }
+
+        if platform == 'tiktok':
+            return {
+                'trending_hashtags': hashtags,
+                'trending_sounds': [{'name': f"Local Sound {i + 1}", 'trend_score': 0.9 - i * 0.05} for i in range(5)],
+                'trending_effects': [],
+                'analysis': {}
+            }
+
+        return {
+            'trending_hashtags': hashtags,
+            'trending_reels_formats': [],
+            'trending_audio': [],
+            'analysis': {}
+        }
+
+    def _hashtags(self, platform: str, keyword: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        tags = ([keyword.replace(' ', '').lower()] if keyword else []) + _BASE_TAGS
+        results = []
+        for i, tag in enumerate(tags[:limit]):
+            digest = hashlib.sha256(f"{self.seed}:{platform}:{tag}".encode()).digest()
+            results.append({
+                'tag': f"#{tag}",
+                'platform': platform,
+                'trend_score': round(0.99 - i * 0.02, 2),
+                'usage_count': 1_000_000 + int.from_bytes(digest[:3], 'big'),
+                'category': 'general'
+            })
+        return results
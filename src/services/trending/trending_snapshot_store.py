@@ -0,0 +1,311 @@
+"""
+Trending Snapshot Store - Shared cache of platform trending data
+Per-platform TTLs, stale-while-revalidate refresh, request coalescing and a
+compact on-disk history for computing trend deltas without refetching
+"""
+
+import os
+import copy
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (platform, keyword, limit, source)
+SnapshotKey = Tuple[str, Optional[str], int, str]
+
+# Data source of snapshots fetched from the platform APIs
+API_SOURCE = "api"
+
+# List fields and the keys used to name and score their items in history records
+_HISTORY_FIELDS = ('trending_hashtags', 'trending_videos', 'trending_tags', 'trending_sounds')
+_NAME_KEYS = ('tag', 'video_id', 'name', 'title')
+_SCORE_KEYS = ('trend_score', 'view_count', 'usage_count', 'count')
+
+
+@dataclass
+class TrendingSnapshotConfig:
+    """Configuration for the trending snapshot store"""
+    # Seconds a snapshot is served without refreshing
+    platform_ttls: Dict[str, int] = field(default_factory=lambda: {
+        'youtube': 3600,
+        'tiktok': 1800,
+        'instagram': 3600
+    })
+    default_ttl: int = 3600
+    # Stale snapshots younger than ttl * stale_multiplier are served while refreshing
+    stale_multiplier: float = 6.0
+    refresh_workers: int = 3
+    history_dir: Optional[str] = os.path.join("cache", "trending_history")
+    history_items: int = 50
+    history_max_bytes: int = 5 * 1024 * 1024
+
+
+@dataclass
+class TrendingSnapshot:
+    """Platform trending data captured at a point in time"""
+    data: Dict[str, Any]
+    fetched_at: float
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class TrendingSnapshotStore:
+    """
+    Process-wide store of trending snapshots
+
+    All analyzers share one store, so concurrent sessions asking for the
+    same platform/keyword trigger a single upstream fetch. Snapshots and
+    history are kept per data source, so stand-in data never answers for
+    real API results. Callers get their own copy of the data.
+    """
+
+    def __init__(self, config: Optional[TrendingSnapshotConfig] = None):
+        self.config = config or TrendingSnapshotConfig()
+        self._snapshots: Dict[SnapshotKey, TrendingSnapshot] = {}
+        self._in_flight: Dict[SnapshotKey, Future] = {}
+        self._recent_history: Dict[SnapshotKey, List[Dict[str, Any]]] = {}
+        self._history_loaded = set()
+        self._lock = threading.Lock()
+        self._history_lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=self.config.refresh_workers,
+            thread_name_prefix="trending-refresh"
+        )
+
+        if self.config.history_dir:
+            os.makedirs(self.config.history_dir, exist_ok=True)
+
+    def ttl_for(self, platform: str) -> int:
+        return self.config.platform_ttls.get(platform, self.config.default_ttl)
+
+    def get(self,
+            platform: str,
+            keyword: Optional[str],
+            limit: int,
+            fetcher: Callable[[], Dict[str, Any]],
+            source: str = API_SOURCE) -> Dict[str, Any]:
+        """
+        Get trending data for a platform, fetching only when needed
+
+        Args:
+            platform: Platform name
+            keyword: Keyword filter used by the fetcher
+            limit: Result limit used by the fetcher
+            fetcher: Callable returning fresh platform data
+            source: Data source the fetcher reads from
+
+        Returns:
+            Copy of the platform trending data (possibly stale while a refresh runs)
+        """
+        key = (platform, keyword, limit, source)
+        ttl = self.ttl_for(platform)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+
+            if snapshot and snapshot.age() < ttl:
+                return copy.deepcopy(snapshot.data)
+
+            if snapshot and snapshot.age() < ttl * self.config.stale_multiplier:
+                # Serve stale data now, refresh once in the background
+                if key not in self._in_flight:
+                    self._in_flight[key] = self._refresh_pool.submit(self._fetch, key, fetcher)
+                    logger.info(f"♻️ Serving stale {platform} trends, refreshing in background")
+                return copy.deepcopy(snapshot.data)
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if owner:
+            # Fetch on the caller's thread; concurrent callers wait on the same future
+            try:
+                future.set_result(self._fetch(key, fetcher))
+            except Exception as e:
+                future.set_exception(e)
+
+        # Waiters share the future's result, so each gets its own copy
+        return copy.deepcopy(future.result())
+
+    def peek(self, platform: str, keyword: Optional[str], limit: int,
+             source: str = API_SOURCE) -> Optional[TrendingSnapshot]:
+        """Return the cached snapshot without triggering a fetch"""
+        with self._lock:
+            return self._snapshots.get((platform, keyword, limit, source))
+
+    def put(self, platform: str, keyword: Optional[str], limit: int, data: Dict[str, Any],
+            source: str = API_SOURCE):
+        """Store a snapshot directly (e.g. data fetched elsewhere)"""
+        key = (platform, keyword, limit, source)
+        with self._lock:
+            self._snapshots[key] = TrendingSnapshot(data=copy.deepcopy(data), fetched_at=time.time())
+        self._record_history(key, data)
+
+    def invalidate(self, platform: Optional[str] = None):
+        """Drop cached snapshots for a platform, or all of them"""
+        with self._lock:
+            for key in [k for k in self._snapshots if platform is None or k[0] == platform]:
+                del self._snapshots[key]
+
+    def get_trend_deltas(self, platform: str, keyword: Optional[str] = None, limit: Optional[int] = None,
+                         source: str = API_SOURCE) -> Dict[str, Any]:
+        """
+        Compare the two most recent history records for a platform
+
+        Returns:
+            Dictionary with new, dropped, rising and falling items
+        """
+        records = self._history_for(platform, keyword, limit, source)
+        if len(records) < 2:
+            return {'platform': platform, 'keyword': keyword, 'available': False}
+
+        previous, current = records[-2], records[-1]
+        prev_scores = dict((name, score) for name, score in previous['items'])
+        curr_scores = dict((name, score) for name, score in current['items'])
+
+        changes = [(name, score - prev_scores[name]) for name, score in curr_scores.items()
+                   if name in prev_scores and score != prev_scores[name]]
+
+        return {
+            'platform': platform,
+            'keyword': keyword,
+            'available': True,
+            'from': previous['ts'],
+            'to': current['ts'],
+            'new': [name for name in curr_scores if name not in prev_scores],
+            'dropped': [name for name in prev_scores if name not in curr_scores],
+            'rising': sorted([c for c in changes if c[1] > 0], key=lambda c: c[1], reverse=True),
+            'falling': sorted([c for c in changes if c[1] < 0], key=lambda c: c[1])
+        }
+
+    def shutdown(self):
+        """Stop background refresh workers"""
+        self._refresh_pool.shutdown(wait=False)
+
+    def _fetch(self, key: SnapshotKey, fetcher: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            data = fetcher()
+        except Exception as e:
+            logger.error(f"❌ Error refreshing {key[0]} trends: {e}")
+            data = {'error': str(e)}
+
+        valid = isinstance(data, dict) and 'error' not in data
+        with self._lock:
+            if valid:
+                self._snapshots[key] = TrendingSnapshot(data=data, fetched_at=time.time())
+            snapshot = self._snapshots.get(key)
+            self._in_flight.pop(key, None)
+
+        if valid:
+            self._record_history(key, data)
+            return data
+
+        # Keep serving the last good snapshot if the refresh failed
+        return snapshot.data if snapshot else data
+
+    def _history_path(self, platform: str, source: str) -> Optional[str]:
+        if not self.config.history_dir:
+            return None
+        if source == API_SOURCE:
+            return os.path.join(self.config.history_dir, f"{platform}.jsonl")
+        return os.path.join(self.config.history_dir, source, f"{platform}.jsonl")
+
+    def _record_history(self, key: SnapshotKey, data: Dict[str, Any]):
+        record = {
+            'ts': time.time(),
+            'keyword': key[1],
+            'limit': key[2],
+            'items': self._compact_items(data)
+        }
+        if not record['items']:
+            return
+
+        self._history_for(*key)
+        with self._history_lock:
+            recent = self._recent_history.setdefault(key, [])
+            recent.append(record)
+            del recent[:-2]
+
+            path = self._history_path(key[0], key[3])
+            if not path:
+                return
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.exists(path) and os.path.getsize(path) > self.config.history_max_bytes:
+                    os.replace(path, path + ".1")
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write trending history: {e}")
+
+    def _history_for(self, platform: str, keyword: Optional[str], limit: Optional[int],
+                     source: str = API_SOURCE) -> List[Dict[str, Any]]:
+        """Last two records for a key, loading them from disk once per platform and source"""
+        with self._history_lock:
+            if (platform, source) not in self._history_loaded:
+                self._history_loaded.add((platform, source))
+                self._load_history(platform, source)
+
+            if limit is not None:
+                return list(self._recent_history.get((platform, keyword, limit, source), []))
+
+            # Without an explicit limit, use whichever limit was recorded most recently
+            candidates = [records for (plat, kw, _, src), records in self._recent_history.items()
+                          if plat == platform and kw == keyword and src == source and records]
+            return list(max(candidates, key=lambda r: r[-1]['ts'])) if candidates else []
+
+    def _load_history(self, platform: str, source: str):
+        path = self._history_path(platform, source)
+        if not path or not os.path.exists(path):
+            return
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (platform, record.get('keyword'), record.get('limit'), source)
+                recent = self._recent_history.setdefault(key, [])
+                recent.append(record)
+                del recent[:-2]
+
+    def _compact_items(self, data: Dict[str, Any]) -> List[List[Any]]:
+        for field_name in _HISTORY_FIELDS:
+            items = data.get(field_name)
+            if not items:
+                continue
+
+            compact = []
+            for item in items[:self.config.history_items]:
+                if not isinstance(item, dict):
+                    continue
+                name = next((item[k] for k in _NAME_KEYS if item.get(k)), None)
+                score = next((item[k] for k in _SCORE_KEYS if isinstance(item.get(k), (int, float))), 0)
+                if name:
+                    compact.append([str(name), score])
+            return compact
+        return []
+
+
+_default_store: Optional[TrendingSnapshotStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_trending_snapshot_store() -> TrendingSnapshotStore:
+    """Get the process-wide trending snapshot store"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TrendingSnapshotStore()
+        return _default_store
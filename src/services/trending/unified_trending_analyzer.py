@@ -11,6 +11,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from .youtube_trending_service import YouTubeTrendingService
 from .tiktok_trending_service import TikTokTrendingService
 from .instagram_trending_service import InstagramTrendingService
+from .trending_snapshot_store import API_SOURCE, TrendingSnapshotStore, get_trending_snapshot_store
+from .local_trending_source import LocalTrendingSource
 from ...utils.logging_config import get_logger
 from ...utils.session_context import SessionContext
 
@@ -22,13 +24,36 @@ class UnifiedTrendingAnalyzer:
     from YouTube, TikTok, and Instagram
     """
     
-    def __init__(self):
-        """Initialize all platform services"""
-        self.youtube_service = YouTubeTrendingService()
-        self.tiktok_service = TikTokTrendingService()
-        self.instagram_service = InstagramTrendingService()
+    def __init__(self,
+                 snapshot_store: Optional[TrendingSnapshotStore] = None,
+                 use_local_source: Optional[bool] = None):
+        """
+        Initialize all platform services
         
-        logger.info("✅ Unified Trending Analyzer initialized with real APIs")
+        Args:
+            snapshot_store: Trending snapshot cache (defaults to the shared process-wide store)
+            use_local_source: Use deterministic local data instead of platform APIs
+                (defaults to the TRENDING_LOCAL_SOURCE environment variable)
+        """
+        self.snapshot_store = snapshot_store or get_trending_snapshot_store()
+        
+        if use_local_source is None:
+            use_local_source = os.getenv('TRENDING_LOCAL_SOURCE', '').lower() in ('1', 'true', 'yes')
+        
+        if use_local_source:
+            self.local_source = LocalTrendingSource()
+            self.data_source = "local"
+            self.youtube_service = None
+            self.tiktok_service = None
+            self.instagram_service = None
+            logger.info("✅ Unified Trending Analyzer initialized with local stand-in data")
+        else:
+            self.local_source = None
+            self.data_source = API_SOURCE
+            self.youtube_service = YouTubeTrendingService()
+            self.tiktok_service = TikTokTrendingService()
+            self.instagram_service = InstagramTrendingService()
+            logger.info("✅ Unified Trending Analyzer initialized with real APIs")
     
     def get_all_trending_data(self, 
                             platform: Optional[str] = None,
@@ -58,15 +83,10 @@ class UnifiedTrendingAnalyzer:
         with ThreadPoolExecutor(max_workers=3) as executor:
             futures = {}
             
-            # Submit tasks based on platform preference
-            if not platform or platform.lower() in ['youtube', 'all']:
-                futures['youtube'] = executor.submit(self._get_youtube_trends, keyword, limit)
-            
-            if not platform or platform.lower() in ['tiktok', 'all']:
-                futures['tiktok'] = executor.submit(self._get_tiktok_trends, limit)
-            
-            if not platform or platform.lower() in ['instagram', 'all']:
-                futures['instagram'] = executor.submit(self._get_instagram_trends, limit)
+            # Submit tasks based on platform preference (served from snapshots when fresh)
+            for platform_name in ['youtube', 'tiktok', 'instagram']:
+                if not platform or platform.lower() in [platform_name, 'all']:
+                    futures[platform_name] = executor.submit(self._platform_trends, platform_name, keyword, limit)
             
             # Collect results
             for platform_name, future in futures.items():
@@ -106,16 +126,16 @@ class UnifiedTrendingAnalyzer:
         
         # Get platform-specific hashtags
         if platform.lower() == 'tiktok':
-            tiktok_hashtags = self.tiktok_service.get_trending_hashtags(limit)
+            tiktok_hashtags = self._platform_trends('tiktok', None, limit).get('trending_hashtags', [])
             all_hashtags.extend(tiktok_hashtags)
         
         elif platform.lower() == 'instagram':
-            instagram_hashtags = self.instagram_service.get_trending_hashtags(limit)
+            instagram_hashtags = self._platform_trends('instagram', None, limit).get('trending_hashtags', [])
             all_hashtags.extend(instagram_hashtags)
         
         elif platform.lower() == 'youtube':
             # YouTube uses tags rather than hashtags
-            youtube_data = self._get_youtube_trends(mission, 10)
+            youtube_data = self._platform_trends('youtube', mission, 10)
             youtube_tags = youtube_data.get('trending_tags', [])
             
             # Convert YouTube tags to hashtag format
@@ -264,6 +284,31 @@ class UnifiedTrendingAnalyzer:
             logger.error(f"❌ Failed to save trending analysis: {e}")
             return None
     
+    def get_trend_deltas(self, platform: str, keyword: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get new, dropped, rising and falling trends since the previous snapshot
+        
+        Computed from the on-disk snapshot history, so no API calls are made.
+        """
+        platform = platform.lower()
+        cache_keyword = keyword if platform == 'youtube' else None
+        return self.snapshot_store.get_trend_deltas(platform, cache_keyword, source=self.data_source)
+    
+    def _platform_trends(self, platform: str, keyword: Optional[str], limit: int) -> Dict[str, Any]:
+        """Get one platform's trends through the snapshot store"""
+        if self.local_source:
+            fetcher = lambda: self.local_source.get_platform_trends(platform, keyword, limit)
+        elif platform == 'youtube':
+            fetcher = lambda: self._get_youtube_trends(keyword, limit)
+        elif platform == 'tiktok':
+            fetcher = lambda: self._get_tiktok_trends(limit)
+        else:
+            fetcher = lambda: self._get_instagram_trends(limit)
+        
+        # Only YouTube filters by keyword, so other platforms share one snapshot per limit
+        cache_keyword = keyword if platform == 'youtube' else None
+        return self.snapshot_store.get(platform, cache_keyword, limit, fetcher, source=self.data_source)
+    
     def _get_youtube_trends(self, keyword: Optional[str], limit: int) -> Dict[str, Any]:
         """Get YouTube trending data"""
         try:
@@ -0,0 +1,270 @@
+"""
+Metrics Core for the Performance Monitor
+Fixed-size log-bucketed histograms, counters and gauges fed through
+per-thread buffers, with interval rollups and OpenMetrics text export
+"""
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LogHistogram:
+    """
+    HDR-style histogram with bounded relative error
+
+    Values are placed in logarithmic buckets growing by ``1 + precision``,
+    so any reported percentile is within ``precision`` of a recorded value.
+    Buckets are stored sparsely and the bucket range is fixed by
+    ``min_value``/``max_value``, so memory stays bounded however many values
+    are recorded.
+    """
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-6, max_value: float = 1e9):
+        self.precision = precision
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, count: int = 1):
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < self.min_value:
+            self.zero_count += count
+            return
+        index = int(math.log(min(value, self.max_value) / self.min_value) / self._log_base)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other: "LogHistogram"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, quantile: float) -> float:
+        """Value at ``quantile`` (0-1), clamped to the observed min/max"""
+        if self.count == 0:
+            return 0.0
+        rank = quantile * self.count
+        if rank >= self.count:
+            return self.max
+        # Values below min_value share one bucket represented by the observed min
+        if self.zero_count and rank <= self.zero_count:
+            return self.min
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Midpoint of the bucket in log space
+                value = self.min_value * math.exp((index + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, float]:
+        stats = {
+            "count": self.count,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "avg": self.mean,
+            "total": self.total
+        }
+        for quantile in quantiles:
+            stats[f"p{int(round(quantile * 100))}"] = self.percentile(quantile)
+        return stats
+
+
+class MetricsRegistry:
+    """
+    Thread-friendly store of histograms, counters and gauges
+
+    Recording threads append to their own buffer without taking a lock;
+    buffers are drained into the shared histograms when they fill up or
+    when a reader asks for data. Histograms exist twice: cumulative (for
+    export) and per rollup interval (for windowed percentiles).
+    """
+
+    def __init__(self, flush_size: int = 256, retained_rollups: int = 60,
+                 precision: float = 0.01):
+        """
+        Args:
+            flush_size: Buffered events per thread before it drains itself
+            retained_rollups: Interval rollups kept for windowed summaries
+            precision: Relative error of histogram percentiles
+        """
+        self.flush_size = flush_size
+        self.precision = precision
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, deque]] = []
+        self._lock = threading.Lock()
+
+        self.histograms: Dict[str, LogHistogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.latest: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+
+        self._interval: Dict[str, LogHistogram] = {}
+        self._interval_started = time.monotonic()
+        self.rollups: deque = deque(maxlen=retained_rollups)
+
+    # Recording (lock-free on the hot path)
+
+    def observe(self, name: str, value: float, unit: str = ""):
+        self._buffer().append((0, name, value))
+        if unit and name not in self.units:
+            self.units[name] = unit
+        self._maybe_flush()
+
+    def increment(self, name: str, value: float = 1):
+        self._buffer().append((1, name, value))
+        self._maybe_flush()
+
+    def set_gauge(self, name: str, value: float, unit: str = ""):
+        self.gauges[name] = value
+        if unit:
+            self.units[name] = unit
+        self.observe(name, value, unit)
+
+    def _buffer(self) -> deque:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = deque()
+            self._local.buffer = buffer
+            with self._lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        return buffer
+
+    def _maybe_flush(self):
+        if len(self._local.buffer) >= self.flush_size:
+            self.flush()
+
+    # Draining and reading
+
+    def flush(self):
+        """Drain every thread's buffer into the shared histograms and counters"""
+        with self._lock:
+            live = []
+            for thread, buffer in self._buffers:
+                while True:
+                    try:
+                        kind, name, value = buffer.popleft()
+                    except IndexError:
+                        break
+                    if kind == 0:
+                        self._histogram(self.histograms, name).record(value)
+                        self._histogram(self._interval, name).record(value)
+                        self.latest[name] = value
+                    else:
+                        self.counters[name] = self.counters.get(name, 0) + value
+                if thread.is_alive():
+                    live.append((thread, buffer))
+            self._buffers = live
+
+    def rollup(self) -> Dict[str, Dict[str, float]]:
+        """Close the current interval and return its percentile summary per metric"""
+        self.flush()
+        with self._lock:
+            interval, self._interval = self._interval, {}
+            started, self._interval_started = self._interval_started, time.monotonic()
+            self.rollups.append((started, self._interval_started, interval))
+        return {name: histogram.summary() for name, histogram in interval.items()}
+
+    def window(self, seconds: float) -> Dict[str, LogHistogram]:
+        """Merged histograms for the last ``seconds`` (rollup granularity)"""
+        self.flush()
+        cutoff = time.monotonic() - seconds
+        merged: Dict[str, LogHistogram] = {}
+        with self._lock:
+            intervals = [hist for _, ended, hist in self.rollups if ended >= cutoff]
+            intervals.append(self._interval)
+            for interval in intervals:
+                for name, histogram in interval.items():
+                    self._histogram(merged, name).merge(histogram)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            for _, buffer in self._buffers:
+                buffer.clear()
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.latest.clear()
+            self.units.clear()
+            self._interval = {}
+            self.rollups.clear()
+
+    def _histogram(self, table: Dict[str, LogHistogram], name: str) -> LogHistogram:
+        histogram = table.get(name)
+        if histogram is None:
+            histogram = LogHistogram(self.precision)
+            table[name] = histogram
+        return histogram
+
+    # Export
+
+    def to_openmetrics(self, prefix: str = "",
+                       quantiles: Iterable[float] = DEFAULT_QUANTILES) -> str:
+        """
+        Render counters, gauges and histogram summaries as OpenMetrics text
+
+        Units are left out: OpenMetrics requires a metric name to end in its
+        unit, and the recorded units (percent, MB, GB) are not base units.
+        They remain available in the JSON summaries.
+        """
+        self.flush()
+        lines: List[str] = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(prefix, name)
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}_total {_format_value(value)}")
+            for name, value in sorted(self.gauges.items()):
+                metric = _metric_name(prefix, name)
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {_format_value(value)}")
+            for name, histogram in sorted(self.histograms.items()):
+                if name in self.gauges:
+                    continue
+                metric = _metric_name(prefix, name)
+                lines.append(f"# TYPE {metric} summary")
+                for quantile in quantiles:
+                    lines.append(f'{metric}{{quantile="{quantile}"}} {_format_value(histogram.percentile(quantile))}')
+                lines.append(f"{metric}_count {histogram.count}")
+                lines.append(f"{metric}_sum {_format_value(histogram.total)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+_INVALID_METRIC_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    metric = _INVALID_METRIC_CHARS.sub("_", f"{prefix}_{name}" if prefix else name)
+    return metric if not metric[:1].isdigit() else f"_{metric}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
@@ -6,14 +6,15 @@ Tracks system metrics, API calls, and generation performance
 import time
 import psutil
 import threading
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable
 from dataclasses  import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
 import logging
 import json
 from pathlib import Path
 
+from .metrics_core import MetricsRegistry
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -27,7 +28,7 @@ class PerformanceMetric:
 
 @dataclass
 class TimingContext:
-    """Context for timing operations"""
+    """Context for timing operations (start_time is a perf_counter reading)"""
     name: str
     start_time: float
     tags: Dict[str, str] = field(default_factory=dict)
@@ -37,26 +38,32 @@ class PerformanceMonitor:
     Comprehensive performance monitoring system
 
     Tracks system metrics, API performance, and generation statistics
-    with real-time monitoring and historical analysis.
+    with real-time monitoring and historical analysis. Values are kept in
+    fixed-size histograms, so memory stays flat in long-running processes;
+    percentile rollups are taken every ``rollup_interval`` seconds.
     """
 
-    def __init__(self, name: str = "ai_video_generator"):
+    def __init__(self, name: str = "ai_video_generator", rollup_interval: float = 60.0,
+                 retained_rollups: int = 60):
         """
         Initialize performance monitor
 
         Args:
             name: Name of the monitoring instance
+            rollup_interval: Seconds between percentile rollups
+            retained_rollups: Rollups kept for windowed summaries
         """
         self.name = name
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self.timers: Dict[str, List[float]] = defaultdict(list)
+        self.registry = MetricsRegistry(retained_rollups=retained_rollups)
+        self.timer_names: set = set()
 
         # System monitoring
         self.system_monitoring = True
         self.monitoring_thread = None
         self.monitoring_interval = 30  # seconds
+        self.rollup_interval = rollup_interval
+        self._last_rollup = time.monotonic()
+        self._stop_event = threading.Event()
 
         # Performance thresholds
         self.thresholds = {
@@ -71,6 +78,15 @@ class PerformanceMonitor:
 
         logger.info(f"📊 Performance monitor '{name}' initialized")
 
+    @property
+    def counters(self) -> Dict[str, float]:
+        self.registry.flush()
+        return self.registry.counters
+
+    @property
+    def gauges(self) -> Dict[str, float]:
+        return self.registry.gauges
+
     def record_metric(
         self,
         name: str,
@@ -84,19 +100,10 @@ class PerformanceMonitor:
         Args:
             name: Metric name
             value: Metric value
-            tags: Optional tags for the metric
+            tags: Optional tags for the metric (series are keyed by name only)
             unit: Unit of measurement
         """
-        metric = PerformanceMetric(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            tags=tags or {},
-            unit=unit
-        )
-
-        self.metrics[name].append(metric)
-        logger.debug(f"📈 Recorded metric: {name} = {value} {unit}")
+        self.registry.observe(name, value, unit)
 
     def increment_counter(
         self,
@@ -112,8 +119,7 @@ class PerformanceMonitor:
             value: Increment value
             tags: Optional tags
         """
-        self.counters[name] += value
-        self.record_metric(f"{name}_total", self.counters[name], tags, "count")
+        self.registry.increment(name, value)
 
     def set_gauge(
         self,
@@ -131,8 +137,7 @@ class PerformanceMonitor:
             tags: Optional tags
             unit: Unit of measurement
         """
-        self.gauges[name] = value
-        self.record_metric(name, value, tags, unit)
+        self.registry.set_gauge(name, value, unit)
 
     def time_operation(
         self,
@@ -151,7 +156,7 @@ class PerformanceMonitor:
         """
         return TimingContext(
             name=name,
-            start_time=time.time(),
+            start_time=time.perf_counter(),
             tags=tags or {})
 
     def finish_timing(self, context: TimingContext):
@@ -161,8 +166,8 @@ class PerformanceMonitor:
         Args:
             context: TimingContext from time_operation
         """
-        duration = time.time() - context.start_time
-        self.timers[context.name].append(duration)
+        duration = time.perf_counter() - context.start_time
+        self.timer_names.add(context.name)
         self.record_metric(
             f"{context.name}_duration",
             duration,
@@ -212,10 +217,15 @@ class PerformanceMonitor:
 
     def _monitor_system_metrics(self):
         """Monitor system metrics continuously"""
+        # Non-blocking CPU sampling measures usage since the previous call
+        psutil.cpu_percent(interval=None)
+        process = psutil.Process()
+        process.cpu_percent(interval=None)
+
         while self.system_monitoring:
             try:
                 # CPU metrics
-                cpu_percent = psutil.cpu_percent(interval=1)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 self.set_gauge("system_cpu_usage", cpu_percent, unit="percent")
 
                 # Memory metrics
@@ -240,8 +250,7 @@ class PerformanceMonitor:
                     pass
 
                 # Process metrics
-                process = psutil.Process()
-                self.set_gauge("process_cpu_usage", process.cpu_percent(), unit="percent")
+                self.set_gauge("process_cpu_usage", process.cpu_percent(interval=None), unit="percent")
                 self.set_gauge(
                     "process_memory_usage",
                     process.memory_info().rss / (1024**2),
@@ -250,11 +259,37 @@ class PerformanceMonitor:
                 # Check thresholds
                 self._check_thresholds()
 
-                time.sleep(self.monitoring_interval)
+                if time.monotonic() - self._last_rollup >= self.rollup_interval:
+                    self.rollup()
 
             except Exception as e:
                 logger.error(f"❌ Error in system monitoring: {e}")
-                time.sleep(self.monitoring_interval)
+
+            self._stop_event.wait(self.monitoring_interval)
+
+    def rollup(self) -> Dict[str, Dict[str, float]]:
+        """
+        Close the current rollup interval
+
+        Returns:
+            Per-metric count/min/max/avg and p50/p95/p99 for the interval
+        """
+        self._last_rollup = time.monotonic()
+        summary = self.registry.rollup()
+        stages = {name: stats for name, stats in summary.items() if name.endswith("_duration")}
+        for name, stats in sorted(stages.items()):
+            logger.debug(f"📊 {name}: n={stats['count']} p50={stats['p50']:.3f}s "
+                         f"p95={stats['p95']:.3f}s p99={stats['p99']:.3f}s")
+        return summary
+
+    def export_openmetrics(self) -> str:
+        """
+        Render all metrics in the Prometheus/OpenMetrics text format
+
+        Returns:
+            Exposition text ending with ``# EOF``
+        """
+        return self.registry.to_openmetrics(prefix=self.name)
 
     def _check_thresholds(self):
         """Check performance thresholds and log warnings"""
@@ -285,25 +320,20 @@ class PerformanceMonitor:
         if time_window is None:
             time_window = timedelta(hours=1)
 
-        cutoff_time = datetime.now() - time_window
         summary = {}
-
-        for metric_name, metric_deque in self.metrics.items():
-            # Filter metrics within time window
-            recent_metrics = [
-                m for m in metric_deque
-                if m.timestamp >= cutoff_time
-            ]
-
-            if recent_metrics:
-                values = [m.value for m in recent_metrics]
+        for metric_name, histogram in self.registry.window(time_window.total_seconds()).items():
+            if histogram.count:
+                stats = histogram.summary()
                 summary[metric_name] = {
-                    "count": len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                    "latest": values[-1],
-                    "unit": recent_metrics[-1].unit
+                    "count": stats["count"],
+                    "min": stats["min"],
+                    "max": stats["max"],
+                    "avg": stats["avg"],
+                    "p50": stats["p50"],
+                    "p95": stats["p95"],
+                    "p99": stats["p99"],
+                    "latest": self.registry.latest.get(metric_name),
+                    "unit": self.registry.units.get(metric_name, "")
                 }
 
         return summary
@@ -318,18 +348,12 @@ class PerformanceMonitor:
         # Get metrics summary
         metrics_summary = self.get_metrics_summary()
 
-        # Calculate timer statistics
+        # Timer statistics over the process lifetime
         timer_stats = {}
-        for timer_name, durations in self.timers.items():
-            if durations:
-                timer_stats[timer_name] = {
-                    "count": len(durations),
-                    "min": min(durations),
-                    "max": max(durations),
-                    "avg": sum(durations) / len(durations),
-                    "total": sum(durations),
-                    "unit": "seconds"
-                }
+        for timer_name in sorted(self.timer_names):
+            histogram = self.registry.histograms.get(f"{timer_name}_duration")
+            if histogram and histogram.count:
+                timer_stats[timer_name] = dict(histogram.summary(), unit="seconds")
 
         # Current system status
         system_status = {
@@ -366,15 +390,14 @@ class PerformanceMonitor:
 
     def reset_metrics(self):
         """Reset all metrics and statistics"""
-        self.metrics.clear()
-        self.counters.clear()
-        self.gauges.clear()
-        self.timers.clear()
+        self.registry.reset()
+        self.timer_names.clear()
         logger.info(f"🔄 Reset all metrics for monitor '{self.name}'")
 
     def stop_monitoring(self):
         """Stop system monitoring"""
         self.system_monitoring = False
+        self._stop_event.set()
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5)
         logger.info("🛑 Stopped system monitoring")
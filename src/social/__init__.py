@@ -7,11 +7,15 @@ from .instagram_autoposter import InstagramAutoPoster
 from .whatsapp_sender import WhatsAppSender
 from .telegram_sender import TelegramSender
 from .social_media_manager import SocialMediaManager, SocialMediaConfig
+from .upload_pipeline import PublishingPipeline, DeliveryQueue, RateLimiter
 
 __all__ = [
     'InstagramAutoPoster',
     'WhatsAppSender', 
     'TelegramSender',
     'SocialMediaManager',
-    'SocialMediaConfig'
+    'SocialMediaConfig',
+    'PublishingPipeline',
+    'DeliveryQueue',
+    'RateLimiter'
 ]
\ No newline at end of file
@@ -15,6 +15,8 @@ import requests
 from dataclasses import dataclass
 
 from ..utils.logging_config import get_logger
+from .upload_pipeline import ResumableUploader, create_rate_limiter
+from ..utils.rendition_ladder import find_rendition
 
 logger = get_logger(__name__)
 
@@ -99,6 +101,8 @@ class InstagramAutoPoster:
         
         # Instagram Basic Display API token
         self.instagram_access_token = os.getenv('INSTAGRAM_ACCESS_TOKEN')
+        self.graph_api_base = os.getenv('INSTAGRAM_GRAPH_API', "https://graph.instagram.com/v12.0")
+        self.uploader = ResumableUploader(rate_limiter=create_rate_limiter('instagram'))
         
         # Session management
         self.session_file = credentials.session_file or f"instagram_session_{credentials.username}.json"
@@ -414,6 +418,11 @@ class InstagramAutoPoster:
                 logger.error(f"❌ Video file not found: {content.video_path}")
                 return False
             
+            # Use the session's Instagram rendition when one was pre-encoded
+            video_path = find_rendition(content.video_path, 'instagram') or content.video_path
+            if video_path != content.video_path:
+                logger.info(f"🎞️ Using Instagram rendition: {os.path.basename(video_path)}")
+            
             # Prepare caption with hashtags
             full_caption = self._prepare_caption(content)
             
@@ -425,9 +434,9 @@ class InstagramAutoPoster:
             logger.info("🚀 Attempting real Instagram posting with instagrapi...")
             
             if content.is_reel:
-                success = self._upload_reel(content.video_path, full_caption)
+                success = self._upload_reel(video_path, full_caption)
             else:
-                success = self._upload_video_post(content.video_path, full_caption)
+                success = self._upload_video_post(video_path, full_caption)
             
             if success:
                 logger.info("✅ Real Instagram posting successful!")
@@ -643,25 +652,23 @@ class InstagramAutoPoster:
             
             logger.info("🔧 Attempting upload with Instagram Basic Display API...")
             
-            # Instagram Basic Display API endpoints
-            api_base = "https://graph.instagram.com/v12.0"
+            api_base = self.graph_api_base
             
-            # Step 1: Create container for video upload
+            # Step 1: Create a container for a resumable upload
             container_data = {
                 'access_token': self.instagram_access_token,
                 'media_type': 'REELS' if is_reel else 'VIDEO',
-                'video_url': self._upload_to_instagram_server(video_path),
+                'upload_type': 'resumable',
                 'caption': caption,
-                'location_id': None,  # Optional
                 'thumb_offset': 0,    # Optional
                 'share_to_facebook': False  # Optional
             }
             
             # Create container
-            import requests
-            container_response = requests.post(
+            container_response = self.uploader.session.post(
                 f"{api_base}/me/media",
-                data=container_data
+                data=container_data,
+                timeout=60
             )
             
             if container_response.status_code != 200:
@@ -677,15 +684,26 @@ class InstagramAutoPoster:
             
             logger.info(f"✅ Container created with ID: {creation_id}")
             
-            # Step 2: Publish the container
+            # Step 2: Stream the video in chunks; failed chunks resume from the committed offset
+            upload_uri = container_result.get('uri')
+            if not upload_uri:
+                logger.error("❌ No upload URI returned")
+                return False
+            self.uploader.upload(
+                upload_uri, video_path,
+                headers={'Authorization': f"OAuth {self.instagram_access_token}"}
+            )
+            
+            # Step 3: Publish the container
             publish_data = {
                 'access_token': self.instagram_access_token,
                 'creation_id': creation_id
             }
             
-            publish_response = requests.post(
+            publish_response = self.uploader.session.post(
                 f"{api_base}/me/media_publish",
-                data=publish_data
+                data=publish_data,
+                timeout=60
             )
             
             if publish_response.status_code != 200:
@@ -707,26 +725,6 @@ class InstagramAutoPoster:
             logger.error(f"❌ Official API upload failed: {e}")
             return False
 
-    def _upload_to_instagram_server(self, video_path: str) -> str:
-        """Upload video file to Instagram's servers and return URL"""
-        try:
-            # This is a placeholder - Instagram's actual upload process is more complex
-            # and requires special handling of their upload endpoints
-            
-            logger.info("📤 Uploading video to Instagram servers...")
-            
-            # For now, return a placeholder URL
-            # In a real implementation, this would:
-            # 1. Get upload URL from Instagram
-            # 2. Upload video file in chunks
-            # 3. Return the final video URL
-            
-            return f"https://example.com/uploaded_video_{os.path.basename(video_path)}"
-            
-        except Exception as e:
-            logger.error(f"❌ Video upload to Instagram servers failed: {e}")
-            return ""
-    
     def _schedule_post(self, content: PostContent, options: PostingOptions) -> bool:
         """Schedule post for later"""
         try:
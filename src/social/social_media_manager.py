@@ -6,13 +6,15 @@ Unified interface for sending ViralAI videos to WhatsApp and Telegram groups
 
 import os
 import json
-import time
+import uuid
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
 
 from .whatsapp_sender import WhatsAppSender
 from .telegram_sender import TelegramSender
+from .upload_pipeline import DeliveryQueue, DeliveryState, PublishingPipeline
+from ..utils.rendition_ladder import find_rendition
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -40,17 +42,22 @@ class SocialMediaManager:
     - Delivery tracking and analytics
     """
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, delivery_db_path: str = None):
         """
         Initialize social media manager
         
         Args:
             config_path: Path to configuration file (optional)
+            delivery_db_path: SQLite file recording deliveries (optional)
         """
         self.whatsapp_sender = None
         self.telegram_sender = None
         self.configs = {}
         self.sending_history = []
+        self.delivery_db_path = delivery_db_path or os.getenv(
+            'SOCIAL_DELIVERY_DB', os.path.join('outputs', 'social_deliveries.db')
+        )
+        self._pipeline = None
         
         # Load configuration
         if config_path and os.path.exists(config_path):
@@ -173,112 +180,81 @@ class SocialMediaManager:
     
     def send_video_to_all_platforms(self, video_path: str, mission: str, 
                                    platform: str, hashtags: List[str] = None,
-                                   custom_caption: str = None) -> Dict[str, bool]:
+                                   custom_caption: str = None,
+                                   batch_id: str = None) -> Dict[str, bool]:
         """
         Send video to all configured social media platforms
         
+        All groups of all platforms are delivered concurrently, each platform
+        under its own rate limit. Passing the ``batch_id`` of an earlier call
+        resumes it: groups already delivered are skipped.
+        
         Args:
             video_path: Path to the video file
             mission: Video mission/topic
             platform: Target platform (instagram, tiktok, etc.)
             hashtags: List of hashtags to include
             custom_caption: Custom caption (overrides default)
+            batch_id: Id of the publishing batch (optional)
             
         Returns:
             Dictionary with platform results
         """
-        results = {}
+        batch_id = batch_id or str(uuid.uuid4())
+        targets, senders = {}, {}
+        
+        # Pre-encoded renditions (sized for each platform's limits) when the session has them
+        whatsapp_video = find_rendition(video_path, 'whatsapp') or video_path
+        telegram_video = find_rendition(video_path, 'telegram') or video_path
         
-        # Send to WhatsApp
         if self.whatsapp_sender and self.configs['whatsapp'].auto_send:
-            results['whatsapp'] = self._send_to_whatsapp(
-                video_path, mission, platform, hashtags, custom_caption
+            targets['whatsapp'] = list(self.configs['whatsapp'].target_groups)
+            senders['whatsapp'] = lambda group_id: self.whatsapp_sender.deliver_viral_video_package(
+                group_id, whatsapp_video, mission, platform, hashtags
             )
-        else:
-            results['whatsapp'] = False
         
-        # Send to Telegram
         if self.telegram_sender and self.configs['telegram'].auto_send:
-            results['telegram'] = self._send_to_telegram(
-                video_path, mission, platform, hashtags, custom_caption
+            targets['telegram'] = list(self.configs['telegram'].target_groups)
+            senders['telegram'] = lambda chat_id: self.telegram_sender.deliver_viral_video_package(
+                chat_id, telegram_video, mission, platform, hashtags
             )
-        else:
-            results['telegram'] = False
+        
+        deliveries = self.pipeline.publish(batch_id, targets, senders) if targets else []
+        
+        results = {'whatsapp': False, 'telegram': False}
+        for name in targets:
+            platform_deliveries = [d for d in deliveries if d.platform == name]
+            sent = sum(1 for d in platform_deliveries if d.state == DeliveryState.SENT)
+            total = len(platform_deliveries)
+            success_rate = sent / total if total > 0 else 0
+            logger.info(f"📊 {name.title()}: {sent}/{total} groups successful ({success_rate:.1%})")
+            results[name] = sent > 0
         
         # Record sending history
         self._record_sending_history(video_path, mission, platform, results)
         
         return results
     
-    def _send_to_whatsapp(self, video_path: str, mission: str, platform: str,
-                         hashtags: List[str] = None, custom_caption: str = None) -> bool:
-        """Send video to WhatsApp groups"""
-        try:
-            config = self.configs['whatsapp']
-            success_count = 0
-            total_groups = len(config.target_groups)
-            
-            for group_id in config.target_groups:
-                try:
-                    success = self.whatsapp_sender.send_viral_video_package(
-                        group_id, video_path, mission, platform, hashtags
-                    )
-                    
-                    if success:
-                        success_count += 1
-                        logger.info(f"✅ WhatsApp: Video sent to group {group_id}")
-                    else:
-                        logger.error(f"❌ WhatsApp: Failed to send to group {group_id}")
-                    
-                    # Small delay between groups
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"❌ WhatsApp: Error sending to group {group_id}: {e}")
-            
-            success_rate = success_count / total_groups if total_groups > 0 else 0
-            logger.info(f"📊 WhatsApp: {success_count}/{total_groups} groups successful ({success_rate:.1%})")
-            
-            return success_count > 0
-            
-        except Exception as e:
-            logger.error(f"❌ WhatsApp sending error: {e}")
-            return False
+    @property
+    def pipeline(self) -> PublishingPipeline:
+        """Publishing pipeline, created on first use"""
+        if self._pipeline is None:
+            self._pipeline = PublishingPipeline(DeliveryQueue(self.delivery_db_path))
+        return self._pipeline
     
-    def _send_to_telegram(self, video_path: str, mission: str, platform: str,
-                         hashtags: List[str] = None, custom_caption: str = None) -> bool:
-        """Send video to Telegram groups"""
-        try:
-            config = self.configs['telegram']
-            success_count = 0
-            total_groups = len(config.target_groups)
-            
-            for chat_id in config.target_groups:
-                try:
-                    success = self.telegram_sender.send_viral_video_package(
-                        chat_id, video_path, mission, platform, hashtags
-                    )
-                    
-                    if success:
-                        success_count += 1
-                        logger.info(f"✅ Telegram: Video sent to chat {chat_id}")
-                    else:
-                        logger.error(f"❌ Telegram: Failed to send to chat {chat_id}")
-                    
-                    # Small delay between groups
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Telegram: Error sending to chat {chat_id}: {e}")
-            
-            success_rate = success_count / total_groups if total_groups > 0 else 0
-            logger.info(f"📊 Telegram: {success_count}/{total_groups} chats successful ({success_rate:.1%})")
-            
-            return success_count > 0
-            
-        except Exception as e:
-            logger.error(f"❌ Telegram sending error: {e}")
-            return False
+    def get_delivery_status(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Per-group delivery outcomes of a publishing batch"""
+        return [
+            {
+                'platform': d.platform,
+                'target': d.target,
+                'state': d.state.value,
+                'attempts': d.attempts,
+                'error': d.error,
+                'updated_at': d.updated_at
+            }
+            for d in self.pipeline.queue.list(batch_id)
+        ]
     
     def _record_sending_history(self, video_path: str, mission: str, platform: str, results: Dict[str, bool]):
         """Record sending history for analytics"""
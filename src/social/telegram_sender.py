@@ -7,12 +7,13 @@ Sends generated videos to Telegram groups using Telegram Bot API
 import os
 import requests
 import json
-import time
+import threading
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 import logging
 
 from ..utils.logging_config import get_logger
+from .upload_pipeline import MultipartFileStream, TransientUploadError, raise_for_transient
 
 logger = get_logger(__name__)
 
@@ -40,6 +41,13 @@ class TelegramSender:
         self.bot_token = bot_token
         self.bot_username = bot_username
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.session = requests.Session()
+        self.upload_timeout = 300
+        
+        # Telegram file_ids of uploaded videos, so fan-out uploads each file once
+        self._file_ids: Dict[tuple, str] = {}
+        self._upload_locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
         
         logger.info("📱 Telegram Sender initialized")
         logger.info(f"   Bot Token: {bot_token[:10]}...")
@@ -63,56 +71,101 @@ class TelegramSender:
             True if successful, False otherwise
         """
         try:
-            if not os.path.exists(video_path):
-                logger.error(f"❌ File not found: {video_path}")
-                return False
-            
-            # Check file size (Telegram limit: 50MB for videos)
-            file_size = os.path.getsize(video_path)
-            max_size = 50 * 1024 * 1024  # 50MB
-            
-            if file_size > max_size:
-                logger.error(f"❌ File too large: {file_size / 1024 / 1024:.2f}MB > 50MB")
-                return False
-            
-            # Prepare files and data
-            with open(video_path, 'rb') as video_file:
-                files = {'video': video_file}
-                data = {
-                    'chat_id': chat_id,
-                    'supports_streaming': supports_streaming
-                }
-                
-                if caption:
-                    data['caption'] = caption
-                
-                if reply_to_message_id:
-                    data['reply_to_message_id'] = reply_to_message_id
-                
-                # Send video
-                response = requests.post(
-                    f"{self.base_url}/sendVideo",
-                    files=files,
-                    data=data
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('ok'):
-                        message_id = result['result']['message_id']
-                        logger.info(f"✅ Video sent to chat {chat_id}: {message_id}")
-                        return True
-                    else:
-                        logger.error(f"❌ Telegram API error: {result.get('description')}")
-                        return False
-                else:
-                    logger.error(f"❌ Failed to send video: {response.status_code} - {response.text}")
-                    return False
-                    
+            message = self.deliver_video(chat_id, video_path, caption, reply_to_message_id, supports_streaming)
+            logger.info(f"✅ Video sent to chat {chat_id}: {message.get('message_id')}")
+            return True
         except Exception as e:
             logger.error(f"❌ Error sending video to group: {e}")
             return False
     
+    def deliver_video(self, chat_id: Union[str, int], video_path: str,
+                      caption: str = "", reply_to_message_id: int = None,
+                      supports_streaming: bool = True) -> Dict[str, Any]:
+        """
+        Send a video, uploading the file only the first time
+        
+        The first send streams the file from disk; later sends of the same
+        file (to other chats) reuse the file_id Telegram returned.
+        
+        Returns:
+            The sent Telegram message
+            
+        Raises:
+            TransientUploadError: On throttling, 5xx and network errors (worth retrying)
+            RuntimeError: If Telegram rejects the video
+        """
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"File not found: {video_path}")
+        
+        data = {
+            'chat_id': chat_id,
+            'supports_streaming': supports_streaming,
+            'caption': caption or None,
+            'reply_to_message_id': reply_to_message_id
+        }
+        
+        key = self._file_key(video_path)
+        with self._upload_lock(key):
+            file_id = self._file_ids.get(key)
+            if file_id is None:
+                # Check file size (Telegram limit: 50MB for videos)
+                file_size = os.path.getsize(video_path)
+                max_size = 50 * 1024 * 1024  # 50MB
+                if file_size > max_size:
+                    raise RuntimeError(f"File too large: {file_size / 1024 / 1024:.2f}MB > 50MB")
+                
+                message = self._post_file("sendVideo", "video", video_path, data)
+                media = message.get('video') or message.get('document') or message.get('animation') or {}
+                if media.get('file_id'):
+                    self._file_ids[key] = media['file_id']
+                return message
+        
+        return self._call("sendVideo", {**data, 'video': file_id})
+    
+    def _file_key(self, path: str) -> tuple:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    
+    def _upload_lock(self, key: tuple) -> threading.Lock:
+        with self._locks_guard:
+            return self._upload_locks.setdefault(key, threading.Lock())
+    
+    def _post_file(self, method: str, file_field: str, file_path: str,
+                   data: Dict[str, Any]) -> Dict[str, Any]:
+        """Stream a file to a Bot API method as multipart/form-data"""
+        body = MultipartFileStream(data, file_field, file_path)
+        try:
+            response = self.session.post(
+                f"{self.base_url}/{method}",
+                data=body,
+                headers={'Content-Type': body.content_type},
+                timeout=self.upload_timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise TransientUploadError(str(e))
+        finally:
+            body.close()
+        return self._parse_result(response)
+    
+    def _call(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a Bot API method with a JSON payload"""
+        payload = {key: value for key, value in payload.items() if value is not None}
+        try:
+            response = self.session.post(f"{self.base_url}/{method}", json=payload, timeout=60)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise TransientUploadError(str(e))
+        return self._parse_result(response)
+    
+    def _parse_result(self, response: requests.Response) -> Dict[str, Any]:
+        raise_for_transient(response)
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        if response.status_code != 200 or not result.get('ok'):
+            raise RuntimeError(f"Telegram API error: {result.get('description') or response.status_code}")
+        return result['result']
+    
     def send_text_to_group(self, chat_id: Union[str, int], message: str,
                           reply_to_message_id: int = None, parse_mode: str = "Markdown") -> bool:
         """
@@ -139,7 +192,7 @@ class TelegramSender:
             if parse_mode:
                 payload['parse_mode'] = parse_mode
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/sendMessage",
                 json=payload
             )
@@ -177,36 +230,43 @@ class TelegramSender:
             True if successful, False otherwise
         """
         try:
-            # Create engaging caption
-            caption = self._create_viral_caption(mission, platform, hashtags)
-            
-            # Send video with caption
-            success = self.send_video_to_group(chat_id, video_path, caption)
-            
-            if success:
-                # Send follow-up message with engagement prompt
-                engagement_msg = (
-                    f"🎯 **Viral Video Generated!**\n\n"
-                    f"📱 Platform: {platform.title()}\n"
-                    f"🎬 Mission: {mission}\n\n"
-                    f"💬 What do you think? Share your thoughts below! 👇\n"
-                    f"🔄 Feel free to forward to other groups!\n"
-                    f"🤖 Generated with ViralAI"
-                )
-                
-                # Small delay between messages
-                time.sleep(2)
-                self.send_text_to_group(chat_id, engagement_msg)
-                
-                logger.info(f"✅ Complete viral video package sent to chat {chat_id}")
-                return True
-            else:
-                return False
-                
+            self.deliver_viral_video_package(chat_id, video_path, mission, platform, hashtags)
+            return True
         except Exception as e:
             logger.error(f"❌ Error sending viral video package: {e}")
             return False
     
+    def deliver_viral_video_package(self, chat_id: Union[str, int], video_path: str,
+                                    mission: str, platform: str, hashtags: List[str] = None) -> Dict[str, Any]:
+        """
+        Send the video package, raising on failure (for the publishing pipeline)
+        
+        Returns:
+            The sent video message
+        """
+        # Create engaging caption
+        caption = self._create_viral_caption(mission, platform, hashtags)
+        
+        # Send video with caption
+        message = self.deliver_video(chat_id, video_path, caption)
+        
+        # Send follow-up message with engagement prompt; it follows the video
+        # in order, so no delay is needed between the two
+        engagement_msg = (
+            f"🎯 **Viral Video Generated!**\n\n"
+            f"📱 Platform: {platform.title()}\n"
+            f"🎬 Mission: {mission}\n\n"
+            f"💬 What do you think? Share your thoughts below! 👇\n"
+            f"🔄 Feel free to forward to other groups!\n"
+            f"🤖 Generated with ViralAI"
+        )
+        if not self.send_text_to_group(chat_id, engagement_msg):
+            # The video is delivered; don't fail (and resend) it over the follow-up
+            logger.warning(f"⚠️ Follow-up message not sent to chat {chat_id}")
+        
+        logger.info(f"✅ Complete viral video package sent to chat {chat_id}")
+        return message
+    
     def _create_viral_caption(self, mission: str, platform: str, hashtags: List[str] = None) -> str:
         """
         Create engaging caption for viral video
@@ -318,36 +378,14 @@ class TelegramSender:
                 logger.error(f"❌ File too large: {file_size / 1024 / 1024 / 1024:.2f}GB > 2GB")
                 return False
             
-            with open(document_path, 'rb') as doc_file:
-                files = {'document': doc_file}
-                data = {
-                    'chat_id': chat_id
-                }
-                
-                if caption:
-                    data['caption'] = caption
-                
-                if reply_to_message_id:
-                    data['reply_to_message_id'] = reply_to_message_id
-                
-                response = requests.post(
-                    f"{self.base_url}/sendDocument",
-                    files=files,
-                    data=data
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('ok'):
-                        message_id = result['result']['message_id']
-                        logger.info(f"✅ Document sent to chat {chat_id}: {message_id}")
-                        return True
-                    else:
-                        logger.error(f"❌ Telegram API error: {result.get('description')}")
-                        return False
-                else:
-                    logger.error(f"❌ Failed to send document: {response.status_code} - {response.text}")
-                    return False
+            # Streamed from disk, so large documents are never read into memory
+            message = self._post_file("sendDocument", "document", document_path, {
+                'chat_id': chat_id,
+                'caption': caption or None,
+                'reply_to_message_id': reply_to_message_id
+            })
+            logger.info(f"✅ Document sent to chat {chat_id}: {message.get('message_id')}")
+            return True
                     
         except Exception as e:
             logger.error(f"❌ Error sending document to group: {e}")
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Social Publishing Pipeline
+Streams uploads from disk, retries and resumes failed transfers, and fans
+deliveries out across platforms and groups concurrently under per-platform
+rate limits. Delivery outcomes are kept in SQLite so a re-run of the same
+batch only retries what has not been delivered.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from ..shared.resilience.retry_manager import RetryConfig, RetryManager, RetryStrategy
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class TransientUploadError(Exception):
+    """A failure worth retrying: network errors, throttling, 5xx responses"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def raise_for_transient(response: requests.Response):
+    """Raise TransientUploadError for throttling and server errors"""
+    if response.status_code == 429 or response.status_code >= 500:
+        retry_after = response.headers.get('Retry-After')
+        try:
+            # Telegram reports the wait in the body instead of the header
+            retry_after = retry_after or response.json().get('parameters', {}).get('retry_after')
+        except ValueError:
+            pass
+        raise TransientUploadError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retry_after=float(retry_after) if retry_after else None
+        )
+
+
+def create_retry_manager(name: str, max_retries: int = 3, base_delay: float = 1.0,
+                         max_delay: float = 30.0) -> RetryManager:
+    """Retry manager that only retries transient upload failures"""
+    return RetryManager(name, RetryConfig(
+        max_retries=max_retries,
+        base_delay=base_delay,
+        max_delay=max_delay,
+        strategy=RetryStrategy.EXPONENTIAL_BACKOFF,
+        retryable_exceptions=[
+            TransientUploadError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError
+        ]
+    ))
+
+
+class MultipartFileStream:
+    """
+    multipart/form-data body read from disk one chunk at a time
+
+    requests sends file-like bodies with a known length chunk by chunk, so
+    the video is never held in memory. Create a new stream for every attempt.
+    """
+
+    def __init__(self, fields: Dict[str, Any], file_field: str, file_path: str,
+                 filename: Optional[str] = None, content_type: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        filename = filename or os.path.basename(file_path)
+        content_type = content_type or mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+
+        head = b''.join(
+            self._part_header(name, None, None) + str(value).encode('utf-8') + b'\r\n'
+            for name, value in fields.items() if value is not None
+        )
+        self._head = head + self._part_header(file_field, filename, content_type)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode('utf-8')
+        self._length = len(self._head) + os.path.getsize(file_path) + len(self._tail)
+        self._parts = [self._head, None, self._tail]
+        self._file = None
+        self._buffer = b''
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _part_header(self, name: str, filename: Optional[str], content_type: Optional[str]) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode('utf-8')
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.chunk_size if size is None or size < 0 else size
+        while len(self._buffer) < size and self._parts:
+            part = self._parts[0]
+            if part is None:
+                if self._file is None:
+                    self._file = open(self.file_path, 'rb')
+                data = self._file.read(max(size - len(self._buffer), self.chunk_size))
+                if not data:
+                    self._file.close()
+                    self._parts.pop(0)
+                self._buffer += data
+            else:
+                self._buffer += part
+                self._parts.pop(0)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+
+
+class ResumableUploader:
+    """
+    Chunked upload that resumes from the last acknowledged offset
+
+    Each chunk is sent with ``offset`` and ``file_size`` headers (the
+    Graph API "rupload" convention). A response carrying ``offset`` tells us
+    how much the server has committed; otherwise a 2xx commits the chunk.
+    A failed chunk is retried from the committed offset, not from byte 0.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None,
+                 chunk_size: int = 8 * DEFAULT_CHUNK_SIZE,
+                 retry_manager: Optional[RetryManager] = None,
+                 rate_limiter: Optional["RateLimiter"] = None,
+                 timeout: float = 120):
+        self.session = session or requests.Session()
+        self.chunk_size = chunk_size
+        self.retry_manager = retry_manager or create_retry_manager("resumable_upload")
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+
+    def upload(self, url: str, file_path: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Upload a file in chunks
+
+        Args:
+            url: Upload endpoint
+            file_path: File to upload
+            headers: Extra headers (authorization)
+
+        Returns:
+            JSON body of the final response
+        """
+        file_size = os.path.getsize(file_path)
+        state = {"offset": 0, "result": {}}
+
+        with open(file_path, 'rb') as source:
+            while True:
+                self.retry_manager.execute(self._send_chunk, url, source, file_size, headers or {}, state)
+                if state["offset"] >= file_size:
+                    break
+
+        logger.info(f"✅ Uploaded {file_size / 1024 / 1024:.2f}MB from {os.path.basename(file_path)}")
+        return state["result"]
+
+    def _send_chunk(self, url: str, source, file_size: int, headers: Dict[str, str], state: Dict[str, Any]):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        offset = state["offset"]
+        source.seek(offset)
+        chunk = source.read(self.chunk_size)
+        response = self.session.post(
+            url,
+            data=chunk,
+            headers={
+                **headers,
+                'offset': str(offset),
+                'file_size': str(file_size),
+                'Content-Type': 'application/octet-stream'
+            },
+            timeout=self.timeout
+        )
+        try:
+            raise_for_transient(response)
+        except TransientUploadError as e:
+            if self.rate_limiter and e.retry_after:
+                self.rate_limiter.pause(e.retry_after)
+            raise
+        if response.status_code >= 400:
+            raise RuntimeError(f"Upload rejected: {response.status_code} - {response.text[:200]}")
+
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        committed = result.get('offset') if isinstance(result, dict) else None
+        committed = int(committed) if committed is not None else offset + len(chunk)
+        if committed == offset and offset < file_size:
+            raise TransientUploadError(f"Upload made no progress at offset {offset}")
+        state["offset"] = committed
+        state["result"] = result
+
+
+class RateLimiter:
+    """
+    Token bucket plus a concurrency cap for one platform
+
+    ``acquire`` blocks until a request may be sent; ``pause`` stops the
+    whole platform after the API asks us to back off.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1, max_concurrent: int = 4):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.max_concurrent = max_concurrent
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate_per_second)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"⏸️ Rate limited, pausing for {seconds:.1f}s")
+
+
+# Conservative defaults from the platforms' published limits
+PLATFORM_RATE_LIMITS = {
+    'telegram': {'rate_per_second': 20, 'burst': 20, 'max_concurrent': 8},
+    'whatsapp': {'rate_per_second': 10, 'burst': 10, 'max_concurrent': 4},
+    'instagram': {'rate_per_second': 0.5, 'burst': 1, 'max_concurrent': 1},
+}
+
+
+def create_rate_limiter(platform: str) -> RateLimiter:
+    return RateLimiter(**PLATFORM_RATE_LIMITS.get(platform, {'rate_per_second': 5, 'burst': 5}))
+
+
+class DeliveryState(Enum):
+    """State of one delivery to one group"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+@dataclass
+class Delivery:
+    """One (platform, target) delivery within a publishing batch"""
+    batch_id: str
+    platform: str
+    target: str
+    state: DeliveryState = DeliveryState.PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    updated_at: Optional[str] = None
+
+
+class DeliveryQueue:
+    """Persistent record of deliveries; re-running a batch resumes it"""
+
+    def __init__(self, db_path: str = "outputs/social_deliveries.db"):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    batch_id TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    result TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (batch_id, platform, target)
+                )
+            """)
+
+    def enqueue(self, batch_id: str, platform: str, targets: List[str]):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO deliveries (batch_id, platform, target, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(batch_id, platform, str(target), DeliveryState.PENDING.value, now) for target in targets]
+            )
+
+    def pending(self, batch_id: str) -> List[Delivery]:
+        """Deliveries of a batch that have not been sent yet"""
+        return [d for d in self.list(batch_id) if d.state != DeliveryState.SENT]
+
+    def record(self, delivery: Delivery, state: DeliveryState, attempts: int,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE deliveries SET state = ?, attempts = attempts + ?, error = ?, result = ?, updated_at = ? "
+                "WHERE batch_id = ? AND platform = ? AND target = ?",
+                (state.value, attempts, error, json.dumps(result, default=str) if result is not None else None,
+                 datetime.now().isoformat(), delivery.batch_id, delivery.platform, delivery.target)
+            )
+
+    def list(self, batch_id: str) -> List[Delivery]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id, platform, target, state, attempts, error, result, updated_at "
+                "FROM deliveries WHERE batch_id = ? ORDER BY platform, target",
+                (batch_id,)
+            ).fetchall()
+        return [
+            Delivery(row[0], row[1], row[2], DeliveryState(row[3]), row[4], row[5],
+                     json.loads(row[6]) if row[6] else None, row[7])
+            for row in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+
+class PublishingPipeline:
+    """
+    Concurrent fan-out of one video to many platforms and groups
+
+    Each platform registers a send function ``send(target) -> result``.
+    Deliveries run on a shared thread pool, each platform throttled by its
+    own RateLimiter; a transient failure retries that delivery only.
+    """
+
+    def __init__(self, queue: DeliveryQueue, workers: int = 16, max_attempts: int = 3,
+                 retry_base_delay: float = 1.0):
+        self.queue = queue
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.limiters: Dict[str, RateLimiter] = {}
+
+    def limiter(self, platform: str) -> RateLimiter:
+        if platform not in self.limiters:
+            self.limiters[platform] = create_rate_limiter(platform)
+        return self.limiters[platform]
+
+    def publish(self, batch_id: str, targets: Dict[str, List[str]],
+                senders: Dict[str, Callable[[str], Any]]) -> List[Delivery]:
+        """
+        Deliver to every target not yet delivered in this batch
+
+        Args:
+            batch_id: Stable id of the batch; re-running it resumes
+            targets: Platform name to group/chat ids
+            senders: Platform name to a function sending to one target
+
+        Returns:
+            Final state of every delivery in the batch
+        """
+        for platform, platform_targets in targets.items():
+            self.queue.enqueue(batch_id, platform, platform_targets)
+        pending = [d for d in self.queue.pending(batch_id) if d.platform in senders]
+
+        logger.info(f"📤 Publishing batch {batch_id}: {len(pending)} deliveries")
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+                list(executor.map(lambda d: self._deliver(d, senders[d.platform]), pending))
+
+        deliveries = self.queue.list(batch_id)
+        sent = sum(1 for d in deliveries if d.state == DeliveryState.SENT)
+        logger.info(f"📊 Batch {batch_id}: {sent}/{len(deliveries)} delivered")
+        return deliveries
+
+    def _deliver(self, delivery: Delivery, send: Callable[[str], Any]):
+        limiter = self.limiter(delivery.platform)
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            with limiter.slots:
+                limiter.acquire()
+                try:
+                    result = send(delivery.target)
+                except TransientUploadError as e:
+                    if e.retry_after:
+                        limiter.pause(e.retry_after)
+                    raise
+            if result is False or result is None:
+                raise RuntimeError("Delivery rejected")
+            return result
+
+        retry = create_retry_manager(f"{delivery.platform}:{delivery.target}",
+                                     max_retries=self.max_attempts - 1, base_delay=self.retry_base_delay)
+        try:
+            result = retry.execute(attempt)
+            self.queue.record(delivery, DeliveryState.SENT, attempts,
+                              result=result if isinstance(result, dict) else {"ok": True})
+        except Exception as e:
+            error = str(getattr(e, 'last_exception', None) or e)
+            logger.error(f"❌ {delivery.platform}: delivery to {delivery.target} failed: {error}")
+            self.queue.record(delivery, DeliveryState.FAILED, attempts, error=error)
@@ -7,12 +7,13 @@ Sends generated videos to WhatsApp groups using WhatsApp Business API
 import os
 import requests
 import json
-import time
+import threading
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
 from ..utils.logging_config import get_logger
+from .upload_pipeline import MultipartFileStream, TransientUploadError, raise_for_transient
 
 logger = get_logger(__name__)
 
@@ -42,6 +43,11 @@ class WhatsAppSender:
         self.verify_token = verify_token
         self.base_url = "https://graph.facebook.com/v18.0"
         self.api_url = f"{self.base_url}/{phone_number_id}"
+        self.session = requests.Session()
+        
+        # Media IDs of uploaded files, so fan-out uploads each file once
+        self._media_ids: Dict[tuple, str] = {}
+        self._upload_lock = threading.Lock()
         
         # Headers for API requests
         self.headers = {
@@ -77,26 +83,29 @@ class WhatsAppSender:
                 logger.error(f"❌ File too large: {file_size / 1024 / 1024:.2f}MB > 16MB")
                 return None
             
-            # Upload media
-            upload_url = f"{self.api_url}/media"
-            
-            with open(file_path, 'rb') as file:
-                files = {'file': file}
-                data = {
-                    'messaging_product': 'whatsapp',
-                    'type': media_type
-                }
+            key = (os.path.abspath(file_path), file_size, os.path.getmtime(file_path), media_type)
+            with self._upload_lock:
+                if key in self._media_ids:
+                    return self._media_ids[key]
                 
-                response = requests.post(
-                    upload_url,
-                    headers={"Authorization": f"Bearer {self.access_token}"},
-                    files=files,
-                    data=data
+                # Upload media, streamed from disk
+                body = MultipartFileStream(
+                    {'messaging_product': 'whatsapp', 'type': media_type}, 'file', file_path
                 )
+                try:
+                    response = self.session.post(
+                        f"{self.api_url}/media",
+                        headers={"Authorization": f"Bearer {self.access_token}", "Content-Type": body.content_type},
+                        data=body,
+                        timeout=300
+                    )
+                finally:
+                    body.close()
                 
                 if response.status_code == 200:
                     media_id = response.json().get('id')
                     logger.info(f"✅ Media uploaded successfully: {media_id}")
+                    self._media_ids[key] = media_id
                     return media_id
                 else:
                     logger.error(f"❌ Media upload failed: {response.status_code} - {response.text}")
@@ -230,35 +239,66 @@ class WhatsAppSender:
             True if successful, False otherwise
         """
         try:
-            # Create engaging caption
-            caption = self._create_viral_caption(mission, platform, hashtags)
-            
-            # Send video with caption
-            success = self.send_video_to_group(group_id, video_path, caption)
-            
-            if success:
-                # Send follow-up message with engagement prompt
-                engagement_msg = (
-                    f"🎯 **Viral Video Generated!**\n\n"
-                    f"📱 Platform: {platform.title()}\n"
-                    f"🎬 Mission: {mission}\n\n"
-                    f"💬 What do you think? Share your thoughts below! 👇\n"
-                    f"🔄 Feel free to forward to other groups!"
-                )
-                
-                # Small delay between messages
-                time.sleep(2)
-                self.send_text_to_group(group_id, engagement_msg)
-                
-                logger.info(f"✅ Complete viral video package sent to group {group_id}")
-                return True
-            else:
-                return False
-                
+            self.deliver_viral_video_package(group_id, video_path, mission, platform, hashtags)
+            return True
         except Exception as e:
             logger.error(f"❌ Error sending viral video package: {e}")
             return False
     
+    def deliver_viral_video_package(self, group_id: str, video_path: str, mission: str,
+                                    platform: str, hashtags: List[str] = None) -> Dict[str, Any]:
+        """
+        Send the video package, raising on failure (for the publishing pipeline)
+        
+        Returns:
+            The WhatsApp API response for the video message
+            
+        Raises:
+            TransientUploadError: On throttling, 5xx and network errors (worth retrying)
+            RuntimeError: If WhatsApp rejects the message
+        """
+        # Create engaging caption
+        caption = self._create_viral_caption(mission, platform, hashtags)
+        
+        # Upload once (cached across groups), then send the media by id
+        try:
+            media_id = self.upload_media(video_path, "video")
+            if not media_id:
+                raise RuntimeError(f"Media upload failed for {video_path}")
+            
+            response = self.session.post(
+                f"{self.api_url}/messages",
+                headers=self.headers,
+                json={
+                    "messaging_product": "whatsapp",
+                    "recipient_type": "group",
+                    "to": group_id,
+                    "type": "video",
+                    "video": {"id": media_id, "caption": caption}
+                },
+                timeout=60
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise TransientUploadError(str(e))
+        
+        raise_for_transient(response)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to send video: {response.status_code} - {response.text}")
+        
+        # Send follow-up message with engagement prompt
+        engagement_msg = (
+            f"🎯 **Viral Video Generated!**\n\n"
+            f"📱 Platform: {platform.title()}\n"
+            f"🎬 Mission: {mission}\n\n"
+            f"💬 What do you think? Share your thoughts below! 👇\n"
+            f"🔄 Feel free to forward to other groups!"
+        )
+        if not self.send_text_to_group(group_id, engagement_msg):
+            logger.warning(f"⚠️ Follow-up message not sent to group {group_id}")
+        
+        logger.info(f"✅ Complete viral video package sent to group {group_id}")
+        return response.json()
+    
     def _create_viral_caption(self, mission: str, platform: str, hashtags: List[str] = None) -> str:
         """
         Create engaging caption for viral video
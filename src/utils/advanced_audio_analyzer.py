@@ -3,8 +3,12 @@ Advanced Audio Analyzer for Perfect Subtitle Synchronization
 Uses librosa for sophisticated audio analysis including pace, pitch, speed, and tempo detection
 """
 
+import os
 import numpy as np
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import warnings
@@ -58,6 +62,49 @@ class SubtitleTiming:
     pitch_level: float
 
 
+class DecodedAudioCache:
+    """
+    LRU cache of decoded audio shared by all analyzers in the process
+
+    Entries are keyed on path, modification time, size and sample rate, so a
+    rewritten file is decoded again while repeated analyses of the same
+    narration reuse the samples.
+    """
+    
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, float, int, int], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def load(self, audio_path: str, sample_rate: int) -> np.ndarray:
+        stat = os.stat(audio_path)
+        key = (os.path.abspath(audio_path), stat.st_mtime, stat.st_size, sample_rate)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        
+        y, _ = librosa.load(audio_path, sr=sample_rate)
+        
+        with self._lock:
+            self._entries[key] = y
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return y
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_decoded_audio_cache = DecodedAudioCache()
+
+
+def _analyze_in_worker(audio_path: str) -> "AudioAnalysisResult":
+    """Process pool entry point for batch analysis"""
+    return AdvancedAudioAnalyzer().analyze_audio_file(audio_path)
+
+
 class AdvancedAudioAnalyzer:
     """Advanced audio analysis for perfect subtitle synchronization"""
     
@@ -71,6 +118,35 @@ class AdvancedAudioAnalyzer:
         if not MOVIEPY_AVAILABLE:
             logger.warning("⚠️ moviepy not available. Install with: pip install moviepy")
     
+    def analyze_audio_files(self, audio_paths: List[str],
+                            max_workers: Optional[int] = None) -> Dict[str, AudioAnalysisResult]:
+        """
+        Analyze all audio segments of a session in a process pool
+        
+        Args:
+            audio_paths: Audio files to analyze
+            max_workers: Worker processes (defaults to CPU count, capped by file count)
+            
+        Returns:
+            Analysis result per audio path
+        """
+        unique_paths = list(dict.fromkeys(audio_paths))
+        if not unique_paths:
+            return {}
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(unique_paths))
+        if workers <= 1 or not LIBROSA_AVAILABLE:
+            return {path: self.analyze_audio_file(path) for path in unique_paths}
+        
+        logger.info(f"🎵 Analyzing {len(unique_paths)} audio segments with {workers} workers")
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_analyze_in_worker, unique_paths)
+                return dict(zip(unique_paths, results))
+        except Exception as e:
+            logger.warning(f"⚠️ Parallel audio analysis failed, analyzing serially: {e}")
+            return {path: self.analyze_audio_file(path) for path in unique_paths}
+    
     def analyze_audio_file(self, audio_path: str) -> AudioAnalysisResult:
         """Comprehensive audio analysis for subtitle timing"""
         try:
@@ -79,36 +155,35 @@ class AdvancedAudioAnalyzer:
             
             logger.info(f"🎵 Starting advanced audio analysis: {audio_path}")
             
-            # Load audio file
-            y, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # Load audio file (decoded once per process)
+            y = _decoded_audio_cache.load(audio_path, self.sample_rate)
+            sr = self.sample_rate
             duration = librosa.get_duration(y=y, sr=sr)
             
             logger.info(f"📊 Audio loaded: {duration:.2f}s at {sr}Hz")
             
             # 1. Tempo and Beat Analysis
             tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr, hop_length=self.hop_length)
+            tempo = float(np.atleast_1d(tempo)[0])  # Newer librosa returns an array
             beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=self.hop_length)
             
-            # 2. Pitch Analysis
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr, hop_length=self.hop_length)
-            pitch_values = []
+            # One magnitude spectrogram shared by pitch and spectral features
+            spectrum = np.abs(librosa.stft(y, n_fft=self.frame_length, hop_length=self.hop_length))
             
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:  # Valid pitch
-                    pitch_values.append(pitch)
+            # 2. Pitch Analysis
+            pitches, magnitudes = librosa.piptrack(S=spectrum, sr=sr, hop_length=self.hop_length)
+            pitch_values = self._dominant_pitches(pitches, magnitudes)
             
-            pitch_mean = np.mean(pitch_values) if pitch_values else 0
-            pitch_std = np.std(pitch_values) if pitch_values else 0
+            pitch_mean = np.mean(pitch_values) if len(pitch_values) else 0
+            pitch_std = np.std(pitch_values) if len(pitch_values) else 0
             
             # 3. Energy and Volume Analysis
             energy = librosa.feature.rms(y=y, hop_length=self.hop_length)[0]
             energy_times = librosa.frames_to_time(np.arange(len(energy)), sr=sr, hop_length=self.hop_length)
             
             # 4. Spectral Features
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr, hop_length=self.hop_length)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr, hop_length=self.hop_length)[0]
+            spectral_centroid = librosa.feature.spectral_centroid(S=spectrum, sr=sr, hop_length=self.hop_length)[0]
+            spectral_rolloff = librosa.feature.spectral_rolloff(S=spectrum, sr=sr, hop_length=self.hop_length)[0]
             zero_crossing_rate = librosa.feature.zero_crossing_rate(y, hop_length=self.hop_length)[0]
             
             # 5. Voice Activity Detection (VAD)
@@ -156,78 +231,57 @@ class AdvancedAudioAnalyzer:
             logger.error(f"❌ Audio analysis failed: {e}")
             return self._fallback_analysis(audio_path)
     
+    @staticmethod
+    def _dominant_pitches(pitches: np.ndarray, magnitudes: np.ndarray) -> np.ndarray:
+        """Pitch of the strongest bin in every frame, keeping voiced frames only"""
+        if pitches.size == 0:
+            return np.array([])
+        strongest = magnitudes.argmax(axis=0)
+        frame_pitches = pitches[strongest, np.arange(pitches.shape[1])]
+        return frame_pitches[frame_pitches > 0]
+    
+    @staticmethod
+    def _frame_runs(mask: np.ndarray, times: np.ndarray,
+                    min_duration: float = 0.1) -> List[Tuple[float, float]]:
+        """(start, end) times of runs of True frames lasting longer than ``min_duration``"""
+        if len(mask) == 0:
+            return []
+        # Run-length encode: +1 marks a run start, -1 the frame after it ends
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        start_times = times[starts]
+        # A run reaching the last frame ends at the last frame time
+        end_times = times[np.minimum(ends, len(times) - 1)]
+        keep = end_times - start_times > min_duration
+        return [(float(a), float(b)) for a, b in zip(start_times[keep], end_times[keep])]
+    
     def _detect_silence_segments(self, energy: np.ndarray, times: np.ndarray, 
                                 threshold: float) -> List[Tuple[float, float]]:
         """Detect silent segments in audio"""
-        silent_frames = energy < threshold
-        segments = []
-        
-        in_silence = False
-        start_time = 0
-        
-        for i, (is_silent, time) in enumerate(zip(silent_frames, times)):
-            if is_silent and not in_silence:
-                # Start of silence
-                start_time = time
-                in_silence = True
-            elif not is_silent and in_silence:
-                # End of silence
-                if time - start_time > 0.1:  # Minimum 100ms silence
-                    segments.append((start_time, time))
-                in_silence = False
-        
-        # Handle case where audio ends in silence
-        if in_silence and times[-1] - start_time > 0.1:
-            segments.append((start_time, times[-1]))
-        
-        return segments
+        return self._frame_runs(energy < threshold, times)  # Minimum 100ms silence
     
     def _detect_emphasis_segments(self, energy: np.ndarray, times: np.ndarray,
                                  threshold: float) -> List[Tuple[float, float]]:
         """Detect emphasized/high-energy segments"""
-        emphasized_frames = energy > threshold
-        segments = []
-        
-        in_emphasis = False
-        start_time = 0
-        
-        for i, (is_emphasized, time) in enumerate(zip(emphasized_frames, times)):
-            if is_emphasized and not in_emphasis:
-                start_time = time
-                in_emphasis = True
-            elif not is_emphasized and in_emphasis:
-                if time - start_time > 0.1:  # Minimum 100ms emphasis
-                    segments.append((start_time, time))
-                in_emphasis = False
-        
-        if in_emphasis and times[-1] - start_time > 0.1:
-            segments.append((start_time, times[-1]))
-        
-        return segments
+        return self._frame_runs(energy > threshold, times)  # Minimum 100ms emphasis
     
     def _analyze_pace_variations(self, beat_times: np.ndarray, duration: float) -> List[float]:
         """Analyze how pace/tempo varies throughout the audio"""
         if len(beat_times) < 4:
             return [1.0]  # Constant pace if not enough beats
         
-        # Calculate local tempo variations
+        # Calculate local tempo variations: the mean interval over a window
+        # of beats is the window span divided by its interval count
         window_size = 4  # beats
-        variations = []
-        
-        for i in range(len(beat_times) - window_size + 1):
-            window_beats = beat_times[i:i + window_size]
-            intervals = np.diff(window_beats)
-            avg_interval = np.mean(intervals)
-            tempo_variation = 60.0 / avg_interval if avg_interval > 0 else 120.0
-            variations.append(tempo_variation)
+        avg_intervals = (beat_times[window_size - 1:] - beat_times[:len(beat_times) - window_size + 1]) / (window_size - 1)
+        variations = np.full(len(avg_intervals), 120.0)
+        positive = avg_intervals > 0
+        variations[positive] = 60.0 / avg_intervals[positive]
         
         # Normalize variations to relative pace (1.0 = average pace)
-        if variations:
-            avg_variation = np.mean(variations)
-            normalized_variations = [v / avg_variation for v in variations]
-            return normalized_variations
-        
-        return [1.0]
+        return (variations / np.mean(variations)).tolist()
     
     def _estimate_speech_rate(self, y: np.ndarray, sr: int, 
                             silence_segments: List[Tuple[float, float]]) -> float:
@@ -246,11 +300,7 @@ class AdvancedAudioAnalyzer:
             onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=self.hop_length)
             
             # Filter onsets that occur during speech (not silence)
-            speech_onsets = []
-            for onset_time in onset_times:
-                is_in_silence = any(start <= onset_time <= end for start, end in silence_segments)
-                if not is_in_silence:
-                    speech_onsets.append(onset_time)
+            speech_onsets = onset_times[~self._in_intervals(onset_times, silence_segments)]
             
             # Estimate words per second (typically 1.5-2 syllables per word)
             syllables_per_second = len(speech_onsets) / speaking_duration if speaking_duration > 0 else 0
@@ -265,7 +315,18 @@ class AdvancedAudioAnalyzer:
             logger.warning(f"⚠️ Speech rate estimation failed: {e}")
             return 2.5  # Default rate
     
-    def _calculate_timing_confidence(self, energy: np.ndarray, pitch_values: List[float], 
+    @staticmethod
+    def _in_intervals(points: np.ndarray, intervals: List[Tuple[float, float]]) -> np.ndarray:
+        """Mask of points falling inside any of the sorted, disjoint (start, end) intervals"""
+        if not intervals or len(points) == 0:
+            return np.zeros(len(points), dtype=bool)
+        bounds = np.asarray(intervals, dtype=float)
+        candidate = np.searchsorted(bounds[:, 0], points, side='right') - 1
+        inside = candidate >= 0
+        inside[inside] = points[inside] <= bounds[candidate[inside], 1]
+        return inside
+    
+    def _calculate_timing_confidence(self, energy: np.ndarray, pitch_values: np.ndarray, 
                                    tempo: float) -> float:
         """Calculate confidence in timing analysis (0-1)"""
         confidence_factors = []
@@ -277,7 +338,7 @@ class AdvancedAudioAnalyzer:
             confidence_factors.append(energy_confidence)
         
         # Pitch stability (more stable pitch = higher confidence for speech)
-        if pitch_values:
+        if len(pitch_values):
             pitch_cv = np.std(pitch_values) / (np.mean(pitch_values) + 1e-8)
             pitch_confidence = max(0, 1 - pitch_cv / 100)  # Normalize for typical speech pitch range
             confidence_factors.append(pitch_confidence)
@@ -0,0 +1,283 @@
+"""
+Artifact Store - Content-addressed storage for session media
+Clips, audio, images and final videos are stored once by SHA-256 and
+placed into session folders as hardlinks (or kernel-side copies where
+links are impossible), with a per-session manifest recording what was
+placed where
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = "artifact_manifest.json"
+
+
+class ArtifactStore:
+    """
+    Deduplicating blob store shared by all sessions under one output root
+
+    Blobs never share an inode with a caller's file: a file is moved into
+    the store or copied (reflinked where supported), never hardlinked, so
+    rewriting the original later cannot change stored content.
+    Placed artifacts share storage with their blob, so they must be treated
+    as immutable: write new output to a new path rather than rewriting a
+    placed file. A blob found modified in place is detected by its changed
+    size/mtime, re-verified, and replaced instead of being reused.
+    A blob is unlinked between ``ingest`` and its placement, so ``prune``
+    (possibly from another process) spares recently ingested blobs, and
+    ``place`` re-ingests if its blob was pruned anyway.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    PLACE_ATTEMPTS = 3
+
+    def __init__(self, root: str = os.path.join("outputs", ".artifacts")):
+        """
+        Args:
+            root: Blob directory; keep it on the same filesystem as the
+                session folders so placements can be hardlinks
+        """
+        self.root = root
+        # (device, inode, size, mtime_ns) -> digest, so unchanged files are hashed once
+        self._digests: Dict[Tuple[int, int, int, int], str] = {}
+        self._lock = threading.Lock()
+        self.stats = {"placed": 0, "deduplicated": 0, "bytes_saved": 0}
+
+    def digest(self, path: str) -> str:
+        """SHA-256 of a file's content (cached by inode and modification time)"""
+        key = self._stat_key(path)
+        cached = self._digests.get(key)
+        if cached:
+            return cached
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        self._digests[key] = digest
+        return digest
+
+    def blob_path(self, digest: str, extension: str = "") -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}{extension.lower()}")
+
+    def ingest(self, source_path: str, move: bool = False) -> Tuple[str, str]:
+        """
+        Add a file to the store, reusing an existing blob with the same content
+
+        Args:
+            source_path: File to store
+            move: Let the store take ownership of the file instead of copying it
+
+        Returns:
+            (digest, blob path)
+        """
+        digest = self.digest(source_path)
+        blob = self.blob_path(digest, os.path.splitext(source_path)[1])
+
+        with self._lock:
+            if os.path.exists(blob) and self._blob_intact(blob, digest):
+                # Bump the ctime (mtime unchanged) so prune treats the blob as in use
+                stat = os.stat(blob)
+                os.utime(blob, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                self.stats["deduplicated"] += 1
+                self.stats["bytes_saved"] += os.path.getsize(blob)
+                if move and not os.path.samefile(source_path, blob):
+                    os.remove(source_path)
+                return digest, blob
+
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp_path = f"{blob}.{uuid.uuid4().hex}.tmp"
+            if move:
+                try:
+                    os.replace(source_path, tmp_path)
+                except OSError:
+                    # Different filesystem
+                    self._copy(source_path, tmp_path)
+                    os.remove(source_path)
+            else:
+                # The caller keeps writing to its own file, so the blob must not share its inode
+                self._copy(source_path, tmp_path)
+            os.replace(tmp_path, blob)
+            self._digests[self._stat_key(blob)] = digest
+        return digest, blob
+
+    def place(self, source_path: str, target_path: str, move: bool = False,
+              manifest_path: Optional[str] = None, source: str = "") -> str:
+        """
+        Put the content of ``source_path`` at ``target_path`` without copying it
+
+        Args:
+            source_path: Existing file
+            target_path: Where the artifact should appear (replaced atomically)
+            move: Let the store take ownership of ``source_path``
+            manifest_path: Session manifest to record the placement in
+            source: Component that produced the artifact
+
+        Returns:
+            ``target_path``
+        """
+        if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+            digest = self.digest(target_path)
+            method = "in_place"
+        else:
+            os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+            tmp_path = f"{target_path}.{uuid.uuid4().hex}.tmp"
+            for attempt in range(1, self.PLACE_ATTEMPTS + 1):
+                digest, blob = self.ingest(source_path, move=move)
+                try:
+                    method = self._link_or_copy(blob, tmp_path)
+                    break
+                except FileNotFoundError:
+                    # Pruned before it was linked; ingest recreates it while the source exists
+                    if attempt == self.PLACE_ATTEMPTS or not os.path.exists(source_path):
+                        raise
+                    logger.debug(f"🔁 Artifact {digest[:12]} pruned before placement, re-ingesting")
+            os.replace(tmp_path, target_path)
+
+        self.stats["placed"] += 1
+        if manifest_path:
+            self.record(manifest_path, target_path, digest, method, source)
+        logger.debug(f"📦 Placed {os.path.basename(target_path)} ({method}, {digest[:12]})")
+        return target_path
+
+    def same_content(self, first_path: str, second_path: str) -> bool:
+        try:
+            if os.path.samefile(first_path, second_path):
+                return True
+            if os.path.getsize(first_path) != os.path.getsize(second_path):
+                return False
+            return self.digest(first_path) == self.digest(second_path)
+        except OSError:
+            return False
+
+    def record(self, manifest_path: str, target_path: str, digest: str,
+               method: str, source: str = ""):
+        """Add or update an entry in a session manifest"""
+        with self._lock:
+            manifest = self.load_manifest(manifest_path)
+            session_root = os.path.dirname(os.path.dirname(manifest_path))
+            manifest.setdefault("artifacts", {})[os.path.relpath(target_path, session_root)] = {
+                "digest": digest,
+                "size": os.path.getsize(target_path),
+                "method": method,
+                "source": source,
+                "placed_at": datetime.now().isoformat()
+            }
+            self._write_manifest(manifest_path, manifest)
+
+    def record_rendition(self, manifest_path: str, platform: str, target_path: str,
+                         master_path: str, details: Dict):
+        """Register a per-platform rendition of ``master_path`` in a session manifest for publishers"""
+        with self._lock:
+            manifest = self.load_manifest(manifest_path)
+            session_root = os.path.dirname(os.path.dirname(manifest_path))
+            manifest.setdefault("renditions", {})[platform] = {
+                **details,
+                "path": os.path.relpath(target_path, session_root),
+                "master": os.path.relpath(os.path.abspath(master_path), os.path.abspath(session_root)),
+                "registered_at": datetime.now().isoformat()
+            }
+            self._write_manifest(manifest_path, manifest)
+
+    @staticmethod
+    def _write_manifest(manifest_path: str, manifest: Dict):
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        tmp_path = f"{manifest_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    @staticmethod
+    def load_manifest(manifest_path: str) -> Dict:
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"artifacts": {}}
+
+    def prune(self, min_age_seconds: float = 0) -> int:
+        """
+        Delete blobs no session links to any more
+
+        Args:
+            min_age_seconds: Keep unlinked blobs created, written or
+                reused within this window; they may be about to be placed
+
+        Returns:
+            Bytes freed
+        """
+        freed = 0
+        if not os.path.isdir(self.root):
+            return freed
+        cutoff = time.time() - min_age_seconds
+        with self._lock:
+            for directory, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                        if stat.st_nlink <= 1 and max(stat.st_ctime, stat.st_mtime) < cutoff:
+                            os.remove(path)
+                            freed += stat.st_size
+                    except OSError:
+                        continue
+        if freed:
+            logger.info(f"🧹 Pruned unreferenced artifacts: {freed / (1024 * 1024):.1f}MB")
+        return freed
+
+    def _blob_intact(self, blob: str, digest: str) -> bool:
+        """True if the blob still holds ``digest`` (re-hashed only when its stat changed)"""
+        if self._digests.get(self._stat_key(blob)) == digest:
+            return True
+        if self.digest(blob) == digest:
+            return True
+        logger.warning(f"⚠️ Artifact {digest[:12]} was modified in place; replacing it")
+        os.remove(blob)
+        return False
+
+    @staticmethod
+    def _stat_key(path: str) -> Tuple[int, int, int, int]:
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def _link_or_copy(cls, source_path: str, target_path: str) -> str:
+        """Hardlink, else fall back to _copy"""
+        try:
+            os.link(source_path, target_path)
+            return "hardlink"
+        except OSError:
+            return cls._copy(source_path, target_path)
+
+    @staticmethod
+    def _copy(source_path: str, target_path: str) -> str:
+        """In-kernel copy (reflink on filesystems that support it), else copy"""
+        if hasattr(os, "copy_file_range"):
+            try:
+                with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+                    remaining = os.fstat(src.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                if remaining == 0:
+                    shutil.copystat(source_path, target_path)
+                    return "copy_range"
+            except OSError:
+                pass
+
+        shutil.copy2(source_path, target_path)
+        return "copy"
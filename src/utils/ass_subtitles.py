@@ -0,0 +1,276 @@
+"""
+ASS Subtitle Engine - Styled subtitle documents burned in by libass
+Timed subtitle segments become one ASS document whose styles come from
+video_config.text_overlay and the positioning decision; libass renders it
+(shaping and bidi included) inside an ffmpeg encode that already runs
+"""
+
+import os
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+from PIL import ImageColor
+
+from ..config.video_config import video_config
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RTL_PATTERN = re.compile(r'[\u0590-\u05FF\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+
+# Subtitle sizes in video_config are tuned for libass' default 288-line
+# script space, which is what the SRT burn-in rendered them in
+REFERENCE_SCRIPT_HEIGHT = 288
+
+STYLE_FIELDS = (
+    "Name", "Fontname", "Fontsize", "PrimaryColour", "SecondaryColour", "OutlineColour",
+    "BackColour", "Bold", "Italic", "Underline", "StrikeOut", "ScaleX", "ScaleY", "Spacing",
+    "Angle", "BorderStyle", "Outline", "Shadow", "Alignment", "MarginL", "MarginR", "MarginV",
+    "Encoding"
+)
+EVENT_FIELDS = ("Layer", "Start", "End", "Style", "Name", "MarginL", "MarginR", "MarginV", "Effect", "Text")
+
+# ASS numpad alignment per positioning decision
+POSITION_ALIGNMENT = {
+    'top_third': 8,
+    'center': 5,
+    'bottom_third': 2
+}
+
+
+@dataclass
+class AssStyle:
+    """One [V4+ Styles] entry (sizes in script pixels)"""
+    name: str = "Default"
+    font: str = "Arial"
+    font_size: int = 36
+    primary_color: str = "white"
+    outline_color: str = "black"
+    outline_opacity: float = 1.0
+    back_color: str = "black"
+    back_opacity: float = 0.5
+    # Subtitles are always bold, as with the SRT burn-in
+    bold: bool = True
+    # 1 = outline + shadow, 3 = opaque box behind each line
+    border_style: int = 1
+    outline: float = 2
+    shadow: float = 1
+    alignment: int = 2
+    margin_l: int = 20
+    margin_r: int = 20
+    margin_v: int = 20
+    # -1 lets libass pick the base direction from the text
+    encoding: int = 1
+
+    def to_line(self) -> str:
+        values = [
+            self.name, self.font, str(self.font_size),
+            ass_color(self.primary_color), ass_color(self.primary_color),
+            ass_color(self.outline_color, self.outline_opacity), ass_color(self.back_color, self.back_opacity),
+            "-1" if self.bold else "0", "0", "0", "0", "100", "100", "0", "0",
+            str(self.border_style), _number(self.outline), _number(self.shadow),
+            str(self.alignment), str(self.margin_l), str(self.margin_r), str(self.margin_v),
+            str(self.encoding)
+        ]
+        return "Style: " + ",".join(values)
+
+
+@dataclass
+class AssEvent:
+    """One Dialogue line"""
+    start: float
+    end: float
+    text: str
+    style: str = "Default"
+
+    def to_line(self) -> str:
+        return (f"Dialogue: 0,{ass_time(self.start)},{ass_time(self.end)},{self.style},,0,0,0,,"
+                f"{escape_text(self.text)}")
+
+
+@dataclass
+class AssSubtitleDocument:
+    """An ASS script sized to the video it is burned into"""
+    width: int
+    height: int
+    title: str = "Viral Video Subtitles"
+    styles: Dict[str, AssStyle] = field(default_factory=dict)
+    events: List[AssEvent] = field(default_factory=list)
+
+    def add_style(self, style: AssStyle) -> AssStyle:
+        self.styles[style.name] = style
+        return style
+
+    def add_event(self, start: float, end: float, text: str, style: str = "Default") -> Optional[AssEvent]:
+        if end <= start or not text.strip():
+            return None
+        event = AssEvent(start=start, end=end, text=text, style=style)
+        self.events.append(event)
+        return event
+
+    def to_string(self) -> str:
+        lines = [
+            "[Script Info]",
+            f"Title: {self.title}",
+            "ScriptType: v4.00+",
+            f"PlayResX: {self.width}",
+            f"PlayResY: {self.height}",
+            "WrapStyle: 0",
+            "ScaledBorderAndShadow: yes",
+            "YCbCr Matrix: TV.709",
+            "",
+            "[V4+ Styles]",
+            "Format: " + ", ".join(STYLE_FIELDS)
+        ]
+        lines.extend(style.to_line() for style in self.styles.values())
+        lines.extend(["", "[Events]", "Format: " + ", ".join(EVENT_FIELDS)])
+        lines.extend(event.to_line() for event in sorted(self.events, key=lambda e: e.start))
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # BOM so libass and editors detect UTF-8 for Hebrew/Arabic text
+        with open(path, "w", encoding="utf-8-sig") as f:
+            f.write(self.to_string())
+        logger.info(f"📝 ASS subtitles saved: {path} ({len(self.events)} events)")
+        return path
+
+
+def ass_color(color: str, opacity: float = 1.0) -> str:
+    """Color name or #hex as ASS &HAABBGGRR (alpha 00 is opaque)"""
+    red, green, blue = ImageColor.getrgb(color)[:3]
+    alpha = round((1.0 - max(0.0, min(1.0, opacity))) * 255)
+    return f"&H{alpha:02X}{blue:02X}{green:02X}{red:02X}"
+
+
+def ass_time(seconds: float) -> str:
+    """Seconds as H:MM:SS.cc"""
+    centiseconds = max(0, int(round(seconds * 100)))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+
+
+def escape_text(text: str) -> str:
+    """Keep subtitle text literal: no override blocks, hard line breaks only"""
+    # Backslashes and braces would start override tags; use look-alike characters
+    text = text.replace("\\", "\u29F5").replace("{", "\uFF5B").replace("}", "\uFF5D")
+    return "\\N".join(line.strip() for line in text.strip().splitlines())
+
+
+def _number(value: float) -> str:
+    return f"{value:g}"
+
+
+def is_rtl(text: str) -> bool:
+    return bool(RTL_PATTERN.search(text))
+
+
+def font_family(font: str) -> tuple:
+    """Split an ImageMagick-style name like 'Arial-Bold' into (family, bold)"""
+    if font.lower().endswith("-bold"):
+        return font[:-5], True
+    return font, False
+
+
+def build_subtitle_document(segments: Sequence[Dict[str, Any]], width: int, height: int,
+                            position: str = 'bottom_third', font_size: Optional[int] = None,
+                            boxed: bool = False, box_opacity: Optional[float] = None) -> AssSubtitleDocument:
+    """
+    Build the ASS document for timed subtitle segments
+
+    Args:
+        segments: Dicts with 'start', 'end' and 'text' (or 'full_text'); text may hold line breaks
+        width: Video width the document is rendered at
+        height: Video height the document is rendered at
+        position: 'top_third', 'center' or 'bottom_third' from the positioning decision
+        font_size: Font size in video pixels (defaults to the configured subtitle size)
+        boxed: Draw a translucent box behind each line instead of a drop shadow
+        box_opacity: Box opacity (defaults to text_overlay.background_opacity)
+
+    Returns:
+        The document, with an 'RTL' style used by right-to-left segments
+    """
+    overlay = video_config.text_overlay
+    scale = height / REFERENCE_SCRIPT_HEIGHT
+    if font_size is None:
+        reference_size = video_config.get_font_size('subtitle', width)
+        font_size = round(reference_size * scale)
+        outline = max(2, int(reference_size * 0.08)) * scale
+        shadow = max(1, int(reference_size * 0.05)) * scale
+    else:
+        outline = max(3, int(font_size * 0.08))
+        shadow = max(1, int(font_size * 0.05))
+
+    is_portrait = height > width
+    if position == 'top_third':
+        margin_v = round(height * 0.20)
+    elif position == 'center':
+        margin_v = 0
+    else:
+        # Clear of platform UI at the bottom of portrait players
+        margin_v = round(height * (0.25 if is_portrait else 0.30))
+        position = 'bottom_third'
+
+    if boxed:
+        # BorderStyle 3 draws a box in the outline colour, padded by the outline width
+        opacity = box_opacity if box_opacity is not None else overlay.background_opacity
+        border_style, outline_color, outline_opacity = 3, "black", opacity
+        outline, shadow = round(font_size * 0.4), 0
+    else:
+        border_style, outline_color, outline_opacity = 1, overlay.default_stroke_color, 1.0
+        outline, shadow = round(outline, 1), round(shadow, 1)
+
+    family, _ = font_family(overlay.default_font)
+    base = AssStyle(
+        name="Default",
+        font=family,
+        font_size=font_size,
+        primary_color=overlay.default_text_color,
+        outline_color=outline_color,
+        outline_opacity=outline_opacity,
+        border_style=border_style,
+        outline=outline,
+        shadow=shadow,
+        alignment=POSITION_ALIGNMENT[position],
+        margin_l=round(width * 0.05),
+        margin_r=round(width * 0.05),
+        margin_v=margin_v
+    )
+
+    document = AssSubtitleDocument(width=width, height=height)
+    document.add_style(base)
+    document.add_style(replace(base, name="RTL", font=font_family(overlay.rtl_font)[0], encoding=-1))
+
+    for segment in segments:
+        text = str(segment.get('full_text') or segment.get('text') or '')
+        # Logical order without direction marks: libass shapes and reorders RTL runs itself
+        text = text.replace('\u200F', '').replace('\u200E', '')
+        document.add_event(
+            float(segment.get('start', 0.0)),
+            float(segment.get('end', 0.0)),
+            text,
+            style="RTL" if is_rtl(text) else "Default"
+        )
+    return document
+
+
+def escape_filter_path(path: str) -> str:
+    """Escape a file path for use as a filter option inside an ffmpeg filtergraph"""
+    path = path.replace("\\", "/")
+    # Option-value level, then filtergraph level
+    for char in ("\\", "'", ":"):
+        path = path.replace(char, "\\" + char)
+    for char in ("\\", "'", "[", "]", ",", ";"):
+        path = path.replace(char, "\\" + char)
+    return path
+
+
+def ass_filter(ass_path: str, fonts_dir: Optional[str] = None) -> str:
+    """The ffmpeg ``ass`` filter for a document, appendable to an existing -vf chain"""
+    filter_str = f"ass={escape_filter_path(ass_path)}"
+    if fonts_dir:
+        filter_str += f":fontsdir={escape_filter_path(fonts_dir)}"
+    return filter_str
@@ -0,0 +1,205 @@
+"""
+Continuity Frame Extractor
+Decodes exactly one frame near the end of a clip for frame continuity,
+using input-side seeking and a per-clip cache
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, Optional, Tuple
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ClipFrameInfo:
+    """Frame timing of a clip's first video stream"""
+    frame_count: int
+    fps: float
+
+    def timestamp_for(self, frame_index: int) -> float:
+        """Presentation time of a frame, assuming constant frame rate"""
+        return frame_index / self.fps
+
+
+class ContinuityFrameExtractor:
+    """
+    Extracts the continuity frame of a clip with a single-frame decode
+
+    The frame index is counted back from the end of the clip by
+    ``trim_frames`` (the same convention as
+    ``video_config.animation.frame_continuity_trim_frames``). Seeking
+    happens on the input side so FFmpeg starts decoding at the nearest
+    keyframe rather than at the beginning of the file.
+    """
+
+    def __init__(self):
+        # (path, mtime_ns, size, trim_frames) -> extracted frame path / JPEG bytes
+        self._path_cache: Dict[Tuple, str] = {}
+        self._buffer_cache: Dict[Tuple, bytes] = {}
+        self._info_cache: Dict[Tuple, ClipFrameInfo] = {}
+        self._lock = threading.Lock()
+
+    def extract_to_path(self, video_path: str, output_path: str, trim_frames: int = 1) -> Optional[str]:
+        """
+        Write the continuity frame of a clip to an image file
+
+        Args:
+            video_path: Source clip
+            output_path: Target image path (format chosen by extension)
+            trim_frames: Frames to skip back from the final frame
+
+        Returns:
+            output_path on success, otherwise None
+        """
+        key = self._cache_key(video_path, trim_frames)
+        if key is None:
+            return None
+
+        with self._lock:
+            cached = self._path_cache.get(key)
+        if cached and os.path.exists(cached):
+            if cached != output_path:
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                shutil.copyfile(cached, output_path)
+            logger.debug(f"🖼️ Continuity frame cache hit for {video_path}")
+            return output_path
+
+        seek_args = self._seek_args(video_path, key, trim_frames)
+        if seek_args is None:
+            return None
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        cmd = ['ffmpeg', '-y', '-v', 'error'] + seek_args + [
+            '-q:v', '1',
+            '-pix_fmt', 'yuvj420p',  # Use full-range YUV for JPEG
+            output_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        if result.returncode != 0 or not os.path.exists(output_path):
+            logger.warning(f"Failed to extract continuity frame: {result.stderr}")
+            return None
+
+        with self._lock:
+            self._path_cache[key] = output_path
+        return output_path
+
+    def extract_to_buffer(self, video_path: str, trim_frames: int = 1) -> Optional[bytes]:
+        """
+        Decode the continuity frame of a clip into JPEG bytes in memory
+
+        Args:
+            video_path: Source clip
+            trim_frames: Frames to skip back from the final frame
+
+        Returns:
+            JPEG-encoded frame, or None on failure
+        """
+        key = self._cache_key(video_path, trim_frames)
+        if key is None:
+            return None
+
+        with self._lock:
+            cached = self._buffer_cache.get(key)
+        if cached is not None:
+            return cached
+
+        seek_args = self._seek_args(video_path, key, trim_frames)
+        if seek_args is None:
+            return None
+
+        cmd = ['ffmpeg', '-v', 'error'] + seek_args + [
+            '-q:v', '1',
+            '-f', 'image2pipe', '-c:v', 'mjpeg',
+            'pipe:1'
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+
+        if result.returncode != 0 or not result.stdout:
+            logger.warning(f"Failed to extract continuity frame: {result.stderr.decode(errors='replace')}")
+            return None
+
+        with self._lock:
+            self._buffer_cache[key] = result.stdout
+        return result.stdout
+
+    def clear_cache(self):
+        """Forget all cached frames and probe results"""
+        with self._lock:
+            self._path_cache.clear()
+            self._buffer_cache.clear()
+            self._info_cache.clear()
+
+    def probe_frame_info(self, video_path: str) -> Optional[ClipFrameInfo]:
+        """Read frame count and frame rate with a single ffprobe call"""
+        cmd = [
+            'ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
+            '-show_entries', 'stream=nb_frames,r_frame_rate,avg_frame_rate,duration:format=duration',
+            '-of', 'json', video_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+
+        try:
+            probe = json.loads(result.stdout)
+            stream = probe['streams'][0]
+            fps = self._parse_rate(stream.get('avg_frame_rate')) or self._parse_rate(stream.get('r_frame_rate'))
+            if not fps:
+                return None
+
+            frame_count = int(stream.get('nb_frames') or 0)
+            if frame_count <= 0:
+                # Some containers don't store a frame count; derive it from duration
+                duration = float(stream.get('duration') or probe.get('format', {}).get('duration') or 0)
+                frame_count = int(round(duration * fps))
+            if frame_count <= 0:
+                return None
+
+            return ClipFrameInfo(frame_count=frame_count, fps=fps)
+        except (KeyError, IndexError, ValueError):
+            return None
+
+    def _seek_args(self, video_path: str, key: Tuple, trim_frames: int) -> Optional[list]:
+        with self._lock:
+            info = self._info_cache.get(key[:3])
+        if info is None:
+            info = self.probe_frame_info(video_path)
+            if info is None:
+                logger.warning(f"Could not determine frame count for: {video_path}")
+                return None
+            with self._lock:
+                self._info_cache[key[:3]] = info
+
+        frame_index = max(0, info.frame_count - int(trim_frames) - 1)
+        timestamp = info.timestamp_for(frame_index)
+        logger.debug(f"📍 Continuity frame {frame_index + 1}/{info.frame_count} at {timestamp:.3f}s")
+
+        return ['-ss', f"{timestamp:.6f}", '-i', video_path, '-an', '-frames:v', '1']
+
+    @staticmethod
+    def _cache_key(video_path: str, trim_frames: int) -> Optional[Tuple]:
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            logger.warning(f"Clip not found for continuity frame: {video_path}")
+            return None
+        return (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size, int(trim_frames))
+
+    @staticmethod
+    def _parse_rate(rate: Optional[str]) -> Optional[float]:
+        if not rate or rate in ("0/0", "0"):
+            return None
+        try:
+            value = float(Fraction(rate))
+        except (ValueError, ZeroDivisionError):
+            return None
+        return value if value > 0 else None
@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import logging
 
+from .tracing import run_subprocess
+
 logger = logging.getLogger(__name__)
 
 class FFmpegProcessor:
@@ -524,8 +526,9 @@ class FFmpegProcessor:
         logger.debug(f"Command: {' '.join(cmd)}")
         
         try:
-            result = subprocess.run(
+            result = run_subprocess(
                 cmd, 
+                span_name="ffmpeg",
                 capture_output=True, 
                 text=True, 
                 check=True,
@@ -0,0 +1,160 @@
+"""
+Local Frame Interpolation
+Optical-flow in-between frames and FFmpeg xfade transitions computed on CPU,
+replacing remote image generation for scene-to-scene transitions
+"""
+
+import os
+from typing import List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class FrameInterpolator:
+    """Deterministic scene transitions without network calls"""
+
+    # Optical flow is estimated on a downscaled copy, then scaled back up
+    FLOW_MAX_DIMENSION = 480
+
+    def __init__(self, flow_max_dimension: int = FLOW_MAX_DIMENSION):
+        self.flow_max_dimension = flow_max_dimension
+
+    def interpolate_frames(self,
+                           image1_path: str,
+                           image2_path: str,
+                           num_frames: int,
+                           output_dir: str,
+                           prefix: str = "interp") -> List[str]:
+        """
+        Write in-between frames that morph the first image into the second
+
+        Args:
+            image1_path: Path to the starting frame
+            image2_path: Path to the ending frame (resized to match the first)
+            num_frames: Number of intermediate frames to produce
+            output_dir: Directory for the generated frames
+            prefix: Filename prefix for the generated frames
+
+        Returns:
+            List of frame paths in playback order
+        """
+        frame1 = cv2.imread(image1_path)
+        frame2 = cv2.imread(image2_path)
+        if frame1 is None or frame2 is None:
+            raise ValueError(f"Could not read frames for interpolation: {image1_path}, {image2_path}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        frames = self.interpolate(frame1, frame2, num_frames)
+
+        paths = []
+        for i, frame in enumerate(frames, 1):
+            path = os.path.join(output_dir, f"{prefix}_{i:03d}.png")
+            cv2.imwrite(path, frame)
+            paths.append(path)
+
+        logger.info(f"🔄 Interpolated {len(paths)} transition frames locally")
+        return paths
+
+    def interpolate(self, frame1: np.ndarray, frame2: np.ndarray, num_frames: int) -> List[np.ndarray]:
+        """
+        Compute intermediate frames using bidirectional optical flow
+
+        Each frame warps both endpoints toward time t along the estimated
+        motion and blends them, so moving content travels instead of ghosting.
+        """
+        if num_frames <= 0:
+            return []
+
+        height, width = frame1.shape[:2]
+        if frame2.shape[:2] != (height, width):
+            frame2 = cv2.resize(frame2, (width, height), interpolation=cv2.INTER_AREA)
+
+        flow_forward, flow_backward = self._bidirectional_flow(frame1, frame2)
+        grid_x, grid_y = np.meshgrid(np.arange(width, dtype=np.float32),
+                                     np.arange(height, dtype=np.float32))
+
+        source1 = frame1.astype(np.float32)
+        source2 = frame2.astype(np.float32)
+
+        frames = []
+        for i in range(1, num_frames + 1):
+            t = i / (num_frames + 1)
+            warped1 = cv2.remap(source1,
+                                grid_x - t * flow_forward[..., 0],
+                                grid_y - t * flow_forward[..., 1],
+                                cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+            warped2 = cv2.remap(source2,
+                                grid_x - (1 - t) * flow_backward[..., 0],
+                                grid_y - (1 - t) * flow_backward[..., 1],
+                                cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+            blended = (1 - t) * warped1 + t * warped2
+            frames.append(np.clip(blended, 0, 255).astype(np.uint8))
+
+        return frames
+
+    def _bidirectional_flow(self, frame1: np.ndarray, frame2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        height, width = frame1.shape[:2]
+        scale = min(1.0, self.flow_max_dimension / max(height, width))
+        small_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        gray1 = cv2.cvtColor(cv2.resize(frame1, small_size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        gray2 = cv2.cvtColor(cv2.resize(frame2, small_size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+
+        flows = []
+        for source, target in ((gray1, gray2), (gray2, gray1)):
+            flow = cv2.calcOpticalFlowFarneback(source, target, None,
+                                                0.5, 3, 15, 3, 5, 1.2, 0)
+            if scale < 1.0:
+                flow = cv2.resize(flow, (width, height), interpolation=cv2.INTER_LINEAR) / scale
+            flows.append(flow.astype(np.float32))
+
+        return flows[0], flows[1]
+
+    @staticmethod
+    def build_xfade_chain(input_labels: Sequence[str],
+                          durations: Sequence[float],
+                          transition_duration: float,
+                          transition: str = "fade",
+                          output_label: str = "outv") -> str:
+        """
+        Build an FFmpeg xfade filter chain joining several video streams
+
+        Offsets are computed from the actual stream durations; each
+        transition overlaps the tail of the running output with the head
+        of the next stream.
+
+        Args:
+            input_labels: Stream labels without brackets, e.g. ["v0", "v1"]
+            durations: Duration in seconds of each labelled stream
+            transition_duration: Length of each transition in seconds
+            transition: xfade transition name
+            output_label: Label for the final stream
+
+        Returns:
+            Filter graph fragment ending in [output_label]
+        """
+        if len(input_labels) < 2:
+            raise ValueError("xfade needs at least two inputs")
+
+        # A transition can't be longer than either side it joins
+        transition_duration = min([transition_duration] + [d for d in durations if d > 0])
+
+        parts = []
+        current = input_labels[0]
+        elapsed = durations[0]
+        for i in range(1, len(input_labels)):
+            offset = max(0.0, elapsed - transition_duration)
+            label = output_label if i == len(input_labels) - 1 else f"xf{i}"
+            parts.append(
+                f"[{current}][{input_labels[i]}]xfade=transition={transition}:"
+                f"duration={transition_duration:.3f}:offset={offset:.3f}[{label}]"
+            )
+            current = label
+            elapsed = offset + durations[i]
+
+        return ";".join(parts)
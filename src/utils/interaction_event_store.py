@@ -0,0 +1,238 @@
+"""
+Append-only Interaction Event Store
+Line-delimited JSON log with batched writes and per-content incremental indexes
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Stores with possibly unflushed events, flushed when the interpreter exits
+_open_stores: "weakref.WeakSet[InteractionEventStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        try:
+            store.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not flush {store.log_path} at exit: {e}")
+
+
+class FsyncPolicy(Enum):
+    """When buffered events are forced to stable storage"""
+    NEVER = "never"     # Leave durability to the OS page cache
+    BATCH = "batch"     # fsync once per flushed batch
+    ALWAYS = "always"   # Flush and fsync after every event
+
+
+@dataclass
+class EventStoreConfig:
+    """Configuration for the interaction event store"""
+    batch_size: int = 50
+    flush_interval_seconds: float = 2.0
+    fsync_policy: FsyncPolicy = FsyncPolicy.BATCH
+    log_filename: str = "interaction_events.jsonl"
+
+
+class InteractionEventStore:
+    """
+    Append-only, line-delimited event log.
+
+    Events are buffered in memory and appended to the log in batches, so
+    recording a metric never re-reads or rewrites earlier entries. A
+    background thread flushes the buffer every ``flush_interval_seconds``
+    and pending events are flushed at interpreter exit, so a quiet tracker
+    never holds events indefinitely.
+    """
+
+    def __init__(self, store_dir: Path, config: Optional[EventStoreConfig] = None):
+        self.config = config or EventStoreConfig()
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.store_dir / self.config.log_filename
+
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        _open_stores.add(self)
+        if self.config.fsync_policy != FsyncPolicy.ALWAYS:
+            # The thread holds only a weak reference so the store can be collected
+            threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._stop, self.config.flush_interval_seconds),
+                name=f"event-store-flush-{self.config.log_filename}",
+                daemon=True
+            ).start()
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Queue an event for appending to the log"""
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if self._should_flush():
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write all buffered events to the log"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush pending events and stop the background flusher
+
+        The store can still be used afterwards; later appends are flushed
+        by batch size, on the next append after the interval, or at exit.
+        """
+        self._stop.set()
+        self.flush()
+
+    def iter_events(self, event_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over persisted events in append order"""
+        self.flush()
+        if not self.log_path.exists():
+            return
+
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated final line
+                    logger.warning(f"⚠️ Skipping corrupt event at {self.log_path}:{line_number}")
+                    continue
+                if event_type is None or event.get("type") == event_type:
+                    yield event
+
+    @property
+    def pending_events(self) -> int:
+        """Number of events buffered but not yet written"""
+        return len(self._buffer)
+
+    def _should_flush(self) -> bool:
+        if self.config.fsync_policy == FsyncPolicy.ALWAYS:
+            return True
+        if len(self._buffer) >= self.config.batch_size:
+            return True
+        return time.monotonic() - self._last_flush >= self.config.flush_interval_seconds
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(self._buffer) + "\n")
+            if self.config.fsync_policy != FsyncPolicy.NEVER:
+                f.flush()
+                os.fsync(f.fileno())
+        self._buffer.clear()
+
+
+def _flush_periodically(store_ref: "weakref.ref[InteractionEventStore]",
+                        stop: threading.Event, interval: float) -> None:
+    """Background loop flushing a store's buffer every ``interval`` seconds"""
+    while not stop.wait(interval):
+        store = store_ref()
+        if store is None:
+            return
+        if store.pending_events:
+            try:
+                store.flush()
+            except OSError as e:
+                logger.warning(f"⚠️ Background flush of {store.log_path} failed: {e}")
+        del store
+
+
+@dataclass
+class ContentIndex:
+    """Incrementally maintained timeline for a single piece of content"""
+    content_id: str
+    timeline: List[Dict[str, Any]] = field(default_factory=list)
+    _timestamps: List[str] = field(default_factory=list, repr=False)
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        """Insert a data point in timestamp order and update growth rates"""
+        position = bisect_right(self._timestamps, interaction['timestamp'])
+        self._timestamps.insert(position, interaction['timestamp'])
+        self.timeline.insert(position, {
+            "timestamp": interaction['timestamp'],
+            "metrics": interaction['metrics'],
+            "engagement_score": interaction['engagement_score'],
+            "calculated_rates": interaction.get('calculated_rates', {}),
+            "growth_rates": {}
+        })
+
+        # Only the inserted point and its successor see a new predecessor
+        for index in (position, position + 1):
+            if index < len(self.timeline):
+                self.timeline[index]["growth_rates"] = self._growth_rates(index)
+
+    @property
+    def first(self) -> Dict[str, Any]:
+        return self.timeline[0]
+
+    @property
+    def latest(self) -> Dict[str, Any]:
+        return self.timeline[-1]
+
+    def _growth_rates(self, index: int) -> Dict[str, float]:
+        current = self.timeline[index]['metrics']
+        if index == 0:
+            return {metric: 0 for metric in current.keys()}
+
+        previous = self.timeline[index - 1]['metrics']
+        growth_rates = {}
+        for metric, current_value in current.items():
+            prev_value = previous.get(metric, 0)
+            if prev_value > 0:
+                growth_rate = ((current_value - prev_value) / prev_value) * 100
+            else:
+                growth_rate = 100 if current_value > 0 else 0
+            growth_rates[metric] = round(growth_rate, 2)
+        return growth_rates
+
+
+@dataclass
+class PlatformTimingAggregate:
+    """Running engagement-score sums per posting hour and weekday"""
+    data_points: int = 0
+    hourly: Dict[int, List[float]] = field(default_factory=dict)
+    daily: Dict[str, List[float]] = field(default_factory=dict)
+
+    def add(self, timestamp: str, score: float) -> None:
+        dt = datetime.fromisoformat(timestamp)
+        self.data_points += 1
+        self._accumulate(self.hourly, dt.hour, score)
+        self._accumulate(self.daily, dt.strftime('%A'), score)
+
+    def hourly_averages(self) -> Dict[int, float]:
+        return {hour: total / count for hour, (total, count) in self.hourly.items()}
+
+    def daily_averages(self) -> Dict[str, float]:
+        return {day: total / count for day, (total, count) in self.daily.items()}
+
+    @staticmethod
+    def _accumulate(bucket: Dict[Any, List[float]], key: Any, score: float) -> None:
+        totals = bucket.setdefault(key, [0.0, 0])
+        totals[0] += score
+        totals[1] += 1
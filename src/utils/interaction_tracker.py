@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from ..utils.logging_config import get_logger
+from ..utils.interaction_event_store import (
+    InteractionEventStore, EventStoreConfig, ContentIndex, PlatformTimingAggregate
+)
 from ..ai.manager import AIServiceManager
 from ..ai.interfaces.text_generation import TextGenerationRequest
 from ..ai.interfaces.base import AIServiceType
@@ -21,16 +24,30 @@ class InteractionTracker:
     Focuses on likes, follows, reactions, and behavioral patterns
     """
     
-    def __init__(self, session_context, ai_manager: AIServiceManager = None):
+    def __init__(
+        self,
+        session_context,
+        ai_manager: AIServiceManager = None,
+        store_config: Optional[EventStoreConfig] = None
+    ):
         self.session_context = session_context
         self.ai_manager = ai_manager
         self.tracking_data = {}
         self.interaction_history = []
+        self.behavioral_data = {}
+        
+        # Incremental indexes kept in step with the event log
+        self.content_indexes: Dict[str, ContentIndex] = {}
+        self.platform_aggregates: Dict[str, PlatformTimingAggregate] = {}
         
         # Create tracking directory
         self.tracking_dir = Path(session_context.session_dir) / "interaction_tracking"
         self.tracking_dir.mkdir(exist_ok=True)
         
+        # Append-only event log replaces per-content read-modify-write JSON
+        self.event_store = InteractionEventStore(self.tracking_dir, store_config)
+        self._replay_events()
+        
         logger.info("✅ Interaction Tracker initialized")
     
     def track_engagement_metrics(
@@ -76,12 +93,8 @@ class InteractionTracker:
             "engagement_score": self._calculate_engagement_score(metrics)
         }
         
-        # Store in tracking data
-        if content_id not in self.tracking_data:
-            self.tracking_data[content_id] = []
-        
-        self.tracking_data[content_id].append(interaction_data)
-        self.interaction_history.append(interaction_data)
+        # Store in tracking data and indexes
+        self._index_interaction(interaction_data)
         
         # Save to file
         self._save_tracking_data(content_id, interaction_data)
@@ -113,10 +126,9 @@ class InteractionTracker:
             }
         }
         
-        # Save behavioral data
-        behavior_file = self.tracking_dir / f"{content_id}_behavior.json"
-        with open(behavior_file, 'w') as f:
-            json.dump(behavior_tracking, f, indent=2)
+        # Save behavioral data (latest snapshot per content wins on replay)
+        self.behavioral_data[content_id] = behavior_tracking
+        self.event_store.append({"type": "behavior", **behavior_tracking})
         
         logger.info("✅ Behavioral patterns tracked")
     
@@ -181,53 +193,33 @@ class InteractionTracker:
         """
         logger.info(f"⏰ Tracking performance over time for {content_id}")
         
-        content_data = self.tracking_data.get(content_id, [])
-        if not content_data:
+        content_index = self.content_indexes.get(content_id)
+        if not content_index or not content_index.timeline:
             return {"error": "No data available for content"}
         
-        # Sort by timestamp
-        content_data.sort(key=lambda x: x['timestamp'])
-        
-        # Analyze performance evolution
-        performance_timeline = []
-        growth_rates = {}
-        
-        for i, data_point in enumerate(content_data):
-            if i == 0:
-                # First data point
-                growth_rates = {metric: 0 for metric in data_point['metrics'].keys()}
-            else:
-                # Calculate growth rates
-                prev_metrics = content_data[i-1]['metrics']
-                curr_metrics = data_point['metrics']
-                
-                for metric, current_value in curr_metrics.items():
-                    prev_value = prev_metrics.get(metric, 0)
-                    if prev_value > 0:
-                        growth_rate = ((current_value - prev_value) / prev_value) * 100
-                    else:
-                        growth_rate = 100 if current_value > 0 else 0
-                    growth_rates[metric] = round(growth_rate, 2)
-            
-            performance_timeline.append({
-                "timestamp": data_point['timestamp'],
-                "metrics": data_point['metrics'],
-                "engagement_score": data_point['engagement_score'],
-                "growth_rates": growth_rates.copy()
-            })
+        # Timeline is kept sorted with growth rates maintained on insert
+        performance_timeline = [
+            {
+                "timestamp": point['timestamp'],
+                "metrics": point['metrics'],
+                "engagement_score": point['engagement_score'],
+                "growth_rates": dict(point['growth_rates'])
+            }
+            for point in content_index.timeline
+        ]
         
         # Identify performance phases
         phases = self._identify_performance_phases(performance_timeline)
         
         return {
             "content_id": content_id,
-            "tracking_start": content_data[0]['timestamp'],
-            "tracking_end": content_data[-1]['timestamp'],
-            "data_points": len(content_data),
+            "tracking_start": content_index.first['timestamp'],
+            "tracking_end": content_index.latest['timestamp'],
+            "data_points": len(performance_timeline),
             "performance_timeline": performance_timeline,
             "performance_phases": phases,
             "peak_performance": max(performance_timeline, key=lambda x: x['engagement_score']),
-            "overall_growth": self._calculate_overall_growth(content_data[0], content_data[-1])
+            "overall_growth": self._calculate_overall_growth(content_index.first, content_index.latest)
         }
     
     def predict_optimal_posting_times(
@@ -240,38 +232,15 @@ class InteractionTracker:
         """
         logger.info(f"🎯 Predicting optimal posting times for {platform}")
         
-        # Filter data by platform
-        platform_data = [data for data in self.interaction_history 
-                        if data['platform'].lower() == platform.lower()]
+        # Posting time vs engagement is aggregated as metrics arrive
+        aggregate = self.platform_aggregates.get(platform.lower())
         
-        if not platform_data:
+        if not aggregate or not aggregate.data_points:
             return {"error": f"No data available for {platform}"}
         
-        # Analyze posting times vs engagement
-        hourly_performance = {}
-        daily_performance = {}
-        
-        for data in platform_data:
-            dt = datetime.fromisoformat(data['timestamp'])
-            hour = dt.hour
-            day = dt.strftime('%A')
-            score = data['engagement_score']
-            
-            # Hourly analysis
-            if hour not in hourly_performance:
-                hourly_performance[hour] = []
-            hourly_performance[hour].append(score)
-            
-            # Daily analysis
-            if day not in daily_performance:
-                daily_performance[day] = []
-            daily_performance[day].append(score)
-        
         # Calculate averages
-        best_hours = {hour: sum(scores)/len(scores) 
-                     for hour, scores in hourly_performance.items()}
-        best_days = {day: sum(scores)/len(scores) 
-                    for day, scores in daily_performance.items()}
+        best_hours = aggregate.hourly_averages()
+        best_days = aggregate.daily_averages()
         
         # Get top recommendations
         top_hours = sorted(best_hours.items(), key=lambda x: x[1], reverse=True)[:3]
@@ -279,7 +248,7 @@ class InteractionTracker:
         
         return {
             "platform": platform,
-            "analysis_based_on": len(platform_data),
+            "analysis_based_on": aggregate.data_points,
             "optimal_hours": [{"hour": hour, "avg_score": round(score, 1)} 
                              for hour, score in top_hours],
             "optimal_days": [{"day": day, "avg_score": round(score, 1)} 
@@ -301,8 +270,9 @@ class InteractionTracker:
         comparison_data = {}
         
         for content_id in content_ids:
-            if content_id in self.tracking_data:
-                latest_data = self.tracking_data[content_id][-1]  # Get latest metrics
+            content_index = self.content_indexes.get(content_id)
+            if content_index and content_index.timeline:
+                latest_data = content_index.latest  # Get latest metrics
                 comparison_data[content_id] = {
                     "metrics": latest_data['metrics'],
                     "engagement_score": latest_data['engagement_score'],
@@ -373,15 +343,7 @@ class InteractionTracker:
         
         if include_behavioral:
             # Include behavioral data
-            behavioral_files = list(self.tracking_dir.glob("*_behavior.json"))
-            behavioral_data = {}
-            
-            for file_path in behavioral_files:
-                with open(file_path, 'r') as f:
-                    content_id = file_path.stem.replace('_behavior', '')
-                    behavioral_data[content_id] = json.load(f)
-            
-            export_data["behavioral_data"] = behavioral_data
+            export_data["behavioral_data"] = dict(self.behavioral_data)
         
         # Save export file
         timestamp = int(time.time())
@@ -436,22 +398,48 @@ class InteractionTracker:
         
         return round(score + completion_bonus, 1)
     
+    def flush(self) -> None:
+        """Write any buffered events to the event log"""
+        self.event_store.flush()
+    
+    def close(self) -> None:
+        """Flush pending events before the tracker is discarded"""
+        self.event_store.close()
+    
     def _save_tracking_data(self, content_id: str, data: Dict[str, Any]) -> None:
-        """Save tracking data to file"""
-        file_path = self.tracking_dir / f"{content_id}_tracking.json"
-        
-        # Load existing data if file exists
-        existing_data = []
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                existing_data = json.load(f)
+        """Append tracking data to the event log"""
+        self.event_store.append({"type": "engagement", **data})
+    
+    def _index_interaction(self, interaction_data: Dict[str, Any]) -> None:
+        """Update in-memory history and incremental indexes for one data point"""
+        content_id = interaction_data['content_id']
+        self.tracking_data.setdefault(content_id, []).append(interaction_data)
+        self.interaction_history.append(interaction_data)
         
-        # Append new data
-        existing_data.append(data)
+        if content_id not in self.content_indexes:
+            self.content_indexes[content_id] = ContentIndex(content_id)
+        self.content_indexes[content_id].add(interaction_data)
         
-        # Save updated data
-        with open(file_path, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        platform = interaction_data['platform'].lower()
+        if platform not in self.platform_aggregates:
+            self.platform_aggregates[platform] = PlatformTimingAggregate()
+        self.platform_aggregates[platform].add(
+            interaction_data['timestamp'], interaction_data['engagement_score']
+        )
+    
+    def _replay_events(self) -> None:
+        """Rebuild indexes from a previously written event log"""
+        replayed = 0
+        for event in self.event_store.iter_events():
+            event_type = event.pop("type", None)
+            if event_type == "engagement":
+                self._index_interaction(event)
+                replayed += 1
+            elif event_type == "behavior":
+                self.behavioral_data[event['content_id']] = event
+        
+        if replayed:
+            logger.info(f"📂 Replayed {replayed} tracked interactions from event log")
     
     def _analyze_patterns(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze patterns in interaction data"""
@@ -10,6 +10,7 @@ from functools import partial
 import time
 
 from src.utils.logging_config import get_logger
+from src.utils.tracing import propagate, trace_span, traced
 
 logger = get_logger(__name__)
 
@@ -20,62 +21,165 @@ class ParallelProcessor:
     Optimizes performance by running independent tasks concurrently
     """
     
-    def __init__(self, max_workers: int = 4):
-        """Initialize parallel processor"""
+    def __init__(self, max_workers: int = 4, discussion_timeout: Optional[float] = None):
+        """
+        Initialize parallel processor
+        
+        Args:
+            max_workers: Worker threads for script/media tasks and for discussions
+            discussion_timeout: Default per-discussion timeout in seconds (None waits indefinitely)
+        """
         self.max_workers = max_workers
+        self.discussion_timeout = discussion_timeout
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        # Separate pool so long discussions don't starve script/media tasks in a concurrent batch
+        self.discussion_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="discussion"
+        )
+        self.last_discussion_metrics: Dict[str, Any] = {}
         logger.info(f"🚀 Parallel Processor initialized with {max_workers} workers")
     
-    async def run_parallel_ai_discussions(self, discussion_tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Run multiple AI discussions in parallel"""
+    async def run_parallel_ai_discussions(self,
+                                          discussion_tasks: List[Dict[str, Any]],
+                                          timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run multiple AI discussions in parallel without blocking the event loop
+        
+        Args:
+            discussion_tasks: Tasks with task_id, topic, participants and discussion_system
+                (or a 'runner' callable taking topic and participants)
+            timeout: Per-discussion timeout in seconds (defaults to discussion_timeout)
+            
+        Returns:
+            Results of the discussions that completed, keyed by task_id
+        """
+        return await asyncio.to_thread(self.run_discussions, discussion_tasks, timeout)
+    
+    @traced("parallel.discussions")
+    def run_discussions(self,
+                        discussion_tasks: List[Dict[str, Any]],
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run multiple AI discussions concurrently on the bounded discussion pool
+        
+        Blocking discussion calls run on worker threads. Each discussion's
+        timeout counts from the moment a worker picks it up, so queued
+        discussions are not penalised. Discussions that time out or fail are
+        left out of the results; the rest are returned as soon as they finish.
+        
+        Args:
+            discussion_tasks: Tasks with task_id, topic, participants and discussion_system
+                (or a 'runner' callable taking topic and participants)
+            timeout: Per-discussion timeout in seconds (defaults to discussion_timeout)
+            
+        Returns:
+            Results of the discussions that completed, keyed by task_id
+        """
+        timeout = self.discussion_timeout if timeout is None else timeout
         logger.info(f"🔄 Running {len(discussion_tasks)} AI discussions in parallel")
         start_time = time.time()
         
-        async def run_single_discussion(task_info):
-            """Run a single discussion task"""
-            discussion_system = task_info['discussion_system']
-            topic = task_info['topic']
-            participants = task_info['participants']
-            
-            try:
-                result = discussion_system.start_discussion(topic, participants)
-                return {
-                    'task_id': task_info['task_id'],
-                    'status': 'completed',
-                    'result': result,
-                    'topic': topic.title
-                }
-            except Exception as e:
-                logger.error(f"❌ Discussion failed for {task_info['task_id']}: {e}")
-                return {
-                    'task_id': task_info['task_id'],
-                    'status': 'failed', 
-                    'error': str(e),
-                    'topic': topic.title
-                }
+        started_at: Dict[str, float] = {}
+        futures = {
+            self.discussion_executor.submit(propagate(self._run_single_discussion), task, started_at): task
+            for task in discussion_tasks
+        }
         
-        # Run all discussions concurrently
-        tasks = [run_single_discussion(task) for task in discussion_tasks]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        pending = set(futures)
+        while pending:
+            wait_for = None
+            if timeout:
+                # Wake up at the earliest deadline among discussions already running
+                deadlines = [started_at[futures[f]['task_id']] + timeout
+                             for f in pending if futures[f]['task_id'] in started_at]
+                wait_for = max(0.0, min(deadlines) - time.time()) if deadlines else 0.05
+            
+            done, pending = concurrent.futures.wait(
+                pending, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                outcome = future.result()
+                outcomes[outcome['task_id']] = outcome
+            
+            if not timeout:
+                continue
+            
+            now = time.time()
+            for future in list(pending):
+                task_id = futures[future]['task_id']
+                if task_id in started_at and now - started_at[task_id] >= timeout:
+                    # The worker thread can't be interrupted; stop waiting for it
+                    pending.discard(future)
+                    future.cancel()
+                    outcomes[task_id] = {
+                        'task_id': task_id,
+                        'status': 'timed_out',
+                        'topic': futures[future]['topic'].title,
+                        'elapsed': now - started_at[task_id]
+                    }
+                    logger.warning(f"⏰ Discussion timed out after {timeout:.0f}s: {futures[future]['topic'].title}")
         
         # Process results
         discussion_results = {}
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"❌ Discussion task failed: {result}")
-                continue
-                
-            if result['status'] == 'completed':
-                discussion_results[result['task_id']] = result['result']
-                logger.info(f"✅ Discussion completed: {result['topic']}")
-            else:
-                logger.warning(f"⚠️ Discussion failed: {result['topic']}")
+        for outcome in outcomes.values():
+            if outcome['status'] == 'completed':
+                discussion_results[outcome['task_id']] = outcome['result']
+                logger.info(f"✅ Discussion completed: {outcome['topic']}")
+            elif outcome['status'] == 'failed':
+                logger.warning(f"⚠️ Discussion failed: {outcome['topic']}")
         
         elapsed_time = time.time() - start_time
-        logger.info(f"🚀 Parallel discussions completed in {elapsed_time:.1f}s (vs ~{len(discussion_tasks) * 20}s sequential)")
+        sequential_time = sum(outcome['elapsed'] for outcome in outcomes.values())
+        self.last_discussion_metrics = {
+            'discussions': len(discussion_tasks),
+            'completed': sum(1 for o in outcomes.values() if o['status'] == 'completed'),
+            'failed': sum(1 for o in outcomes.values() if o['status'] == 'failed'),
+            'timed_out': sum(1 for o in outcomes.values() if o['status'] == 'timed_out'),
+            'wall_clock_seconds': round(elapsed_time, 3),
+            'sequential_seconds': round(sequential_time, 3),
+            'speedup': round(sequential_time / elapsed_time, 2) if elapsed_time > 0 else 1.0,
+            'per_discussion': {
+                task_id: {'status': o['status'], 'seconds': round(o['elapsed'], 3)}
+                for task_id, o in outcomes.items()
+            }
+        }
+        
+        logger.info(f"🚀 Parallel discussions completed in {elapsed_time:.1f}s "
+                    f"(sum of discussion times {sequential_time:.1f}s)")
         
         return discussion_results
     
+    @staticmethod
+    def _run_single_discussion(task_info: Dict[str, Any], started_at: Dict[str, float]) -> Dict[str, Any]:
+        """Run a single discussion task on a worker thread"""
+        topic = task_info['topic']
+        participants = task_info['participants']
+        runner = task_info.get('runner') or task_info['discussion_system'].start_discussion
+        
+        task_started = time.time()
+        started_at[task_info['task_id']] = task_started
+        try:
+            with trace_span("discussion", task_id=task_info['task_id']):
+                result = runner(topic, participants)
+            return {
+                'task_id': task_info['task_id'],
+                'status': 'completed',
+                'result': result,
+                'topic': topic.title,
+                'elapsed': time.time() - task_started
+            }
+        except Exception as e:
+            logger.error(f"❌ Discussion failed for {task_info['task_id']}: {e}")
+            return {
+                'task_id': task_info['task_id'],
+                'status': 'failed',
+                'error': str(e),
+                'topic': topic.title,
+                'elapsed': time.time() - task_started
+            }
+    
+    @traced("parallel.scripts")
     async def run_parallel_script_processing(self, script_tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Run script generation and processing in parallel"""
         logger.info(f"📝 Running {len(script_tasks)} script tasks in parallel")
@@ -93,7 +197,7 @@ class ParallelProcessor:
                 if asyncio.iscoroutinefunction(func):
                     result = await func(*args, **kwargs)
                 else:
-                    result = await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+                    result = await loop.run_in_executor(self.executor, propagate(partial(func, *args, **kwargs)))
                 
                 return {
                     'task_id': task_info['task_id'],
@@ -130,6 +234,7 @@ class ParallelProcessor:
         
         return script_results
     
+    @traced("parallel.media")
     async def run_parallel_media_generation(self, media_tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Run video and audio generation in parallel"""
         logger.info(f"🎬 Running {len(media_tasks)} media generation tasks in parallel")
@@ -148,7 +253,7 @@ class ParallelProcessor:
                 if asyncio.iscoroutinefunction(func):
                     result = await func(*args, **kwargs)
                 else:
-                    result = await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+                    result = await loop.run_in_executor(self.executor, propagate(partial(func, *args, **kwargs)))
                 
                 return {
                     'task_id': task_info['task_id'],
@@ -236,4 +341,6 @@ class ParallelProcessor:
     def __del__(self):
         """Cleanup executor on deletion"""
         if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=False)
\ No newline at end of file
+            self.executor.shutdown(wait=False)
+        if hasattr(self, 'discussion_executor'):
+            self.discussion_executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Rendition Ladder - Per-platform renditions of the final video in one encode
+The master is decoded once and split inside a single ffmpeg filter graph;
+renditions that share a geometry share one scale/crop, and every output gets
+its own bitrate cap derived from the platform's upload size limit
+"""
+
+import os
+import json
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config.video_config import RenditionSpec, video_config
+from .artifact_store import MANIFEST_FILENAME
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Rendition:
+    """A rendered per-platform output (width/height as encoded, not the spec box)"""
+    platform: str
+    path: str
+    width: int
+    height: int
+    fit: str
+    video_bitrate_k: int
+    max_size_mb: Optional[float]
+    size_bytes: int = 0
+
+    @property
+    def within_limit(self) -> bool:
+        return self.max_size_mb is None or self.size_bytes <= self.max_size_mb * 1024 * 1024
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["within_limit"] = self.within_limit
+        return data
+
+
+def video_bitrate_for(spec: RenditionSpec, duration: Optional[float]) -> int:
+    """Video bitrate (kbit/s) for a spec, lowered so the file fits its size limit"""
+    bitrate = spec.video_bitrate_k
+    if spec.max_size_mb and duration and duration > 0:
+        config = video_config.renditions
+        budget_k = spec.max_size_mb * 1024 * 1024 * 8 / 1000 * config.size_safety_margin / duration
+        bitrate = min(bitrate, int(budget_k - config.audio_bitrate_k))
+    return max(bitrate, video_config.renditions.min_video_bitrate_k)
+
+
+def geometry_filter(spec: RenditionSpec) -> str:
+    """Scale/crop/pad chain producing the spec's frame"""
+    w, h = spec.width, spec.height
+    if spec.fit == 'crop':
+        chain = f"scale={w}:{h}:force_original_aspect_ratio=increase,crop={w}:{h}"
+    elif spec.fit == 'pad':
+        chain = (f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                 f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:black")
+    elif spec.fit == 'fit':
+        # Keep the master's aspect inside the box, never upscale
+        chain = (f"scale='min({w},iw)':'min({h},ih)':force_original_aspect_ratio=decrease,"
+                 f"scale=trunc(iw/2)*2:trunc(ih/2)*2")
+    else:
+        raise ValueError(f"Unknown rendition fit: {spec.fit}")
+    return chain + ",setsar=1"
+
+
+def build_ladder_command(master_path: str, outputs: Sequence[Tuple[str, RenditionSpec, str]],
+                         duration: Optional[float] = None, has_audio: bool = True,
+                         preset: Optional[str] = None) -> List[str]:
+    """
+    One ffmpeg invocation writing every rendition
+
+    Args:
+        master_path: Final video to derive renditions from
+        outputs: (platform, spec, output path) per rendition
+        duration: Master duration in seconds, for size-capped bitrates
+        has_audio: Whether the master has an audio stream to carry over
+        preset: x264 preset (defaults to the encoding config's fallback preset)
+
+    Returns:
+        ffmpeg argument list
+    """
+    encoding = video_config.encoding
+    preset = preset or encoding.fallback_preset
+
+    # Renditions with the same geometry share one scale/crop
+    groups: Dict[str, List[int]] = {}
+    for index, (_, spec, _) in enumerate(outputs):
+        groups.setdefault(geometry_filter(spec), []).append(index)
+
+    graph = [f"[0:v]split={len(groups)}" + "".join(f"[g{i}]" for i in range(len(groups)))]
+    for group_index, (chain, members) in enumerate(groups.items()):
+        labels = "".join(f"[v{member}]" for member in members)
+        graph.append(f"[g{group_index}]{chain},split={len(members)}{labels}")
+
+    cmd = ['ffmpeg', '-y', '-i', master_path, '-filter_complex', ";".join(graph)]
+    for index, (_, spec, output_path) in enumerate(outputs):
+        bitrate = video_bitrate_for(spec, duration)
+        cmd += [
+            '-map', f'[v{index}]',
+            '-c:v', encoding.video_codec, '-preset', preset,
+            '-b:v', f'{bitrate}k', '-maxrate', f'{bitrate}k', '-bufsize', f'{bitrate * 2}k',
+            '-pix_fmt', encoding.pixel_format
+        ]
+        if spec.fps:
+            # A cap, not a target: masters below it keep their frame rate
+            cmd += ['-fpsmax', str(spec.fps)]
+        if has_audio:
+            cmd += ['-map', '0:a:0', '-c:a', encoding.audio_codec,
+                    '-b:a', f'{video_config.renditions.audio_bitrate_k}k']
+        cmd += ['-movflags', '+faststart', output_path]
+    return cmd
+
+
+def probe_media(path: str) -> Tuple[Optional[float], bool]:
+    """(duration in seconds, has audio) of a media file"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', path],
+            capture_output=True, text=True
+        )
+        data = json.loads(result.stdout)
+        duration = float(data['format']['duration']) if 'duration' in data.get('format', {}) else None
+        has_audio = any(stream.get('codec_type') == 'audio' for stream in data.get('streams', []))
+        return duration, has_audio
+    except (OSError, ValueError, KeyError):
+        return None, True
+
+
+def probe_video_size(path: str) -> Optional[Tuple[int, int]]:
+    """(width, height) of a file's first video stream, or None if it cannot be probed"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-select_streams', 'v:0',
+             '-show_entries', 'stream=width,height', path],
+            capture_output=True, text=True
+        )
+        stream = json.loads(result.stdout)['streams'][0]
+        return int(stream['width']), int(stream['height'])
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+def render_ladder(master_path: str, output_dir: str, platforms: Sequence[str],
+                  duration: Optional[float] = None, has_audio: Optional[bool] = None) -> Dict[str, Rendition]:
+    """
+    Render the rendition ladder for the given platforms
+
+    Args:
+        master_path: Final video
+        output_dir: Directory the renditions are written to
+        platforms: Platforms to render (unknown ones are skipped)
+        duration: Master duration (probed when omitted)
+        has_audio: Whether the master has audio (probed when omitted)
+
+    Returns:
+        Platform name to rendition; empty if the encode failed
+    """
+    ladder = video_config.renditions.ladder
+    specs = [(p.lower(), ladder[p.lower()]) for p in dict.fromkeys(platforms) if p.lower() in ladder]
+    skipped = [p for p in platforms if p.lower() not in ladder]
+    if skipped:
+        logger.warning(f"⚠️ No rendition spec for: {', '.join(skipped)}")
+    if not specs:
+        return {}
+
+    if duration is None or has_audio is None:
+        probed_duration, probed_audio = probe_media(master_path)
+        duration = probed_duration if duration is None else duration
+        has_audio = probed_audio if has_audio is None else has_audio
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(master_path))[0]
+    outputs = [(platform, spec, os.path.join(output_dir, f"{base}_{platform}.mp4")) for platform, spec in specs]
+
+    cmd = build_ladder_command(master_path, outputs, duration, has_audio)
+    logger.info(f"🎞️ Rendering {len(outputs)} renditions in one pass: {', '.join(p for p, _, _ in outputs)}")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"❌ Rendition ladder failed: {result.stderr[-500:]}")
+        return {}
+
+    renditions = {}
+    for platform, spec, output_path in outputs:
+        if not os.path.exists(output_path):
+            continue
+        # 'fit' keeps the master's aspect, so only the encoded file knows its frame size
+        width, height = probe_video_size(output_path) or (spec.width, spec.height)
+        rendition = Rendition(
+            platform=platform, path=output_path, width=width, height=height, fit=spec.fit,
+            video_bitrate_k=video_bitrate_for(spec, duration), max_size_mb=spec.max_size_mb,
+            size_bytes=os.path.getsize(output_path)
+        )
+        if not rendition.within_limit:
+            logger.warning(f"⚠️ {platform} rendition is {rendition.size_bytes / 1024 / 1024:.1f}MB, "
+                           f"over the {spec.max_size_mb}MB limit")
+        renditions[platform] = rendition
+    logger.info(f"✅ Rendered {len(renditions)} renditions")
+    return renditions
+
+
+def find_rendition(video_path: str, platform: str) -> Optional[str]:
+    """
+    Path of the registered rendition of a session's final video for a platform
+
+    Looks up the session manifest next to ``video_path``
+    (``<session>/final_output/...`` -> ``<session>/metadata``). A rendition
+    is only returned for the master it was rendered from (or when
+    ``video_path`` is the rendition itself), so other videos in
+    final_output are published as they are.
+
+    Returns:
+        Absolute path of the rendition, or None if there is none
+    """
+    video_path = os.path.abspath(video_path)
+    directory = os.path.dirname(video_path)
+    # Renditions live one level below final_output
+    for session_dir in (os.path.dirname(directory), os.path.dirname(os.path.dirname(directory))):
+        manifest_path = os.path.join(session_dir, "metadata", MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            continue
+        try:
+            with open(manifest_path, "r") as f:
+                entry = json.load(f).get("renditions", {}).get(platform.lower())
+        except (OSError, ValueError):
+            return None
+        relative = os.path.relpath(video_path, session_dir)
+        if entry and relative in (entry.get("master"), entry["path"]):
+            path = os.path.join(session_dir, entry["path"])
+            return path if os.path.exists(path) else None
+        return None
+    return None
@@ -4,8 +4,8 @@ Ensures all generated content is properly organized within session directories
 """
 
 import os
-import shutil
-from typing import Optional
+from typing import Any, Dict, Optional
+from .artifact_store import MANIFEST_FILENAME
 from .session_manager import session_manager
 from .logging_config import get_logger
 
@@ -167,7 +167,7 @@ class SessionContext:
             os.makedirs(os.path.dirname(target_path), exist_ok=True)
 
             if os.path.exists(source_path):
-                shutil.copy2(source_path, target_path)
+                self._place_artifact(source_path, target_path)
                 logger.info(f"💾 Saved {filename} to session {target_subdir}")
 
                 # Register with session manager if it's a final video
@@ -183,6 +183,12 @@ class SessionContext:
             logger.error(f"Failed to save file {filename}: {e}")
             return source_path
 
+    def _place_artifact(self, source_path: str, target_path: str) -> str:
+        """Link a file into the session through the shared artifact store"""
+        manifest_path = os.path.join(self.session_dir, "metadata", MANIFEST_FILENAME)
+        return self.session_manager.artifacts.place(
+            source_path, target_path, manifest_path=manifest_path, source="SessionContext")
+
     def save_final_video(self, video_path: str, suffix: str = "") -> str:
         """Save final video to session directory with optional suffix"""
         try:
@@ -197,11 +203,10 @@ class SessionContext:
                 final_filename = f"final_video_{self.session_id}.mp4"
             final_path = os.path.join(final_dir, final_filename)
             
-            # Only copy if source and destination are different
+            # Only place if source and destination are different
             if os.path.abspath(video_path) != os.path.abspath(final_path):
-                import shutil
-                shutil.copy2(video_path, final_path)
-                logger.info(f"💾 Final video copied to: {final_path}")
+                self._place_artifact(video_path, final_path)
+                logger.info(f"💾 Final video placed at: {final_path}")
             else:
                 logger.info(f"💾 Final video already in correct location: {final_path}")
             
@@ -211,6 +216,27 @@ class SessionContext:
             logger.error(f"❌ Failed to save final video: {e}")
             return video_path
 
+    def register_rendition(self, platform: str, rendition_path: str, master_path: str,
+                           details: Dict[str, Any]) -> str:
+        """
+        Record a per-platform rendition in the session manifest
+
+        Args:
+            platform: Platform the rendition is for
+            rendition_path: Rendition inside the session directory
+            master_path: Final video the rendition was rendered from
+            details: Geometry, bitrate and size limit of the rendition
+
+        Returns:
+            ``rendition_path``
+        """
+        manifest_path = os.path.join(self.session_dir, "metadata", MANIFEST_FILENAME)
+        self._place_artifact(rendition_path, rendition_path)
+        self.session_manager.artifacts.record_rendition(manifest_path, platform, rendition_path,
+                                                        master_path, details)
+        logger.info(f"📋 Registered {platform} rendition: {os.path.basename(rendition_path)}")
+        return rendition_path
+
     def save_video_clip(self, clip_path: str, clip_id: str) -> str:
         """
         Save video clip to session's video_clips directory
@@ -0,0 +1,580 @@
+"""
+Session Garbage Collector - Retention policy for the outputs directory
+Keeps a per-session size/age index that is refreshed incrementally
+(a subdirectory is only rescanned when its mtime changes) and expires
+intermediate artifacts by type, enforces an outputs quota and a free
+disk space floor, and reports disk usage
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+from .logging_config import get_logger
+from .artifact_store import ArtifactStore
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = ".gc_index.json"
+PROTECT_PREFIX = ".gc_protect."  # Marker in a session directory, suffixed with the owner's pid
+ROOT_FILES = ""  # Index key for files directly inside a session directory
+
+
+class ArtifactClass(Enum):
+    """Retention class of a session subdirectory"""
+    FINAL = "final"                  # Deliverables, never collected
+    METADATA = "metadata"            # Manifests, scripts and other small records, never collected
+    DISCUSSION = "discussion"        # Agent discussions and decisions
+    LOG = "log"                      # Logs, debug info and metrics
+    INTERMEDIATE = "intermediate"    # Clips, audio and images composed into the final video
+    TEMP = "temp"                    # Scratch files
+
+
+SUBDIR_CLASSES: Dict[str, ArtifactClass] = {
+    "final_output": ArtifactClass.FINAL,
+    "final_video": ArtifactClass.FINAL,
+    "metadata": ArtifactClass.METADATA,
+    "scripts": ArtifactClass.METADATA,
+    "subtitles": ArtifactClass.METADATA,
+    "overlays": ArtifactClass.METADATA,
+    "hashtags": ArtifactClass.METADATA,
+    "user_configs": ArtifactClass.METADATA,
+    "success_metrics": ArtifactClass.METADATA,
+    "analysis": ArtifactClass.METADATA,
+    "prompts": ArtifactClass.METADATA,
+    "agent_discussions": ArtifactClass.DISCUSSION,
+    "discussions": ArtifactClass.DISCUSSION,
+    "langgraph_discussions": ArtifactClass.DISCUSSION,
+    "ai_agents": ArtifactClass.DISCUSSION,
+    "decisions": ArtifactClass.DISCUSSION,
+    "logs": ArtifactClass.LOG,
+    "comprehensive_logs": ArtifactClass.LOG,
+    "error_logs": ArtifactClass.LOG,
+    "debug_info": ArtifactClass.LOG,
+    "performance_metrics": ArtifactClass.LOG,
+    "video_clips": ArtifactClass.INTERMEDIATE,
+    "veo_clips": ArtifactClass.INTERMEDIATE,
+    "audio": ArtifactClass.INTERMEDIATE,
+    "images": ArtifactClass.INTERMEDIATE,
+    "fallback_content": ArtifactClass.INTERMEDIATE,
+    "temp_files": ArtifactClass.TEMP,
+    "temp": ArtifactClass.TEMP,
+}
+
+
+@dataclass
+class RetentionPolicy:
+    """Retention rules for session outputs"""
+    # Hours since an artifact type was last written before it expires; None keeps it forever
+    max_age_hours: Dict[ArtifactClass, Optional[float]] = field(default_factory=lambda: {
+        ArtifactClass.FINAL: None,
+        ArtifactClass.METADATA: None,
+        ArtifactClass.DISCUSSION: 14 * 24,
+        ArtifactClass.LOG: 7 * 24,
+        ArtifactClass.INTERMEDIATE: 24,
+        ArtifactClass.TEMP: 1,
+    })
+    # Unknown subdirectories are kept unless mapped here
+    subdir_classes: Dict[str, ArtifactClass] = field(default_factory=lambda: dict(SUBDIR_CLASSES))
+    default_class: ArtifactClass = ArtifactClass.METADATA
+    # Above this many bytes of outputs, expirable artifacts go oldest-first regardless of age
+    quota_bytes: Optional[int] = None
+    # Same pressure when the volume has less free space than this
+    min_free_bytes: int = 2 * 1024 ** 3
+    # Sessions written to within this window are treated as rendering and left alone
+    active_grace_minutes: float = 30
+    # Sessions refreshed per background tick
+    scan_batch_size: int = 25
+    # Files growing in place don't change directory mtimes; rescan fully this often
+    full_rescan_hours: float = 6
+
+    def classify(self, subdir: str) -> ArtifactClass:
+        if subdir == ROOT_FILES:
+            return ArtifactClass.METADATA
+        return self.subdir_classes.get(subdir, self.default_class)
+
+
+@dataclass
+class GCAction:
+    """One subdirectory selected for collection"""
+    session_id: str
+    subdir: str
+    artifact_class: ArtifactClass
+    bytes: int
+    files: int
+    reason: str  # "expired" or "pressure"
+
+
+@dataclass
+class GCReport:
+    """Result of a collection pass"""
+    dry_run: bool
+    actions: List[GCAction] = field(default_factory=list)
+    planned_bytes: int = 0
+    freed_bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "planned_bytes": self.planned_bytes,
+            "freed_bytes": self.freed_bytes,
+            "actions": [
+                {"session_id": a.session_id, "subdir": a.subdir, "class": a.artifact_class.value,
+                 "bytes": a.bytes, "files": a.files, "reason": a.reason}
+                for a in self.actions
+            ],
+            "errors": list(self.errors)
+        }
+
+
+_protected_sessions: Dict[str, int] = {}
+_protected_lock = threading.Lock()
+
+
+def protect_session(session_dir: str):
+    """
+    Exclude a session from collection while it is being generated
+
+    Generation and the GC usually run in different processes, so besides an
+    in-process count this drops a pid marker file into the session directory.
+    """
+    key = os.path.abspath(session_dir)
+    with _protected_lock:
+        _protected_sessions[key] = _protected_sessions.get(key, 0) + 1
+        if _protected_sessions[key] == 1:
+            try:
+                with open(_marker_path(key, os.getpid()), "w") as f:
+                    f.write(str(os.getpid()))
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to write GC protection marker for {session_dir}: {e}")
+
+
+def release_session(session_dir: str):
+    key = os.path.abspath(session_dir)
+    with _protected_lock:
+        count = _protected_sessions.get(key, 0) - 1
+        if count > 0:
+            _protected_sessions[key] = count
+            return
+        _protected_sessions.pop(key, None)
+        try:
+            os.remove(_marker_path(key, os.getpid()))
+        except OSError:
+            pass
+
+
+def is_protected(session_dir: str) -> bool:
+    """True if any live process protects the session; markers left by dead processes are removed"""
+    key = os.path.abspath(session_dir)
+    with _protected_lock:
+        if key in _protected_sessions:
+            return True
+    try:
+        with os.scandir(key) as entries:
+            markers = [entry.name for entry in entries if entry.name.startswith(PROTECT_PREFIX)]
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    for marker in markers:
+        try:
+            pid = int(marker[len(PROTECT_PREFIX):])
+        except ValueError:
+            continue
+        if _pid_alive(pid):
+            return True
+        logger.info(f"🧹 Removing stale GC protection marker {marker} from {session_dir}")
+        try:
+            os.remove(os.path.join(key, marker))
+        except OSError:
+            pass
+    return False
+
+
+def _marker_path(session_dir: str, pid: int) -> str:
+    return os.path.join(session_dir, f"{PROTECT_PREFIX}{pid}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class SessionUsageIndex:
+    """
+    Per-session, per-subdirectory byte/file counts and newest mtimes
+
+    Persisted next to the sessions so restarts don't rescan everything.
+    A subdirectory is rescanned only when its own mtime changed (a file was
+    added, removed or renamed in it) or when a full rescan is forced.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.path = os.path.join(root, INDEX_FILENAME)
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    def session_ids(self) -> List[str]:
+        """Session directories currently present (one directory listing, no walk)"""
+        try:
+            with os.scandir(self.root) as entries:
+                return sorted(
+                    entry.name for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")
+                )
+        except FileNotFoundError:
+            return []
+
+    def refresh_session(self, session_id: str, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Bring one session's entry up to date
+
+        Args:
+            session_id: Session directory name
+            force: Rescan every subdirectory regardless of mtimes
+
+        Returns:
+            The session entry, or None if the session no longer exists
+        """
+        session_dir = os.path.join(self.root, session_id)
+        try:
+            with os.scandir(session_dir) as scanned:
+                entries = list(scanned)
+        except (FileNotFoundError, NotADirectoryError):
+            self.forget(session_id)
+            return None
+
+        with self._lock:
+            previous = self.sessions.get(session_id, {}).get("subdirs", {})
+        subdirs: Dict[str, Dict[str, Any]] = {}
+        root_usage = {"bytes": 0, "files": 0, "exclusive_bytes": 0, "newest": 0.0, "dir_mtime_ns": 0}
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                    cached = previous.get(entry.name)
+                    if force or cached is None or cached.get("dir_mtime_ns") != mtime_ns:
+                        subdirs[entry.name] = self._scan(entry.path, mtime_ns)
+                    else:
+                        subdirs[entry.name] = cached
+                elif entry.is_file(follow_symlinks=False):
+                    self._add_file(root_usage, entry.stat(follow_symlinks=False))
+            except FileNotFoundError:
+                continue
+        if root_usage["files"]:
+            subdirs[ROOT_FILES] = root_usage
+
+        session = {
+            "subdirs": subdirs,
+            "bytes": sum(usage["bytes"] for usage in subdirs.values()),
+            "files": sum(usage["files"] for usage in subdirs.values()),
+            "last_activity": max([usage["newest"] for usage in subdirs.values()] or [0.0]),
+            "scanned_at": time.time(),
+            "full_scan_at": time.time() if force else
+            self.sessions.get(session_id, {}).get("full_scan_at", time.time())
+        }
+        with self._lock:
+            self.sessions[session_id] = session
+        return session
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+    def save(self):
+        with self._lock:
+            payload = {"version": 1, "sessions": self.sessions}
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to save GC index: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                self.sessions = json.load(f).get("sessions", {})
+        except (OSError, ValueError, AttributeError):
+            self.sessions = {}
+
+    @classmethod
+    def _scan(cls, path: str, dir_mtime_ns: int) -> Dict[str, Any]:
+        usage = {"bytes": 0, "files": 0, "exclusive_bytes": 0, "newest": 0.0, "dir_mtime_ns": dir_mtime_ns}
+        for directory, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    cls._add_file(usage, os.stat(os.path.join(directory, filename), follow_symlinks=False))
+                except OSError:
+                    continue
+        return usage
+
+    @staticmethod
+    def _add_file(usage: Dict[str, Any], stat: os.stat_result):
+        usage["bytes"] += stat.st_size
+        usage["files"] += 1
+        # Hardlinked artifacts only free space once their last link goes
+        if stat.st_nlink <= 1:
+            usage["exclusive_bytes"] += stat.st_size
+        usage["newest"] = max(usage["newest"], stat.st_mtime)
+
+
+class SessionGarbageCollector:
+    """
+    Applies a RetentionPolicy to every session under an output root
+
+    ``collect`` plans and (unless ``dry_run``) deletes expired subdirectories,
+    then prunes artifact-store blobs nothing links to any more. ``start`` runs
+    incremental refresh + collect passes on a background thread.
+    """
+
+    def __init__(self, root: str = "outputs", policy: Optional[RetentionPolicy] = None):
+        """
+        Args:
+            root: Output directory holding the session folders
+            policy: Retention rules (defaults apply when omitted)
+        """
+        self.root = root
+        self.policy = policy or RetentionPolicy()
+        self.index = SessionUsageIndex(root)
+        self.artifacts = ArtifactStore(os.path.join(root, ".artifacts"))
+        self.stats = {"passes": 0, "freed_bytes": 0, "removed_subdirs": 0}
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Index maintenance
+
+    def refresh(self, session_ids: Optional[Iterable[str]] = None, force: bool = False):
+        """Refresh the given sessions (default: every session) and drop vanished ones"""
+        present = self.index.session_ids()
+        for session_id in set(self.index.sessions) - set(present):
+            self.index.forget(session_id)
+        for session_id in (present if session_ids is None else session_ids):
+            self._refresh(session_id, force)
+
+    def refresh_batch(self) -> List[str]:
+        """Refresh the next ``scan_batch_size`` sessions, round-robin"""
+        present = self.index.session_ids()
+        for session_id in set(self.index.sessions) - set(present):
+            self.index.forget(session_id)
+        if not present:
+            return []
+        # New sessions first, then continue the rotation
+        batch = [s for s in present if s not in self.index.sessions][:self.policy.scan_batch_size]
+        while len(batch) < min(self.policy.scan_batch_size, len(present)):
+            self._cursor %= len(present)
+            candidate = present[self._cursor]
+            self._cursor += 1
+            if candidate in batch:
+                break
+            batch.append(candidate)
+        for session_id in batch:
+            self._refresh(session_id)
+        return batch
+
+    def _refresh(self, session_id: str, force: bool = False) -> Optional[Dict[str, Any]]:
+        entry = self.index.sessions.get(session_id)
+        if not force and entry:
+            force = time.time() - entry.get("full_scan_at", 0) > self.policy.full_rescan_hours * 3600
+        return self.index.refresh_session(session_id, force=force)
+
+    # Collection
+
+    def collect(self, dry_run: bool = False) -> GCReport:
+        """
+        Expire artifacts by age, then oldest-first while over quota or low on disk
+
+        Candidate sessions are rescanned before anything is deleted, so a
+        stale index never removes files from a session that is still active.
+
+        Args:
+            dry_run: Only report what would be removed
+
+        Returns:
+            GCReport describing planned (and, if not a dry run, performed) removals
+        """
+        with self._lock:
+            report = GCReport(dry_run=dry_run)
+            now = time.time()
+            grace = self.policy.active_grace_minutes * 60
+
+            candidates: List[GCAction] = []
+            for session_id in list(self.index.sessions):
+                entry = self.index.sessions.get(session_id) or {}
+                if now - entry.get("last_activity", 0) < grace or not self._has_expirable(entry):
+                    continue
+                if is_protected(os.path.join(self.root, session_id)):
+                    continue
+                entry = self.index.refresh_session(session_id, force=True)
+                if not entry or now - entry["last_activity"] < grace:
+                    continue
+                for subdir, usage in entry["subdirs"].items():
+                    artifact_class = self.policy.classify(subdir)
+                    max_age = self.policy.max_age_hours.get(artifact_class)
+                    if max_age is None or not usage["files"]:
+                        continue
+                    expired = now - usage["newest"] > max_age * 3600
+                    candidates.append(GCAction(session_id, subdir, artifact_class, usage["bytes"],
+                                               usage["files"], "expired" if expired else "pressure"))
+
+            # Oldest first; everything expired goes, unexpired only while under pressure
+            candidates.sort(key=lambda a: self.index.sessions[a.session_id]["subdirs"][a.subdir]["newest"])
+            excess = self._excess_bytes()
+            for action in candidates:
+                if action.reason == "expired":
+                    report.actions.append(action)
+                    excess -= action.bytes
+            for action in candidates:
+                if action.reason == "pressure" and excess > 0:
+                    report.actions.append(action)
+                    excess -= action.bytes
+            report.planned_bytes = sum(action.bytes for action in report.actions)
+
+            if not dry_run and report.actions:
+                for action in report.actions:
+                    report.freed_bytes += self._remove(action, report)
+                # Blobs are unlinked for a moment while a session places them
+                report.freed_bytes += self.artifacts.prune(min_age_seconds=grace)
+                self.stats["freed_bytes"] += report.freed_bytes
+                self.stats["removed_subdirs"] += len(report.actions) - len(report.errors)
+                self.index.save()
+
+            self.stats["passes"] += 1
+            if report.actions:
+                verb = "Would free" if dry_run else "Freed"
+                amount = report.planned_bytes if dry_run else report.freed_bytes
+                logger.info(f"🧹 GC: {verb} {amount / 1024 ** 2:.1f}MB from {len(report.actions)} "
+                            f"session folders")
+            return report
+
+    def ensure_free_space(self) -> Optional[GCReport]:
+        """Collect now if the volume is below the free space floor (cheap when it isn't)"""
+        if self._free_bytes() >= self.policy.min_free_bytes:
+            return None
+        logger.warning(f"⚠️ Low disk space under {self.root}, collecting expired session artifacts")
+        self.refresh()
+        return self.collect()
+
+    def run_once(self) -> GCReport:
+        """One background tick: refresh a batch of sessions, then collect"""
+        self.refresh_batch()
+        report = self.collect()
+        if not report.actions:
+            self.index.save()
+        return report
+
+    def _has_expirable(self, entry: Dict[str, Any]) -> bool:
+        return any(self.policy.max_age_hours.get(self.policy.classify(subdir)) is not None and usage["files"]
+                   for subdir, usage in entry.get("subdirs", {}).items())
+
+    def _excess_bytes(self) -> int:
+        excess = 0
+        if self.policy.quota_bytes is not None:
+            excess = sum(s.get("bytes", 0) for s in self.index.sessions.values()) - self.policy.quota_bytes
+        return max(excess, self.policy.min_free_bytes - self._free_bytes(), 0)
+
+    def _free_bytes(self) -> int:
+        try:
+            return shutil.disk_usage(self.root).free
+        except OSError:
+            return self.policy.min_free_bytes
+
+    def _remove(self, action: GCAction, report: GCReport) -> int:
+        path = os.path.join(self.root, action.session_id, action.subdir)
+        usage = self.index.sessions[action.session_id]["subdirs"].get(action.subdir, {})
+        try:
+            shutil.rmtree(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            report.errors.append(f"{action.session_id}/{action.subdir}: {e}")
+            logger.warning(f"⚠️ GC failed to remove {path}: {e}")
+            return 0
+        self.index.refresh_session(action.session_id)
+        return usage.get("exclusive_bytes", 0)
+
+    # Reporting
+
+    def usage(self) -> Dict[str, Any]:
+        """Disk usage of the outputs directory by artifact class and session"""
+        by_class = {artifact_class.value: 0 for artifact_class in ArtifactClass}
+        sessions = []
+        for session_id, entry in list(self.index.sessions.items()):
+            for subdir, usage in entry["subdirs"].items():
+                by_class[self.policy.classify(subdir).value] += usage["bytes"]
+            sessions.append((entry["bytes"], session_id))
+        sessions.sort(reverse=True)
+
+        try:
+            disk = shutil.disk_usage(self.root)
+            volume = {"total_bytes": disk.total, "used_bytes": disk.used, "free_bytes": disk.free}
+        except OSError:
+            volume = {}
+        return {
+            "root": self.root,
+            "sessions": len(self.index.sessions),
+            "total_bytes": sum(size for size, _ in sessions),
+            "by_class": by_class,
+            "largest_sessions": [{"session_id": s, "bytes": size} for size, s in sessions[:10]],
+            "volume": volume,
+            "quota_bytes": self.policy.quota_bytes,
+            "gc": dict(self.stats)
+        }
+
+    # Background service
+
+    def start(self, interval_seconds: float = 300):
+        """Run ``run_once`` every ``interval_seconds`` on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval_seconds,),
+                                        name="session-gc", daemon=True)
+        self._thread.start()
+        logger.info(f"🧹 Session GC started for {self.root} (every {interval_seconds:.0f}s)")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _loop(self, interval_seconds: float):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Session GC pass failed: {e}")
+            self._stop_event.wait(interval_seconds)
+
+
+_collectors: Dict[str, SessionGarbageCollector] = {}
+_collectors_lock = threading.Lock()
+
+
+def get_session_gc(root: str = "outputs") -> SessionGarbageCollector:
+    """Get the process-wide collector for an output root"""
+    key = os.path.abspath(root)
+    with _collectors_lock:
+        if key not in _collectors:
+            _collectors[key] = SessionGarbageCollector(root)
+        return _collectors[key]
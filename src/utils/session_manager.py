@@ -15,6 +15,8 @@ import glob
 import re
 
 from .logging_config import get_logger
+from .artifact_store import ArtifactStore, MANIFEST_FILENAME
+from .session_gc import get_session_gc, protect_session, release_session
 
 logger = get_logger(__name__)
 
@@ -26,6 +28,8 @@ class SessionManager:
         self.current_session = None
         self.session_data = {}
         self.tracked_files = {}  # Track all files created during session
+        # Media is stored once by content and linked into session folders
+        self.artifacts = ArtifactStore(os.path.join(base_output_dir, ".artifacts"))
 
     def create_session(
         self,
@@ -70,6 +74,13 @@ class SessionManager:
         for subdir in subdirs:
             os.makedirs(os.path.join(session_dir, subdir), exist_ok=True)
 
+        # Keep the GC away from this session and reclaim space before rendering into it
+        protect_session(session_dir)
+        try:
+            get_session_gc(self.base_output_dir).ensure_free_space()
+        except Exception as e:
+            logger.warning(f"⚠️ Session GC check failed: {e}")
+
         # Initialize session data
         self.current_session = session_id
         self.session_data = {
@@ -142,6 +153,15 @@ class SessionManager:
             return self.session_data["subdirs"][subdir]
         return self.session_data["session_dir"]
 
+    def get_manifest_path(self) -> str:
+        """Path of the current session's artifact manifest"""
+        return os.path.join(self.get_session_path("metadata"), MANIFEST_FILENAME)
+
+    def _place_artifact(self, source_path: str, target_path: str, source: str) -> str:
+        """Place a media file in the session, sharing storage with identical artifacts"""
+        return self.artifacts.place(source_path, target_path,
+                                    manifest_path=self.get_manifest_path(), source=source)
+
     def track_file(
         self,
         file_path: str,
@@ -194,18 +214,17 @@ class SessionManager:
             target_dir = self.get_session_path(target_subdir)
             filename = os.path.basename(file_path)
 
-            # Handle duplicate filenames
-            counter = 1
-            base_name, ext = os.path.splitext(filename)
-            while os.path.exists(os.path.join(target_dir, filename)):
-                filename = f"{base_name}_{counter}{ext}"
-                counter += 1
-
             target_path = os.path.join(target_dir, filename)
 
-            # Copy/move file
+            # Link file into the session
             if os.path.exists(file_path):
-                shutil.copy2(file_path, target_path)
+                # A different file already has this name: disambiguate by content hash
+                if os.path.exists(target_path) and not self.artifacts.same_content(file_path, target_path):
+                    base_name, ext = os.path.splitext(filename)
+                    filename = f"{base_name}_{self.artifacts.digest(file_path)[:8]}{ext}"
+                    target_path = os.path.join(target_dir, filename)
+
+                self._place_artifact(file_path, target_path, source)
 
                 # Track the file
                 self.tracked_files[target_path] = {
@@ -342,7 +361,7 @@ class SessionManager:
         session_audio_path = os.path.join(session_audio_dir, filename)
 
         if os.path.exists(audio_path):
-            shutil.copy2(audio_path, session_audio_path)
+            self._place_artifact(audio_path, session_audio_path, "TTS")
             self.track_file(session_audio_path, "audio", "TTS")
             logger.info(f"💾 Saved audio clip {clip_id} to session")
             return session_audio_path
@@ -359,7 +378,7 @@ class SessionManager:
         session_video_path = os.path.join(session_video_dir, filename)
 
         if os.path.exists(video_path):
-            shutil.copy2(video_path, session_video_path)
+            self._place_artifact(video_path, session_video_path, "VEO/Gemini")
             self.track_file(session_video_path, "video_clip", "VEO/Gemini")
             logger.info(f"💾 Saved video clip {clip_id} to session")
             return session_video_path
@@ -382,7 +401,7 @@ class SessionManager:
         session_image_path = os.path.join(session_images_dir, filename)
 
         if os.path.exists(image_path):
-            shutil.copy2(image_path, session_image_path)
+            self._place_artifact(image_path, session_image_path, "Gemini")
             self.track_file(session_image_path, "image", "Gemini")
             logger.info(f"💾 Saved image {image_id} to session")
             return session_image_path
@@ -402,7 +421,7 @@ class SessionManager:
         session_final_path = os.path.join(session_final_dir, filename)
 
         if os.path.exists(video_path):
-            shutil.copy2(video_path, session_final_path)
+            self._place_artifact(video_path, session_final_path, "VideoComposer")
             self.track_file(session_final_path, "final_video", "VideoComposer")
             logger.info("💾 Saved final video to session")
             return session_final_path
@@ -538,6 +557,7 @@ class SessionManager:
             f"{summary['tracked_files']} tracked")
 
         session_dir = self.session_data["session_dir"]
+        release_session(session_dir)
         self.current_session = None
         self.session_data = {}
         self.tracked_files = {}
@@ -654,29 +674,24 @@ class SessionManager:
             }
 
             # Count files in session
-            session_dir = self.session_data.get("session_dir", "")
-            if os.path.exists(session_dir):
-                total_files = 0
-                for root, dirs, files in os.walk(session_dir):
-                    total_files += len(files)
-                session_info["total_files"] = total_files
+            usage = get_session_gc(self.base_output_dir).index.refresh_session(session_id)
+            if usage:
+                session_info["total_files"] = usage["files"]
+                session_info["total_bytes"] = usage["bytes"]
 
             return session_info
 
-        # For non-current sessions, construct from directory
+        # For non-current sessions, construct from the usage index
         session_dir = os.path.join(self.base_output_dir, session_id)
-        if not os.path.exists(session_dir):
+        usage = get_session_gc(self.base_output_dir).index.refresh_session(session_id)
+        if usage is None:
             raise ValueError(f"Session {session_id} not found")
 
-        # Count files in session
-        total_files = 0
-        for root, dirs, files in os.walk(session_dir):
-            total_files += len(files)
-
         return {
             "session_id": session_id,
             "session_dir": session_dir,
-            "total_files": total_files,
+            "total_files": usage["files"],
+            "total_bytes": usage["bytes"],
             "created_at": session_id.split("_")[-1] if "_" in session_id else "unknown",
             "is_active": False,
             "mission": "Unknown",
@@ -720,6 +735,7 @@ class SessionManager:
                 # Remove everything
                 shutil.rmtree(session_dir)
 
+            get_session_gc(self.base_output_dir).index.refresh_session(session_id)
             return True
         except Exception as e:
             logger.error(f"Failed to cleanup session {session_id}: {e}")
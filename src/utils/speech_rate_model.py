@@ -0,0 +1,225 @@
+"""
+Speech Rate Model - Learned per-voice duration predictor for TTS
+Every synthesis records (voice, language, speaking rate, text features) ->
+measured duration; script sizing and speed selection use the fitted model
+instead of fixed words-per-second constants, so overruns are caught before
+any TTS call is made
+"""
+
+import os
+import re
+import json
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.tts_config import tts_config
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_PAUSE_PATTERN = re.compile(r"[.,!?;:؟،。！？]")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?؟。！？])\s+")
+
+
+@dataclass
+class SpeechRateSample:
+    """One measured synthesis"""
+    voice: str
+    language: str
+    speaking_rate: float
+    words: int
+    chars: int
+    pauses: int
+    duration: float
+
+
+def text_features(text: str) -> Tuple[int, int, int]:
+    """Word, character (without spaces) and pause-punctuation counts"""
+    words = len(text.split())
+    chars = len(re.sub(r"\s+", "", text))
+    pauses = len(_PAUSE_PATTERN.findall(text))
+    return words, chars, pauses
+
+
+class SpeechRateModel:
+    """
+    Per-voice linear duration model fitted from measured syntheses
+
+    Duration at speaking rate 1.0 is modelled as
+    ``a * words + b * chars / 10 + c * pauses + d``. Fits are ridge
+    regressions pulled towards the TTSConfig words-per-second default, so
+    a handful of samples nudge the estimate and many samples dominate it.
+    Voices without enough samples fall back to the language-wide fit, then
+    to the default.
+    """
+
+    MIN_SAMPLES = 5
+    RIDGE = 4.0
+
+    def __init__(self, store_path: Optional[str] = os.path.join("cache", "speech_rate_samples.jsonl"),
+                 max_samples_per_key: int = 500):
+        """
+        Args:
+            store_path: JSONL file holding measured samples (None keeps them in memory)
+            max_samples_per_key: Most recent samples used per voice/language fit
+        """
+        self.store_path = store_path
+        self.max_samples_per_key = max_samples_per_key
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, str], List[SpeechRateSample]] = {}
+        self._fits: Dict[Tuple[str, str], np.ndarray] = {}
+        self._prior = np.array([1.0 / tts_config.WORDS_PER_SECOND, 0.0, 0.0, 0.0])
+        self._load()
+
+    def record(self, text: str, duration: float, voice: Optional[str] = None,
+               language: Any = None, speaking_rate: float = 1.0):
+        """Record a measured synthesis of ``text``"""
+        if not text or not duration or duration <= 0:
+            return
+        words, chars, pauses = text_features(text)
+        if words == 0:
+            return
+
+        sample = SpeechRateSample(
+            voice=voice or "default",
+            language=self._language_key(language),
+            speaking_rate=float(speaking_rate or 1.0),
+            words=words, chars=chars, pauses=pauses,
+            duration=float(duration)
+        )
+        with self._lock:
+            self._add(sample)
+            if self.store_path:
+                try:
+                    os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+                    with open(self.store_path, "a") as f:
+                        f.write(json.dumps(asdict(sample)) + "\n")
+                except OSError as e:
+                    logger.warning(f"⚠️ Failed to persist speech rate sample: {e}")
+
+        predicted = self.predict_duration(text, sample.voice, sample.language, sample.speaking_rate)
+        logger.debug(f"🗣️ Speech sample {sample.voice}/{sample.language}: {duration:.2f}s measured, "
+                     f"{predicted:.2f}s now predicted")
+
+    def predict_duration(self, text: str, voice: Optional[str] = None,
+                         language: Any = None, speaking_rate: float = 1.0) -> float:
+        """Predicted spoken duration of ``text`` in seconds"""
+        words, chars, pauses = text_features(text)
+        if words == 0:
+            return 0.0
+        weights = self._weights(voice, language)
+        base = float(np.dot(weights, [words, chars / 10.0, pauses, 1.0]))
+        # Never predict faster than twice the default rate
+        base = max(base, words / (2 * tts_config.WORDS_PER_SECOND))
+        return base / max(float(speaking_rate or 1.0), 0.1)
+
+    def words_per_second(self, voice: Optional[str] = None, language: Any = None,
+                         speaking_rate: float = 1.0) -> float:
+        """Effective words per second for typical text of the voice/language"""
+        key = self._fit_key(voice, language)
+        samples = self._samples.get(key) if key else None
+        if samples:
+            words = sum(s.words for s in samples)
+            chars = sum(s.chars for s in samples)
+            pauses = sum(s.pauses for s in samples)
+            seconds = float(np.dot(self._weights(voice, language), [words, chars / 10.0, pauses, len(samples)]))
+            if seconds > 0:
+                return words / seconds * float(speaking_rate or 1.0)
+        return tts_config.WORDS_PER_SECOND * float(speaking_rate or 1.0)
+
+    def word_budget(self, duration: float, voice: Optional[str] = None, language: Any = None,
+                    speaking_rate: float = 1.0) -> int:
+        """Number of words that fit in ``duration`` seconds"""
+        return int(duration * self.words_per_second(voice, language, speaking_rate))
+
+    def trim_to_duration(self, text: str, duration: float, voice: Optional[str] = None,
+                         language: Any = None, speaking_rate: float = 1.0) -> str:
+        """Keep whole sentences from the start of ``text`` while they fit in ``duration``"""
+        if self.predict_duration(text, voice, language, speaking_rate) <= duration:
+            return text
+
+        kept: List[str] = []
+        for sentence in _SENTENCE_PATTERN.split(text.strip()):
+            candidate = " ".join(kept + [sentence])
+            if kept and self.predict_duration(candidate, voice, language, speaking_rate) > duration:
+                break
+            kept.append(sentence)
+        return " ".join(kept)
+
+    def sample_count(self, voice: Optional[str] = None, language: Any = None) -> int:
+        return len(self._samples.get((voice or "*", self._language_key(language)), []))
+
+    # Fitting
+
+    def _weights(self, voice: Optional[str], language: Any) -> np.ndarray:
+        key = self._fit_key(voice, language)
+        if key is None:
+            return self._prior
+        with self._lock:
+            if key not in self._fits:
+                self._fits[key] = self._fit(self._samples[key])
+            return self._fits[key]
+
+    def _fit_key(self, voice: Optional[str], language: Any) -> Optional[Tuple[str, str]]:
+        language_key = self._language_key(language)
+        for key in ((voice or "*", language_key), ("*", language_key)):
+            if len(self._samples.get(key, [])) >= self.MIN_SAMPLES:
+                return key
+        return None
+
+    def _fit(self, samples: List[SpeechRateSample]) -> np.ndarray:
+        features = np.array([[s.words, s.chars / 10.0, s.pauses, 1.0] for s in samples])
+        # Normalise every sample to speaking rate 1.0
+        targets = np.array([s.duration * s.speaking_rate for s in samples])
+        ridge = self.RIDGE * np.eye(features.shape[1])
+        weights = np.linalg.solve(features.T @ features + ridge,
+                                  features.T @ targets + ridge @ self._prior)
+        return weights
+
+    def _add(self, sample: SpeechRateSample):
+        keys = {(sample.voice, sample.language), ("*", sample.language)}
+        for key in keys:
+            samples = self._samples.setdefault(key, [])
+            samples.append(sample)
+            if len(samples) > self.max_samples_per_key:
+                del samples[:len(samples) - self.max_samples_per_key]
+            self._fits.pop(key, None)
+
+    def _load(self):
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        loaded = 0
+        try:
+            with open(self.store_path, "r") as f:
+                for line in f:
+                    try:
+                        self._add(SpeechRateSample(**json.loads(line)))
+                        loaded += 1
+                    except (ValueError, TypeError):
+                        continue
+        except OSError as e:
+            logger.warning(f"⚠️ Could not read speech rate samples: {e}")
+            return
+        if loaded:
+            logger.info(f"🗣️ Loaded {loaded} speech rate calibration samples")
+
+    @staticmethod
+    def _language_key(language: Any) -> str:
+        value = getattr(language, 'value', language) or "default"
+        return str(value).lower()
+
+
+_default_model: Optional[SpeechRateModel] = None
+_default_model_lock = threading.Lock()
+
+
+def get_speech_rate_model() -> SpeechRateModel:
+    """Get the process-wide speech rate model"""
+    global _default_model
+    with _default_model_lock:
+        if _default_model is None:
+            _default_model = SpeechRateModel()
+        return _default_model
@@ -31,6 +31,7 @@ class TimelineVisualizer:
         self.session_context = session_context
         self.events: List[TimelineEvent] = []
         self.video_duration = 0.0
+        self.trace_spans: List[Dict[str, Any]] = []
         
     def add_subtitle_event(self, index: int, start: float, end: float, text: str):
         """Add a subtitle timing event"""
@@ -95,6 +96,73 @@ class TimelineVisualizer:
         """Set the total video duration"""
         self.video_duration = duration
         
+    def load_trace(self, trace_path: str) -> int:
+        """Load pipeline spans from a Chrome trace file written by the tracer"""
+        with open(trace_path, 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+            
+        self.trace_spans = []
+        for event in trace.get('traceEvents', []):
+            if event.get('ph') != 'X':
+                continue
+            args = event.get('args', {})
+            self.trace_spans.append({
+                'name': event['name'],
+                'start': event['ts'] / 1e6,
+                'duration': event['dur'] / 1e6,
+                'span_id': args.get('span_id'),
+                'parent_id': args.get('parent_id'),
+                'thread_id': event.get('tid'),
+                'args': args
+            })
+        self.trace_spans.sort(key=lambda s: s['start'])
+        return len(self.trace_spans)
+        
+    def generate_trace_report(self, width: int = 120) -> str:
+        """Generate a stage waterfall and per-stage totals from loaded trace spans"""
+        if not self.trace_spans:
+            return "No trace data available"
+            
+        trace_end = max(s['start'] + s['duration'] for s in self.trace_spans)
+        trace_start = min(s['start'] for s in self.trace_spans)
+        total = max(trace_end - trace_start, 1e-9)
+        
+        # Nesting depth from parent links
+        depths = {}
+        for span in self.trace_spans:
+            depths[span['span_id']] = depths.get(span['parent_id'], -1) + 1
+            
+        label_width = 46
+        bar_width = max(10, width - label_width - 14)
+        lines = []
+        lines.append("=" * width)
+        lines.append(f"PIPELINE TRACE (Wall Time: {total:.2f}s, {len(self.trace_spans)} spans)")
+        lines.append("=" * width)
+        
+        for span in self.trace_spans:
+            start_pos = int((span['start'] - trace_start) / total * bar_width)
+            duration_width = max(1, int(span['duration'] / total * bar_width))
+            bar = (" " * start_pos + "█" * duration_width)[:bar_width]
+            label = ("  " * depths.get(span['span_id'], 0) + span['name'])[:label_width]
+            lines.append(f"{label:<{label_width}} |{bar:<{bar_width}}| {span['duration']:8.3f}s")
+            
+        # Stage totals, slowest first
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.trace_spans:
+            stage = totals.setdefault(span['name'], {'count': 0, 'total': 0.0, 'cpu': 0.0})
+            stage['count'] += 1
+            stage['total'] += span['duration']
+            stage['cpu'] += span['args'].get('thread_cpu_s', 0.0) + span['args'].get('child_cpu_s', 0.0)
+            
+        lines.append("-" * width)
+        lines.append(f"{'STAGE':<{label_width}} {'CALLS':>6} {'TOTAL':>10} {'CPU':>10}")
+        for name, stage in sorted(totals.items(), key=lambda item: item[1]['total'], reverse=True):
+            lines.append(f"{name[:label_width]:<{label_width}} {stage['count']:>6} "
+                         f"{stage['total']:>9.3f}s {stage['cpu']:>9.3f}s")
+        lines.append("=" * width)
+        
+        return "\n".join(lines)
+        
     def analyze_alignment(self) -> Dict[str, Any]:
         """Analyze timing alignment and detect issues"""
         issues = []
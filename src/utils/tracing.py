@@ -0,0 +1,325 @@
+"""
+Span Tracing - Nested stage timings for the video generation pipeline
+Spans record wall time, thread CPU time and, for subprocesses, child CPU
+time. A session's spans are written as a Chrome trace (open in
+chrome://tracing or Perfetto) into the session's analysis directory and
+rendered as a text waterfall by the TimelineVisualizer
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRACE_FILENAME = "trace.json"
+TRACE_REPORT_FILENAME = "trace_timeline.txt"
+
+
+@dataclass
+class Span:
+    """One timed operation"""
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    thread_id: int
+    thread_name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    end_ns: Optional[int] = None
+    cpu_seconds: float = 0.0
+
+    def set(self, **attributes: Any) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+    @property
+    def duration(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+
+class _NullSpan:
+    """Returned when no trace is active so instrumented code needs no checks"""
+
+    def set(self, **attributes: Any) -> "_NullSpan":
+        return self
+
+
+_NULL_SPAN = _NullSpan()
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar("current_tracer", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+# Worker threads don't inherit context variables; their spans go to the first active trace
+_process_tracer: Optional["Tracer"] = None
+_process_tracer_lock = threading.Lock()
+
+
+class Tracer:
+    """Collects the spans of one generation session"""
+
+    def __init__(self, name: str = "pipeline", max_spans: int = 20000):
+        """
+        Args:
+            name: Name of the traced run
+            max_spans: Spans kept before further spans are counted as dropped
+        """
+        self.name = name
+        self.max_spans = max_spans
+        self.output_dir: Optional[str] = None
+        self.dropped = 0
+        self.epoch_ns = time.perf_counter_ns()
+        self.started_at = datetime.now()
+        self._spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def bind(self, output_dir: str):
+        """Set the directory the trace is written to (first binding wins)"""
+        if self.output_dir is None:
+            self.output_dir = output_dir
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        parent = _current_span.get()
+        thread = threading.current_thread()
+        span = Span(
+            name=name,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.perf_counter_ns(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        cpu_start = time.thread_time()
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            span.cpu_seconds = time.thread_time() - cpu_start
+            span.end_ns = time.perf_counter_ns()
+            _current_span.reset(token)
+            with self._lock:
+                if len(self._spans) < self.max_spans:
+                    self._spans.append(span)
+                else:
+                    self.dropped += 1
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total and max seconds per span name"""
+        stages: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            stage = stages.setdefault(span.name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stage["count"] += 1
+            stage["total_seconds"] = round(stage["total_seconds"] + span.duration, 4)
+            stage["max_seconds"] = round(max(stage["max_seconds"], span.duration), 4)
+        return stages
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Spans as Chrome trace complete events (microsecond timestamps)"""
+        pid = os.getpid()
+        events = []
+        thread_names = {}
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            thread_names[span.thread_id] = span.thread_name
+            args = {key: _jsonable(value) for key, value in span.attributes.items()}
+            args.update(span_id=span.span_id, parent_id=span.parent_id,
+                        thread_cpu_s=round(span.cpu_seconds, 4))
+            events.append({
+                "name": span.name,
+                "cat": self.name,
+                "ph": "X",
+                "ts": (span.start_ns - self.epoch_ns) / 1000,
+                "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args
+            })
+        for thread_id, thread_name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_name}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace": self.name,
+                "started_at": self.started_at.isoformat(),
+                "dropped_spans": self.dropped
+            }
+        }
+
+    def write(self, output_dir: Optional[str] = None) -> Optional[str]:
+        """
+        Write the Chrome trace and its text waterfall
+
+        Args:
+            output_dir: Target directory (defaults to the bound session directory)
+
+        Returns:
+            Path of the trace file, or None if there was nowhere to write it
+        """
+        output_dir = output_dir or self.output_dir
+        if not output_dir:
+            return None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            trace_path = os.path.join(output_dir, TRACE_FILENAME)
+            with open(trace_path, "w") as f:
+                json.dump(self.to_chrome_trace(), f)
+
+            from .timeline_visualizer import TimelineVisualizer
+            visualizer = TimelineVisualizer()
+            visualizer.load_trace(trace_path)
+            with open(os.path.join(output_dir, TRACE_REPORT_FILENAME), "w", encoding="utf-8") as f:
+                f.write(visualizer.generate_trace_report())
+
+            logger.info(f"🧭 Trace saved: {trace_path} ({len(self._spans)} spans)")
+            return trace_path
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Failed to write trace: {e}")
+            return None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The trace active in this context, or the process fallback for worker threads"""
+    return _current_tracer.get() or _process_tracer
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time a block as a span of the active trace (a no-op without one)"""
+    tracer = get_tracer()
+    if tracer is None:
+        yield _NULL_SPAN
+        return
+    with tracer.span(name, **attributes) as span:
+        yield span
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of a function or coroutine as a span"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def session_trace(name: str) -> Iterator[Tracer]:
+    """
+    Run a block inside a trace
+
+    Joins the trace already active in this context (the outer owner writes
+    it); otherwise starts a new trace and writes it on exit to the
+    directory bound with ``Tracer.bind``.
+    """
+    global _process_tracer
+    existing = _current_tracer.get()
+    if existing is not None:
+        with existing.span(name):
+            yield existing
+        return
+
+    tracer = Tracer(name)
+    token = _current_tracer.set(tracer)
+    with _process_tracer_lock:
+        owns_fallback = _process_tracer is None
+        if owns_fallback:
+            _process_tracer = tracer
+    try:
+        with tracer.span(name):
+            yield tracer
+    finally:
+        _current_tracer.reset(token)
+        if owns_fallback:
+            with _process_tracer_lock:
+                _process_tracer = None
+        tracer.write()
+
+
+def propagate(func: Callable) -> Callable:
+    """Wrap ``func`` to run in a copy of the current context, keeping span parents across threads"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def run_subprocess(cmd, span_name: Optional[str] = None, **kwargs: Any) -> subprocess.CompletedProcess:
+    """
+    ``subprocess.run`` recorded as a span with wall time and child CPU time
+
+    Child CPU comes from RUSAGE_CHILDREN, so it also counts other children
+    that exited during the call.
+    """
+    if isinstance(cmd, (list, tuple)):
+        program = os.path.basename(str(cmd[0])) if cmd else "subprocess"
+    else:
+        program = str(cmd).split(" ", 1)[0]
+
+    with trace_span(span_name or f"subprocess.{program}", program=program) as span:
+        cpu_before = _children_cpu_seconds()
+        try:
+            result = subprocess.run(cmd, **kwargs)
+        except subprocess.CalledProcessError as e:
+            span.set(returncode=e.returncode)
+            raise
+        finally:
+            span.set(child_cpu_s=round(_children_cpu_seconds() - cpu_before, 4))
+        span.set(returncode=result.returncode)
+        return result
+
+
+def _children_cpu_seconds() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
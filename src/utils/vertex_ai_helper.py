@@ -11,6 +11,7 @@ import vertexai
 from vertexai.generative_models import GenerativeModel, Content, Part
 from google.oauth2 import service_account
 from src.utils.logging_config import get_logger
+from src.utils.tracing import traced
 from config.config import settings
 from src.config.ai_model_config import DEFAULT_AI_MODEL, MODEL_CONFIGS
 
@@ -64,6 +65,7 @@ class VertexAIHelper:
         
         return mapping.get(model_name, "gemini-1.5-flash-002")  # Default to flash
     
+    @traced("llm.generate")
     def generate_content(self, 
                         prompt: str, 
                         model_name: Optional[str] = None,
@@ -0,0 +1,166 @@
+"""
+Unit tests for the content-addressed artifact store and its session integration
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.artifact_store import ArtifactStore, MANIFEST_FILENAME
+from src.utils.session_manager import SessionManager
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test linking, deduplication, manifests and tamper detection"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = self.temp_dir.name
+        self.store = ArtifactStore(os.path.join(self.root, ".artifacts"))
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_identical_content_shares_one_blob(self):
+        first = self._write("clip_a.mp4", b"video" * 1000)
+        second = self._write("clip_b.mp4", b"video" * 1000)
+
+        placed_a = self.store.place(first, os.path.join(self.root, "s1", "video_clips", "clip.mp4"))
+        placed_b = self.store.place(second, os.path.join(self.root, "s2", "final_output", "final.mp4"))
+
+        self.assertEqual(os.stat(placed_a).st_ino, os.stat(placed_b).st_ino)
+        self.assertEqual(self.store.stats["deduplicated"], 1)
+        with open(placed_b, "rb") as f:
+            self.assertEqual(f.read(), b"video" * 1000)
+
+    def test_manifest_records_placements(self):
+        source = self._write("audio.mp3", b"audio-bytes")
+        session_dir = os.path.join(self.root, "session_1")
+        manifest_path = os.path.join(session_dir, "metadata", MANIFEST_FILENAME)
+
+        self.store.place(source, os.path.join(session_dir, "audio", "a.mp3"),
+                         manifest_path=manifest_path, source="TTS")
+
+        with open(manifest_path) as f:
+            entry = json.load(f)["artifacts"][os.path.join("audio", "a.mp3")]
+        self.assertEqual(entry["digest"], self.store.digest(source))
+        self.assertEqual(entry["size"], len(b"audio-bytes"))
+        self.assertEqual(entry["source"], "TTS")
+
+    def test_rewriting_source_leaves_blob_unchanged(self):
+        source = self._write("render.mp4", b"original")
+        placed = self.store.place(source, os.path.join(self.root, "s1", "render.mp4"))
+
+        self.assertNotEqual(os.stat(source).st_ino, os.stat(placed).st_ino)
+        with open(source, "wb") as f:
+            f.write(b"rewritten")
+
+        with open(placed, "rb") as f:
+            self.assertEqual(f.read(), b"original")
+
+    def test_blob_modified_in_place_is_not_reused(self):
+        source = self._write("render.mp4", b"original")
+        digest = self.store.digest(source)
+        placed = self.store.place(source, os.path.join(self.root, "s1", "render.mp4"))
+
+        # Rewriting a placement in place also rewrites its linked blob
+        time.sleep(0.01)
+        with open(placed, "wb") as f:
+            f.write(b"rewritten")
+
+        again = self._write("again.mp4", b"original")
+        placed = self.store.place(again, os.path.join(self.root, "s2", "render.mp4"))
+        with open(placed, "rb") as f:
+            self.assertEqual(f.read(), b"original")
+        self.assertEqual(self.store.digest(placed), digest)
+
+    def test_move_takes_ownership(self):
+        source = self._write("temp.mp4", b"temporary")
+        target = self.store.place(source, os.path.join(self.root, "s1", "clip.mp4"), move=True)
+        self.assertFalse(os.path.exists(source))
+        self.assertTrue(os.path.exists(target))
+
+    def test_prune_removes_unreferenced_blobs(self):
+        source = self._write("clip.mp4", b"payload")
+        target = self.store.place(source, os.path.join(self.root, "s1", "clip.mp4"), move=True)
+        self.assertEqual(self.store.prune(), 0)
+        os.remove(target)
+        self.assertEqual(self.store.prune(), len(b"payload"))
+
+    def test_prune_spares_recently_ingested_blobs(self):
+        source = self._write("clip.mp4", b"payload")
+        _, blob = self.store.ingest(source)
+        self.assertEqual(self.store.prune(min_age_seconds=60), 0)
+        self.assertTrue(os.path.exists(blob))
+        self.assertEqual(self.store.prune(), len(b"payload"))
+
+    def test_place_reingests_blob_pruned_before_linking(self):
+        source = self._write("clip.mp4", b"payload")
+        ingest = self.store.ingest
+        calls = []
+
+        def ingest_then_prune(*args, **kwargs):
+            digest, blob = ingest(*args, **kwargs)
+            calls.append(blob)
+            if len(calls) == 1:
+                # A GC in another process prunes the unlinked blob
+                os.remove(blob)
+            return digest, blob
+
+        self.store.ingest = ingest_then_prune
+        target = self.store.place(source, os.path.join(self.root, "s1", "clip.mp4"))
+
+        self.assertEqual(len(calls), 2)
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), b"payload")
+
+
+class TestSessionManagerArtifacts(unittest.TestCase):
+    """Session saves link media instead of copying it"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.manager = SessionManager(base_output_dir=os.path.join(self.temp_dir.name, "outputs"))
+        self.manager.create_session("mission", "tiktok", 10, "Education")
+        self.source = os.path.join(self.manager.get_session_path("temp_files"), "render.mp4")
+        with open(self.source, "wb") as f:
+            f.write(b"final-video")
+
+    def test_saves_are_links_and_recorded(self):
+        clip = self.manager.save_video_clip(self.source, "1")
+        final = self.manager.save_final_video(self.source)
+
+        self.assertEqual(os.stat(clip).st_ino, os.stat(final).st_ino)
+        self.assertNotEqual(os.stat(clip).st_ino, os.stat(self.source).st_ino)
+        manifest = ArtifactStore.load_manifest(self.manager.get_manifest_path())
+        self.assertIn(os.path.join("video_clips", "video_clip_1.mp4"), manifest["artifacts"])
+
+    def test_track_file_names_by_content(self):
+        other_dir = os.path.join(self.temp_dir.name, "elsewhere")
+        os.makedirs(other_dir)
+        paths = []
+        for content in (b"one", b"one", b"two"):
+            path = os.path.join(other_dir, "clip.mp4")
+            with open(path, "wb") as f:
+                f.write(content)
+            paths.append(self.manager.track_file(path, "video_clip"))
+            os.remove(path)
+
+        # Same content keeps the name; different content gets a hash suffix
+        self.assertEqual(paths[0], paths[1])
+        self.assertNotEqual(paths[0], paths[2])
+        self.assertTrue(os.path.basename(paths[2]).startswith("clip_"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the ASS subtitle engine
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils.ass_subtitles import (
+    AssStyle, AssSubtitleDocument, ass_color, ass_filter, ass_time,
+    build_subtitle_document, escape_text
+)
+
+
+class TestAssFormatting(unittest.TestCase):
+    """Test ASS value formatting"""
+
+    def test_time_format(self):
+        self.assertEqual(ass_time(0), "0:00:00.00")
+        self.assertEqual(ass_time(61.257), "0:01:01.26")
+        self.assertEqual(ass_time(3725.5), "1:02:05.50")
+
+    def test_color_is_alpha_blue_green_red(self):
+        self.assertEqual(ass_color("white"), "&H00FFFFFF")
+        self.assertEqual(ass_color("#FF8000"), "&H000080FF")
+        self.assertEqual(ass_color("black", 0.5), "&H80000000")
+
+    def test_text_cannot_inject_override_tags(self):
+        escaped = escape_text("Price {\\b1} now\nsecond line")
+        self.assertNotIn("{", escaped)
+        self.assertEqual(escaped.count("\\"), 1)
+        self.assertTrue(escaped.endswith("now\\Nsecond line"))
+
+    def test_filter_escapes_path(self):
+        filter_str = ass_filter("/tmp/out:put,dir/sub's.ass")
+        self.assertTrue(filter_str.startswith("ass="))
+        self.assertIn("\\\\:", filter_str)
+        self.assertIn("\\,", filter_str)
+        self.assertNotIn(",dir", filter_str.replace("\\,", ""))
+
+
+class TestSubtitleDocument(unittest.TestCase):
+    """Test document construction from timed segments"""
+
+    def setUp(self):
+        self.segments = [
+            {'start': 0.0, 'end': 2.5, 'text': 'Hello there\nfriend'},
+            {'start': 2.5, 'end': 4.0, 'text': '\u200fשלום עולם\u200f'},
+            {'start': 4.0, 'end': 4.0, 'text': 'zero length'},
+            {'start': 4.0, 'end': 6.0, 'full_text': 'Full sentence', 'text': 'Full...'}
+        ]
+
+    def test_document_matches_video_resolution(self):
+        document = build_subtitle_document(self.segments, 1080, 1920)
+        content = document.to_string()
+        self.assertIn("PlayResX: 1080", content)
+        self.assertIn("PlayResY: 1920", content)
+        self.assertIn("[V4+ Styles]", content)
+        self.assertIn("[Events]", content)
+
+    def test_events_and_rtl_style(self):
+        document = build_subtitle_document(self.segments, 1080, 1920)
+        self.assertEqual(len(document.events), 3)
+        self.assertEqual(document.events[0].style, "Default")
+        self.assertEqual(document.events[1].style, "RTL")
+        # Direction marks are left to libass' bidi
+        self.assertNotIn("\u200f", document.events[1].text)
+        self.assertEqual(document.events[2].text, "Full sentence")
+        self.assertEqual(document.styles["RTL"].encoding, -1)
+        self.assertIn("Dialogue: 0,0:00:00.00,0:00:02.50,Default,,0,0,0,,Hello there\\Nfriend", document.to_string())
+
+    def test_positioning_decision_sets_alignment(self):
+        top = build_subtitle_document(self.segments, 1080, 1920, position='top_third')
+        center = build_subtitle_document(self.segments, 1080, 1920, position='center')
+        bottom = build_subtitle_document(self.segments, 1080, 1920, position='unknown')
+        self.assertEqual(top.styles["Default"].alignment, 8)
+        self.assertEqual(center.styles["Default"].alignment, 5)
+        self.assertEqual(bottom.styles["Default"].alignment, 2)
+        self.assertGreater(bottom.styles["Default"].margin_v, 0)
+
+    def test_boxed_style(self):
+        document = build_subtitle_document(self.segments, 1920, 1080, font_size=30, boxed=True, box_opacity=0.7)
+        style = document.styles["Default"]
+        self.assertEqual(style.font_size, 30)
+        self.assertEqual(style.border_style, 3)
+        self.assertIn(",&H4D000000,", style.to_line())
+
+    def test_save_writes_utf8(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            document = AssSubtitleDocument(width=640, height=360)
+            document.add_style(AssStyle())
+            document.add_event(0.0, 1.0, "שלום")
+            path = document.save(os.path.join(temp_dir, "subs", "subtitles.ass"))
+            with open(path, encoding="utf-8-sig") as f:
+                self.assertIn("שלום", f.read())
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for single-frame continuity extraction
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.continuity_frame_extractor import ContinuityFrameExtractor
+
+
+class TestContinuityFrameExtractor(unittest.TestCase):
+    """Test seek placement, frame selection and caching"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.clip = os.path.join(self.temp_dir.name, "clip.mp4")
+        with open(self.clip, "wb") as f:
+            f.write(b"fake video")
+        self.extractor = ContinuityFrameExtractor()
+
+    def _fake_run(self, probe):
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            if cmd[0] == 'ffprobe':
+                return MagicMock(returncode=0, stdout=json.dumps(probe))
+            if cmd[-1] == 'pipe:1':
+                return MagicMock(returncode=0, stdout=b"\xff\xd8jpeg", stderr=b"")
+            with open(cmd[-1], "wb") as f:
+                f.write(b"jpeg")
+            return MagicMock(returncode=0, stderr="")
+
+        return run, calls
+
+    def test_seeks_on_input_side_to_trimmed_frame(self):
+        run, calls = self._fake_run({"streams": [{"nb_frames": "240", "avg_frame_rate": "24/1"}]})
+        output = os.path.join(self.temp_dir.name, "frames", "last.jpg")
+
+        with patch("src.utils.continuity_frame_extractor.subprocess.run", side_effect=run):
+            result = self.extractor.extract_to_path(self.clip, output, trim_frames=2)
+
+        self.assertEqual(result, output)
+        ffmpeg_cmd = calls[1]
+        self.assertLess(ffmpeg_cmd.index('-ss'), ffmpeg_cmd.index('-i'))
+        # Frame 237 of 0..239 at 24 fps
+        self.assertEqual(ffmpeg_cmd[ffmpeg_cmd.index('-ss') + 1], f"{237 / 24:.6f}")
+        self.assertEqual(ffmpeg_cmd[ffmpeg_cmd.index('-frames:v') + 1], '1')
+
+    def test_frame_count_derived_from_duration(self):
+        run, calls = self._fake_run({
+            "streams": [{"avg_frame_rate": "0/0", "r_frame_rate": "30000/1001"}],
+            "format": {"duration": "2.002"}
+        })
+
+        with patch("src.utils.continuity_frame_extractor.subprocess.run", side_effect=run):
+            info = self.extractor.probe_frame_info(self.clip)
+
+        self.assertEqual(info.frame_count, 60)
+        self.assertAlmostEqual(info.fps, 29.97, places=2)
+
+    def test_results_are_cached_per_clip(self):
+        run, calls = self._fake_run({"streams": [{"nb_frames": "10", "avg_frame_rate": "10/1"}]})
+        first = os.path.join(self.temp_dir.name, "a.jpg")
+        second = os.path.join(self.temp_dir.name, "b.jpg")
+
+        with patch("src.utils.continuity_frame_extractor.subprocess.run", side_effect=run):
+            self.extractor.extract_to_path(self.clip, first)
+            self.extractor.extract_to_path(self.clip, second)
+            buffer = self.extractor.extract_to_buffer(self.clip)
+            self.extractor.extract_to_buffer(self.clip)
+
+        self.assertTrue(os.path.exists(second))
+        self.assertEqual(buffer, b"\xff\xd8jpeg")
+        # One probe, one file decode, one buffer decode
+        self.assertEqual([cmd[0] for cmd in calls], ['ffprobe', 'ffmpeg', 'ffmpeg'])
+
+    def test_missing_clip_returns_none(self):
+        missing = os.path.join(self.temp_dir.name, "missing.mp4")
+        self.assertIsNone(self.extractor.extract_to_path(missing, missing + ".jpg"))
+
+
+if __name__ == '__main__':
+    unittest.main()
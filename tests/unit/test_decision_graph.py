@@ -0,0 +1,162 @@
+"""
+Unit tests for dependency-graph decision resolution and the decision memo
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.core.decision_graph import DecisionGraph, DecisionMemo
+from src.core.decision_framework import DecisionFramework, DecisionSource
+
+
+class _SessionContext:
+    """Minimal session context writing into a temp directory"""
+
+    def __init__(self, root):
+        self.root = root
+        self.session_id = "test_session"
+
+    def get_output_path(self, subdir, filename=""):
+        return os.path.join(self.root, subdir, filename)
+
+
+class TestDecisionGraph(unittest.TestCase):
+    """Test ordering, cycle detection and concurrent resolution"""
+
+    def test_order_respects_inputs(self):
+        graph = DecisionGraph()
+        graph.add('c', lambda d: d['a'] + d['b'], inputs=['a', 'b'])
+        graph.add('a', lambda _: 1)
+        graph.add('b', lambda d: d['a'] * 10, inputs=['a'])
+
+        order = graph.order()
+        self.assertLess(order.index('a'), order.index('b'))
+        self.assertLess(order.index('b'), order.index('c'))
+        self.assertEqual(asyncio.run(graph.resolve())['c'], 11)
+
+    def test_cycle_and_unknown_input_rejected(self):
+        graph = DecisionGraph()
+        graph.add('a', lambda d: d['b'], inputs=['b'])
+        graph.add('b', lambda d: d['a'], inputs=['a'])
+        with self.assertRaises(ValueError):
+            graph.order()
+
+        graph = DecisionGraph()
+        graph.add('a', lambda d: d['missing'], inputs=['missing'])
+        with self.assertRaises(ValueError):
+            graph.order()
+
+    def test_blocking_nodes_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+
+        def slow(_):
+            # Both blocking nodes must be in flight at once to pass the barrier
+            barrier.wait()
+            return threading.current_thread().name
+
+        async def combine(d):
+            return (d['x'], d['y'])
+
+        graph = DecisionGraph()
+        graph.add('x', slow, blocking=True)
+        graph.add('y', slow, blocking=True)
+        graph.add('both', combine, inputs=['x', 'y'])
+
+        results = asyncio.run(graph.resolve())
+        self.assertEqual(len(results['both']), 2)
+
+    def test_failure_propagates(self):
+        def boom(_):
+            raise RuntimeError("decision failed")
+
+        graph = DecisionGraph()
+        graph.add('a', boom)
+        graph.add('b', lambda d: d['a'], inputs=['a'])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(graph.resolve())
+
+
+class TestDecisionMemo(unittest.TestCase):
+    """Test memo keys and persistence"""
+
+    def test_round_trip_and_merge(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            memo = DecisionMemo(cache_dir)
+            key = memo.key_for({'mission': 'm', 'duration': 16}, None, True)
+
+            self.assertEqual(memo.load(key), {})
+            memo.store(key, {'a': {'value': 1}})
+            memo.store(key, {'b': {'value': [1, 2]}})
+
+            self.assertEqual(memo.load(key), {'a': {'value': 1}, 'b': {'value': [1, 2]}})
+            self.assertNotEqual(key, memo.key_for({'mission': 'other', 'duration': 16}, None, True))
+
+
+class TestDecisionFrameworkGraph(unittest.TestCase):
+    """Test make_all_decisions on top of the graph"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.session = _SessionContext(os.path.join(self.temp_dir.name, "session"))
+        self.memo_dir = os.path.join(self.temp_dir.name, "memo")
+        self.cli_args = {'mission': 'Explain how rainbows form', 'duration': 20, 'platform': 'tiktok',
+                         'category': 'Educational'}
+
+    def _framework(self):
+        framework = DecisionFramework(self.session, memo_dir=self.memo_dir)
+        framework.mission_planning_agent = MagicMock()
+        return framework
+
+    def test_ai_decisions_are_memoized(self):
+        first = self._framework()
+        first.mission_agent = MagicMock()
+        first.mission_agent.model.generate_content.return_value = MagicMock(
+            text='{"color_palette": "sunset gradient", "reasoning": "warm"}'
+        )
+        decisions = asyncio.run(first.make_all_decisions(self.cli_args, ai_agents_available=True))
+        self.assertEqual(decisions.color_palette, "sunset gradient")
+
+        second = self._framework()
+        second._decide_visual_elements = MagicMock()
+        memoized = asyncio.run(second.make_all_decisions(self.cli_args, ai_agents_available=True))
+
+        second._decide_visual_elements.assert_not_called()
+        self.assertEqual(memoized.color_palette, "sunset gradient")
+        self.assertEqual(second.decisions['color_palette'].source, DecisionSource.AI_AGENT)
+
+    def test_fallback_decisions_are_not_memoized(self):
+        first = self._framework()
+        decisions = asyncio.run(first.make_all_decisions(self.cli_args, ai_agents_available=True))
+        # The planning agent mock is not awaitable, so clip structure falls back to the heuristic
+        self.assertEqual(first.decisions['num_clips'].source, DecisionSource.SYSTEM_DEFAULT)
+        self.assertEqual(first.decisions['color_palette'].source, DecisionSource.SYSTEM_DEFAULT)
+
+        second = self._framework()
+        second._decide_visual_elements = MagicMock(wraps=second._decide_visual_elements)
+        second._ai_optimize_clip_structure = MagicMock(wraps=second._ai_optimize_clip_structure)
+        retried = asyncio.run(second.make_all_decisions(self.cli_args, ai_agents_available=True))
+
+        second._decide_visual_elements.assert_called_once()
+        second._ai_optimize_clip_structure.assert_called_once()
+        self.assertEqual(retried.num_clips, decisions.num_clips)
+
+    def test_cheap_mode_skips_planning_agent(self):
+        framework = self._framework()
+        cli_args = dict(self.cli_args, cheap_mode=True)
+        decisions = asyncio.run(framework.make_all_decisions(cli_args, ai_agents_available=True))
+
+        framework.mission_planning_agent.analyze_mission.assert_not_called()
+        self.assertEqual(decisions.num_clips, 3)
+        self.assertEqual(decisions.clip_durations, [8.0] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit tests for batched segment rewriting in Director
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.generators.director import Director
+
+
+def _response(text):
+    response = MagicMock()
+    response.text = text
+    return response
+
+
+class TestDirectorBatchRewrite(unittest.TestCase):
+    """Test single-call rewriting, validation and per-segment fallback"""
+
+    def setUp(self):
+        self.director = Director(api_key="test-key")
+        self.director.model = MagicMock()
+        self.script = {
+            'segments': [
+                {'text': 'The latest update changes everything'},
+                {'text': 'A timeless explanation of the basics'},
+                {'text': 'Recent trend numbers are surprising'},
+                {'text': 'Now is the moment to look closer'}
+            ]
+        }
+
+    def test_all_segments_rewritten_in_one_call(self):
+        self.director.model.generate_content.return_value = _response(json.dumps({
+            'segments': [
+                {'index': 0, 'text': 'The latest 2025 update changes everything'},
+                {'index': 2, 'text': 'Recent trend numbers are up 40 percent'},
+                {'index': 3, 'text': 'Now, after this week, look closer'}
+            ]
+        }))
+
+        script = self.director.incorporate_current_info(self.script, "Context about this week")
+
+        self.assertEqual(self.director.model.generate_content.call_count, 1)
+        self.assertEqual(script['segments'][0]['text'], 'The latest 2025 update changes everything')
+        self.assertEqual(script['segments'][1]['text'], 'A timeless explanation of the basics')
+        self.assertEqual(script['segments'][3]['text'], 'Now, after this week, look closer')
+
+    def test_invalid_segments_fall_back_individually(self):
+        batch = _response(json.dumps({
+            'segments': [
+                {'index': 0, 'text': 'The latest 2025 update changes everything'},
+                {'index': 2, 'text': ''},
+                {'index': 3, 'text': 'x' * 500}
+            ]
+        }))
+        self.director.model.generate_content.side_effect = [
+            batch, _response('Fallback two'), _response('Fallback three')
+        ]
+
+        script = self.director.incorporate_current_info(self.script, "Context about this week")
+
+        self.assertEqual(self.director.model.generate_content.call_count, 3)
+        self.assertEqual(script['segments'][2]['text'], 'Fallback two')
+        self.assertEqual(script['segments'][3]['text'], 'Fallback three')
+
+    def test_disabled_batching_uses_individual_calls(self):
+        self.director.batch_refinement = False
+        self.director.model.generate_content.return_value = _response('Rewritten')
+
+        script = self.director.incorporate_current_info(self.script, "Context")
+
+        self.assertEqual(self.director.model.generate_content.call_count, 3)
+        self.assertEqual(script['segments'][0]['text'], 'Rewritten')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for compiling cinematic effects into FFmpeg filter chains
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.effects.ffmpeg_effect_compiler import FFmpegEffectCompiler, VideoStreamInfo
+
+
+class TestFFmpegEffectCompiler(unittest.TestCase):
+    """Test filter construction, LUT export and single-encode rendering"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.compiler = FFmpegEffectCompiler(lut_dir=self.temp_dir.name)
+        self.info = VideoStreamInfo(width=1920, height=1080, fps=24.0, duration=8.0, has_audio=True)
+
+    def test_letterbox_and_linear_grade(self):
+        self.assertEqual(self.compiler.letterbox(self.info), "crop=iw:ih-216:0:108,pad=iw:ih+216:0:108:black")
+        self.assertEqual(
+            self.compiler.linear_grade(scale=1.3, offset=-20, b=1.1),
+            "lutrgb=r='clip(val*1.3-20,0,255)':g='clip(val*1.3-20,0,255)':"
+            "b='clip(clip(val*1.3-20,0,255)*1.1,0,255)'"
+        )
+
+    def test_ken_burns_spans_clip_frames(self):
+        zoompan = self.compiler.ken_burns(self.info, zoom_factor=1.2, pan_direction='right')
+
+        self.assertIn("z='1+0.2*(on/192)'", zoompan)
+        self.assertIn("iw*0.1*(on/192)", zoompan)
+        self.assertIn("s=1920x1080", zoompan)
+
+    def test_lut3d_cube_matches_channel_lut(self):
+        values = np.arange(256)
+        lut = np.zeros((256, 1, 3), dtype=np.uint8)
+        lut[:, 0, 0] = np.clip(values * 1.1, 0, 255)
+        lut[:, 0, 1] = values
+        lut[:, 0, 2] = np.clip(values * 0.85, 0, 255)
+
+        lut_filter = self.compiler.lut3d("warm", lut)
+        cube_path = lut_filter.split("file='")[1].rstrip("'").replace("\\:", ":")
+        with open(cube_path) as f:
+            lines = f.read().splitlines()
+
+        self.assertEqual(lines[1], "LUT_3D_SIZE 33")
+        entries = np.array([list(map(float, line.split())) for line in lines[2:]])
+        self.assertEqual(entries.shape, (33 ** 3, 3))
+        # Last entry is white in; red saturates, blue is scaled down
+        np.testing.assert_allclose(entries[-1], [1.0, 1.0, 216 / 255], atol=1e-6)
+        # Red varies fastest
+        self.assertLess(entries[0][0], entries[1][0])
+        self.assertEqual(entries[0][2], entries[1][2])
+        # Same LUT reuses the cached file
+        self.assertEqual(self.compiler.lut3d("warm", lut), lut_filter)
+
+    def test_render_single_encode_copies_audio(self):
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            with open(cmd[-1], "wb") as f:
+                f.write(b"video")
+            return MagicMock(returncode=0, stderr="")
+
+        output = os.path.join(self.temp_dir.name, "out.mp4")
+        with patch("src.effects.ffmpeg_effect_compiler.subprocess.run", side_effect=run):
+            result = self.compiler.render("in.mp4", output, ["eq=saturation=1.2", None], info=self.info, fps=24)
+
+        self.assertEqual(result, output)
+        self.assertEqual(len(calls), 1)
+        cmd = calls[0]
+        self.assertEqual(cmd[cmd.index('-vf') + 1], "eq=saturation=1.2,fps=24,format=yuv420p")
+        self.assertEqual(cmd[cmd.index('-c:a') + 1], 'copy')
+
+    def test_render_sequence_joins_clips_in_one_encode(self):
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            with open(cmd[-1], "wb") as f:
+                f.write(b"video")
+            return MagicMock(returncode=0, stderr="")
+
+        silent = VideoStreamInfo(width=1280, height=720, fps=30.0, duration=4.0, has_audio=False)
+        segments = [("a.mp4", ["eq=saturation=1.2"], self.info), ("b.mp4", [None], silent)]
+        output = os.path.join(self.temp_dir.name, "seq.mp4")
+        with patch("src.effects.ffmpeg_effect_compiler.subprocess.run", side_effect=run):
+            result = self.compiler.render_sequence(segments, output, transition='fade', transition_duration=0.5)
+
+        self.assertEqual(result, output)
+        self.assertEqual(len(calls), 1)
+        cmd = calls[0]
+        graph = cmd[cmd.index('-filter_complex') + 1]
+        self.assertIn("[0:v]eq=saturation=1.2,scale=1920:1080", graph)
+        self.assertIn("[1:v]scale=1920:1080", graph)
+        self.assertIn("xfade=transition=fade:duration=0.500:offset=7.500[xfv];[xfv]format=yuv420p[outv]", graph)
+        # Clip without audio is padded with generated silence
+        self.assertIn('anullsrc=r=48000:cl=stereo', cmd)
+        self.assertIn("[2:a]aresample=48000", graph)
+        self.assertIn("acrossfade=d=0.500[outa]", graph)
+
+    def test_probe_reads_audio_presence(self):
+        probe = {
+            "streams": [
+                {"codec_type": "video", "width": 1280, "height": 720, "avg_frame_rate": "30000/1001"},
+                {"codec_type": "audio"}
+            ],
+            "format": {"duration": "5.0"}
+        }
+        with patch("src.effects.ffmpeg_effect_compiler.subprocess.run",
+                   return_value=MagicMock(returncode=0, stdout=json.dumps(probe))):
+            info = self.compiler.probe("clip.mp4")
+
+        self.assertEqual((info.width, info.height), (1280, 720))
+        self.assertAlmostEqual(info.fps, 29.97, places=2)
+        self.assertTrue(info.has_audio)
+        self.assertEqual(info.frame_count, 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Unit tests for local optical-flow frame interpolation
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.frame_interpolator import FrameInterpolator
+
+
+class TestFrameInterpolator(unittest.TestCase):
+    """Test in-between frames and xfade chain construction"""
+
+    def _square_frame(self, x):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        frame[40:80, x:x + 40] = 255
+        return frame
+
+    def test_interpolate_is_deterministic_and_moves_content(self):
+        interpolator = FrameInterpolator()
+        start, end = self._square_frame(20), self._square_frame(60)
+
+        frames = interpolator.interpolate(start, end, 3)
+        again = interpolator.interpolate(start, end, 3)
+
+        self.assertEqual(len(frames), 3)
+        for frame, repeat in zip(frames, again):
+            np.testing.assert_array_equal(frame, repeat)
+
+        # Centre of brightness should move from left to right
+        centres = [np.nonzero(frame.mean(axis=(0, 2)) > 64)[0].mean() for frame in frames]
+        self.assertEqual(centres, sorted(centres))
+
+    def test_interpolate_frames_writes_files_and_resizes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = os.path.join(temp_dir, "a.png")
+            second = os.path.join(temp_dir, "b.png")
+            cv2.imwrite(first, self._square_frame(10))
+            cv2.imwrite(second, cv2.resize(self._square_frame(50), (80, 60)))
+
+            paths = FrameInterpolator().interpolate_frames(first, second, 2, temp_dir, "t")
+
+            self.assertEqual([os.path.basename(p) for p in paths], ["t_001.png", "t_002.png"])
+            self.assertEqual(cv2.imread(paths[0]).shape, (120, 160, 3))
+
+    def test_build_xfade_chain_offsets(self):
+        chain = FrameInterpolator.build_xfade_chain(["v0", "v1", "v2"], [8.0, 7.5, 6.0], 0.5)
+
+        self.assertEqual(
+            chain,
+            "[v0][v1]xfade=transition=fade:duration=0.500:offset=7.500[xf1];"
+            "[xf1][v2]xfade=transition=fade:duration=0.500:offset=14.500[outv]"
+        )
+
+    def test_build_xfade_chain_requires_two_inputs(self):
+        with self.assertRaises(ValueError):
+            FrameInterpolator.build_xfade_chain(["v0"], [8.0], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
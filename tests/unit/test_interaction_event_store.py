@@ -0,0 +1,140 @@
+"""
+Unit tests for the append-only interaction event store and tracker indexes
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.interaction_event_store import (
+    InteractionEventStore, EventStoreConfig, FsyncPolicy, ContentIndex, _flush_open_stores
+)
+from src.utils.interaction_tracker import InteractionTracker
+
+
+class TestInteractionEventStore(unittest.TestCase):
+    """Test batched append-only persistence"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_batches_until_batch_size(self):
+        config = EventStoreConfig(batch_size=3, flush_interval_seconds=3600)
+        store = InteractionEventStore(self.temp_dir.name, config)
+
+        store.append({"type": "engagement", "n": 1})
+        store.append({"type": "engagement", "n": 2})
+        self.assertFalse(store.log_path.exists())
+        self.assertEqual(store.pending_events, 2)
+
+        store.append({"type": "engagement", "n": 3})
+        with open(store.log_path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(store.pending_events, 0)
+
+    def test_always_policy_writes_each_event(self):
+        config = EventStoreConfig(fsync_policy=FsyncPolicy.ALWAYS)
+        store = InteractionEventStore(self.temp_dir.name, config)
+
+        store.append({"type": "behavior", "content_id": "a"})
+        self.assertEqual(store.pending_events, 0)
+        self.assertEqual([e["content_id"] for e in store.iter_events("behavior")], ["a"])
+
+    def test_background_flush_without_further_appends(self):
+        config = EventStoreConfig(batch_size=50, flush_interval_seconds=0.05)
+        store = InteractionEventStore(self.temp_dir.name, config)
+
+        store.append({"type": "engagement", "n": 1})
+        deadline = time.monotonic() + 2
+        while store.pending_events and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(store.pending_events, 0)
+        with open(store.log_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        store.close()
+
+    def test_pending_events_flushed_at_exit(self):
+        config = EventStoreConfig(batch_size=50, flush_interval_seconds=3600)
+        store = InteractionEventStore(self.temp_dir.name, config)
+        store.append({"type": "engagement", "n": 1})
+
+        _flush_open_stores()
+
+        self.assertEqual([e["n"] for e in store.iter_events()], [1])
+
+    def test_skips_truncated_line(self):
+        store = InteractionEventStore(self.temp_dir.name)
+        store.append({"type": "engagement", "n": 1})
+        store.flush()
+        with open(store.log_path, 'a') as f:
+            f.write('{"type": "engag')
+
+        self.assertEqual([e["n"] for e in store.iter_events()], [1])
+
+
+class TestContentIndex(unittest.TestCase):
+    """Test incremental timeline ordering and growth rates"""
+
+    def _point(self, timestamp, likes):
+        return {"timestamp": timestamp, "metrics": {"likes": likes}, "engagement_score": likes}
+
+    def test_out_of_order_insert_recomputes_neighbours(self):
+        index = ContentIndex("c1")
+        index.add(self._point("2025-01-01T10:00:00", 10))
+        index.add(self._point("2025-01-01T12:00:00", 40))
+        index.add(self._point("2025-01-01T11:00:00", 20))
+
+        self.assertEqual([p["metrics"]["likes"] for p in index.timeline], [10, 20, 40])
+        self.assertEqual(index.timeline[0]["growth_rates"], {"likes": 0})
+        self.assertEqual(index.timeline[1]["growth_rates"], {"likes": 100.0})
+        self.assertEqual(index.timeline[2]["growth_rates"], {"likes": 100.0})
+        self.assertEqual(index.latest["metrics"]["likes"], 40)
+
+
+class TestInteractionTrackerPersistence(unittest.TestCase):
+    """Test tracker queries served from indexes and rebuilt from the log"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.session_context = SimpleNamespace(session_dir=self.temp_dir.name)
+
+    def test_replay_restores_indexes(self):
+        tracker = InteractionTracker(self.session_context)
+        tracker.track_engagement_metrics(
+            "c1", "TikTok", {"views": 100, "likes": 10}, "2025-01-06T09:00:00"
+        )
+        tracker.track_engagement_metrics(
+            "c1", "TikTok", {"views": 200, "likes": 30}, "2025-01-06T10:00:00"
+        )
+        tracker.track_behavioral_patterns("c1", {"peak_times": [3]})
+        tracker.close()
+
+        reloaded = InteractionTracker(self.session_context)
+        timeline = reloaded.track_content_performance_over_time("c1")
+        self.assertEqual(timeline["data_points"], 2)
+        self.assertEqual(timeline["performance_timeline"][1]["growth_rates"]["likes"], 200.0)
+
+        timing = reloaded.predict_optimal_posting_times("tiktok")
+        self.assertEqual(timing["analysis_based_on"], 2)
+        self.assertEqual(timing["optimal_days"][0]["day"], "Monday")
+
+        comparison = reloaded.compare_content_performance(["c1", "missing"])
+        self.assertEqual(comparison["best_performer"]["metrics"]["likes"], 30)
+
+        export_file = reloaded.export_tracking_data(include_behavioral=True)
+        with open(export_file) as f:
+            exported = json.load(f)
+        self.assertEqual(exported["behavioral_data"]["c1"]["patterns"]["peak_engagement_times"], [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
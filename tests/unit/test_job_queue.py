@@ -0,0 +1,134 @@
+"""
+Unit tests for the video generator's durable job queue
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from src.microservices.video_generator.job_queue import (
+    DurableJobQueue, JobPriority, JobQueueConfig, JobState, JobWorkerPool
+)
+
+
+class TestDurableJobQueue(unittest.TestCase):
+    """Test leasing, retries and persistence"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = JobQueueConfig(
+            db_path=os.path.join(self.temp_dir, "jobs.db"),
+            lease_seconds=30,
+            max_attempts=2,
+            backoff_base=0.01,
+            backoff_max=0.05,
+            poll_interval=0.05
+        )
+        self.queue = DurableJobQueue(self.config)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_priority_lanes_lease_first(self):
+        low = self.queue.enqueue({"prompt": "low"}, priority="low")
+        normal = self.queue.enqueue({"prompt": "normal"})
+        high = self.queue.enqueue({"prompt": "high"}, priority=JobPriority.HIGH)
+
+        leased = [self.queue.lease("w1").job_id for _ in range(3)]
+        self.assertEqual(leased, [high.job_id, normal.job_id, low.job_id])
+        self.assertIsNone(self.queue.lease("w1"))
+
+    def test_jobs_survive_restart(self):
+        job = self.queue.enqueue({"prompt": "persist me"})
+        reopened = DurableJobQueue(self.config)
+
+        stored = reopened.get(job.job_id)
+        self.assertEqual(stored.state, JobState.QUEUED)
+        self.assertEqual(stored.payload["prompt"], "persist me")
+
+    def test_failed_attempt_retries_with_backoff_then_fails(self):
+        job = self.queue.enqueue({"prompt": "flaky"})
+
+        self.queue.lease("w1")
+        self.assertEqual(self.queue.fail(job.job_id, "w1", "timeout"), JobState.QUEUED)
+        self.assertGreater(self.queue.get(job.job_id).available_at, time.time())
+
+        time.sleep(0.07)
+        self.assertEqual(self.queue.lease("w1").attempts, 2)
+        self.assertEqual(self.queue.fail(job.job_id, "w1", "timeout"), JobState.FAILED)
+        self.assertEqual(self.queue.get(job.job_id).error, "timeout")
+
+    def test_expired_lease_is_reclaimed(self):
+        job = self.queue.enqueue({"prompt": "orphaned"})
+        self.queue.lease("dead-worker", lease_seconds=0.01)
+        time.sleep(0.03)
+
+        # Backoff before the reclaimed job is available again
+        self.assertIsNone(self.queue.lease("w2"))
+        time.sleep(0.07)
+        leased = self.queue.lease("w2")
+        self.assertEqual(leased.job_id, job.job_id)
+        # The stale owner can no longer complete it
+        self.assertFalse(self.queue.complete(job.job_id, "dead-worker", {"success": True}))
+        self.assertTrue(self.queue.complete(job.job_id, "w2", {"success": True}))
+
+    def test_heartbeat_extends_lease(self):
+        job = self.queue.enqueue({"prompt": "long"})
+        self.queue.lease("w1", lease_seconds=1)
+        before = self.queue.get(job.job_id).lease_expires
+
+        self.assertTrue(self.queue.heartbeat(job.job_id, "w1", lease_seconds=60))
+        self.assertGreater(self.queue.get(job.job_id).lease_expires, before)
+        self.assertFalse(self.queue.heartbeat(job.job_id, "w2"))
+
+    def test_worker_pool_runs_jobs_concurrently(self):
+        def handler(job):
+            if job.payload.get("fail"):
+                return {"success": False, "error": "blocked"}
+            time.sleep(0.2)
+            return {"success": True, "video_path": job.payload["prompt"]}
+
+        pool = JobWorkerPool(self.queue, handler, workers=3)
+        jobs = [self.queue.enqueue({"prompt": f"clip_{i}"}) for i in range(3)]
+        failing = self.queue.enqueue({"prompt": "bad", "fail": True}, max_attempts=1)
+
+        started = time.time()
+        pool.start()
+        try:
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                counts = self.queue.counts()
+                if counts["completed"] == 3 and counts["failed"] == 1:
+                    break
+                time.sleep(0.02)
+        finally:
+            pool.stop()
+
+        self.assertLess(time.time() - started, 0.55)
+        for job in jobs:
+            stored = self.queue.get(job.job_id)
+            self.assertEqual(stored.state, JobState.COMPLETED)
+            self.assertEqual(stored.result["video_path"], job.payload["prompt"])
+        self.assertEqual(self.queue.get(failing.job_id).state, JobState.FAILED)
+        self.assertEqual(self.queue.get(failing.job_id).to_dict()["status"], "failed")
+
+    def test_non_retryable_result_fails_without_requeue(self):
+        calls = []
+
+        def handler(job):
+            calls.append(job.job_id)
+            return {"success": False, "error": "retries exhausted", "retryable": False}
+
+        job = self.queue.enqueue({"prompt": "clip"})
+        self.assertTrue(JobWorkerPool(self.queue, handler).run_one("w1"))
+
+        stored = self.queue.get(job.job_id)
+        self.assertEqual(stored.state, JobState.FAILED)
+        self.assertEqual(stored.attempts, 1)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
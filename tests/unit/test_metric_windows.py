@@ -0,0 +1,98 @@
+"""
+Unit tests for the monitoring service's batch parsing and windowed aggregation
+"""
+
+import json
+import time
+from datetime import datetime
+import unittest
+
+from src.microservices.monitoring.metric_windows import (
+    EventDigest, WindowedAggregator, parse_batch, parse_line_protocol, parse_timestamp
+)
+
+
+class TestBatchParsing(unittest.TestCase):
+    """Test NDJSON and line protocol payloads"""
+
+    def test_ndjson(self):
+        body = "\n".join(json.dumps({"service": "orchestrator", "name": "clips", "value": i}) for i in range(3))
+        metrics, errors = parse_batch(body + "\n{not json}\n", "application/x-ndjson")
+        self.assertEqual(len(metrics), 3)
+        self.assertEqual(metrics[2]["value"], 2)
+        self.assertEqual(len(errors), 1)
+
+    def test_line_protocol_fields_and_tags(self):
+        metrics = parse_line_protocol(
+            "render_time,service=video-generator,clip=c\\ 1 value=12.5,frames=240i,ok=t 1700000000000000000"
+        )
+        by_name = {m["name"]: m for m in metrics}
+        self.assertEqual(by_name["render_time"]["value"], 12.5)
+        self.assertEqual(by_name["render_time.frames"]["value"], 240)
+        self.assertEqual(by_name["render_time.ok"]["value"], 1)
+        self.assertEqual(by_name["render_time"]["service"], "video-generator")
+        self.assertEqual(by_name["render_time"]["tags"], {"clip": "c 1"})
+        self.assertAlmostEqual(by_name["render_time"]["timestamp"], 1700000000.0)
+
+    def test_line_protocol_detected_without_content_type(self):
+        metrics, errors = parse_batch("# comment\nqueue_depth value=3\nbroken\n", "", default_service="worker")
+        self.assertEqual([(m["service"], m["name"]) for m in metrics], [("worker", "queue_depth")])
+        self.assertEqual(len(errors), 1)
+
+    def test_timestamp_units(self):
+        self.assertAlmostEqual(parse_timestamp(1700000000), 1700000000)
+        self.assertAlmostEqual(parse_timestamp(1700000000000), 1700000000)
+        self.assertAlmostEqual(parse_timestamp("2024-01-01T00:00:00"), datetime(2024, 1, 1).timestamp())
+
+
+class TestWindowedAggregator(unittest.TestCase):
+    """Test incremental window aggregates"""
+
+    def test_summary_over_windows(self):
+        aggregator = WindowedAggregator(window_seconds=10)
+        now = time.time()
+        for value in range(1, 101):
+            aggregator.record("svc.latency", value, now - (value % 3) * 10)
+        self.assertFalse(aggregator.record("svc.latency", "n/a"))
+
+        stats = aggregator.summary()["svc.latency"]
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["min"], 1)
+        self.assertEqual(stats["max"], 100)
+        self.assertAlmostEqual(stats["avg"], 50.5)
+        self.assertAlmostEqual(stats["p95"], 95, delta=1.5)
+        self.assertEqual(aggregator.summary(service="other"), {})
+
+    def test_old_windows_are_evicted(self):
+        aggregator = WindowedAggregator(window_seconds=1, retained_windows=3)
+        now = time.time()
+        for age in range(6):
+            aggregator.record("svc.m", age, now - age)
+        self.assertLessEqual(aggregator.summary()["svc.m"]["count"], 3)
+
+    def test_drain_returns_only_updated_windows(self):
+        aggregator = WindowedAggregator(window_seconds=10)
+        aggregator.record("svc.a", 1)
+        aggregator.record("svc.a", 3)
+        aggregator.record("svc.b", 5)
+
+        deltas = {d["key"]: d for d in aggregator.drain_deltas()}
+        self.assertEqual(set(deltas), {"svc.a", "svc.b"})
+        self.assertEqual(deltas["svc.a"]["count"], 2)
+        self.assertEqual(aggregator.drain_deltas(), [])
+
+        aggregator.record("svc.b", 7)
+        self.assertEqual([d["key"] for d in aggregator.drain_deltas()], ["svc.b"])
+
+    def test_event_digest(self):
+        digest = EventDigest(max_pending=2)
+        for i in range(3):
+            digest.add({"service": "orchestrator", "type": "workflow.completed", "data": {"i": i}})
+        drained = digest.drain()
+        self.assertEqual(len(drained["events"]), 2)
+        self.assertEqual(drained["counts"], {"orchestrator.workflow.completed": 3})
+        self.assertEqual(digest.drain()["events"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
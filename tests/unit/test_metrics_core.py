@@ -0,0 +1,152 @@
+"""
+Unit tests for the histogram-based metrics core and PerformanceMonitor
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+import numpy as np
+
+try:
+    from prometheus_client.openmetrics.parser import text_string_to_metric_families
+    PROMETHEUS_CLIENT_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_CLIENT_AVAILABLE = False
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.shared.monitoring.metrics_core import LogHistogram, MetricsRegistry
+from src.shared.monitoring.performance_monitor import PerformanceMonitor
+
+
+class TestLogHistogram(unittest.TestCase):
+    """Percentiles within the configured relative error, bounded memory"""
+
+    def test_percentiles_within_precision(self):
+        values = np.random.default_rng(1).lognormal(mean=0.0, sigma=1.5, size=50000)
+        histogram = LogHistogram(precision=0.01)
+        for value in values:
+            histogram.record(float(value))
+
+        for quantile in (0.5, 0.95, 0.99):
+            expected = np.quantile(values, quantile)
+            self.assertAlmostEqual(histogram.percentile(quantile) / expected, 1.0, delta=0.02)
+        self.assertEqual(histogram.count, len(values))
+        self.assertAlmostEqual(histogram.mean, float(np.mean(values)), places=6)
+        # Memory depends on the value range, not the sample count
+        self.assertLess(len(histogram.buckets), 2000)
+
+    def test_merge_and_small_values(self):
+        first, second = LogHistogram(), LogHistogram()
+        for value in (0.0, 0.0, 1.0):
+            first.record(value)
+        second.record(3.0)
+        first.merge(second)
+
+        self.assertEqual(first.count, 4)
+        self.assertEqual(first.percentile(0.5), 0.0)
+        self.assertEqual(first.percentile(1.0), 3.0)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Per-thread buffering, rollups and OpenMetrics export"""
+
+    def test_concurrent_counters_are_exact(self):
+        registry = MetricsRegistry(flush_size=64)
+
+        def work():
+            for _ in range(5000):
+                registry.increment("jobs")
+                registry.observe("stage_duration", 0.01, "seconds")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        registry.flush()
+
+        self.assertEqual(registry.counters["jobs"], 20000)
+        self.assertEqual(registry.histograms["stage_duration"].count, 20000)
+        # Buffers of finished threads are dropped once drained
+        self.assertEqual(len(registry._buffers), 0)
+
+    def test_rollup_starts_new_interval(self):
+        registry = MetricsRegistry()
+        for value in range(1, 101):
+            registry.observe("render_duration", value / 100)
+
+        summary = registry.rollup()
+        registry.observe("render_duration", 5.0)
+
+        self.assertEqual(summary["render_duration"]["count"], 100)
+        self.assertAlmostEqual(summary["render_duration"]["p50"], 0.5, delta=0.01)
+        self.assertEqual(registry.window(3600)["render_duration"].count, 101)
+        self.assertEqual(registry.histograms["render_duration"].count, 101)
+
+    def test_openmetrics_text(self):
+        registry = MetricsRegistry()
+        registry.increment("video.generations", 3)
+        registry.set_gauge("cpu_usage", 12.5, "percent")
+        registry.observe("tts_duration", 0.2, "seconds")
+
+        text = registry.to_openmetrics(prefix="viral")
+
+        self.assertIn("# TYPE viral_video_generations counter\nviral_video_generations_total 3", text)
+        self.assertIn("viral_cpu_usage 12.5", text)
+        self.assertIn('viral_tts_duration{quantile="0.99"}', text)
+        self.assertIn("viral_tts_duration_count 1", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    @unittest.skipUnless(PROMETHEUS_CLIENT_AVAILABLE, "prometheus_client not installed")
+    def test_openmetrics_text_parses(self):
+        registry = MetricsRegistry()
+        registry.increment("api_calls", 2)
+        registry.set_gauge("system_memory_usage", 41.0, "percent")
+        registry.observe("api_latency", 0.3, "seconds")
+        registry.observe("render_duration", 12.0, "seconds")
+
+        families = {family.name: family for family in
+                    text_string_to_metric_families(registry.to_openmetrics(prefix="ai_video_generator"))}
+
+        self.assertEqual(families["ai_video_generator_api_calls"].type, "counter")
+        self.assertEqual(families["ai_video_generator_system_memory_usage"].type, "gauge")
+        latency = families["ai_video_generator_api_latency"]
+        self.assertEqual(latency.type, "summary")
+        self.assertIn(("ai_video_generator_api_latency_count", 1.0),
+                      [(sample.name, sample.value) for sample in latency.samples])
+
+
+class TestPerformanceMonitor(unittest.TestCase):
+    """Report structure and non-blocking background sampling"""
+
+    def setUp(self):
+        self.monitor = PerformanceMonitor("unit_test")
+        self.addCleanup(self.monitor.stop_monitoring)
+
+    def test_report_and_timers(self):
+        self.monitor.increment_counter("test_counter", 5)
+        self.monitor.set_gauge("test_gauge", 78.9, unit="percent")
+        context = self.monitor.time_operation("test_operation")
+        self.monitor.finish_timing(context)
+
+        report = self.monitor.get_performance_report()
+
+        self.assertEqual(report["counters"]["test_counter"], 5)
+        self.assertEqual(report["gauges"]["test_gauge"], 78.9)
+        self.assertEqual(report["timer_statistics"]["test_operation"]["count"], 1)
+        self.assertIn("p95", report["metrics_summary"]["test_operation_duration"])
+        self.assertIn("unit_test_test_counter_total 5", self.monitor.export_openmetrics())
+
+    def test_stop_is_prompt(self):
+        started = time.monotonic()
+        self.monitor.stop_monitoring()
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertFalse(self.monitor.monitoring_thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for the orchestrator microservice's pipelined stages and metric buffering
+"""
+
+import importlib.util
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+# The services run as standalone scripts, so load the module from its file
+_spec = importlib.util.spec_from_file_location(
+    "orchestrator_server",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'microservices', 'orchestrator', 'server.py')
+)
+orchestrator_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(orchestrator_server)
+
+
+def _response(status_code=200, payload=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    return response
+
+
+class TestMetricsBuffer(unittest.TestCase):
+    """Test buffered metric shipping"""
+
+    def test_flush_sends_one_ndjson_batch(self):
+        session = Mock()
+        session.post.return_value = _response()
+        buffer = orchestrator_server.MetricsBuffer("http://monitoring", session, flush_interval=60)
+        try:
+            for i in range(5):
+                buffer.metric("clips.done", i)
+            buffer.flush()
+        finally:
+            buffer._stop.set()
+
+        self.assertEqual(session.post.call_count, 1)
+        url = session.post.call_args[0][0]
+        self.assertTrue(url.endswith("/metrics/batch"))
+        self.assertEqual(len(session.post.call_args[1]["data"].splitlines()), 5)
+
+    def test_falls_back_to_single_posts_without_batch_endpoint(self):
+        session = Mock()
+        session.post.side_effect = lambda url, **kwargs: _response(404 if url.endswith("/batch") else 200)
+        buffer = orchestrator_server.MetricsBuffer("http://monitoring", session, flush_interval=60)
+        try:
+            buffer.metric("a", 1)
+            buffer.event("workflow.completed", {"workflow_id": "w"})
+            buffer.flush()
+            buffer.metric("b", 2)
+            buffer.flush()
+        finally:
+            buffer._stop.set()
+
+        urls = [call[0][0] for call in session.post.call_args_list]
+        self.assertEqual(urls.count("http://monitoring/metrics/batch"), 1)
+        self.assertEqual(urls.count("http://monitoring/metrics"), 2)
+        self.assertEqual(urls.count("http://monitoring/events"), 1)
+
+    def test_full_buffer_drops_oldest(self):
+        buffer = orchestrator_server.MetricsBuffer("http://monitoring", Mock(), flush_interval=60, max_buffered=3)
+        buffer._stop.set()
+        for i in range(5):
+            buffer.metric("m", i)
+        self.assertEqual(buffer.dropped, 2)
+
+
+class TestPromptPipelining(unittest.TestCase):
+    """Test batched prompt optimization"""
+
+    def setUp(self):
+        self.service = orchestrator_server.OrchestratorService()
+        self.service.metrics = Mock()
+        self.service.prompt_batch_size = 2
+        self.request = orchestrator_server.WorkflowRequest(mission="Ocean facts", duration=30)
+        self.script = {"segments": [{"text": f"part {i}"} for i in range(5)]}
+
+    def test_prompts_are_optimized_in_batches(self):
+        self.service.session = Mock()
+        self.service.session.post.side_effect = lambda url, json, timeout: _response(
+            200, {"results": [{"optimized_prompt": p.upper()} for p in json["prompts"]]}
+        )
+
+        prompts = self.service._optimize_prompts(self.script, self.request)
+
+        self.assertEqual(self.service.session.post.call_count, 3)
+        self.assertEqual(len(prompts), 5)
+        self.assertEqual(prompts[3], "OCEAN FACTS: PART 3 IN CINEMATIC STYLE")
+
+    def test_failed_batch_keeps_original_prompts(self):
+        self.service.session = Mock()
+        self.service.session.post.return_value = _response(500)
+
+        prompts = self.service._optimize_prompts(self.script, self.request)
+
+        self.assertEqual(prompts[0], "Ocean facts: part 0 in cinematic style")
+
+    def test_prompt_batches_do_not_queue_behind_clip_polls(self):
+        self.service.session = Mock()
+        self.service.session.post.return_value = _response(500)
+        # Every clip thread is busy long-polling another workflow's job
+        release = threading.Event()
+        self.service.clip_executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(self.service.clip_executor.shutdown)
+        self.addCleanup(release.set)
+        self.service.clip_executor.submit(release.wait)
+
+        optimized = []
+        worker = threading.Thread(
+            target=lambda: optimized.extend(self.service._optimize_prompts(self.script, self.request))
+        )
+        worker.start()
+        worker.join(timeout=2)
+
+        self.assertEqual(len(optimized), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
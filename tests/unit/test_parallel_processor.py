@@ -0,0 +1,95 @@
+"""
+Unit tests for concurrent AI discussions in ParallelProcessor
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.parallel_processor import ParallelProcessor
+
+
+def _task(task_id, runner):
+    return {
+        'task_id': task_id,
+        'topic': SimpleNamespace(title=task_id.replace('_', ' ').title()),
+        'participants': [],
+        'runner': runner
+    }
+
+
+def _sleeping(seconds, result=None):
+    def run(topic, participants):
+        time.sleep(seconds)
+        return result or topic.title
+    return run
+
+
+class TestParallelDiscussions(unittest.TestCase):
+    """Test concurrency, timeouts, partial results and metrics"""
+
+    def setUp(self):
+        self.processor = ParallelProcessor(max_workers=3)
+
+    def test_discussions_run_concurrently(self):
+        tasks = [_task(f"d{i}", _sleeping(0.2)) for i in range(3)]
+
+        results = self.processor.run_discussions(tasks)
+        metrics = self.processor.last_discussion_metrics
+
+        self.assertEqual(set(results), {'d0', 'd1', 'd2'})
+        self.assertLess(metrics['wall_clock_seconds'], 0.5)
+        self.assertGreaterEqual(metrics['sequential_seconds'], 0.6)
+        self.assertGreater(metrics['speedup'], 1.5)
+
+    def test_timeout_and_failure_return_partial_results(self):
+        def failing(topic, participants):
+            raise RuntimeError("model unavailable")
+
+        tasks = [_task('fast', _sleeping(0.05)), _task('slow', _sleeping(1.0)), _task('broken', failing)]
+
+        start = time.time()
+        results = self.processor.run_discussions(tasks, timeout=0.2)
+
+        self.assertLess(time.time() - start, 0.8)
+        self.assertEqual(list(results), ['fast'])
+        per_discussion = self.processor.last_discussion_metrics['per_discussion']
+        self.assertEqual(per_discussion['slow']['status'], 'timed_out')
+        self.assertEqual(per_discussion['broken']['status'], 'failed')
+
+    def test_async_wrapper_does_not_block_event_loop(self):
+        async def scenario():
+            ticks = []
+
+            async def ticker():
+                for _ in range(5):
+                    ticks.append(time.time())
+                    await asyncio.sleep(0.02)
+
+            tasks = [_task(f"d{i}", _sleeping(0.2)) for i in range(2)]
+            results, _ = await asyncio.gather(self.processor.run_parallel_ai_discussions(tasks), ticker())
+            return results, ticks
+
+        results, ticks = asyncio.run(scenario())
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[-1] - ticks[0], 0.2)
+
+    def test_discussion_system_start_discussion_used_by_default(self):
+        system = SimpleNamespace(start_discussion=lambda topic, participants: f"result:{topic.title}")
+        task = _task('script_strategy', None)
+        task['discussion_system'] = system
+
+        results = self.processor.run_discussions([task])
+
+        self.assertEqual(results, {'script_strategy': 'result:Script Strategy'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Unit tests for per-session WebSocket progress fan-out
+"""
+
+import asyncio
+import json
+import unittest
+
+from src.api.progress_fanout import ALL_SESSIONS, ConnectionManager, progress_delta
+
+
+class FakeWebSocket:
+    """Records sent frames; a blocked socket holds every send until released"""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(json.loads(text))
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestProgressFanout(unittest.IsolatedAsyncioTestCase):
+    """Test subscriptions, delta encoding and slow-client queues"""
+
+    async def asyncSetUp(self):
+        self.manager = ConnectionManager(max_queue=3)
+
+    async def asyncTearDown(self):
+        for websocket in self.manager.active_connections:
+            self.manager.disconnect(websocket)
+
+    async def test_progress_only_reaches_subscribers(self):
+        watcher, other, dashboard = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for websocket in (watcher, other, dashboard):
+            await self.manager.connect(websocket)
+        self.manager.subscribe(watcher, "s1")
+        self.manager.subscribe(other, "s2")
+        self.manager.subscribe(dashboard, ALL_SESSIONS)
+
+        self.assertEqual(self.manager.publish_progress("s1", {"progress": 5, "status": "processing"}), 2)
+        await _settle()
+
+        self.assertEqual([m["session_id"] for m in watcher.sent], ["s1"])
+        self.assertEqual(other.sent, [])
+        self.assertEqual(len(dashboard.sent), 1)
+
+    async def test_updates_are_delta_encoded(self):
+        websocket = FakeWebSocket()
+        await self.manager.connect(websocket)
+        self.manager.subscribe(websocket, "s1")
+
+        state = {"progress": 5, "currentPhase": "Initialization", "agents": []}
+        self.manager.publish_progress("s1", state)
+        await _settle()
+        state["progress"] = 25
+        self.manager.publish_progress("s1", state)
+        await _settle()
+        # An output line that changes nothing sends nothing
+        self.assertEqual(self.manager.publish_progress("s1", state), 0)
+        await _settle()
+
+        self.assertEqual(len(websocket.sent), 2)
+        self.assertEqual(websocket.sent[1]["data"], {"progress": 25})
+        self.assertTrue(websocket.sent[1]["delta"])
+        self.assertEqual(websocket.sent[1]["seq"], 2)
+
+    async def test_late_subscriber_gets_full_snapshot(self):
+        self.manager.publish_progress("s1", {"progress": 40, "currentPhase": "Script Generation"})
+        websocket = FakeWebSocket()
+        await self.manager.connect(websocket)
+        self.manager.subscribe(websocket, "s1")
+        await _settle()
+
+        self.assertFalse(websocket.sent[0]["delta"])
+        self.assertEqual(websocket.sent[0]["data"]["currentPhase"], "Script Generation")
+
+    async def test_finished_session_state_is_released(self):
+        # Nobody watching: released as soon as the job finishes
+        self.manager.publish_progress("s1", {"progress": 100, "status": "completed"})
+        self.manager.finish_session("s1")
+        self.assertEqual(self.manager.stats()["sessions"], 0)
+
+        # Watched: kept for late subscribers until the last subscriber leaves
+        watcher, dashboard = FakeWebSocket(), FakeWebSocket()
+        await self.manager.connect(watcher)
+        await self.manager.connect(dashboard)
+        self.manager.subscribe(watcher, "s2")
+        self.manager.subscribe(dashboard, ALL_SESSIONS)
+        self.manager.publish_progress("s2", {"progress": 60, "status": "failed"})
+        self.manager.finish_session("s2")
+        self.assertEqual(self.manager.stats()["sessions"], 1)
+
+        late = FakeWebSocket()
+        await self.manager.connect(late)
+        self.manager.subscribe(late, "s2")
+        await _settle()
+        self.assertEqual(late.sent[0]["data"]["status"], "failed")
+
+        self.manager.unsubscribe(late, "s2")
+        self.assertEqual(self.manager.stats()["sessions"], 1)
+        self.manager.disconnect(watcher)
+        self.assertEqual(self.manager.stats()["sessions"], 0)
+
+    async def test_slow_client_gets_coalesced_updates(self):
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        for websocket in (slow, fast):
+            await self.manager.connect(websocket)
+            self.manager.subscribe(websocket, "s1")
+
+        state = {"progress": 0, "currentPhase": "Initialization"}
+        for progress in range(0, 100, 10):
+            state = dict(state, progress=progress)
+            if progress == 60:
+                state["currentPhase"] = "Video Generation"
+            self.manager.publish_progress("s1", state)
+            await _settle()
+
+        # The fast client saw every update while the slow one was stuck
+        self.assertEqual(len(fast.sent), 10)
+        slow.release.set()
+        await _settle()
+
+        # First frame was in flight when the socket blocked; the rest folded into one
+        self.assertLessEqual(len(slow.sent), 2)
+        merged = {}
+        for message in slow.sent:
+            merged.update(message["data"])
+        self.assertEqual(merged, {"progress": 90, "currentPhase": "Video Generation"})
+
+    async def test_full_queue_drops_oldest_and_resyncs(self):
+        websocket = FakeWebSocket(blocked=True)
+        channel = await self.manager.connect(websocket)
+        self.manager.subscribe(websocket, "s1")
+        await _settle()
+
+        self.manager.publish_progress("s1", {"progress": 10, "status": "processing"})
+        for i in range(3):
+            await self.manager.broadcast(json.dumps({"event": "notice", "i": i}))
+        self.manager.publish("s1", "generation_complete", {"finalVideo": None})
+        self.assertEqual(channel.dropped, 2)
+
+        # The dropped progress delta is replaced by the full state
+        self.manager.publish_progress("s1", {"progress": 100, "status": "completed"})
+        websocket.release.set()
+        await _settle()
+
+        events = [m["event"] for m in websocket.sent]
+        self.assertIn("generation_complete", events)
+        progress = [m for m in websocket.sent if m["event"] == "progress_update"]
+        self.assertFalse(progress[-1]["delta"])
+        self.assertEqual(progress[-1]["data"], {"progress": 100, "status": "completed"})
+
+    async def test_failed_socket_is_disconnected(self):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_text(self, text):
+                raise ConnectionResetError("gone")
+
+        websocket = BrokenWebSocket()
+        await self.manager.connect(websocket)
+        self.manager.subscribe(websocket, "s1")
+        self.manager.publish_progress("s1", {"progress": 5})
+        await _settle()
+
+        self.assertEqual(self.manager.active_connections, [])
+
+    def test_progress_delta(self):
+        self.assertEqual(
+            progress_delta({"progress": 5, "agents": ["a"]}, {"progress": 5, "agents": ["a", "b"], "message": "x"}),
+            {"agents": ["a", "b"], "message": "x"}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
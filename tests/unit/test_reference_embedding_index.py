@@ -0,0 +1,163 @@
+"""
+Unit tests for the persisted reference embedding index
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.generators.reference_embedding_index import (
+    ReferenceEmbeddingIndex, compute_color_signature, compute_image_embedding, palette_coverage,
+    EMBEDDING_DIM, SIGNATURE_DIM
+)
+
+
+class TestComputeImageEmbedding(unittest.TestCase):
+    """Test perceptual embeddings"""
+
+    def test_similar_images_score_higher_than_different(self):
+        rng = np.random.default_rng(0)
+        base = np.zeros((120, 90, 3), dtype=np.uint8)
+        base[20:100, 30:60] = (30, 160, 220)
+        noisy = np.clip(base.astype(int) + rng.integers(-8, 8, base.shape), 0, 255).astype(np.uint8)
+        different = np.full((120, 90, 3), (200, 40, 40), dtype=np.uint8)
+        different[::10] = 255
+
+        emb_base = compute_image_embedding(base)
+        self.assertEqual(emb_base.shape, (EMBEDDING_DIM,))
+        self.assertAlmostEqual(float(np.linalg.norm(emb_base)), 1.0, places=5)
+        self.assertGreater(emb_base @ compute_image_embedding(noisy),
+                           emb_base @ compute_image_embedding(different))
+
+    def test_unreadable_image_returns_zeros(self):
+        embedding = compute_image_embedding("/nonexistent/image.png")
+        self.assertFalse(embedding.any())
+
+
+class TestReferenceEmbeddingIndex(unittest.TestCase):
+    """Test persistence, incremental updates and top-k search"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.dim = 4
+
+    def _index(self):
+        return ReferenceEmbeddingIndex(self.temp_dir.name, dim=self.dim)
+
+    def test_add_persist_and_reload(self):
+        index = self._index()
+        index.add_many(["a", "b"], np.eye(self.dim)[:2])
+        index.add("c", np.array([0, 0, 3, 0]))
+
+        reloaded = self._index()
+        self.assertEqual(reloaded.ids, ["a", "b", "c"])
+        np.testing.assert_allclose(reloaded.get("c"), [0, 0, 1, 0])
+
+    def test_replace_and_remove(self):
+        index = self._index()
+        index.add_many(["a", "b", "c"], np.eye(self.dim)[:3])
+        index.add("a", np.array([0, 0, 0, 1]))
+        self.assertTrue(index.remove("b"))
+        self.assertFalse(index.remove("b"))
+
+        reloaded = self._index()
+        self.assertEqual(sorted(reloaded.ids), ["a", "c"])
+        np.testing.assert_allclose(reloaded.get("a"), [0, 0, 0, 1])
+        np.testing.assert_allclose(reloaded.get("c"), [0, 0, 1, 0])
+        self.assertEqual(os.path.getsize(reloaded.matrix_path), 2 * self.dim * 4)
+
+    def test_batched_top_k(self):
+        index = self._index()
+        index.add_many(["x", "y", "z"], np.eye(self.dim)[:3])
+
+        results = index.top_k(np.array([[1, 0.5, 0, 0], [0, 0, 1, 0]]), k=2)
+        self.assertEqual([ref_id for ref_id, _ in results[0]], ["x", "y"])
+        self.assertEqual(results[1][0][0], "z")
+
+        restricted = index.top_k(np.array([1, 0, 0, 0]), k=5, candidate_ids=["y", "z"])
+        self.assertEqual(len(restricted[0]), 2)
+
+    def test_unlisted_rows_dropped_on_load(self):
+        index = self._index()
+        index.add("a", np.array([1, 0, 0, 0]))
+        with open(index.matrix_path, "ab") as f:
+            f.write(np.ones(self.dim, dtype=np.float32).tobytes())
+
+        reloaded = self._index()
+        reloaded.add("b", np.array([0, 1, 0, 0]))
+        np.testing.assert_allclose(reloaded.get("b"), [0, 1, 0, 0])
+
+
+class TestCharacterConsistency(unittest.TestCase):
+    """Test rank-based consistency checks on rendered characters"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.rng = np.random.default_rng(1)
+
+    def _character(self, body, head, x, y, scale, background):
+        img = np.full((256, 256, 3), background, dtype=np.uint8)
+        img = np.clip(img.astype(int) + self.rng.integers(-10, 10, img.shape), 0, 255).astype(np.uint8)
+        cv2.rectangle(img, (x - int(25 * scale), y), (x + int(25 * scale), y + int(90 * scale)), body, -1)
+        cv2.circle(img, (x, y - int(20 * scale)), int(22 * scale), head, -1)
+        return img
+
+    def test_same_character_passes_and_different_character_fails(self):
+        hero = ((40, 60, 200), (150, 190, 230))
+        villain = ((200, 160, 30), (60, 80, 120))
+        index = ReferenceEmbeddingIndex(self.temp_dir.name)
+        index.add_many(["hero", "villain"], np.stack([
+            compute_image_embedding(self._character(*hero, 128, 100, 1.0, (90, 110, 70))),
+            compute_image_embedding(self._character(*villain, 128, 100, 1.0, (90, 110, 70)))
+        ]))
+
+        hero_render = compute_image_embedding(self._character(*hero, 110, 95, 1.1, (80, 120, 60)))
+        villain_render = compute_image_embedding(self._character(*villain, 110, 95, 1.1, (80, 120, 60)))
+
+        self.assertEqual(index.mismatched(hero_render, ["hero"], ["villain"], floor=0.15), {})
+        self.assertIn("hero", index.mismatched(villain_render, ["hero"], ["villain"], floor=0.15))
+        # Without rivals the floor still rejects an unreadable render
+        self.assertIn("hero", index.mismatched(np.zeros(EMBEDDING_DIM), ["hero"], floor=0.15))
+
+    def _scene(self):
+        # Sky gradient, grass and a few buildings, like a generated frame
+        img = np.zeros((256, 256, 3), dtype=np.uint8)
+        img[:150] = np.linspace((235, 190, 140), (200, 150, 90), 150)[:, np.newaxis]
+        img[150:] = (60, 140, 70)
+        for left, width, height, shade in [(10, 40, 90, 120), (170, 60, 110, 150), (235, 21, 70, 100)]:
+            img[150 - height:150, left:left + width] = shade
+        return np.clip(img.astype(int) + self.rng.integers(-10, 10, img.shape), 0, 255).astype(np.uint8)
+
+    def _render(self, body, head, x, y, scale):
+        img = self._scene()
+        cv2.rectangle(img, (x - int(25 * scale), y), (x + int(25 * scale), y + int(90 * scale)), body, -1)
+        cv2.circle(img, (x, y - int(20 * scale)), int(22 * scale), head, -1)
+        return img
+
+    def test_palette_coverage_rejects_other_character_without_rivals(self):
+        hero = ((40, 60, 200), (150, 190, 230))
+        # Shares the hero's skin tone but wears different clothes
+        stranger = ((180, 60, 60), (150, 190, 230))
+        villain = ((200, 160, 30), (60, 80, 120))
+        index = ReferenceEmbeddingIndex(self.temp_dir.name, dim=SIGNATURE_DIM)
+        # Reference portrait on a clean background
+        index.add("hero", compute_color_signature(self._character(*hero, 128, 100, 1.0, (245, 245, 245))))
+        signature = index.get("hero")
+
+        for x, y, scale in [(128, 120, 0.6), (60, 90, 1.2), (190, 130, 0.8)]:
+            self.assertGreaterEqual(palette_coverage(signature, self._render(*hero, x, y, scale)), 0.75)
+            self.assertLess(palette_coverage(signature, self._render(*stranger, x, y, scale)), 0.75)
+            self.assertLess(palette_coverage(signature, self._render(*villain, x, y, scale)), 0.75)
+        self.assertEqual(palette_coverage(signature, np.zeros((0, 0, 3), dtype=np.uint8)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for the per-platform rendition ladder
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from src.config.video_config import RenditionSpec
+from src.utils.artifact_store import MANIFEST_FILENAME, ArtifactStore
+from src.utils.rendition_ladder import (
+    build_ladder_command, find_rendition, render_ladder, video_bitrate_for
+)
+
+
+class TestLadderCommand(unittest.TestCase):
+    """Test the single multi-output ffmpeg command"""
+
+    def setUp(self):
+        self.outputs = [
+            ("tiktok", RenditionSpec(1080, 1920, 'crop', video_bitrate_k=6000), "t.mp4"),
+            ("instagram", RenditionSpec(1080, 1920, 'crop', video_bitrate_k=5000), "i.mp4"),
+            ("youtube", RenditionSpec(1920, 1080, 'pad', video_bitrate_k=8000), "y.mp4"),
+            ("whatsapp", RenditionSpec(848, 848, 'fit', video_bitrate_k=1500, fps=30), "w.mp4"),
+        ]
+
+    def test_one_decode_shared_geometry(self):
+        cmd = build_ladder_command("master.mp4", self.outputs, duration=30)
+
+        self.assertEqual(cmd.count('-i'), 1)
+        graph = cmd[cmd.index('-filter_complex') + 1]
+        # Three distinct geometries; tiktok and instagram share one crop
+        self.assertTrue(graph.startswith("[0:v]split=3[g0][g1][g2]"))
+        self.assertEqual(graph.count("crop=1080:1920"), 1)
+        self.assertIn("split=2[v0][v1]", graph)
+        for index, (_, _, path) in enumerate(self.outputs):
+            self.assertIn(f'[v{index}]', cmd)
+            self.assertIn(path, cmd)
+        self.assertEqual(cmd.count('0:a:0'), 4)
+        self.assertEqual(cmd[cmd.index('-fpsmax') + 1], '30')
+
+    def test_no_audio_maps_video_only(self):
+        cmd = build_ladder_command("master.mp4", self.outputs[:1], duration=30, has_audio=False)
+        self.assertNotIn('0:a:0', cmd)
+
+    def test_size_limit_caps_bitrate(self):
+        spec = RenditionSpec(848, 848, 'fit', video_bitrate_k=1500, max_size_mb=16)
+        self.assertEqual(video_bitrate_for(spec, 20), 1500)
+        long_video = video_bitrate_for(spec, 180)
+        self.assertLess(long_video, 700)
+        # Video plus audio stays inside the limit
+        self.assertLess((long_video + 128) * 1000 / 8 * 180, 16 * 1024 * 1024)
+
+
+class TestRenditionManifest(unittest.TestCase):
+    """Test registering renditions for publishers"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.session_dir = os.path.join(self.temp_dir, "session_1")
+        self.final_dir = os.path.join(self.session_dir, "final_output")
+        os.makedirs(os.path.join(self.final_dir, "renditions"))
+        self.master = os.path.join(self.final_dir, "final_video_session_1__final.mp4")
+        self.audio_only = os.path.join(self.final_dir, "final_video_session_1__audio_only.mp4")
+        self.rendition = os.path.join(self.final_dir, "renditions", "final_video_session_1__final_telegram.mp4")
+        for path in (self.master, self.audio_only, self.rendition):
+            with open(path, "wb") as f:
+                f.write(os.urandom(64))
+        self.manifest_path = os.path.join(self.session_dir, "metadata", MANIFEST_FILENAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_registered_rendition_is_found_from_master(self):
+        store = ArtifactStore(os.path.join(self.temp_dir, ".artifacts"))
+        store.place(self.master, self.master, manifest_path=self.manifest_path)
+        store.record_rendition(self.manifest_path, "telegram", self.rendition, self.master,
+                               {"width": 720, "max_size_mb": 50})
+
+        manifest = store.load_manifest(self.manifest_path)
+        self.assertEqual(manifest["renditions"]["telegram"]["path"],
+                         os.path.join("final_output", "renditions", os.path.basename(self.rendition)))
+        self.assertEqual(manifest["renditions"]["telegram"]["master"],
+                         os.path.join("final_output", os.path.basename(self.master)))
+        self.assertIn(os.path.join("final_output", os.path.basename(self.master)), manifest["artifacts"])
+
+        self.assertEqual(find_rendition(self.master, "telegram"), self.rendition)
+        self.assertEqual(find_rendition(self.rendition, "Telegram"), self.rendition)
+        self.assertIsNone(find_rendition(self.master, "whatsapp"))
+        # Other videos in final_output are not the rendition's master
+        self.assertIsNone(find_rendition(self.audio_only, "telegram"))
+
+
+@unittest.skipUnless(shutil.which("ffmpeg") and shutil.which("ffprobe"), "ffmpeg not available")
+class TestRenderLadder(unittest.TestCase):
+    """Test an actual single-pass ladder encode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.master = os.path.join(self.temp_dir, "master.mp4")
+        subprocess.run([
+            'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=size=360x640:rate=24:duration=1',
+            '-f', 'lavfi', '-i', 'sine=frequency=440:duration=1',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-shortest', self.master
+        ], capture_output=True, check=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_renders_each_platform(self):
+        renditions = render_ladder(self.master, os.path.join(self.temp_dir, "renditions"),
+                                   ["tiktok", "youtube", "telegram", "myspace"], duration=1, has_audio=True)
+
+        self.assertEqual(set(renditions), {"tiktok", "youtube", "telegram"})
+        # 'fit' keeps the master's 360x640 frame rather than the 1280x1280 box
+        self.assertEqual((renditions["telegram"].width, renditions["telegram"].height), (360, 640))
+        self.assertEqual((renditions["tiktok"].width, renditions["tiktok"].height), (1080, 1920))
+        for rendition in renditions.values():
+            self.assertTrue(os.path.getsize(rendition.path) > 0)
+            self.assertTrue(rendition.within_limit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for the checkpointed scene render farm
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.generators.scene_render_farm import (
+    SceneRenderFarm, SceneRenderFarmConfig, SceneJob, scene_fingerprint
+)
+from src.utils.exceptions import QuotaExceededError
+
+
+class TestSceneRenderFarm(unittest.TestCase):
+    """Test parallelism, dependencies, manifest reuse and pausing"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.work_dir = self.temp_dir.name
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _renderer(self, scene_id, delay=0.0, fail_with=None):
+        def render(dep_clips):
+            with self.lock:
+                self.calls.append((scene_id, dict(dep_clips), time.time()))
+            time.sleep(delay)
+            if fail_with:
+                raise fail_with
+            path = os.path.join(self.work_dir, f"scene_{scene_id}.mp4")
+            with open(path, "wb") as f:
+                f.write(b"clip")
+            return path
+        return render
+
+    def _jobs(self, count, delay=0.0, chained=(), failing=None):
+        failing = failing or {}
+        return [
+            SceneJob(
+                scene_id=i,
+                fingerprint=scene_fingerprint("prompt", i),
+                render=self._renderer(i, delay, failing.get(i)),
+                depends_on=[i - 1] if i in chained else []
+            )
+            for i in range(count)
+        ]
+
+    def test_independent_scenes_render_in_parallel(self):
+        farm = SceneRenderFarm(self.work_dir, SceneRenderFarmConfig(max_workers=4))
+
+        start = time.time()
+        result = farm.render(self._jobs(4, delay=0.2))
+
+        self.assertTrue(result.complete)
+        self.assertEqual(sorted(result.clips), [0, 1, 2, 3])
+        self.assertLess(time.time() - start, 0.6)
+
+    def test_chained_scene_waits_for_previous_clip(self):
+        farm = SceneRenderFarm(self.work_dir, SceneRenderFarmConfig(max_workers=4))
+
+        result = farm.render(self._jobs(3, delay=0.05, chained=(2,)))
+
+        calls = {scene_id: (deps, started) for scene_id, deps, started in self.calls}
+        self.assertEqual(calls[2][0], {1: result.clips[1]})
+        self.assertGreaterEqual(calls[2][1], calls[1][1] + 0.05)
+
+    def test_rerun_skips_completed_scenes_and_retries_failed(self):
+        config = SceneRenderFarmConfig(max_workers=2, max_attempts=1, max_consecutive_failures=10)
+        first = SceneRenderFarm(self.work_dir, config).render(
+            self._jobs(3, failing={1: RuntimeError("boom")}))
+        self.assertEqual(list(first.failed), [1])
+
+        self.calls.clear()
+        second = SceneRenderFarm(self.work_dir, config).render(self._jobs(3))
+
+        self.assertTrue(second.complete)
+        self.assertEqual(sorted(second.skipped), [0, 2])
+        self.assertEqual([c[0] for c in self.calls], [1])
+
+    def test_changed_fingerprint_rerenders_scene(self):
+        SceneRenderFarm(self.work_dir).render(self._jobs(2))
+        self.calls.clear()
+
+        jobs = self._jobs(2)
+        jobs[0].fingerprint = scene_fingerprint("new prompt", 0)
+        SceneRenderFarm(self.work_dir).render(jobs)
+
+        self.assertEqual([c[0] for c in self.calls], [0])
+
+    def test_rerendered_scene_invalidates_chained_successor(self):
+        SceneRenderFarm(self.work_dir).render(self._jobs(3, chained=(1,)))
+        self.calls.clear()
+
+        jobs = self._jobs(3, chained=(1,))
+        jobs[0].fingerprint = scene_fingerprint("new prompt", 0)
+        result = SceneRenderFarm(self.work_dir).render(jobs)
+
+        self.assertEqual(sorted(c[0] for c in self.calls), [0, 1])
+        self.assertEqual(result.skipped, [2])
+
+    def test_quota_exhaustion_pauses_and_resumes(self):
+        config = SceneRenderFarmConfig(max_workers=1)
+        paused = SceneRenderFarm(self.work_dir, config).render(
+            self._jobs(4, failing={1: QuotaExceededError("veo3")}))
+
+        self.assertTrue(paused.paused)
+        self.assertEqual(list(paused.clips), [0])
+        self.assertEqual(paused.failed, {})
+
+        self.calls.clear()
+        resumed = SceneRenderFarm(self.work_dir, config).render(self._jobs(4))
+
+        self.assertTrue(resumed.complete)
+        self.assertEqual([c[0] for c in self.calls], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
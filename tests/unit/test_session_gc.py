@@ -0,0 +1,152 @@
+"""
+Unit tests for the session retention policy and usage index
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.session_gc import (
+    ArtifactClass, RetentionPolicy, SessionGarbageCollector, protect_session, release_session
+)
+
+
+class TestSessionGarbageCollector(unittest.TestCase):
+    """Test retention by artifact type, quotas, dry runs and incremental indexing"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = self.temp_dir.name
+        self.policy = RetentionPolicy(min_free_bytes=0)
+        self.gc = SessionGarbageCollector(self.root, self.policy)
+
+    def _write(self, session_id, subdir, name, size=1000, age_hours=0.0):
+        path = os.path.join(self.root, session_id, subdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        stamp = time.time() - age_hours * 3600
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def _old_session(self, session_id, age_hours=48):
+        self._write(session_id, "final_output", "final.mp4", age_hours=age_hours)
+        self._write(session_id, "metadata", "artifact_manifest.json", 100, age_hours=age_hours)
+        self._write(session_id, "video_clips", "clip_1.mp4", age_hours=age_hours)
+        self._write(session_id, "temp_files", "frame.png", age_hours=age_hours)
+        self._write(session_id, "logs", "run.log", age_hours=age_hours)
+
+    def test_expires_intermediates_and_keeps_finals(self):
+        self._old_session("session_old")
+        self.gc.refresh()
+
+        report = self.gc.collect()
+
+        removed = {action.subdir for action in report.actions}
+        self.assertEqual(removed, {"video_clips", "temp_files"})
+        session_dir = os.path.join(self.root, "session_old")
+        self.assertTrue(os.path.exists(os.path.join(session_dir, "final_output", "final.mp4")))
+        self.assertTrue(os.path.exists(os.path.join(session_dir, "metadata", "artifact_manifest.json")))
+        self.assertTrue(os.path.exists(os.path.join(session_dir, "logs", "run.log")))
+        self.assertFalse(os.path.exists(os.path.join(session_dir, "video_clips")))
+        self.assertEqual(report.freed_bytes, 2000)
+
+    def test_dry_run_deletes_nothing(self):
+        self._old_session("session_old")
+        self.gc.refresh()
+
+        report = self.gc.collect(dry_run=True)
+
+        self.assertEqual(report.planned_bytes, 2000)
+        self.assertEqual(report.freed_bytes, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.root, "session_old", "video_clips", "clip_1.mp4")))
+
+    def test_active_and_protected_sessions_are_skipped(self):
+        self._old_session("session_busy")
+        # A fresh write anywhere in the session marks it as rendering
+        self._write("session_busy", "audio", "segment.mp3")
+        self._old_session("session_protected")
+        self.gc.refresh()
+
+        protected_dir = os.path.join(self.root, "session_protected")
+        protect_session(protected_dir)
+        self.addCleanup(release_session, protected_dir)
+        self.assertEqual(self.gc.collect().actions, [])
+
+    def test_session_protected_by_another_process_is_skipped(self):
+        self._old_session("session_remote")
+        self.gc.refresh()
+        session_dir = os.path.join(self.root, "session_remote")
+        # Generation runs in its own process and protects the session there
+        generator = subprocess.Popen(
+            [sys.executable, "-c",
+             "import sys; from src.utils.session_gc import protect_session; "
+             "protect_session(sys.argv[1]); print('ready', flush=True); sys.stdin.read()",
+             session_dir],
+            cwd=os.path.join(os.path.dirname(__file__), '..', '..'),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        self.addCleanup(generator.stdin.close)
+        self.addCleanup(generator.stdout.close)
+        self.addCleanup(generator.wait)
+        self.addCleanup(generator.kill)
+        self.assertEqual(generator.stdout.readline().strip(), "ready")
+
+        self.assertEqual(self.gc.collect().actions, [])
+        self.assertTrue(os.path.exists(os.path.join(session_dir, "video_clips", "clip_1.mp4")))
+
+        # A crashed generator's marker no longer protects the session
+        generator.kill()
+        generator.wait()
+        removed = {action.subdir for action in self.gc.collect().actions}
+        self.assertEqual(removed, {"video_clips", "temp_files"})
+
+    def test_quota_removes_oldest_unexpired_first(self):
+        self.policy.max_age_hours[ArtifactClass.INTERMEDIATE] = 1000
+        self.policy.max_age_hours[ArtifactClass.TEMP] = 1000
+        self._write("session_a", "video_clips", "clip.mp4", 5000, age_hours=10)
+        self._write("session_b", "video_clips", "clip.mp4", 5000, age_hours=5)
+        self._write("session_b", "final_output", "final.mp4", 5000, age_hours=5)
+        self.policy.quota_bytes = 12000
+        self.gc.refresh()
+
+        report = self.gc.collect()
+
+        self.assertEqual([(a.session_id, a.reason) for a in report.actions], [("session_a", "pressure")])
+        self.assertEqual(self.gc.usage()["total_bytes"], 10000)
+
+    def test_index_rescans_only_changed_subdirectories(self):
+        self._old_session("session_old")
+        self.gc.refresh()
+        logs = self.gc.index.sessions["session_old"]["subdirs"]["logs"]
+
+        self._write("session_old", "audio", "new.mp3", 500)
+        entry = self.gc.index.refresh_session("session_old")
+
+        self.assertIs(entry["subdirs"]["logs"], logs)
+        self.assertEqual(entry["subdirs"]["audio"]["bytes"], 500)
+        self.assertEqual(entry["files"], 6)
+
+        # The index survives restarts
+        self.gc.index.save()
+        reloaded = SessionGarbageCollector(self.root, self.policy)
+        self.assertEqual(reloaded.index.sessions["session_old"]["files"], 6)
+
+    def test_usage_by_class(self):
+        self._old_session("session_old")
+        self.gc.refresh()
+        usage = self.gc.usage()
+        self.assertEqual(usage["sessions"], 1)
+        self.assertEqual(usage["by_class"]["final"], 1000)
+        self.assertEqual(usage["by_class"]["intermediate"], 1000)
+        self.assertEqual(usage["by_class"]["metadata"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit tests for the learned speech rate model
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.config.tts_config import tts_config
+from src.models.video_models import Language
+from src.utils.speech_rate_model import SpeechRateModel
+
+
+SENTENCES = [
+    "The ocean covers most of our planet.",
+    "Scientists still know very little about the deep sea.",
+    "Strange creatures glow in total darkness, far below the waves.",
+    "Pressure there would crush a car.",
+    "Yet life thrives, and it keeps surprising us.",
+    "New species are found every single year."
+]
+
+
+class TestSpeechRateModel(unittest.TestCase):
+    """Test defaults, calibration, persistence and trimming"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store_path = os.path.join(self.temp_dir.name, "samples.jsonl")
+
+    def _calibrate(self, model, voice, words_per_second, speaking_rate=1.0):
+        for sentence in SENTENCES * 3:
+            duration = len(sentence.split()) / words_per_second / speaking_rate
+            model.record(sentence, duration, voice, Language.ENGLISH_US, speaking_rate)
+
+    def test_uncalibrated_model_uses_config_rate(self):
+        model = SpeechRateModel(store_path=None)
+        text = "one two three four five six seven eight nine ten eleven twelve thirteen fourteen"
+        self.assertAlmostEqual(model.predict_duration(text), 14 / tts_config.WORDS_PER_SECOND, places=2)
+        self.assertEqual(model.word_budget(10), int(10 * tts_config.WORDS_PER_SECOND))
+
+    def test_learns_per_voice_rate(self):
+        model = SpeechRateModel(store_path=None)
+        self._calibrate(model, "en-US-Journey-D", 2.0)
+        self._calibrate(model, "en-US-Neural2-F", 3.4, speaking_rate=1.1)
+
+        text = "A calm narrator reads this sentence slowly, with care."
+        slow = model.predict_duration(text, "en-US-Journey-D", Language.ENGLISH_US)
+        fast = model.predict_duration(text, "en-US-Neural2-F", Language.ENGLISH_US)
+
+        self.assertAlmostEqual(slow, 9 / 2.0, delta=0.6)
+        self.assertAlmostEqual(fast, 9 / 3.4, delta=0.6)
+        self.assertAlmostEqual(model.words_per_second("en-US-Journey-D", "en-US"), 2.0, delta=0.25)
+        # Unknown voices use the language-wide fit, somewhere between the two
+        pooled = model.words_per_second("en-US-Studio-O", Language.ENGLISH_US)
+        self.assertTrue(2.0 < pooled < 3.4)
+
+    def test_samples_persist(self):
+        self._calibrate(SpeechRateModel(store_path=self.store_path), "voice", 2.0)
+
+        reloaded = SpeechRateModel(store_path=self.store_path)
+        self.assertEqual(reloaded.sample_count("voice", Language.ENGLISH_US), len(SENTENCES) * 3)
+        self.assertAlmostEqual(reloaded.words_per_second("voice", Language.ENGLISH_US), 2.0, delta=0.25)
+
+    def test_trim_keeps_whole_sentences(self):
+        model = SpeechRateModel(store_path=None)
+        text = " ".join(SENTENCES)
+
+        trimmed = model.trim_to_duration(text, 6.0)
+
+        self.assertTrue(text.startswith(trimmed))
+        self.assertTrue(trimmed.endswith("."))
+        self.assertLessEqual(model.predict_duration(trimmed), 6.0)
+        self.assertEqual(model.trim_to_duration(SENTENCES[0], 60.0), SENTENCES[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
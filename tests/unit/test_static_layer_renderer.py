@@ -0,0 +1,97 @@
+"""
+Unit tests for the cheap mode static-layer renderer
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.generators.static_layer_renderer import StaticLayerRenderer
+
+
+class TestStaticLayerRenderer(unittest.TestCase):
+    """Test layer flattening, sprite timing and the single-pass FFmpeg command"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.renderer = StaticLayerRenderer(360, 640, self.temp_dir.name, fps=30, background=(10, 20, 40))
+
+    def test_static_layers_flatten_into_one_image(self):
+        self.renderer.add_rect((0, 0, 360, 40), (200, 0, 0))
+        self.renderer.add_rect((0, 600, 360, 40), (0, 0, 0), opacity=0.5)
+        self.renderer.add_text("BREAKING", (10, 5), "Arial-Bold", 24, "white", bg_color="red")
+
+        with Image.open(self.renderer.flatten()) as image:
+            self.assertEqual(image.size, (360, 640))
+            self.assertEqual(image.getpixel((350, 35)), (200, 0, 0))
+            self.assertEqual(image.getpixel((180, 300)), (10, 20, 40))
+            # Half-transparent black over the background
+            self.assertEqual(image.getpixel((350, 620)), (5, 10, 20))
+        self.assertEqual(self.renderer.sprites, [])
+
+    def test_timed_text_becomes_cropped_sprite(self):
+        sprite = self.renderer.add_timed_text(
+            "A fairly long subtitle line that has to wrap", 1.0, 2.5, ('center', 500),
+            "Arial-Bold", 28, "white", stroke_color="black", stroke_width=2, max_width=200
+        )
+        self.assertIsNone(self.renderer.add_timed_text("skipped", 3.0, 3.0, ('center', 500), "Arial", 28))
+
+        with Image.open(sprite.path) as image:
+            self.assertLessEqual(image.width, 200 + 4)
+            self.assertGreater(image.height, 28 * 2)
+            self.assertEqual(image.mode, "RGBA")
+        self.assertEqual(sprite.x, (360 - image.width) // 2)
+        self.assertEqual(len(self.renderer.sprites), 1)
+
+    def test_command_is_single_pass_with_timed_overlays(self):
+        self.renderer.add_timed_text("First", 0.0, 1.5, ('center', 500), "Arial", 28)
+        self.renderer.add_timed_text("Second", 1.8, 3.0, ('center', 500), "Arial", 28)
+        self.renderer.add_scrolling_text("ticker", y=600, speed=200, font="Arial", font_size=20)
+
+        cmd = self.renderer.build_command("out.mp4", 3.0, "voice.mp3")
+
+        self.assertEqual(cmd.count("-i"), 5)
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        self.assertIn("enable='between(t,0.000,1.500)'", graph)
+        self.assertIn("enable='between(t,1.800,3.000)'", graph)
+        self.assertIn("x='main_w-(t-0.000)*200'", graph)
+        self.assertEqual(cmd[cmd.index("-map", cmd.index("[vout]")) + 1], "4:a")
+        self.assertEqual(cmd[cmd.index("-t") + 1], "3.000")
+
+    def test_still_mode_encodes_only_distinct_frames(self):
+        self.renderer.add_timed_text("First", 0.5, 1.5, ('center', 500), "Arial", 28)
+        self.renderer.add_timed_text("Second", 1.5, 2.0, ('center', 500), "Arial", 28)
+        self.assertFalse(self.renderer.has_motion)
+
+        cmd = self.renderer.build_still_command("out.mp4", 3.0, "voice.mp3")
+
+        frames = [line for line in open(cmd[cmd.index("-i") + 1]).read().splitlines() if line.startswith("duration")]
+        self.assertEqual(frames, ["duration 0.500", "duration 1.000", "duration 0.500", "duration 1.000"])
+        self.assertIn("vfr", cmd)
+        self.assertEqual(cmd[cmd.index("-map", cmd.index("0:v")) + 1], "1:a")
+
+        self.renderer.add_scrolling_text("ticker", y=600, speed=200, font="Arial", font_size=20)
+        self.assertTrue(self.renderer.has_motion)
+
+    @unittest.skipUnless(shutil.which("ffmpeg") and shutil.which("ffprobe"), "FFmpeg not installed")
+    def test_render_produces_video_of_requested_duration(self):
+        self.renderer.add_timed_text("Hello", 0.2, 1.0, ('center', 300), "Arial", 32)
+        for frame_mode in ("still", "constant"):
+            output = self.renderer.render(os.path.join(self.temp_dir.name, f"{frame_mode}.mp4"), 1.5,
+                                          frame_mode=frame_mode)
+
+            probe = subprocess.run(["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
+                                    "-of", "csv=p=0", output], capture_output=True, text=True)
+            self.assertAlmostEqual(float(probe.stdout.strip()), 1.5, delta=0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for pipeline span tracing and trace rendering
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.timeline_visualizer import TimelineVisualizer
+from src.utils.tracing import (
+    get_tracer, propagate, run_subprocess, session_trace, trace_span, traced,
+    TRACE_FILENAME, TRACE_REPORT_FILENAME
+)
+
+
+class TestTracing(unittest.TestCase):
+    """Test nesting, propagation, subprocess spans and trace output"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_spans_are_noops_without_trace(self):
+        self.assertIsNone(get_tracer())
+        with trace_span("orphan") as span:
+            span.set(ignored=True)
+
+    def test_nested_spans_and_errors(self):
+        @traced("stage.work")
+        def work():
+            with trace_span("inner", clip=1):
+                pass
+
+        with session_trace("run") as tracer:
+            work()
+            with self.assertRaises(ValueError):
+                with trace_span("failing"):
+                    raise ValueError("boom")
+
+        spans = {span.name: span for span in tracer.spans}
+        self.assertEqual(spans["stage.work"].parent_id, spans["run"].span_id)
+        self.assertEqual(spans["inner"].parent_id, spans["stage.work"].span_id)
+        self.assertEqual(spans["inner"].attributes, {"clip": 1})
+        self.assertEqual(spans["failing"].attributes["error"], "ValueError")
+        self.assertIsNone(get_tracer())
+
+    def test_async_and_thread_spans_keep_parents(self):
+        @traced("async.stage")
+        async def stage():
+            await asyncio.sleep(0)
+
+        def worker(index):
+            with trace_span("worker", index=index):
+                return index
+
+        with session_trace("run") as tracer:
+            asyncio.run(stage())
+            with trace_span("fan_out"):
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    self.assertEqual(list(pool.map(propagate(worker), range(3))), [0, 1, 2])
+
+        spans = tracer.spans
+        fan_out = next(s for s in spans if s.name == "fan_out")
+        workers = [s for s in spans if s.name == "worker"]
+        self.assertEqual(len(workers), 3)
+        self.assertTrue(all(s.parent_id == fan_out.span_id for s in workers))
+        self.assertIn("async.stage", [s.name for s in spans])
+
+    def test_subprocess_span(self):
+        with session_trace("run") as tracer:
+            result = run_subprocess([sys.executable, "-c", "pass"], capture_output=True)
+
+        self.assertEqual(result.returncode, 0)
+        span = next(s for s in tracer.spans if s.name.startswith("subprocess."))
+        self.assertEqual(span.attributes["returncode"], 0)
+        self.assertIn("child_cpu_s", span.attributes)
+
+    def test_trace_written_and_rendered(self):
+        with session_trace("outer") as tracer:
+            tracer.bind(self.temp_dir.name)
+            # A nested session joins the outer trace instead of writing its own
+            with session_trace("inner.session") as inner:
+                self.assertIs(inner, tracer)
+                with trace_span("stage.audio"):
+                    pass
+
+        trace_path = os.path.join(self.temp_dir.name, TRACE_FILENAME)
+        with open(trace_path) as f:
+            trace = json.load(f)
+        names = [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(sorted(names), ["inner.session", "outer", "stage.audio"])
+
+        visualizer = TimelineVisualizer()
+        self.assertEqual(visualizer.load_trace(trace_path), 3)
+        report = visualizer.generate_trace_report()
+        self.assertIn("    stage.audio", report)
+        with open(os.path.join(self.temp_dir.name, TRACE_REPORT_FILENAME), encoding="utf-8") as f:
+            self.assertIn("PIPELINE TRACE", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Unit tests for the shared trending snapshot store
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.services.trending.trending_snapshot_store import TrendingSnapshotStore, TrendingSnapshotConfig
+from src.services.trending.local_trending_source import LocalTrendingSource
+from src.services.trending.unified_trending_analyzer import UnifiedTrendingAnalyzer
+
+
+class TestTrendingSnapshotStore(unittest.TestCase):
+    """Test TTLs, stale refresh, coalescing and trend deltas"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = TrendingSnapshotStore(TrendingSnapshotConfig(history_dir=self.temp_dir.name))
+        self.addCleanup(self.store.shutdown)
+
+    def _counting_fetcher(self, data_fn):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return data_fn(len(calls))
+
+        return fetch, calls
+
+    def test_fresh_snapshot_is_reused(self):
+        fetch, calls = self._counting_fetcher(lambda n: {'trending_hashtags': [{'tag': '#a', 'trend_score': n}]})
+
+        first = self.store.get('tiktok', None, 10, fetch)
+        second = self.store.get('tiktok', None, 10, fetch)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_callers_get_independent_copies(self):
+        fetch, _ = self._counting_fetcher(lambda n: {'trending_hashtags': [{'tag': '#a', 'trend_score': n}]})
+
+        first = self.store.get('tiktok', None, 10, fetch)
+        first['trending_hashtags'].clear()
+
+        self.assertEqual(len(self.store.get('tiktok', None, 10, fetch)['trending_hashtags']), 1)
+
+    def test_sources_do_not_share_snapshots_or_history(self):
+        local_fetch, local_calls = self._counting_fetcher(lambda n: {'trending_hashtags': [{'tag': '#local', 'trend_score': n}]})
+        api_fetch, api_calls = self._counting_fetcher(lambda n: {'trending_hashtags': [{'tag': '#api', 'trend_score': n}]})
+
+        local = self.store.get('tiktok', None, 10, local_fetch, source='local')
+        api = self.store.get('tiktok', None, 10, api_fetch)
+
+        self.assertEqual(local['trending_hashtags'][0]['tag'], '#local')
+        self.assertEqual(api['trending_hashtags'][0]['tag'], '#api')
+        self.assertEqual((len(local_calls), len(api_calls)), (1, 1))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, 'local', 'tiktok.jsonl')))
+        with open(os.path.join(self.temp_dir.name, 'tiktok.jsonl')) as f:
+            self.assertNotIn('#local', f.read())
+
+    def test_stale_snapshot_served_while_refreshing(self):
+        fetch, calls = self._counting_fetcher(lambda n: {'trending_hashtags': [{'tag': '#a', 'trend_score': n}]})
+        self.store.get('tiktok', None, 10, fetch)
+        self.store.peek('tiktok', None, 10).fetched_at -= self.store.ttl_for('tiktok') + 1
+
+        stale = self.store.get('tiktok', None, 10, fetch)
+        self.assertEqual(stale['trending_hashtags'][0]['trend_score'], 1)
+
+        deadline = time.time() + 2
+        while self.store.peek('tiktok', None, 10).data['trending_hashtags'][0]['trend_score'] != 2:
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(2)
+            return {'trending_hashtags': [{'tag': '#a', 'trend_score': 1}]}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.store.get('youtube', 'ai', 5, slow_fetch)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+
+    def test_failed_refresh_keeps_last_good_snapshot(self):
+        good = {'trending_hashtags': [{'tag': '#a', 'trend_score': 1}]}
+        self.store.get('instagram', None, 10, lambda: good)
+        self.store.invalidate('instagram')
+        self.assertEqual(self.store.get('instagram', None, 10, lambda: {'error': 'quota'}), {'error': 'quota'})
+
+        self.store.put('instagram', None, 10, good)
+        self.store.peek('instagram', None, 10).fetched_at -= 10 ** 6
+        self.assertEqual(self.store.get('instagram', None, 10, lambda: {'error': 'quota'}), good)
+
+    def test_trend_deltas_survive_restart(self):
+        self.store.put('tiktok', None, 10, {'trending_hashtags': [
+            {'tag': '#a', 'trend_score': 0.5}, {'tag': '#b', 'trend_score': 0.9}]})
+        self.store.put('tiktok', None, 10, {'trending_hashtags': [
+            {'tag': '#a', 'trend_score': 0.8}, {'tag': '#c', 'trend_score': 0.7}]})
+
+        reopened = TrendingSnapshotStore(TrendingSnapshotConfig(history_dir=self.temp_dir.name))
+        self.addCleanup(reopened.shutdown)
+        deltas = reopened.get_trend_deltas('tiktok')
+
+        self.assertTrue(deltas['available'])
+        self.assertEqual(deltas['new'], ['#c'])
+        self.assertEqual(deltas['dropped'], ['#b'])
+        self.assertEqual([name for name, _ in deltas['rising']], ['#a'])
+
+    def test_analyzer_with_local_source(self):
+        analyzer = UnifiedTrendingAnalyzer(snapshot_store=self.store, use_local_source=True)
+
+        data = analyzer.get_all_trending_data(limit=5)
+        again = analyzer.get_all_trending_data(limit=5)
+
+        self.assertEqual(set(data['platforms']), {'youtube', 'tiktok', 'instagram'})
+        self.assertEqual(data['platforms'], again['platforms'])
+        self.assertEqual(LocalTrendingSource().get_platform_trends('tiktok', None, 5)['trending_hashtags'],
+                         data['platforms']['tiktok']['trending_hashtags'])
+
+
+if __name__ == '__main__':
+    unittest.main()
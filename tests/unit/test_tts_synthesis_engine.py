@@ -0,0 +1,92 @@
+"""
+Unit tests for the TTS synthesis engine and audio cache
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.generators.tts_synthesis_engine import TTSSynthesisEngine, TTSEngineConfig
+
+
+class TestTTSSynthesisEngine(unittest.TestCase):
+    """Test caching, per-provider limits and ordered fan-out"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.engine = TTSSynthesisEngine(TTSEngineConfig(
+            cache_dir=os.path.join(self.temp_dir.name, "cache"),
+            provider_limits={"google_cloud": 2},
+            max_workers=6
+        ))
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _synth(self, content=b"audio-bytes", delay=0.0):
+        def synthesize():
+            with self.lock:
+                self.calls += 1
+            time.sleep(delay)
+            path = os.path.join(self.temp_dir.name, f"{uuid.uuid4()}.mp3")
+            with open(path, "wb") as f:
+                f.write(content)
+            return path
+        return synthesize
+
+    def test_identical_requests_hit_cache_with_private_copies(self):
+        params = {"text": "Hello there", "voice": "en-US-Journey-F", "language": "en-US", "rate": 1.0}
+
+        first = self.engine.synthesize("google_cloud", params, self._synth())
+        second = self.engine.synthesize("google_cloud", params, self._synth())
+        other_rate = self.engine.synthesize("google_cloud", dict(params, rate=1.1), self._synth())
+
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(first, second)
+        with open(second, "rb") as f:
+            self.assertEqual(f.read(), b"audio-bytes")
+        # Callers may delete what they get back without affecting the cache
+        os.remove(second)
+        self.assertIsNotNone(self.engine.synthesize("google_cloud", params, self._synth()))
+        self.assertEqual(self.calls, 2)
+        self.assertTrue(os.path.exists(other_rate))
+
+    def test_failed_synthesis_not_cached(self):
+        params = {"text": "Hi", "lang": "en", "tld": "com"}
+        self.assertIsNone(self.engine.synthesize("gtts", params, lambda: None))
+        self.engine.synthesize("gtts", params, self._synth())
+        self.assertEqual(self.calls, 1)
+
+    def test_provider_limit_bounds_concurrency(self):
+        active = {"now": 0, "peak": 0}
+
+        def job(index):
+            def synthesize():
+                with self.lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(0.05)
+                with self.lock:
+                    active["now"] -= 1
+                return None
+            return self.engine.synthesize("google_cloud", {"text": f"segment {index}"}, synthesize)
+
+        self.engine.map(job, list(range(6)))
+        self.assertEqual(active["peak"], 2)
+
+    def test_map_preserves_order_and_nests(self):
+        def outer(index):
+            return self.engine.map(lambda j: (index, j), [0, 1])
+
+        results = self.engine.map(outer, [0, 1, 2])
+        self.assertEqual(results, [[(i, 0), (i, 1)] for i in range(3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
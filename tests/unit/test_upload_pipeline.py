@@ -0,0 +1,211 @@
+"""
+Unit tests for the social publishing pipeline against local stand-in API servers
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.social.telegram_sender import TelegramSender
+from src.social.upload_pipeline import (
+    DeliveryQueue, DeliveryState, MultipartFileStream, PublishingPipeline,
+    RateLimiter, ResumableUploader, create_retry_manager
+)
+
+
+class StandInServer:
+    """Local HTTP server; ``handle(handler, body)`` returns (status, payload, headers)"""
+
+    def __init__(self, handle):
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, payload, headers = handle(self, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestStreamingUploads(unittest.TestCase):
+    """Test multipart streaming and resumable chunked uploads"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.temp_dir, "clip.mp4")
+        self.video = os.urandom(300_000)
+        with open(self.video_path, 'wb') as f:
+            f.write(self.video)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_multipart_stream_matches_declared_length(self):
+        received = {}
+
+        def handle(handler, body):
+            received['type'] = handler.headers['Content-Type']
+            received['body'] = body
+            return 200, {"ok": True}, None
+
+        server = StandInServer(handle)
+        try:
+            stream = MultipartFileStream({'chat_id': 42, 'caption': None}, 'video', self.video_path, chunk_size=4096)
+            requests.post(server.url, data=stream, headers={'Content-Type': stream.content_type})
+        finally:
+            server.close()
+
+        self.assertEqual(len(received['body']), len(stream))
+        self.assertIn(stream.boundary, received['type'])
+        self.assertIn(b'name="chat_id"\r\n\r\n42\r\n', received['body'])
+        self.assertNotIn(b'name="caption"', received['body'])
+        self.assertIn(self.video, received['body'])
+
+    def test_resumable_upload_resumes_from_committed_offset(self):
+        stored = bytearray()
+        calls = []
+
+        def handle(handler, body):
+            offset = int(handler.headers['offset'])
+            calls.append(offset)
+            if len(calls) == 2:
+                return 503, {"error": "busy"}, None
+            if len(calls) == 3:
+                # Commit only part of the chunk; the client resends the rest
+                body = body[:1000]
+            stored[offset:offset + len(body)] = body
+            return 200, {"offset": offset + len(body), "success": True}, None
+
+        server = StandInServer(handle)
+        try:
+            uploader = ResumableUploader(
+                chunk_size=100_000,
+                retry_manager=create_retry_manager("test_upload", max_retries=3, base_delay=0.01)
+            )
+            result = uploader.upload(server.url, self.video_path, headers={'Authorization': 'OAuth t'})
+        finally:
+            server.close()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(bytes(stored), self.video)
+        self.assertEqual(calls[:4], [0, 100_000, 100_000, 101_000])
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test token bucket pacing"""
+
+    def test_acquire_paces_to_rate(self):
+        limiter = RateLimiter(rate_per_second=50, burst=1)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_pause_blocks_platform(self):
+        limiter = RateLimiter(rate_per_second=1000, burst=10)
+        limiter.pause(0.1)
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+
+class TestTelegramFanOut(unittest.TestCase):
+    """Test concurrent fan-out with upload-once, retries and resume"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.video_path = os.path.join(self.temp_dir, "viral.mp4")
+        with open(self.video_path, 'wb') as f:
+            f.write(os.urandom(200_000))
+        self.lock = threading.Lock()
+        self.uploads = 0
+        self.sent_to = []
+        self.throttled = set()
+        self.server = StandInServer(self._handle)
+        self.sender = TelegramSender("123:TEST")
+        self.sender.base_url = f"{self.server.url}/bot123:TEST"
+        self.queue = DeliveryQueue(os.path.join(self.temp_dir, "deliveries.db"))
+        self.pipeline = PublishingPipeline(self.queue, workers=8, retry_base_delay=0.01)
+
+    def tearDown(self):
+        self.server.close()
+        self.queue.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _handle(self, handler, body):
+        method = handler.path.rsplit('/', 1)[-1]
+        if method == "sendMessage":
+            return 200, {"ok": True, "result": {"message_id": 1}}, None
+
+        if handler.headers['Content-Type'].startswith('multipart/form-data'):
+            with self.lock:
+                self.uploads += 1
+            chat_id = body.split(b'name="chat_id"\r\n\r\n')[1].split(b'\r\n')[0].decode()
+        else:
+            payload = json.loads(body)
+            if payload['video'] != "FILE-1":
+                return 400, {"ok": False, "description": "bad file_id"}, None
+            chat_id = str(payload['chat_id'])
+
+        with self.lock:
+            if chat_id == "-1003" and chat_id not in self.throttled:
+                self.throttled.add(chat_id)
+                return 429, {"ok": False, "parameters": {"retry_after": 0.05}}, None
+            if chat_id == "-1009":
+                return 403, {"ok": False, "description": "bot was kicked"}, None
+            self.sent_to.append(chat_id)
+        return 200, {"ok": True, "result": {"message_id": 7, "video": {"file_id": "FILE-1"}}}, None
+
+    def _send(self, chat_id):
+        return self.sender.deliver_viral_video_package(chat_id, self.video_path, "Ocean facts", "tiktok")
+
+    def test_fan_out_uploads_once_and_isolates_failures(self):
+        chats = [str(-1000 - i) for i in range(20)]
+
+        deliveries = self.pipeline.publish("batch-1", {"telegram": chats}, {"telegram": self._send})
+
+        states = {d.target: d.state for d in deliveries}
+        self.assertEqual(self.uploads, 1)
+        self.assertEqual(states["-1009"], DeliveryState.FAILED)
+        self.assertEqual(states["-1003"], DeliveryState.SENT)
+        self.assertEqual(sum(state == DeliveryState.SENT for state in states.values()), 19)
+        self.assertEqual(next(d for d in deliveries if d.target == "-1003").attempts, 2)
+
+    def test_rerunning_batch_only_retries_undelivered(self):
+        chats = ["-1001", "-1002", "-1009"]
+        self.pipeline.publish("batch-2", {"telegram": chats}, {"telegram": self._send})
+        sent_before = len(self.sent_to)
+
+        deliveries = self.pipeline.publish("batch-2", {"telegram": chats}, {"telegram": self._send})
+
+        self.assertEqual(len(self.sent_to), sent_before)
+        failed = next(d for d in deliveries if d.target == "-1009")
+        self.assertEqual(failed.state, DeliveryState.FAILED)
+        self.assertEqual(failed.attempts, 2)
+        self.assertIn("bot was kicked", failed.error)
+
+
+if __name__ == '__main__':
+    unittest.main()